@@ -2,7 +2,7 @@
 Application configuration using pydantic-settings.
 """
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import Field, PostgresDsn, RedisDsn, validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -87,11 +87,33 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = 60
     rate_limit_per_hour: int = 1000
     rate_limit_storage_url: Optional[str] = None  # Uses redis_url if None
+    rate_limit_lease_size: int = 10  # Tokens each replica takes per store round trip
+    rate_limit_route_costs: Dict[str, int] = {
+        "POST /api/v1/skills/*/execute": 10,
+        "POST /api/v1/tools/execute": 5,
+    }
+    rate_limit_exempt_paths: List[str] = ["/health", "/docs*", "/redoc*", "/openapi.json", "/ws*"]
+
+    # WebSocket event fan-out
+    ws_fanout_enabled: bool = True
+    ws_fanout_tick_ms: int = 100  # Flush interval for per-room outboxes
+    ws_fanout_max_pending: int = 500  # Per-room outbox capacity
+    ws_fanout_max_batch: int = 100  # Maximum events per emitted frame
+    ws_fanout_drop_policy: str = Field(
+        default="drop_oldest", pattern="^(drop_oldest|drop_newest|block)$"
+    )
+
+    # WebSocket rooms
+    ws_room_backend: str = Field(default="local", pattern="^(local|redis)$")
+    ws_presence_ttl_seconds: int = 60  # Members without a heartbeat are reaped after this
+    ws_presence_heartbeat_seconds: int = 20
 
     # Logging
     log_level: str = Field(default="INFO", pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")
     log_format: str = "json"  # json or text
     log_file: Optional[str] = None
+    log_sample_rate: float = Field(default=0.1, ge=0.0, le=1.0)  # Successful requests logged
+    log_slow_request_ms: int = 1000  # Slower requests are always logged
 
     # Security
     allowed_hosts: List[str] = ["*"]
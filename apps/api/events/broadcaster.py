@@ -4,12 +4,13 @@ Event broadcaster for emitting WebSocket events from any part of the application
 This module provides helper functions to emit real-time events to clients,
 integrating with the WebSocket server and supporting Temporal workflow integration.
 """
-import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Hashable, List, Tuple
 from uuid import UUID
 from datetime import datetime
 
+from config import settings
+from events.fanout import DropPolicy, EventFanout
 from websocket.server import get_sio
 from websocket.models import (
     EventType,
@@ -25,35 +26,71 @@ from middleware.logging import logger as app_logger
 
 logger = logging.getLogger(__name__)
 
+Target = Tuple[str, Optional[UUID]]
+
 
 class EventBroadcaster:
     """Broadcasts real-time events to WebSocket clients."""
 
-    def __init__(self):
-        """Initialize broadcaster."""
+    def __init__(self, fanout: Optional[EventFanout] = None):
+        """
+        Initialize broadcaster.
+
+        Args:
+            fanout: Optional outbound queue; when set, events are coalesced and
+                delivered in per-room frames instead of emitted one by one
+        """
         self.sio = None
+        self.fanout = fanout
         self._initialized = False
 
     def init(self):
         """Initialize broadcaster with Socket.IO server."""
         try:
             self.sio = get_sio()
+            if self.fanout is None and settings.ws_fanout_enabled:
+                self.fanout = EventFanout(
+                    emit=self._send,
+                    tick_interval=settings.ws_fanout_tick_ms / 1000,
+                    max_pending_per_room=settings.ws_fanout_max_pending,
+                    max_batch_size=settings.ws_fanout_max_batch,
+                    drop_policy=DropPolicy(settings.ws_fanout_drop_policy),
+                )
             self._initialized = True
             logger.info("EventBroadcaster initialized")
         except Exception as e:
             logger.error(f"Failed to initialize EventBroadcaster: {str(e)}")
 
+    async def close(self) -> None:
+        """Deliver pending events and stop the fan-out loop."""
+        if self.fanout is not None:
+            await self.fanout.close()
+
     async def _ensure_initialized(self) -> bool:
         """Ensure broadcaster is initialized."""
         if not self._initialized:
             self.init()
         return self._initialized
 
+    @staticmethod
+    def _get_room(target_type: str, target_id: Optional[UUID]) -> Optional[str]:
+        """Map a target to its room name, or None if the target is invalid."""
+        if target_type == "global":
+            return "global"
+        if target_type in ("project", "user", "agent") and target_id:
+            return f"{target_type}:{target_id}"
+        return None
+
+    async def _send(self, event: str, data: Any, room: str) -> None:
+        """Emit a single payload to a room on the /ws namespace."""
+        await self.sio.emit(event, data, room=room, namespace="/ws")
+
     async def _emit_event(
         self,
         event: WebSocketEvent,
         target_type: str = "global",
         target_id: Optional[UUID] = None,
+        coalesce_key: Optional[Hashable] = None,
     ) -> bool:
         """
         Internal method to emit an event.
@@ -62,47 +99,61 @@ class EventBroadcaster:
             event: WebSocketEvent to emit
             target_type: Type of target (global, project, user, agent)
             target_id: Optional ID for targeted emission
+            coalesce_key: Key identifying events that supersede each other
 
         Returns:
             True if emission successful
         """
+        return await self._emit_to_targets(event, [(target_type, target_id)], coalesce_key)
+
+    async def _emit_to_targets(
+        self,
+        event: WebSocketEvent,
+        targets: List[Target],
+        coalesce_key: Optional[Hashable] = None,
+    ) -> bool:
+        """
+        Serialize an event once and deliver it to every target room.
+
+        Args:
+            event: WebSocketEvent to emit
+            targets: (target_type, target_id) pairs
+            coalesce_key: Key identifying events that supersede each other
+
+        Returns:
+            True if the event was delivered (or queued) for every target
+        """
         if not await self._ensure_initialized():
             logger.error("EventBroadcaster not initialized")
             return False
 
         try:
             event_data = event.dict()
-
-            # Determine room based on target
-            if target_type == "global":
-                room = "global"
-            elif target_type == "project" and target_id:
-                room = f"project:{target_id}"
-            elif target_type == "user" and target_id:
-                room = f"user:{target_id}"
-            elif target_type == "agent" and target_id:
-                room = f"agent:{target_id}"
-            else:
-                logger.warning(f"Unknown target type: {target_type}")
-                return False
-
-            # Emit event to room
-            await self.sio.emit(
-                event.type.value,
-                event_data,
-                room=room,
-                namespace="/ws"
-            )
-
-            app_logger.info(
-                "event_broadcast",
-                event_type=event.type.value,
-                target_type=target_type,
-                target_id=str(target_id) if target_id else None,
-                room=room
-            )
-
-            return True
+            ok = True
+
+            for target_type, target_id in targets:
+                room = self._get_room(target_type, target_id)
+                if room is None:
+                    logger.warning(f"Unknown target type: {target_type}")
+                    ok = False
+                    continue
+
+                if self.fanout is not None:
+                    ok = await self.fanout.enqueue(
+                        room, event.type.value, event_data, coalesce_key
+                    ) and ok
+                else:
+                    await self._send(event.type.value, event_data, room)
+
+                app_logger.debug(
+                    "event_broadcast",
+                    event_type=event.type.value,
+                    target_type=target_type,
+                    target_id=str(target_id) if target_id else None,
+                    room=room
+                )
+
+            return ok
 
         except Exception as e:
             logger.error(f"Error emitting event: {str(e)}", exc_info=True)
@@ -149,14 +200,10 @@ class EventBroadcaster:
         )
 
         # Broadcast to project room and owner's user room
-        results = await asyncio.gather(
-            self._emit_event(event, "project", project_id),
-            self._emit_event(event, "user", updated_by),
-            return_exceptions=True
+        return await self._emit_to_targets(
+            event, [("project", project_id), ("user", updated_by)]
         )
 
-        return all(r for r in results if not isinstance(r, Exception))
-
     async def broadcast_project_deleted(
         self,
         project_id: UUID,
@@ -178,14 +225,10 @@ class EventBroadcaster:
             source="project_service"
         )
 
-        results = await asyncio.gather(
-            self._emit_event(event, "project", project_id),
-            self._emit_event(event, "user", deleted_by),
-            return_exceptions=True
+        return await self._emit_to_targets(
+            event, [("project", project_id), ("user", deleted_by)]
         )
 
-        return all(r for r in results if not isinstance(r, Exception))
-
     # Agent Events
 
     async def broadcast_agent_status_changed(
@@ -223,15 +266,14 @@ class EventBroadcaster:
             source="agent_service"
         )
 
-        # Broadcast to agent room and global room
-        results = await asyncio.gather(
-            self._emit_event(event, "agent", agent_id),
-            self._emit_event(event, "global"),
-            return_exceptions=True
+        # Broadcast to agent room and global room; a newer status supersedes
+        # any still-queued one for the same agent
+        return await self._emit_to_targets(
+            event,
+            [("agent", agent_id), ("global", None)],
+            coalesce_key=(EventType.AGENT_STATUS_CHANGED.value, str(agent_id)),
         )
 
-        return all(r for r in results if not isinstance(r, Exception))
-
     # Workflow Events
 
     async def broadcast_workflow_progress(
@@ -280,11 +322,14 @@ class EventBroadcaster:
             source="workflow_service"
         )
 
+        # Only the latest progress per workflow is delivered
+        coalesce_key = (EventType.WORKFLOW_PROGRESS.value, str(workflow_id))
+
         # Broadcast to project room if available, otherwise global
         if project_id:
-            return await self._emit_event(event, "project", project_id)
+            return await self._emit_event(event, "project", project_id, coalesce_key)
         else:
-            return await self._emit_event(event, "global")
+            return await self._emit_event(event, "global", coalesce_key=coalesce_key)
 
     # PR Events
 
@@ -412,11 +457,11 @@ class EventBroadcaster:
         )
 
         # Broadcast to project room and assigned user if applicable
-        results = [await self._emit_event(event, "project", project_id)]
+        targets: List[Target] = [("project", project_id)]
         if assigned_to:
-            results.append(await self._emit_event(event, "user", assigned_to))
+            targets.append(("user", assigned_to))
 
-        return all(results)
+        return await self._emit_to_targets(event, targets)
 
     # AI Events
 
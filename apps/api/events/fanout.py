@@ -0,0 +1,266 @@
+"""
+Coalescing, rate-bounded fan-out of WebSocket events.
+
+High-frequency producers (workflow progress, agent heartbeats) can emit far
+more events than subscribers need to see. Instead of calling ``sio.emit`` for
+every event, the broadcaster enqueues events into a per-room outbox:
+
+- Events that carry a coalesce key replace any pending event with the same
+  key, so only the latest progress per workflow is delivered.
+- Every ``tick_interval`` seconds each non-empty outbox is flushed as a single
+  frame, so one Socket.IO emit (and one Redis publish) is made per room per
+  tick regardless of how many events were produced.
+- Outboxes are bounded. When a room falls behind, the configured drop policy
+  decides whether to shed old events, shed new ones, or make producers wait.
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import count
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Event name used when a frame carries more than one event
+BATCH_EVENT = "events.batch"
+
+EmitFn = Callable[[str, Any, str], Awaitable[None]]
+
+
+class DropPolicy(str, Enum):
+    """What to do when a room outbox is full."""
+    DROP_OLDEST = "drop_oldest"  # Evict the oldest pending event
+    DROP_NEWEST = "drop_newest"  # Reject the incoming event
+    BLOCK = "block"  # Wait for the next flush (bounded by enqueue_timeout)
+
+
+@dataclass
+class OutboundEvent:
+    """A serialized event waiting to be delivered to a room."""
+    event: str
+    data: Dict[str, Any]
+    coalesce_key: Optional[Hashable] = None
+
+
+@dataclass
+class RoomOutbox:
+    """Pending events for a single room, in delivery order."""
+    room: str
+    pending: "OrderedDict[Hashable, OutboundEvent]" = field(default_factory=OrderedDict)
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+
+class EventFanout:
+    """Per-room outbound queues with coalescing, batching and drop policy."""
+
+    def __init__(
+        self,
+        emit: EmitFn,
+        tick_interval: float = 0.1,
+        max_pending_per_room: int = 500,
+        max_batch_size: int = 100,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        enqueue_timeout: float = 1.0,
+    ):
+        """
+        Initialize fan-out.
+
+        Args:
+            emit: Coroutine ``emit(event, data, room)`` performing the actual send
+            tick_interval: Seconds between flushes
+            max_pending_per_room: Outbox capacity before the drop policy applies
+            max_batch_size: Maximum events per frame; the rest wait for the next tick
+            drop_policy: Policy applied when an outbox is full
+            enqueue_timeout: Maximum wait in seconds under ``DropPolicy.BLOCK``
+        """
+        self._emit = emit
+        self.tick_interval = tick_interval
+        self.max_pending_per_room = max_pending_per_room
+        self.max_batch_size = max_batch_size
+        self.drop_policy = drop_policy
+        self.enqueue_timeout = enqueue_timeout
+
+        self._outboxes: Dict[str, RoomOutbox] = {}
+        self._stats: Dict[str, int] = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "frames_sent": 0,
+            "events_sent": 0,
+        }
+        self._seq = count()
+        self._flushed = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """Start the background flush loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._closed = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the flush loop and deliver everything still pending."""
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self.pending_count():
+            await self.flush()
+
+    async def _run(self) -> None:
+        """Flush outboxes every tick until closed."""
+        while not self._closed:
+            await asyncio.sleep(self.tick_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing event fan-out: {str(e)}", exc_info=True)
+
+    # Producer side
+
+    async def enqueue(
+        self,
+        room: str,
+        event: str,
+        data: Dict[str, Any],
+        coalesce_key: Optional[Hashable] = None,
+    ) -> bool:
+        """
+        Queue an event for delivery to a room.
+
+        Args:
+            room: Target room
+            event: Event name
+            data: Already-serialized event payload
+            coalesce_key: Events with the same key in the same room supersede
+                each other; only the latest is delivered
+
+        Returns:
+            True if the event was queued, False if it was dropped
+        """
+        self.start()
+        outbox = self._outboxes.get(room)
+        if outbox is None:
+            outbox = self._outboxes[room] = RoomOutbox(room=room)
+
+        item = OutboundEvent(event=event, data=data, coalesce_key=coalesce_key)
+
+        if coalesce_key is not None and coalesce_key in outbox.pending:
+            # Superseded: drop the stale event and requeue at the tail
+            del outbox.pending[coalesce_key]
+            outbox.pending[coalesce_key] = item
+            self._stats["coalesced"] += 1
+            return True
+
+        if len(outbox) >= self.max_pending_per_room:
+            if not await self._make_room(outbox):
+                return False
+            # A flush may have retired the outbox while we were waiting
+            outbox = self._outboxes.setdefault(room, outbox)
+
+        key = coalesce_key if coalesce_key is not None else ("seq", next(self._seq))
+        outbox.pending[key] = item
+        self._stats["enqueued"] += 1
+        return True
+
+    async def _make_room(self, outbox: RoomOutbox) -> bool:
+        """Apply the drop policy to a full outbox. Returns False to reject."""
+        if self.drop_policy == DropPolicy.DROP_OLDEST:
+            outbox.pending.popitem(last=False)
+            self._stats["dropped"] += 1
+            return True
+
+        if self.drop_policy == DropPolicy.BLOCK:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.enqueue_timeout
+            while len(outbox) >= self.max_pending_per_room:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._flushed.clear()
+                try:
+                    await asyncio.wait_for(self._flushed.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            if len(outbox) < self.max_pending_per_room:
+                return True
+
+        self._stats["dropped"] += 1
+        logger.warning(f"Outbox for room {outbox.room} is full, dropping event")
+        return False
+
+    # Consumer side
+
+    async def flush(self) -> int:
+        """
+        Send one frame to every room with pending events.
+
+        Returns:
+            Number of frames sent
+        """
+        async with self._flush_lock:
+            frames = []
+            for room, outbox in list(self._outboxes.items()):
+                if not outbox.pending:
+                    del self._outboxes[room]
+                    continue
+                batch: List[OutboundEvent] = []
+                while outbox.pending and len(batch) < self.max_batch_size:
+                    batch.append(outbox.pending.popitem(last=False)[1])
+                frames.append((outbox, batch))
+
+            self._flushed.set()
+            if not frames:
+                return 0
+
+            results = await asyncio.gather(
+                *(self._send_frame(outbox.room, batch) for outbox, batch in frames),
+                return_exceptions=True,
+            )
+
+            sent = 0
+            for (outbox, batch), result in zip(frames, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error emitting frame to room {outbox.room}: {str(result)}")
+                    continue
+                self._stats["frames_sent"] += 1
+                self._stats["events_sent"] += len(batch)
+                sent += 1
+            return sent
+
+    async def _send_frame(self, room: str, batch: List[OutboundEvent]) -> None:
+        """Emit a batch as a single event, unwrapping single-event frames."""
+        if len(batch) == 1:
+            await self._emit(batch[0].event, batch[0].data, room)
+            return
+
+        frame = {
+            "events": [{"type": item.event, "data": item.data} for item in batch],
+            "count": len(batch),
+        }
+        await self._emit(BATCH_EVENT, frame, room)
+
+    # Introspection
+
+    def pending_count(self, room: Optional[str] = None) -> int:
+        """Number of events waiting to be flushed, for one room or all rooms."""
+        if room is not None:
+            outbox = self._outboxes.get(room)
+            return len(outbox) if outbox else 0
+        return sum(len(outbox) for outbox in self._outboxes.values())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cumulative enqueue, coalesce, drop and send counters."""
+        return {**self._stats, "pending": self.pending_count(), "rooms": len(self._outboxes)}
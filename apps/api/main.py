@@ -10,7 +10,7 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from config import settings
-from middleware import setup_cors, setup_logging, setup_rate_limiting, logger
+from middleware import setup_cors, setup_logging, setup_rate_limiting, shutdown_logging, logger
 from routers import (
     auth_router,
     projects_router,
@@ -37,6 +37,7 @@ async def lifespan(app: FastAPI):
 
     # Initialize WebSocket server
     ws_server = init_websocket_server()
+    await ws_server.start()
     logger.info("websocket_server_initialized")
 
     # Initialize event broadcaster
@@ -64,6 +65,13 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("application_shutting_down")
 
+    # Deliver queued WebSocket events
+    await broadcaster.close()
+    logger.info("event_broadcaster_closed")
+
+    # Stop WebSocket presence heartbeats
+    await ws_server.close()
+
     # Close database connections
     try:
         await close_db_pool()
@@ -73,10 +81,11 @@ async def lifespan(app: FastAPI):
 
     # TODO: Close Redis connections
     # TODO: Gracefully shutdown background tasks
-    # TODO: Flush logs and metrics
-
     logger.info("application_stopped")
 
+    # Flush queued log records
+    shutdown_logging()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -117,10 +126,12 @@ app = FastAPI(
 )
 
 
-# Setup middleware (order matters!)
-setup_logging(app)  # First: logging
-setup_cors(app)  # Second: CORS
-setup_rate_limiting(app)  # Third: rate limiting
+# Setup middleware (order matters!). The last one added is the outermost,
+# so requests pass logging, then CORS, then rate limiting: 429 responses get
+# a request ID, CORS headers, logs and metrics
+setup_rate_limiting(app)  # Innermost: rate limiting
+setup_cors(app)  # CORS
+setup_logging(app)  # Outermost: logging and request IDs
 
 
 # Custom exception handlers
@@ -5,7 +5,6 @@ Custom metrics for agents, costs, quality, and business KPIs
 
 from typing import Optional, Dict, Any
 from functools import wraps
-import time
 
 from prometheus_client import (
     Counter,
@@ -18,7 +17,7 @@ from prometheus_client import (
     generate_latest,
     CONTENT_TYPE_LATEST,
 )
-from fastapi import Request, Response
+from fastapi import Response
 from fastapi.responses import PlainTextResponse
 import asyncio
 
@@ -426,24 +425,7 @@ class PrometheusMetrics:
 prometheus_metrics = PrometheusMetrics()
 
 
-# FastAPI middleware
-async def prometheus_middleware(request: Request, call_next):
-    """FastAPI middleware to track request metrics"""
-    start_time = time.time()
-
-    # Process request
-    response = await call_next(request)
-
-    # Record metrics
-    duration = time.time() - start_time
-    prometheus_metrics.record_http_request(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code,
-        duration_seconds=duration,
-    )
-
-    return response
+# HTTP request metrics are recorded by middleware.logging.RequestObservabilityMiddleware
 
 
 # Metrics endpoint
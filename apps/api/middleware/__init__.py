@@ -2,12 +2,13 @@
 Middleware module.
 """
 from middleware.cors import setup_cors
-from middleware.logging import setup_logging, logger
+from middleware.logging import setup_logging, shutdown_logging, logger
 from middleware.rate_limit import setup_rate_limiting, limiter
 
 __all__ = [
     "setup_cors",
     "setup_logging",
+    "shutdown_logging",
     "setup_rate_limiting",
     "logger",
     "limiter",
@@ -1,16 +1,33 @@
 """
-Request logging middleware with correlation IDs.
+Request observability middleware: correlation IDs, timing, metrics and logging.
+
+The middleware is pure ASGI, so it adds no per-request task or body stream
+the way ``BaseHTTPMiddleware`` does. It records Prometheus metrics for every
+request and writes one log line per request, but only for a sample of
+successful requests. Errors and slow requests are always logged. Records go
+through a ``QueueHandler`` and a background ``QueueListener`` thread handles
+the actual I/O, so log output never blocks the event loop.
 """
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
 import time
-import uuid
-from typing import Callable
+from typing import Optional
 
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
 from config import settings
 
+try:
+    from metrics.prometheus_metrics import prometheus_metrics
+except ImportError:  # prometheus_client not installed
+    prometheus_metrics = None
+
 
 # Configure structured logging
 structlog.configure(
@@ -32,79 +49,161 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+REQUEST_ID_HEADER = b"x-request-id"
+MAX_REQUEST_ID_LENGTH = 128
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for structured request/response logging."""
+_queue_listener: Optional[logging.handlers.QueueListener] = None
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Process request and log details.
 
-        Args:
-            request: Incoming request
-            call_next: Next middleware/route handler
+def _new_request_id() -> str:
+    """Generate a random 128-bit request ID (cheaper than uuid4)."""
+    return os.urandom(16).hex()
 
-        Returns:
-            Response: HTTP response
-        """
-        # Generate correlation ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-
-        # Extract request details
-        client_host = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
-
-        # Bind context to logger
-        log = logger.bind(
-            request_id=request_id,
-            method=request.method,
-            path=request.url.path,
-            client_ip=client_host,
-            user_agent=user_agent,
-        )
 
-        # Log request
-        log.info(
-            "request_started",
-            query_params=dict(request.query_params),
-        )
+def _get_header(scope: Scope, name: bytes) -> Optional[str]:
+    """Get a request header value from the raw ASGI header list."""
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
 
-        # Process request
-        start_time = time.time()
-        try:
-            response = await call_next(request)
 
-            # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
+class RequestObservabilityMiddleware:
+    """Pure ASGI middleware for request IDs, timing, metrics and sampled logs."""
 
-            # Log response
-            log.info(
-                "request_completed",
-                status_code=response.status_code,
-                duration_ms=round(duration_ms, 2),
-            )
-
-            # Add correlation ID to response headers
-            response.headers["X-Request-ID"] = request_id
-
-            return response
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        slow_request_ms: float = 1000.0,
+    ):
+        """
+        Initialize middleware.
 
+        Args:
+            app: Downstream ASGI application
+            sample_rate: Fraction of successful, fast requests that are logged
+            slow_request_ms: Requests at least this slow are always logged
+        """
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Reuse the caller's correlation ID when present
+        request_id = _get_header(scope, REQUEST_ID_HEADER)
+        if not request_id or len(request_id) > MAX_REQUEST_ID_LENGTH:
+            request_id = _new_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
-            # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Log error
-            log.error(
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self._record(scope, 500, duration_ms, response_size)
+            logger.error(
                 "request_failed",
+                request_id=request_id,
+                method=scope["method"],
+                path=scope["path"],
                 error=str(exc),
                 error_type=type(exc).__name__,
                 duration_ms=round(duration_ms, 2),
                 exc_info=True,
             )
-
             raise
 
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        self._record(scope, status_code, duration_ms, response_size)
+
+        is_error = status_code >= 500
+        is_slow = duration_ms >= self.slow_request_ms
+        if is_error or is_slow or random.random() < self.sample_rate:
+            client = scope.get("client")
+            log = logger.error if is_error else logger.warning if is_slow else logger.info
+            log(
+                "request_completed",
+                request_id=request_id,
+                method=scope["method"],
+                path=scope["path"],
+                query_string=scope.get("query_string", b"").decode("latin-1"),
+                status_code=status_code,
+                duration_ms=round(duration_ms, 2),
+                response_size=response_size,
+                client_ip=client[0] if client else "unknown",
+                user_agent=_get_header(scope, b"user-agent") or "unknown",
+                sampled=not (is_error or is_slow),
+            )
+
+    @staticmethod
+    def _record(scope: Scope, status_code: int, duration_ms: float, response_size: int) -> None:
+        """Record Prometheus request metrics, labelled by route template."""
+        if prometheus_metrics is None:
+            return
+
+        # Use the matched route template to keep label cardinality bounded
+        route = scope.get("route")
+        endpoint = getattr(route, "path", None) or (
+            "unmatched" if status_code == 404 else scope["path"]
+        )
+        prometheus_metrics.record_http_request(
+            method=scope["method"],
+            endpoint=endpoint,
+            status=status_code,
+            duration_seconds=duration_ms / 1000,
+            response_size_bytes=response_size,
+        )
+
+
+def _setup_queue_logging() -> None:
+    """Route stdlib log records through a queue drained by a background thread."""
+    global _queue_listener
+    if _queue_listener is not None:
+        return
+
+    root = logging.getLogger()
+    handlers = root.handlers[:] or [logging.StreamHandler()]
+    if settings.log_file:
+        handlers.append(logging.FileHandler(settings.log_file))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(settings.log_level)
+
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the background listener."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
 
 def setup_logging(app: FastAPI) -> None:
     """
@@ -113,8 +212,13 @@ def setup_logging(app: FastAPI) -> None:
     Args:
         app: FastAPI application instance
     """
-    app.add_middleware(LoggingMiddleware)
+    _setup_queue_logging()
+    app.add_middleware(
+        RequestObservabilityMiddleware,
+        sample_rate=settings.log_sample_rate,
+        slow_request_ms=settings.log_slow_request_ms,
+    )
 
 
 # Export logger for use in other modules
-__all__ = ["setup_logging", "logger"]
+__all__ = ["setup_logging", "shutdown_logging", "logger"]
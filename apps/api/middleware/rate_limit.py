@@ -1,15 +1,40 @@
 """
 Rate limiting middleware.
+
+Global API limits (per-minute and per-hour) are enforced by a leased token
+limiter shared across replicas:
+
+- Counters live in Redis, one fixed-window counter per identifier and window.
+- Each replica leases a small batch of tokens at a time with an atomic Lua
+  script and spends them from memory, so most requests make no network call.
+- Leases expire when the earliest window resets. Unused leased tokens are
+  lost, so a replica can over-restrict by at most one lease per window.
+- Routes can cost more than one token (e.g. skill execution).
+- If the store fails, requests are allowed (fail open) and the store is not
+  retried for a few seconds, so an outage does not add latency to every request.
+
+Per-route limits declared with ``@limiter.limit(...)`` still go through slowapi.
 """
-from typing import Optional
+import asyncio
+import fnmatch
+import json
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from fastapi import FastAPI, Request, Response
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def get_identifier(request: Request) -> str:
     """
@@ -39,19 +64,317 @@ def get_identifier(request: Request) -> str:
     return f"ip:{get_remote_address(request)}"
 
 
-# Create limiter instance
+# Create limiter instance for per-route limits
 limiter = Limiter(
     key_func=get_identifier,
     storage_uri=settings.rate_limit_storage_url,
     enabled=settings.rate_limit_enabled,
-    default_limits=[
-        f"{settings.rate_limit_per_minute}/minute",
-        f"{settings.rate_limit_per_hour}/hour",
-    ],
     headers_enabled=True,  # Add rate limit headers to responses
 )
 
 
+@dataclass(frozen=True)
+class RateWindow:
+    """A fixed-window limit, e.g. 60 requests per 60 seconds."""
+    limit: int
+    seconds: int
+
+    def key(self, prefix: str, identifier: str, now: float) -> str:
+        """Counter key for the window containing ``now``."""
+        return f"{prefix}:{identifier}:{self.seconds}:{int(now // self.seconds)}"
+
+    def reset_in(self, now: float) -> float:
+        """Seconds until the current window ends."""
+        return self.seconds - (now % self.seconds)
+
+
+class TokenStore(ABC):
+    """Shared counters that grant tokens against every window atomically."""
+
+    @abstractmethod
+    async def acquire(
+        self,
+        identifier: str,
+        windows: Sequence[RateWindow],
+        amount: int,
+        now: float,
+    ) -> int:
+        """
+        Take up to ``amount`` tokens from every window.
+
+        Returns:
+            Number of tokens granted (the same number is charged to each window)
+        """
+
+
+class MemoryTokenStore(TokenStore):
+    """Process-local token store for development and tests."""
+
+    def __init__(self, prefix: str = "ratelimit"):
+        self.prefix = prefix
+        self._counters: Dict[str, Tuple[int, float]] = {}
+
+    async def acquire(self, identifier, windows, amount, now) -> int:
+        keys = [window.key(self.prefix, identifier, now) for window in windows]
+        grant = amount
+        for key, window in zip(keys, windows):
+            used, expires_at = self._counters.get(key, (0, 0.0))
+            if expires_at <= now:
+                used = 0
+            grant = min(grant, window.limit - used)
+
+        if grant <= 0:
+            return 0
+
+        for key, window in zip(keys, windows):
+            used, expires_at = self._counters.get(key, (0, 0.0))
+            if expires_at <= now:
+                used, expires_at = 0, now + window.reset_in(now)
+            self._counters[key] = (used + grant, expires_at)
+        return grant
+
+
+# KEYS: one counter per window
+# ARGV: amount, then (limit, ttl) for each window
+_ACQUIRE_SCRIPT = """
+local grant = tonumber(ARGV[1])
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i])
+    local used = tonumber(redis.call('GET', key) or '0')
+    grant = math.min(grant, limit - used)
+end
+if grant <= 0 then
+    return 0
+end
+for i, key in ipairs(KEYS) do
+    if redis.call('INCRBY', key, grant) == grant then
+        redis.call('EXPIRE', key, ARGV[2 * i + 1])
+    end
+end
+return grant
+"""
+
+
+class RedisTokenStore(TokenStore):
+    """Redis token store; one round trip per lease."""
+
+    def __init__(self, redis, prefix: str = "ratelimit"):
+        """
+        Initialize Redis token store.
+
+        Args:
+            redis: ``redis.asyncio.Redis`` client
+            prefix: Key prefix
+        """
+        self.redis = redis
+        self.prefix = prefix
+        self._acquire = redis.register_script(_ACQUIRE_SCRIPT)
+
+    async def acquire(self, identifier, windows, amount, now) -> int:
+        args: List[int] = [amount]
+        for window in windows:
+            args.extend([window.limit, int(window.reset_in(now)) + 1])
+        granted = await self._acquire(
+            keys=[window.key(self.prefix, identifier, now) for window in windows],
+            args=args,
+        )
+        return int(granted)
+
+
+@dataclass
+class _Lease:
+    tokens: int = 0
+    expires_at: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class LeasedRateLimiter:
+    """Rate limiter that spends locally leased tokens from a shared store."""
+
+    def __init__(
+        self,
+        store: TokenStore,
+        windows: Sequence[RateWindow],
+        lease_size: int = 10,
+        max_identifiers: int = 10000,
+        failure_backoff: float = 5.0,
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            store: Shared token store
+            windows: Limits that must all be satisfied
+            lease_size: Tokens requested per store round trip
+            max_identifiers: Maximum identifiers tracked in memory
+            failure_backoff: Seconds to fail open without calling the store
+                after a store error
+        """
+        self.store = store
+        self.windows = list(windows)
+        # A lease can never usefully exceed the tightest window
+        self.lease_size = max(1, min(lease_size, min(w.limit for w in self.windows)))
+        self.max_identifiers = max_identifiers
+        self.failure_backoff = failure_backoff
+        self._leases: Dict[str, _Lease] = {}
+        self._store_down_until = 0.0
+
+    def _get_lease(self, identifier: str, now: float) -> _Lease:
+        lease = self._leases.get(identifier)
+        if lease is None:
+            if len(self._leases) >= self.max_identifiers:
+                self._evict(now)
+            lease = self._leases[identifier] = _Lease()
+        elif lease.expires_at <= now:
+            lease.tokens = 0
+        return lease
+
+    def _evict(self, now: float) -> None:
+        """Drop expired leases, then the oldest ones if still over capacity."""
+        for identifier in [i for i, l in self._leases.items() if l.expires_at <= now]:
+            del self._leases[identifier]
+        while len(self._leases) >= self.max_identifiers:
+            del self._leases[next(iter(self._leases))]
+
+    async def acquire(self, identifier: str, cost: int = 1) -> Tuple[bool, float]:
+        """
+        Spend ``cost`` tokens for an identifier.
+
+        Args:
+            identifier: Rate limit subject
+            cost: Tokens this request costs
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        now = time.time()
+        lease = self._get_lease(identifier, now)
+        if lease.tokens >= cost:
+            lease.tokens -= cost
+            return True, 0.0
+        if now < self._store_down_until:
+            return True, 0.0
+
+        async with lease.lock:
+            now = time.time()
+            if lease.expires_at <= now:
+                lease.tokens = 0
+            if lease.tokens >= cost:
+                lease.tokens -= cost
+                return True, 0.0
+            # Callers that queued on the lock during a failed store call
+            if now < self._store_down_until:
+                return True, 0.0
+
+            amount = max(cost - lease.tokens, self.lease_size)
+            try:
+                granted = await self.store.acquire(identifier, self.windows, amount, now)
+            except Exception as e:
+                # Fail open: an unavailable store must not take the API down
+                logger.warning(f"Rate limit store unavailable: {str(e)}")
+                self._store_down_until = time.time() + self.failure_backoff
+                return True, 0.0
+
+            reset_in = min(window.reset_in(now) for window in self.windows)
+            lease.tokens += granted
+            lease.expires_at = now + reset_in
+
+            if lease.tokens >= cost:
+                lease.tokens -= cost
+                return True, 0.0
+            return False, reset_in
+
+
+class LeasedRateLimitMiddleware:
+    """Pure ASGI middleware enforcing global limits with weighted route costs."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: LeasedRateLimiter,
+        route_costs: Optional[Dict[str, int]] = None,
+        exempt_paths: Sequence[str] = (),
+    ):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Downstream ASGI application
+            limiter: Leased limiter
+            route_costs: Map of ``"METHOD /path/pattern"`` (fnmatch syntax,
+                ``*`` matches any method) to token cost; unmatched requests cost 1
+            exempt_paths: fnmatch patterns for paths that are never limited
+        """
+        self.app = app
+        self.limiter = limiter
+        self.route_costs = [
+            (method, re.compile(fnmatch.translate(pattern)), cost)
+            for method, pattern, cost in (
+                (*rule.split(" ", 1), cost) for rule, cost in (route_costs or {}).items()
+            )
+        ]
+        self.exempt = [re.compile(fnmatch.translate(pattern)) for pattern in exempt_paths]
+
+    def get_cost(self, method: str, path: str) -> int:
+        """Token cost of a request; the first matching rule wins."""
+        for rule_method, pattern, cost in self.route_costs:
+            if rule_method in ("*", method) and pattern.match(path):
+                return cost
+        return 1
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # CORS preflights carry no credentials and are answered by an outer
+        # middleware, so they are never charged
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or any(p.match(scope["path"]) for p in self.exempt)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        identifier = get_identifier(Request(scope))
+        cost = self.get_cost(scope["method"], scope["path"])
+        allowed, retry_after = await self.limiter.acquire(identifier, cost)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = scope.get("state", {}).get("request_id")
+        response = Response(
+            content=json.dumps({
+                "error": {
+                    "code": 429,
+                    "message": "Rate limit exceeded",
+                    "type": "rate_limit_exceeded",
+                    "request_id": request_id,
+                }
+            }),
+            status_code=429,
+            media_type="application/json",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+        await response(scope, receive, send)
+
+
+def _create_token_store() -> TokenStore:
+    """Create the shared token store from settings."""
+    storage_url = settings.rate_limit_storage_url
+    if storage_url.startswith("memory://"):
+        return MemoryTokenStore()
+
+    try:
+        import redis.asyncio as aioredis
+
+        # Short timeouts: the limiter fails open rather than stall requests
+        return RedisTokenStore(aioredis.from_url(
+            storage_url, socket_connect_timeout=0.5, socket_timeout=0.5
+        ))
+    except ImportError:
+        logger.warning("Redis not available, using in-memory rate limit store")
+        return MemoryTokenStore()
+
+
 def setup_rate_limiting(app: FastAPI) -> None:
     """
     Configure rate limiting for the FastAPI application.
@@ -68,6 +391,21 @@ def setup_rate_limiting(app: FastAPI) -> None:
     # Register exception handler
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+    # Global limits
+    app.add_middleware(
+        LeasedRateLimitMiddleware,
+        limiter=LeasedRateLimiter(
+            _create_token_store(),
+            windows=[
+                RateWindow(limit=settings.rate_limit_per_minute, seconds=60),
+                RateWindow(limit=settings.rate_limit_per_hour, seconds=3600),
+            ],
+            lease_size=settings.rate_limit_lease_size,
+        ),
+        route_costs=settings.rate_limit_route_costs,
+        exempt_paths=settings.rate_limit_exempt_paths,
+    )
+
 
 # Export limiter for use in routes
 __all__ = ["setup_rate_limiting", "limiter"]
@@ -0,0 +1,114 @@
+"""
+Benchmark for WebSocketServer.emit_to_room with skip_sid.
+
+Compares the native room broadcast with exclusion against the previous
+per-member loop for rooms of 10, 100 and 1000 members. Each manager-level
+emit pays a simulated message-queue publish, which is what a send through the
+Redis adapter costs in production.
+
+Run with: pytest apps/api/tests/performance/test_websocket_emit_benchmark.py -v -s
+"""
+import asyncio
+import time
+from typing import Dict, List
+
+import pytest
+from socketio import AsyncManager, AsyncServer
+
+from websocket.server import WebSocketServer
+
+NAMESPACE = "/ws"
+ROOM = "project:benchmark"
+ROOM_SIZES = [10, 100, 1000]
+PUBLISH_LATENCY = 0.0005  # Simulated Redis publish per manager emit (seconds)
+
+
+class PublishingManager(AsyncManager):
+    """In-memory manager that charges one publish per emit call."""
+
+    def __init__(self):
+        super().__init__()
+        self.publishes = 0
+
+    async def emit(self, *args, **kwargs):
+        self.publishes += 1
+        await asyncio.sleep(PUBLISH_LATENCY)
+        return await super().emit(*args, **kwargs)
+
+
+async def _build_server(members: int):
+    """Create a WebSocketServer with ``members`` connected sids in ROOM."""
+    manager = PublishingManager()
+    sio = AsyncServer(async_mode="asgi", client_manager=manager)
+    received: Dict[str, int] = {}
+
+    async def send_eio_packet(eio_sid, pkt):
+        received[eio_sid] = received.get(eio_sid, 0) + 1
+
+    sio._send_eio_packet = send_eio_packet
+
+    sids: List[str] = []
+    for i in range(members):
+        sid = await manager.connect(f"eio-{i}", NAMESPACE)
+        await manager.enter_room(sid, NAMESPACE, ROOM)
+        sids.append(sid)
+
+    server = WebSocketServer.__new__(WebSocketServer)
+    server.sio = sio
+    return server, manager, sids, received
+
+
+async def _legacy_emit_skip_sid(server, manager, event, data, skip_sid):
+    """The previous implementation: one awaited emit per room member."""
+    for sid, _ in list(manager.get_participants(NAMESPACE, ROOM)):
+        if sid != skip_sid:
+            await server.sio.emit(event, data, to=sid, namespace=NAMESPACE)
+
+
+@pytest.mark.slow
+@pytest.mark.websocket
+class TestEmitToRoomBenchmark:
+    """Benchmark skip_sid emission."""
+
+    @pytest.mark.parametrize("members", ROOM_SIZES)
+    async def test_skip_sid_is_single_broadcast(self, members):
+        """The sender is excluded and everyone else receives exactly once."""
+        server, manager, sids, received = await _build_server(members)
+        sender = sids[0]
+
+        await server.emit_to_room(ROOM, "issue.updated", {"id": 1}, skip_sid=sender)
+
+        assert manager.publishes == 1
+        assert "eio-0" not in received
+        assert len(received) == members - 1
+        assert set(received.values()) == {1}
+
+    @pytest.mark.parametrize("members", ROOM_SIZES)
+    async def test_benchmark_native_vs_per_member(self, members):
+        """Report wall-clock time and publishes for both strategies."""
+        server, manager, sids, _ = await _build_server(members)
+        sender = sids[0]
+
+        start = time.perf_counter()
+        await _legacy_emit_skip_sid(server, manager, "issue.updated", {"id": 1}, sender)
+        legacy_seconds = time.perf_counter() - start
+        legacy_publishes = manager.publishes
+
+        manager.publishes = 0
+        start = time.perf_counter()
+        await server.emit_to_room(ROOM, "issue.updated", {"id": 1}, skip_sid=sender)
+        native_seconds = time.perf_counter() - start
+
+        print(
+            f"\nmembers={members:5d} "
+            f"per-member: {legacy_seconds * 1000:8.2f} ms / {legacy_publishes:4d} publishes | "
+            f"native: {native_seconds * 1000:8.2f} ms / {manager.publishes} publish"
+        )
+
+        assert legacy_publishes == members - 1
+        assert manager.publishes == 1
+        assert native_seconds < legacy_seconds
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,179 @@
+"""
+Unit tests for coalescing WebSocket event fan-out.
+"""
+import asyncio
+
+import pytest
+
+from events.fanout import BATCH_EVENT, DropPolicy, EventFanout
+
+
+class RecordingEmitter:
+    """Collects (event, data, room) tuples instead of emitting."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.delay = delay
+
+    async def __call__(self, event, data, room):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.calls.append((event, data, room))
+
+
+@pytest.fixture
+def emitter():
+    return RecordingEmitter()
+
+
+@pytest.mark.unit
+@pytest.mark.websocket
+class TestEventFanout:
+    """Test per-room coalescing, batching and drop policies."""
+
+    async def test_single_event_is_unwrapped(self, emitter):
+        fanout = EventFanout(emitter, tick_interval=60)
+
+        await fanout.enqueue("project:1", "pr.created", {"pr_id": "a"})
+        sent = await fanout.flush()
+
+        assert sent == 1
+        assert emitter.calls == [("pr.created", {"pr_id": "a"}, "project:1")]
+        await fanout.close()
+
+    async def test_progress_events_are_coalesced(self, emitter):
+        fanout = EventFanout(emitter, tick_interval=60)
+        key = ("workflow.progress", "wf-1")
+
+        for progress in range(0, 100, 10):
+            await fanout.enqueue("project:1", "workflow.progress", {"progress": progress}, key)
+
+        assert fanout.pending_count("project:1") == 1
+        await fanout.flush()
+
+        assert emitter.calls == [("workflow.progress", {"progress": 90}, "project:1")]
+        assert fanout.get_stats()["coalesced"] == 9
+        await fanout.close()
+
+    async def test_events_batched_into_one_frame_per_room(self, emitter):
+        fanout = EventFanout(emitter, tick_interval=60)
+
+        await fanout.enqueue("project:1", "workflow.progress", {"progress": 10}, ("wf", "1"))
+        await fanout.enqueue("project:1", "pr.created", {"pr_id": "a"})
+        await fanout.enqueue("project:1", "workflow.progress", {"progress": 20}, ("wf", "2"))
+        await fanout.enqueue("global", "agent.status_changed", {"status": "busy"})
+
+        sent = await fanout.flush()
+
+        assert sent == 2
+        frames = {room: (event, data) for event, data, room in emitter.calls}
+        event, frame = frames["project:1"]
+        assert event == BATCH_EVENT
+        assert frame["count"] == 3
+        assert [e["type"] for e in frame["events"]] == [
+            "workflow.progress", "pr.created", "workflow.progress"
+        ]
+        assert frames["global"][0] == "agent.status_changed"
+        await fanout.close()
+
+    async def test_coalesced_event_moves_behind_newer_events(self, emitter):
+        fanout = EventFanout(emitter, tick_interval=60)
+        key = ("workflow.progress", "wf-1")
+
+        await fanout.enqueue("global", "workflow.progress", {"progress": 10}, key)
+        await fanout.enqueue("global", "workflow.completed", {"id": "wf-0"})
+        await fanout.enqueue("global", "workflow.progress", {"progress": 20}, key)
+        await fanout.flush()
+
+        frame = emitter.calls[0][1]
+        assert [e["data"] for e in frame["events"]] == [{"id": "wf-0"}, {"progress": 20}]
+        await fanout.close()
+
+    async def test_max_batch_size_carries_over(self, emitter):
+        fanout = EventFanout(emitter, tick_interval=60, max_batch_size=2)
+
+        for i in range(5):
+            await fanout.enqueue("global", "issue.updated", {"i": i})
+
+        await fanout.flush()
+        assert emitter.calls[-1][1]["count"] == 2
+        assert fanout.pending_count() == 3
+
+        await fanout.close()
+        assert fanout.pending_count() == 0
+        delivered = [e["data"]["i"] for _, frame, _ in emitter.calls if frame.get("events")
+                     for e in frame["events"]]
+        delivered += [frame["i"] for _, frame, _ in emitter.calls if "i" in frame]
+        assert sorted(delivered) == [0, 1, 2, 3, 4]
+
+    async def test_drop_oldest_policy(self, emitter):
+        fanout = EventFanout(
+            emitter, tick_interval=60, max_pending_per_room=2,
+            drop_policy=DropPolicy.DROP_OLDEST,
+        )
+
+        for i in range(4):
+            assert await fanout.enqueue("global", "issue.updated", {"i": i}) is True
+
+        await fanout.flush()
+        assert [e["data"]["i"] for e in emitter.calls[0][1]["events"]] == [2, 3]
+        assert fanout.get_stats()["dropped"] == 2
+        await fanout.close()
+
+    async def test_drop_newest_policy(self, emitter):
+        fanout = EventFanout(
+            emitter, tick_interval=60, max_pending_per_room=2,
+            drop_policy=DropPolicy.DROP_NEWEST,
+        )
+
+        results = [await fanout.enqueue("global", "issue.updated", {"i": i}) for i in range(3)]
+
+        assert results == [True, True, False]
+        await fanout.flush()
+        assert [e["data"]["i"] for e in emitter.calls[0][1]["events"]] == [0, 1]
+        await fanout.close()
+
+    async def test_block_policy_waits_for_flush(self, emitter):
+        fanout = EventFanout(
+            emitter, tick_interval=0.01, max_pending_per_room=1,
+            drop_policy=DropPolicy.BLOCK, enqueue_timeout=1.0,
+        )
+
+        assert await fanout.enqueue("global", "issue.updated", {"i": 0})
+        assert await fanout.enqueue("global", "issue.updated", {"i": 1})
+
+        await fanout.close()
+        assert [data["i"] for _, data, _ in emitter.calls] == [0, 1]
+        assert fanout.get_stats()["dropped"] == 0
+
+    async def test_block_policy_times_out(self, emitter):
+        fanout = EventFanout(
+            emitter, tick_interval=60, max_pending_per_room=1,
+            drop_policy=DropPolicy.BLOCK, enqueue_timeout=0.01,
+        )
+
+        assert await fanout.enqueue("global", "issue.updated", {"i": 0})
+        assert await fanout.enqueue("global", "issue.updated", {"i": 1}) is False
+        await fanout.close()
+
+    async def test_background_loop_flushes_on_tick(self, emitter):
+        fanout = EventFanout(emitter, tick_interval=0.01)
+
+        await fanout.enqueue("global", "workflow.progress", {"progress": 1}, "wf")
+        await asyncio.sleep(0.05)
+
+        assert emitter.calls == [("workflow.progress", {"progress": 1}, "global")]
+        await fanout.close()
+
+    async def test_slow_room_does_not_fail_other_rooms(self):
+        async def emit(event, data, room):
+            if room == "bad":
+                raise RuntimeError("redis down")
+
+        fanout = EventFanout(emit, tick_interval=60)
+        await fanout.enqueue("bad", "issue.updated", {})
+        await fanout.enqueue("good", "issue.updated", {})
+
+        assert await fanout.flush() == 1
+        assert fanout.get_stats()["frames_sent"] == 1
+        await fanout.close()
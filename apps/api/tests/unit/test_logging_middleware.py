@@ -0,0 +1,143 @@
+"""
+Unit tests for the request observability middleware.
+"""
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from httpx import ASGITransport, AsyncClient
+
+from middleware import logging as logging_middleware
+from middleware.logging import RequestObservabilityMiddleware
+
+
+class RecordingLogger:
+    """Captures structlog-style calls."""
+
+    def __init__(self):
+        self.records = []
+
+    def _log(self, level):
+        def log(event, **kwargs):
+            self.records.append((level, event, kwargs))
+        return log
+
+    def __getattr__(self, level):
+        return self._log(level)
+
+
+class RecordingMetrics:
+    """Captures record_http_request calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def record_http_request(self, **kwargs):
+        self.calls.append(kwargs)
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    log = RecordingLogger()
+    metrics = RecordingMetrics()
+    monkeypatch.setattr(logging_middleware, "logger", log)
+    monkeypatch.setattr(logging_middleware, "prometheus_metrics", metrics)
+    return log, metrics
+
+
+def build_app(sample_rate: float = 0.0, slow_request_ms: float = 1000.0) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"item_id": item_id}
+
+    @app.get("/broken")
+    async def broken():
+        raise HTTPException(status_code=503, detail="unavailable")
+
+    @app.get("/request-id")
+    async def request_id(request: Request):
+        return {"request_id": request.state.request_id}
+
+    app.add_middleware(
+        RequestObservabilityMiddleware,
+        sample_rate=sample_rate,
+        slow_request_ms=slow_request_ms,
+    )
+    return app
+
+
+async def get(app: FastAPI, path: str, **kwargs):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path, **kwargs)
+
+
+@pytest.mark.unit
+class TestRequestObservabilityMiddleware:
+    """Test request IDs, metrics and sampled logging."""
+
+    async def test_request_id_header_and_state(self, recorder):
+        app = build_app()
+
+        response = await get(app, "/request-id")
+
+        request_id = response.headers["x-request-id"]
+        assert len(request_id) == 32
+        assert response.json()["request_id"] == request_id
+
+    async def test_incoming_request_id_is_propagated(self, recorder):
+        response = await get(build_app(), "/request-id", headers={"X-Request-ID": "abc-123"})
+
+        assert response.headers["x-request-id"] == "abc-123"
+        assert response.json()["request_id"] == "abc-123"
+
+    async def test_metrics_use_route_template(self, recorder):
+        _, metrics = recorder
+
+        await get(build_app(), "/items/42")
+
+        assert len(metrics.calls) == 1
+        call = metrics.calls[0]
+        assert call["endpoint"] == "/items/{item_id}"
+        assert call["status"] == 200
+        assert call["response_size_bytes"] > 0
+
+    async def test_successful_requests_are_sampled_out(self, recorder):
+        log, _ = recorder
+
+        await get(build_app(sample_rate=0.0), "/items/1")
+
+        assert log.records == []
+
+    async def test_successful_requests_logged_when_sampled(self, recorder):
+        log, _ = recorder
+
+        await get(build_app(sample_rate=1.0), "/items/1")
+
+        level, event, fields = log.records[0]
+        assert (level, event) == ("info", "request_completed")
+        assert fields["status_code"] == 200
+        assert fields["sampled"] is True
+
+    async def test_errors_are_always_logged(self, recorder):
+        log, _ = recorder
+
+        await get(build_app(sample_rate=0.0), "/broken")
+
+        level, event, fields = log.records[0]
+        assert level == "error"
+        assert fields["status_code"] == 503
+        assert fields["sampled"] is False
+
+    async def test_slow_requests_are_always_logged(self, recorder):
+        log, _ = recorder
+
+        await get(build_app(sample_rate=0.0, slow_request_ms=0), "/items/1")
+
+        assert log.records[0][0] == "warning"
+
+    async def test_unmatched_routes_share_a_label(self, recorder):
+        _, metrics = recorder
+
+        await get(build_app(), "/does-not-exist/123")
+
+        assert metrics.calls[0]["endpoint"] == "unmatched"
@@ -0,0 +1,221 @@
+"""
+Unit tests for the leased rate limiter.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from httpx import ASGITransport, AsyncClient
+
+from middleware.logging import RequestObservabilityMiddleware
+from middleware.rate_limit import (
+    LeasedRateLimiter,
+    LeasedRateLimitMiddleware,
+    MemoryTokenStore,
+    RateWindow,
+    RedisTokenStore,
+)
+
+
+class CountingStore(MemoryTokenStore):
+    """Memory store that counts round trips."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def acquire(self, identifier, windows, amount, now):
+        self.calls += 1
+        return await super().acquire(identifier, windows, amount, now)
+
+
+class FailingStore(CountingStore):
+    async def acquire(self, identifier, windows, amount, now):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeAsyncRedis()
+
+
+def build_app(limiter: LeasedRateLimiter, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def list_items():
+        return {"items": []}
+
+    @app.post("/skills/{skill_id}/execute")
+    async def execute_skill(skill_id: str):
+        return {"skill_id": skill_id}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    app.add_middleware(LeasedRateLimitMiddleware, limiter=limiter, **kwargs)
+    return app
+
+
+@pytest.mark.unit
+class TestTokenStores:
+    """Both stores grant at most the remaining budget of the tightest window."""
+
+    @pytest.fixture(params=["memory", "redis"])
+    def store(self, request):
+        if request.param == "memory":
+            return MemoryTokenStore()
+        return RedisTokenStore(request.getfixturevalue("redis_client"))
+
+    async def test_grants_are_capped_by_every_window(self, store):
+        windows = [RateWindow(limit=15, seconds=60), RateWindow(limit=25, seconds=3600)]
+
+        assert await store.acquire("ip:1", windows, 10, now=0.0) == 10
+        assert await store.acquire("ip:1", windows, 10, now=1.0) == 5
+        assert await store.acquire("ip:1", windows, 10, now=2.0) == 0
+
+        # New minute window; the hourly window still caps the grant
+        assert await store.acquire("ip:1", windows, 20, now=61.0) == 10
+
+    async def test_identifiers_are_independent(self, store):
+        windows = [RateWindow(limit=5, seconds=60)]
+
+        assert await store.acquire("ip:1", windows, 5, now=0.0) == 5
+        assert await store.acquire("ip:2", windows, 5, now=0.0) == 5
+
+
+@pytest.mark.unit
+class TestLeasedRateLimiter:
+    """Test local token leasing."""
+
+    async def test_store_is_hit_once_per_lease(self):
+        store = CountingStore()
+        limiter = LeasedRateLimiter(store, [RateWindow(limit=100, seconds=60)], lease_size=10)
+
+        for _ in range(30):
+            assert (await limiter.acquire("ip:1"))[0] is True
+
+        assert store.calls == 3
+
+    async def test_rejects_when_budget_is_exhausted(self):
+        limiter = LeasedRateLimiter(
+            MemoryTokenStore(), [RateWindow(limit=5, seconds=60)], lease_size=10
+        )
+
+        results = [await limiter.acquire("ip:1") for _ in range(6)]
+
+        assert [allowed for allowed, _ in results] == [True] * 5 + [False]
+        assert 0 < results[-1][1] <= 60
+
+    async def test_replicas_share_the_budget(self, redis_client):
+        windows = [RateWindow(limit=10, seconds=60)]
+        replica_a = LeasedRateLimiter(RedisTokenStore(redis_client), windows, lease_size=4)
+        replica_b = LeasedRateLimiter(RedisTokenStore(redis_client), windows, lease_size=4)
+
+        allowed = 0
+        for _ in range(10):
+            allowed += (await replica_a.acquire("user:1"))[0]
+            allowed += (await replica_b.acquire("user:1"))[0]
+
+        assert allowed == 10
+
+    async def test_cost_larger_than_lease(self):
+        limiter = LeasedRateLimiter(
+            MemoryTokenStore(), [RateWindow(limit=20, seconds=60)], lease_size=2
+        )
+
+        assert (await limiter.acquire("ip:1", cost=10))[0] is True
+        assert (await limiter.acquire("ip:1", cost=10))[0] is True
+        assert (await limiter.acquire("ip:1", cost=1))[0] is False
+
+    async def test_fails_open_when_store_is_unavailable(self):
+        limiter = LeasedRateLimiter(FailingStore(), [RateWindow(limit=1, seconds=60)])
+
+        assert await limiter.acquire("ip:1") == (True, 0.0)
+
+    async def test_store_is_skipped_after_a_failure(self):
+        store = FailingStore()
+        limiter = LeasedRateLimiter(store, [RateWindow(limit=1, seconds=60)])
+
+        for i in range(5):
+            assert await limiter.acquire(f"ip:{i}") == (True, 0.0)
+
+        assert store.calls == 1
+        limiter._store_down_until = 0.0
+        await limiter.acquire("ip:1")
+        assert store.calls == 2
+
+    async def test_identifier_table_is_bounded(self):
+        limiter = LeasedRateLimiter(
+            MemoryTokenStore(), [RateWindow(limit=10, seconds=60)], max_identifiers=3
+        )
+
+        for i in range(10):
+            await limiter.acquire(f"ip:{i}")
+
+        assert len(limiter._leases) <= 3
+
+
+@pytest.mark.unit
+class TestLeasedRateLimitMiddleware:
+    """Test route costs, exemptions and 429 responses."""
+
+    async def test_route_costs(self):
+        limiter = LeasedRateLimiter(
+            MemoryTokenStore(), [RateWindow(limit=12, seconds=60)], lease_size=1
+        )
+        app = build_app(limiter, route_costs={"POST /skills/*/execute": 10})
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.post("/skills/abc/execute")).status_code == 200
+            assert (await client.get("/items")).status_code == 200
+            assert (await client.post("/skills/abc/execute")).status_code == 429
+            assert (await client.get("/items")).status_code == 200
+
+    async def test_rejection_format(self):
+        limiter = LeasedRateLimiter(MemoryTokenStore(), [RateWindow(limit=1, seconds=60)])
+        app = build_app(limiter)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/items")
+            response = await client.get("/items")
+
+        assert response.status_code == 429
+        assert 1 <= int(response.headers["retry-after"]) <= 60
+        assert response.json()["error"]["type"] == "rate_limit_exceeded"
+
+    async def test_exempt_paths(self):
+        limiter = LeasedRateLimiter(MemoryTokenStore(), [RateWindow(limit=1, seconds=60)])
+        app = build_app(limiter, exempt_paths=["/health"])
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            for _ in range(3):
+                assert (await client.get("/health")).status_code == 200
+
+    async def test_preflight_not_charged(self):
+        limiter = LeasedRateLimiter(MemoryTokenStore(), [RateWindow(limit=1, seconds=60)])
+        app = build_app(limiter)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            for _ in range(3):
+                assert (await client.options("/items")).status_code != 429
+            assert (await client.get("/items")).status_code == 200
+
+    async def test_rejection_passes_outer_middleware(self):
+        limiter = LeasedRateLimiter(MemoryTokenStore(), [RateWindow(limit=1, seconds=60)])
+        app = build_app(limiter)
+        # Registered after the limiter, as in main.py, so they wrap it
+        app.add_middleware(CORSMiddleware, allow_origins=["http://app.test"])
+        app.add_middleware(RequestObservabilityMiddleware, sample_rate=0.0)
+        headers = {"Origin": "http://app.test"}
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/items", headers=headers)
+            response = await client.get("/items", headers=headers)
+
+        assert response.status_code == 429
+        assert response.json()["error"]["request_id"] == response.headers["x-request-id"]
+        assert response.headers["access-control-allow-origin"] == "http://app.test"
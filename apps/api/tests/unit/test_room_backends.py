@@ -0,0 +1,121 @@
+"""
+Unit tests for WebSocket room backends.
+"""
+import pytest
+
+from websocket.room_backends import LocalRoomBackend, RedisRoomBackend
+from websocket.rooms import RoomManager, RoomSubscriptionManager
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture(params=["local", "redis"])
+def backend(request, redis_client):
+    if request.param == "local":
+        return LocalRoomBackend()
+    return RedisRoomBackend(redis_client)
+
+
+@pytest.mark.unit
+@pytest.mark.websocket
+class TestRoomBackendContract:
+    """Both backends behave the same through the managers."""
+
+    async def test_membership_and_reverse_index(self, backend):
+        manager = RoomManager(backend)
+
+        assert await manager.add_member_to_room("project:1", "sid-1") is True
+        assert await manager.add_member_to_room("project:1", "sid-1") is False
+        await manager.add_member_to_room("project:1", "sid-2")
+        await manager.add_member_to_room("global", "sid-1")
+
+        assert await manager.get_room_members("project:1") == {"sid-1", "sid-2"}
+        assert await manager.get_member_rooms("sid-1") == {"project:1", "global"}
+        assert await manager.get_all_rooms() == {"project:1": 2, "global": 1}
+
+    async def test_remove_member_updates_counts(self, backend):
+        manager = RoomManager(backend)
+        await manager.add_member_to_room("project:1", "sid-1")
+
+        assert await manager.remove_member_from_room("project:1", "sid-1") is True
+        assert await manager.remove_member_from_room("project:1", "sid-1") is False
+        assert await manager.get_room_count("project:1") == 0
+        assert await manager.get_member_rooms("sid-1") == set()
+        assert await manager.get_all_rooms() == {}
+
+    async def test_remove_member_from_all_rooms(self, backend):
+        manager = RoomManager(backend)
+        for room in ("room_1", "room_2", "room_3"):
+            await manager.add_member_to_room(room, "sid-1")
+        await manager.add_member_to_room("room_1", "sid-2")
+
+        removed = await manager.remove_member_from_all_rooms("sid-1")
+
+        assert sorted(removed) == ["room_1", "room_2", "room_3"]
+        assert await manager.get_all_rooms() == {"room_1": 1}
+        assert await manager.remove_member_from_all_rooms("sid-1") == []
+
+    async def test_subscriptions(self, backend):
+        manager = RoomSubscriptionManager(backend)
+
+        assert await manager.subscribe_to_room("conn-1", "project:1") is False
+
+        await manager.register_connection("conn-1", "user-1")
+        assert await manager.subscribe_to_room("conn-1", "project:1") is True
+        assert await manager.subscribe_to_room("conn-1", "agent:1") is True
+        assert await manager.unsubscribe_from_room("conn-1", "agent:1") is True
+        assert await manager.get_user_rooms("user-1") == {"project:1"}
+
+        assert await manager.unregister_connection("conn-1") == "user-1"
+        assert await manager.get_connection_user("conn-1") is None
+        assert await manager.clear_user_subscriptions("user-1") == {"project:1"}
+        assert await manager.get_user_rooms("user-1") == set()
+
+
+@pytest.mark.unit
+@pytest.mark.websocket
+class TestRedisRoomBackend:
+    """Cross-replica behaviour of the Redis backend."""
+
+    async def test_counts_are_shared_across_replicas(self, redis_client):
+        replica_a = RoomManager(RedisRoomBackend(redis_client))
+        replica_b = RoomManager(RedisRoomBackend(redis_client))
+
+        await replica_a.add_member_to_room("project:1", "sid-a")
+        await replica_b.add_member_to_room("project:1", "sid-b")
+
+        assert await replica_a.get_room_count("project:1") == 2
+        assert await replica_b.get_all_rooms() == {"project:1": 2}
+
+        await replica_b.remove_member_from_all_rooms("sid-a")
+        assert await replica_a.get_room_members("project:1") == {"sid-b"}
+
+    async def test_stale_members_are_reaped(self, redis_client):
+        live = RedisRoomBackend(redis_client, presence_ttl=60)
+        dead = RedisRoomBackend(redis_client, presence_ttl=-1)  # Already expired
+        await live.add_member("project:1", "sid-live")
+        await dead.add_member("project:1", "sid-dead")
+        await dead.add_member("global", "sid-dead")
+        await dead.register_connection("sid-dead", "user-1")
+
+        reaped = await live.reap_expired()
+
+        assert reaped == 1
+        assert await live.get_all_rooms() == {"project:1": 1}
+        assert await live.get_member_rooms("sid-dead") == set()
+        assert await live.get_connection_user("sid-dead") is None
+
+    async def test_heartbeat_keeps_local_members_present(self, redis_client):
+        backend = RedisRoomBackend(redis_client, presence_ttl=-1)
+        await backend.add_member("project:1", "sid-1")
+
+        backend.presence_ttl = 60
+        await backend.heartbeat()
+
+        assert await backend.reap_expired() == 0
+        assert await backend.get_room_count("project:1") == 1
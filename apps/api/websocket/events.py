@@ -58,17 +58,17 @@ class WebSocketEventHandler:
             )
 
             # Register connection
-            self.subscription_manager.register_connection(sid, user_id)
+            await self.subscription_manager.register_connection(sid, user_id)
 
             # Auto-subscribe to user's personal room
             user_room = self.room_manager.get_user_room(UUID(user_id))
             await self.sio.enter_room(sid, user_room)
-            self.room_manager.add_member_to_room(user_room, sid)
+            await self.room_manager.add_member_to_room(user_room, sid)
 
             # Auto-subscribe to global room
             global_room = self.room_manager.get_global_room()
             await self.sio.enter_room(sid, global_room)
-            self.room_manager.add_member_to_room(global_room, sid)
+            await self.room_manager.add_member_to_room(global_room, sid)
 
             # Send connection established event
             connection_event = WebSocketEvent(
@@ -96,18 +96,11 @@ class WebSocketEventHandler:
             sid: Session ID
         """
         try:
-            # Get user ID before unregistering
-            user_id = None
-            for cid, uid in self.subscription_manager.connection_to_user.items():
-                if cid == sid:
-                    user_id = uid
-                    break
-
             # Remove from all rooms
-            removed_from = self.room_manager.remove_member_from_all_rooms(sid)
+            removed_from = await self.room_manager.remove_member_from_all_rooms(sid)
 
             # Unregister connection
-            self.subscription_manager.unregister_connection(sid)
+            user_id = await self.subscription_manager.unregister_connection(sid)
 
             app_logger.info(
                 "websocket_disconnect",
@@ -153,8 +146,8 @@ class WebSocketEventHandler:
 
             # Join room
             await self.sio.enter_room(sid, room)
-            self.room_manager.add_member_to_room(room, sid)
-            self.subscription_manager.subscribe_to_room(sid, room)
+            await self.room_manager.add_member_to_room(room, sid)
+            await self.subscription_manager.subscribe_to_room(sid, room)
 
             logger.info(f"User {auth.sub} subscribed to room {room}")
             return {"status": "success", "room": room}
@@ -190,8 +183,8 @@ class WebSocketEventHandler:
 
             # Leave room
             await self.sio.leave_room(sid, room)
-            self.room_manager.remove_member_from_room(room, sid)
-            self.subscription_manager.unsubscribe_from_room(sid, room)
+            await self.room_manager.remove_member_from_room(room, sid)
+            await self.subscription_manager.unsubscribe_from_room(sid, room)
 
             logger.info(f"User {auth.sub} unsubscribed from room {room}")
             return {"status": "success", "room": room}
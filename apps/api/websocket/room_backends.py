@@ -0,0 +1,429 @@
+"""
+Storage backends for WebSocket room membership and subscriptions.
+
+RoomManager and RoomSubscriptionManager delegate all state to a RoomBackend:
+
+- LocalRoomBackend keeps everything in process memory. Counts only reflect
+  connections on this replica; use it for development and single-instance
+  deployments.
+- RedisRoomBackend keeps membership in Redis so every replica sees the same
+  rooms and counts. Each room is a set of members with a reverse index of
+  rooms per member, so lookups are O(1) and removing a member from all of its
+  rooms is O(k) in the number of rooms it joined. Multi-key updates run as
+  Lua scripts so they are atomic and cost a single round trip.
+
+Presence: a replica that dies never sees its connections disconnect. The
+Redis backend records an expiry timestamp per member and each replica
+refreshes the members it owns on a heartbeat. Any replica reaps members whose
+heartbeat has lapsed, so counts converge even after a crash.
+"""
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class RoomBackend(ABC):
+    """Interface for room membership and subscription storage."""
+
+    # Room membership
+
+    @abstractmethod
+    async def add_member(self, room: str, member_id: str) -> bool:
+        """Add a member to a room. Returns True if the member was new."""
+
+    @abstractmethod
+    async def remove_member(self, room: str, member_id: str) -> bool:
+        """Remove a member from a room. Returns True if it was present."""
+
+    @abstractmethod
+    async def get_room_members(self, room: str) -> Set[str]:
+        """Get all members of a room."""
+
+    @abstractmethod
+    async def get_member_rooms(self, member_id: str) -> Set[str]:
+        """Get all rooms a member belongs to."""
+
+    @abstractmethod
+    async def remove_member_from_all_rooms(self, member_id: str) -> List[str]:
+        """Remove a member from every room. Returns the rooms it left."""
+
+    @abstractmethod
+    async def get_room_count(self, room: str) -> int:
+        """Get the number of members in a room."""
+
+    @abstractmethod
+    async def get_all_rooms(self) -> Dict[str, int]:
+        """Get all non-empty rooms and their member counts."""
+
+    # Subscriptions
+
+    @abstractmethod
+    async def register_connection(self, connection_id: str, user_id: str) -> None:
+        """Associate a connection with a user."""
+
+    @abstractmethod
+    async def unregister_connection(self, connection_id: str) -> Optional[str]:
+        """Forget a connection. Returns its user ID if it was registered."""
+
+    @abstractmethod
+    async def get_connection_user(self, connection_id: str) -> Optional[str]:
+        """Get the user ID for a connection."""
+
+    @abstractmethod
+    async def add_user_subscription(self, user_id: str, room: str) -> None:
+        """Record that a user subscribes to a room."""
+
+    @abstractmethod
+    async def remove_user_subscription(self, user_id: str, room: str) -> bool:
+        """Drop a user's subscription. Returns False if the user is unknown."""
+
+    @abstractmethod
+    async def get_user_rooms(self, user_id: str) -> Set[str]:
+        """Get all rooms a user subscribes to."""
+
+    @abstractmethod
+    async def clear_user_subscriptions(self, user_id: str) -> Set[str]:
+        """Remove all subscriptions for a user. Returns the cleared rooms."""
+
+    # Lifecycle
+
+    async def start(self) -> None:
+        """Start background maintenance (presence heartbeats)."""
+
+    async def close(self) -> None:
+        """Stop background maintenance and release resources."""
+
+
+class LocalRoomBackend(RoomBackend):
+    """Process-local backend. Counts only cover this replica."""
+
+    def __init__(self):
+        self.room_members: Dict[str, Set[str]] = {}
+        # Reverse index: member_id -> rooms
+        self.member_rooms: Dict[str, Set[str]] = {}
+        self.user_subscriptions: Dict[str, Set[str]] = {}
+        self.connection_to_user: Dict[str, str] = {}
+
+    async def add_member(self, room: str, member_id: str) -> bool:
+        members = self.room_members.setdefault(room, set())
+        if member_id in members:
+            return False
+        members.add(member_id)
+        self.member_rooms.setdefault(member_id, set()).add(room)
+        return True
+
+    async def remove_member(self, room: str, member_id: str) -> bool:
+        members = self.room_members.get(room)
+        if not members or member_id not in members:
+            return False
+
+        members.discard(member_id)
+        if not members:
+            del self.room_members[room]
+
+        rooms = self.member_rooms.get(member_id)
+        if rooms is not None:
+            rooms.discard(room)
+            if not rooms:
+                del self.member_rooms[member_id]
+        return True
+
+    async def get_room_members(self, room: str) -> Set[str]:
+        return self.room_members.get(room, set()).copy()
+
+    async def get_member_rooms(self, member_id: str) -> Set[str]:
+        return self.member_rooms.get(member_id, set()).copy()
+
+    async def remove_member_from_all_rooms(self, member_id: str) -> List[str]:
+        rooms = self.member_rooms.pop(member_id, set())
+        for room in rooms:
+            members = self.room_members.get(room)
+            if members is None:
+                continue
+            members.discard(member_id)
+            if not members:
+                del self.room_members[room]
+        return list(rooms)
+
+    async def get_room_count(self, room: str) -> int:
+        return len(self.room_members.get(room, ()))
+
+    async def get_all_rooms(self) -> Dict[str, int]:
+        return {room: len(members) for room, members in self.room_members.items()}
+
+    async def register_connection(self, connection_id: str, user_id: str) -> None:
+        self.connection_to_user[connection_id] = user_id
+        self.user_subscriptions.setdefault(user_id, set())
+
+    async def unregister_connection(self, connection_id: str) -> Optional[str]:
+        return self.connection_to_user.pop(connection_id, None)
+
+    async def get_connection_user(self, connection_id: str) -> Optional[str]:
+        return self.connection_to_user.get(connection_id)
+
+    async def add_user_subscription(self, user_id: str, room: str) -> None:
+        self.user_subscriptions.setdefault(user_id, set()).add(room)
+
+    async def remove_user_subscription(self, user_id: str, room: str) -> bool:
+        rooms = self.user_subscriptions.get(user_id)
+        if rooms is None:
+            return False
+        rooms.discard(room)
+        return True
+
+    async def get_user_rooms(self, user_id: str) -> Set[str]:
+        return self.user_subscriptions.get(user_id, set()).copy()
+
+    async def clear_user_subscriptions(self, user_id: str) -> Set[str]:
+        return self.user_subscriptions.pop(user_id, set())
+
+
+# KEYS: room set, member reverse index, room counts, presence
+# ARGV: room, member_id, presence expiry
+_ADD_MEMBER_SCRIPT = """
+local added = redis.call('SADD', KEYS[1], ARGV[2])
+if added == 1 then
+    redis.call('SADD', KEYS[2], ARGV[1])
+    redis.call('HINCRBY', KEYS[3], ARGV[1], 1)
+end
+redis.call('ZADD', KEYS[4], ARGV[3], ARGV[2])
+return added
+"""
+
+# KEYS: room set, member reverse index, room counts
+# ARGV: room, member_id
+_REMOVE_MEMBER_SCRIPT = """
+local removed = redis.call('SREM', KEYS[1], ARGV[2])
+if removed == 1 then
+    redis.call('SREM', KEYS[2], ARGV[1])
+    if redis.call('HINCRBY', KEYS[3], ARGV[1], -1) <= 0 then
+        redis.call('HDEL', KEYS[3], ARGV[1])
+    end
+end
+return removed
+"""
+
+# KEYS: member reverse index, room counts, presence
+# ARGV: member_id, room key prefix
+_REMOVE_MEMBER_FROM_ALL_SCRIPT = """
+local rooms = redis.call('SMEMBERS', KEYS[1])
+for _, room in ipairs(rooms) do
+    if redis.call('SREM', ARGV[2] .. room, ARGV[1]) == 1 then
+        if redis.call('HINCRBY', KEYS[2], room, -1) <= 0 then
+            redis.call('HDEL', KEYS[2], room)
+        end
+    end
+end
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+return rooms
+"""
+
+
+class RedisRoomBackend(RoomBackend):
+    """
+    Redis-backed backend shared by all replicas.
+
+    Key layout (``prefix`` defaults to ``ws``):
+
+    - ``{prefix}:room:<room>``: set of member IDs
+    - ``{prefix}:member:<member_id>``: set of rooms (reverse index)
+    - ``{prefix}:room_counts``: hash of room -> member count
+    - ``{prefix}:presence``: sorted set of member_id scored by heartbeat expiry
+    - ``{prefix}:conn_user``: hash of connection_id -> user_id
+    - ``{prefix}:subs:<user_id>``: set of rooms a user subscribes to
+
+    The scripts touch keys derived at runtime, so this backend targets a
+    single Redis instance (or a cluster with all ``ws`` keys on one slot).
+    """
+
+    def __init__(
+        self,
+        redis,
+        prefix: str = "ws",
+        presence_ttl: float = 60.0,
+        heartbeat_interval: float = 20.0,
+        reap_batch_size: int = 500,
+    ):
+        """
+        Initialize Redis backend.
+
+        Args:
+            redis: ``redis.asyncio.Redis`` client created with ``decode_responses=True``
+            prefix: Key prefix
+            presence_ttl: Seconds a member stays present without a heartbeat
+            heartbeat_interval: Seconds between presence refreshes
+            reap_batch_size: Maximum expired members removed per heartbeat
+        """
+        self.redis = redis
+        self.prefix = prefix
+        self.presence_ttl = presence_ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.reap_batch_size = reap_batch_size
+
+        self._room_counts_key = f"{prefix}:room_counts"
+        self._presence_key = f"{prefix}:presence"
+        self._conn_user_key = f"{prefix}:conn_user"
+        self._room_key_prefix = f"{prefix}:room:"
+
+        self._add_member = redis.register_script(_ADD_MEMBER_SCRIPT)
+        self._remove_member = redis.register_script(_REMOVE_MEMBER_SCRIPT)
+        self._remove_member_from_all = redis.register_script(_REMOVE_MEMBER_FROM_ALL_SCRIPT)
+
+        # Members owned by this replica; only these get heartbeats from here
+        self._local_members: Set[str] = set()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    def _room_key(self, room: str) -> str:
+        return f"{self._room_key_prefix}{room}"
+
+    def _member_key(self, member_id: str) -> str:
+        return f"{self.prefix}:member:{member_id}"
+
+    def _subs_key(self, user_id: str) -> str:
+        return f"{self.prefix}:subs:{user_id}"
+
+    def _expiry(self) -> float:
+        return time.time() + self.presence_ttl
+
+    # Room membership
+
+    async def add_member(self, room: str, member_id: str) -> bool:
+        self._local_members.add(member_id)
+        added = await self._add_member(
+            keys=[
+                self._room_key(room),
+                self._member_key(member_id),
+                self._room_counts_key,
+                self._presence_key,
+            ],
+            args=[room, member_id, self._expiry()],
+        )
+        return bool(added)
+
+    async def remove_member(self, room: str, member_id: str) -> bool:
+        removed = await self._remove_member(
+            keys=[self._room_key(room), self._member_key(member_id), self._room_counts_key],
+            args=[room, member_id],
+        )
+        return bool(removed)
+
+    async def get_room_members(self, room: str) -> Set[str]:
+        return set(await self.redis.smembers(self._room_key(room)))
+
+    async def get_member_rooms(self, member_id: str) -> Set[str]:
+        return set(await self.redis.smembers(self._member_key(member_id)))
+
+    async def remove_member_from_all_rooms(self, member_id: str) -> List[str]:
+        self._local_members.discard(member_id)
+        rooms = await self._remove_member_from_all(
+            keys=[self._member_key(member_id), self._room_counts_key, self._presence_key],
+            args=[member_id, self._room_key_prefix],
+        )
+        return list(rooms or [])
+
+    async def get_room_count(self, room: str) -> int:
+        return int(await self.redis.scard(self._room_key(room)))
+
+    async def get_all_rooms(self) -> Dict[str, int]:
+        counts = await self.redis.hgetall(self._room_counts_key)
+        return {room: int(count) for room, count in counts.items() if int(count) > 0}
+
+    # Subscriptions
+
+    async def register_connection(self, connection_id: str, user_id: str) -> None:
+        await self.redis.hset(self._conn_user_key, connection_id, user_id)
+
+    async def unregister_connection(self, connection_id: str) -> Optional[str]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hget(self._conn_user_key, connection_id)
+            pipe.hdel(self._conn_user_key, connection_id)
+            user_id, _ = await pipe.execute()
+        return user_id
+
+    async def get_connection_user(self, connection_id: str) -> Optional[str]:
+        return await self.redis.hget(self._conn_user_key, connection_id)
+
+    async def add_user_subscription(self, user_id: str, room: str) -> None:
+        await self.redis.sadd(self._subs_key(user_id), room)
+
+    async def remove_user_subscription(self, user_id: str, room: str) -> bool:
+        await self.redis.srem(self._subs_key(user_id), room)
+        return True
+
+    async def get_user_rooms(self, user_id: str) -> Set[str]:
+        return set(await self.redis.smembers(self._subs_key(user_id)))
+
+    async def clear_user_subscriptions(self, user_id: str) -> Set[str]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.smembers(self._subs_key(user_id))
+            pipe.delete(self._subs_key(user_id))
+            rooms, _ = await pipe.execute()
+        return set(rooms)
+
+    # Presence
+
+    async def heartbeat(self) -> None:
+        """Refresh presence for every member owned by this replica."""
+        if not self._local_members:
+            return
+        expiry = self._expiry()
+        await self.redis.zadd(
+            self._presence_key,
+            {member_id: expiry for member_id in self._local_members},
+        )
+
+    async def reap_expired(self) -> int:
+        """
+        Remove members whose heartbeat has lapsed (e.g. their replica died).
+
+        Returns:
+            Number of members reaped
+        """
+        expired = await self.redis.zrangebyscore(
+            self._presence_key, "-inf", time.time(), start=0, num=self.reap_batch_size
+        )
+        if not expired:
+            return 0
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for member_id in expired:
+                await self._remove_member_from_all(
+                    keys=[self._member_key(member_id), self._room_counts_key, self._presence_key],
+                    args=[member_id, self._room_key_prefix],
+                    client=pipe,
+                )
+                # Members are connection IDs; drop the dead connection too
+                pipe.hdel(self._conn_user_key, member_id)
+            await pipe.execute()
+
+        logger.info(f"Reaped {len(expired)} stale WebSocket members")
+        return len(expired)
+
+    async def _run_heartbeat(self) -> None:
+        while True:
+            try:
+                await self.heartbeat()
+                await self.reap_expired()
+            except Exception as e:
+                logger.error(f"Presence heartbeat failed: {str(e)}")
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def start(self) -> None:
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.get_running_loop().create_task(
+                self._run_heartbeat()
+            )
+
+    async def close(self) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
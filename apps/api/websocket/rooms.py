@@ -6,11 +6,16 @@ Rooms organize subscriptions for different entities:
 - user:<user_id> - User-specific updates
 - agent:<agent_id> - Agent-specific updates
 - global - Global/broadcast updates
+
+Membership is stored in a pluggable backend (see websocket.room_backends);
+use the Redis backend so counts are correct across replicas.
 """
 import logging
 from typing import Set, Optional, Dict, List
 from uuid import UUID
 
+from websocket.room_backends import LocalRoomBackend, RoomBackend
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,9 +28,14 @@ class RoomManager:
     AGENT_ROOM_PREFIX = "agent:"
     GLOBAL_ROOM = "global"
 
-    def __init__(self):
-        # In-memory tracking (in production, use Redis)
-        self.room_members: Dict[str, Set[str]] = {}
+    def __init__(self, backend: Optional[RoomBackend] = None):
+        """
+        Initialize room manager.
+
+        Args:
+            backend: Membership storage; defaults to process-local storage
+        """
+        self.backend = backend or LocalRoomBackend()
 
     @staticmethod
     def get_project_room(project_id: UUID) -> str:
@@ -47,7 +57,7 @@ class RoomManager:
         """Get global room name."""
         return RoomManager.GLOBAL_ROOM
 
-    def add_member_to_room(self, room: str, member_id: str) -> bool:
+    async def add_member_to_room(self, room: str, member_id: str) -> bool:
         """
         Add a member to a room.
 
@@ -58,19 +68,16 @@ class RoomManager:
         Returns:
             True if member was added, False if already existed
         """
-        if room not in self.room_members:
-            self.room_members[room] = set()
-
-        was_new = member_id not in self.room_members[room]
-        self.room_members[room].add(member_id)
-
+        was_new = await self.backend.add_member(room, member_id)
         logger.debug(f"Added {member_id} to room {room}")
         return was_new
 
-    def remove_member_from_room(self, room: str, member_id: str) -> bool:
+    async def remove_member_from_room(self, room: str, member_id: str) -> bool:
         """
         Remove a member from a room.
 
+        Empty rooms are cleaned up automatically.
+
         Args:
             room: Room name
             member_id: Member identifier
@@ -78,20 +85,11 @@ class RoomManager:
         Returns:
             True if member was removed, False if not found
         """
-        if room not in self.room_members:
-            return False
-
-        was_present = member_id in self.room_members[room]
-        self.room_members[room].discard(member_id)
-
-        # Clean up empty rooms
-        if not self.room_members[room]:
-            del self.room_members[room]
-
+        was_present = await self.backend.remove_member(room, member_id)
         logger.debug(f"Removed {member_id} from room {room}")
         return was_present
 
-    def get_room_members(self, room: str) -> Set[str]:
+    async def get_room_members(self, room: str) -> Set[str]:
         """
         Get all members in a room.
 
@@ -101,9 +99,9 @@ class RoomManager:
         Returns:
             Set of member IDs
         """
-        return self.room_members.get(room, set()).copy()
+        return await self.backend.get_room_members(room)
 
-    def get_member_rooms(self, member_id: str) -> Set[str]:
+    async def get_member_rooms(self, member_id: str) -> Set[str]:
         """
         Get all rooms a member belongs to.
 
@@ -113,38 +111,26 @@ class RoomManager:
         Returns:
             Set of room names
         """
-        rooms = set()
-        for room, members in self.room_members.items():
-            if member_id in members:
-                rooms.add(room)
-        return rooms
+        return await self.backend.get_member_rooms(member_id)
 
-    def remove_member_from_all_rooms(self, member_id: str) -> List[str]:
+    async def remove_member_from_all_rooms(self, member_id: str) -> List[str]:
         """
         Remove a member from all rooms (e.g., on disconnect).
 
+        Uses the member's reverse index, so the cost is proportional to the
+        number of rooms the member joined rather than the number of rooms.
+
         Args:
             member_id: Member identifier
 
         Returns:
             List of rooms the member was removed from
         """
-        removed_from = []
-        rooms_to_check = list(self.room_members.keys())
-
-        for room in rooms_to_check:
-            if member_id in self.room_members[room]:
-                self.room_members[room].discard(member_id)
-                removed_from.append(room)
-
-                # Clean up empty rooms
-                if not self.room_members[room]:
-                    del self.room_members[room]
-
+        removed_from = await self.backend.remove_member_from_all_rooms(member_id)
         logger.debug(f"Removed {member_id} from {len(removed_from)} rooms")
         return removed_from
 
-    def get_room_count(self, room: str) -> int:
+    async def get_room_count(self, room: str) -> int:
         """
         Get number of members in a room.
 
@@ -154,28 +140,31 @@ class RoomManager:
         Returns:
             Number of members
         """
-        return len(self.room_members.get(room, set()))
+        return await self.backend.get_room_count(room)
 
-    def get_all_rooms(self) -> Dict[str, int]:
+    async def get_all_rooms(self) -> Dict[str, int]:
         """
         Get all active rooms and their member counts.
 
         Returns:
             Dictionary mapping room names to member counts
         """
-        return {room: len(members) for room, members in self.room_members.items()}
+        return await self.backend.get_all_rooms()
 
 
 class RoomSubscriptionManager:
     """Manages user subscriptions to rooms."""
 
-    def __init__(self):
-        # Maps user_id -> set of rooms they subscribe to
-        self.user_subscriptions: Dict[str, Set[str]] = {}
-        # Maps connection_id -> user_id
-        self.connection_to_user: Dict[str, str] = {}
+    def __init__(self, backend: Optional[RoomBackend] = None):
+        """
+        Initialize subscription manager.
+
+        Args:
+            backend: Subscription storage; defaults to process-local storage
+        """
+        self.backend = backend or LocalRoomBackend()
 
-    def register_connection(self, connection_id: str, user_id: str) -> None:
+    async def register_connection(self, connection_id: str, user_id: str) -> None:
         """
         Register a connection for a user.
 
@@ -183,13 +172,10 @@ class RoomSubscriptionManager:
             connection_id: WebSocket connection ID
             user_id: User ID
         """
-        self.connection_to_user[connection_id] = user_id
-        if user_id not in self.user_subscriptions:
-            self.user_subscriptions[user_id] = set()
-
+        await self.backend.register_connection(connection_id, user_id)
         logger.debug(f"Registered connection {connection_id} for user {user_id}")
 
-    def unregister_connection(self, connection_id: str) -> Optional[str]:
+    async def unregister_connection(self, connection_id: str) -> Optional[str]:
         """
         Unregister a connection.
 
@@ -199,11 +185,23 @@ class RoomSubscriptionManager:
         Returns:
             User ID if found, None otherwise
         """
-        user_id = self.connection_to_user.pop(connection_id, None)
+        user_id = await self.backend.unregister_connection(connection_id)
         logger.debug(f"Unregistered connection {connection_id}")
         return user_id
 
-    def subscribe_to_room(self, connection_id: str, room: str) -> bool:
+    async def get_connection_user(self, connection_id: str) -> Optional[str]:
+        """
+        Get the user that owns a connection.
+
+        Args:
+            connection_id: WebSocket connection ID
+
+        Returns:
+            User ID if registered, None otherwise
+        """
+        return await self.backend.get_connection_user(connection_id)
+
+    async def subscribe_to_room(self, connection_id: str, room: str) -> bool:
         """
         Subscribe a connection to a room.
 
@@ -214,19 +212,16 @@ class RoomSubscriptionManager:
         Returns:
             True if subscription was successful
         """
-        user_id = self.connection_to_user.get(connection_id)
+        user_id = await self.backend.get_connection_user(connection_id)
         if not user_id:
             logger.warning(f"Connection {connection_id} not registered")
             return False
 
-        if user_id not in self.user_subscriptions:
-            self.user_subscriptions[user_id] = set()
-
-        self.user_subscriptions[user_id].add(room)
+        await self.backend.add_user_subscription(user_id, room)
         logger.debug(f"Subscribed user {user_id} to room {room}")
         return True
 
-    def unsubscribe_from_room(self, connection_id: str, room: str) -> bool:
+    async def unsubscribe_from_room(self, connection_id: str, room: str) -> bool:
         """
         Unsubscribe a connection from a room.
 
@@ -237,15 +232,17 @@ class RoomSubscriptionManager:
         Returns:
             True if unsubscription was successful
         """
-        user_id = self.connection_to_user.get(connection_id)
-        if not user_id or user_id not in self.user_subscriptions:
+        user_id = await self.backend.get_connection_user(connection_id)
+        if not user_id:
+            return False
+
+        if not await self.backend.remove_user_subscription(user_id, room):
             return False
 
-        self.user_subscriptions[user_id].discard(room)
         logger.debug(f"Unsubscribed user {user_id} from room {room}")
         return True
 
-    def get_user_rooms(self, user_id: str) -> Set[str]:
+    async def get_user_rooms(self, user_id: str) -> Set[str]:
         """
         Get all rooms a user is subscribed to.
 
@@ -255,9 +252,9 @@ class RoomSubscriptionManager:
         Returns:
             Set of room names
         """
-        return self.user_subscriptions.get(user_id, set()).copy()
+        return await self.backend.get_user_rooms(user_id)
 
-    def clear_user_subscriptions(self, user_id: str) -> Set[str]:
+    async def clear_user_subscriptions(self, user_id: str) -> Set[str]:
         """
         Clear all subscriptions for a user.
 
@@ -267,11 +264,23 @@ class RoomSubscriptionManager:
         Returns:
             Set of rooms that were cleared
         """
-        rooms = self.user_subscriptions.pop(user_id, set())
+        rooms = await self.backend.clear_user_subscriptions(user_id)
         logger.debug(f"Cleared {len(rooms)} subscriptions for user {user_id}")
         return rooms
 
 
+def configure_room_backend(backend: RoomBackend) -> None:
+    """
+    Point the global room and subscription managers at a backend.
+
+    Args:
+        backend: Backend shared by both managers
+    """
+    room_manager.backend = backend
+    subscription_manager.backend = backend
+
+
 # Global instances
-room_manager = RoomManager()
-subscription_manager = RoomSubscriptionManager()
+_default_backend = LocalRoomBackend()
+room_manager = RoomManager(_default_backend)
+subscription_manager = RoomSubscriptionManager(_default_backend)
@@ -13,6 +13,8 @@ from config import settings
 from auth.models import TokenData
 from websocket.auth import ws_auth_handler
 from websocket.events import get_event_handler
+from websocket.room_backends import RedisRoomBackend
+from websocket.rooms import configure_room_backend, room_manager
 from middleware.logging import logger as app_logger
 
 logger = logging.getLogger(__name__)
@@ -58,6 +60,9 @@ class WebSocketServer:
         # Configure message queue with Redis for horizontal scaling
         self._setup_redis_adapter()
 
+        # Share room membership across replicas
+        self._setup_room_backend()
+
         # Get event handler
         self.event_handler = get_event_handler(self.sio)
 
@@ -88,6 +93,42 @@ class WebSocketServer:
         except Exception as e:
             logger.error(f"Failed to setup Redis adapter: {str(e)}")
 
+    def _setup_room_backend(self) -> None:
+        """
+        Set up the room membership backend.
+
+        With the Redis backend, room counts and membership are global across
+        replicas and kept accurate by presence heartbeats.
+        """
+        if settings.ws_room_backend != "redis":
+            return
+
+        try:
+            import redis.asyncio as aioredis
+
+            client = aioredis.from_url(str(settings.redis_url), decode_responses=True)
+            configure_room_backend(
+                RedisRoomBackend(
+                    client,
+                    presence_ttl=settings.ws_presence_ttl_seconds,
+                    heartbeat_interval=settings.ws_presence_heartbeat_seconds,
+                )
+            )
+            logger.info("Redis room backend configured")
+
+        except ImportError:
+            logger.warning("Redis not available, using in-memory room backend")
+        except Exception as e:
+            logger.error(f"Failed to setup Redis room backend: {str(e)}")
+
+    async def start(self) -> None:
+        """Start background room maintenance (presence heartbeats)."""
+        await room_manager.backend.start()
+
+    async def close(self) -> None:
+        """Stop background room maintenance."""
+        await room_manager.backend.close()
+
     def _register_handlers(self) -> None:
         """Register event handlers with Socket.IO."""
 
@@ -159,14 +200,11 @@ class WebSocketServer:
             namespace: Socket.IO namespace
         """
         try:
-            if skip_sid:
-                # Emit to all except sender
-                for sid in self.sio.rooms(namespace).get(room, []):
-                    if sid != skip_sid:
-                        await self.sio.emit(event, data, to=sid, namespace=namespace)
-            else:
-                # Emit to entire room
-                await self.sio.emit(event, data, room=room, namespace=namespace)
+            # Single room broadcast; the manager applies skip_sid on every
+            # host, so excluding the sender costs no extra sends or publishes
+            await self.sio.emit(
+                event, data, room=room, skip_sid=skip_sid, namespace=namespace
+            )
 
             logger.debug(f"Emitted {event} to room {room}")
 
@@ -220,6 +258,9 @@ class WebSocketServer:
         """
         Get information about a room.
 
+        Membership comes from the room backend, so it covers every replica
+        when the Redis backend is configured.
+
         Args:
             room: Room name
             namespace: Socket.IO namespace
@@ -228,7 +269,7 @@ class WebSocketServer:
             Dictionary with room info
         """
         try:
-            sids = self.sio.rooms(namespace).get(room, [])
+            sids = await room_manager.get_room_members(room)
             return {
                 "room": room,
                 "member_count": len(sids),
@@ -118,89 +118,89 @@ class TestRoomManager:
         assert RoomManager.get_agent_room(agent_id) == f"agent:{agent_id}"
         assert RoomManager.get_global_room() == "global"
 
-    def test_add_member_to_room(self):
+    async def test_add_member_to_room(self):
         """Test adding members to rooms."""
         manager = RoomManager()
         room = "test_room"
         member = "member_1"
 
         # Add new member
-        was_new = manager.add_member_to_room(room, member)
+        was_new = await manager.add_member_to_room(room, member)
         assert was_new is True
-        assert manager.get_room_count(room) == 1
+        assert await manager.get_room_count(room) == 1
 
         # Add same member again
-        was_new = manager.add_member_to_room(room, member)
+        was_new = await manager.add_member_to_room(room, member)
         assert was_new is False
-        assert manager.get_room_count(room) == 1
+        assert await manager.get_room_count(room) == 1
 
-    def test_remove_member_from_room(self):
+    async def test_remove_member_from_room(self):
         """Test removing members from rooms."""
         manager = RoomManager()
         room = "test_room"
         member = "member_1"
 
-        manager.add_member_to_room(room, member)
-        assert manager.get_room_count(room) == 1
+        await manager.add_member_to_room(room, member)
+        assert await manager.get_room_count(room) == 1
 
-        was_present = manager.remove_member_from_room(room, member)
+        was_present = await manager.remove_member_from_room(room, member)
         assert was_present is True
-        assert manager.get_room_count(room) == 0
+        assert await manager.get_room_count(room) == 0
 
         # Room should be cleaned up
-        assert room not in manager.room_members
+        assert room not in await manager.get_all_rooms()
 
-    def test_get_room_members(self):
+    async def test_get_room_members(self):
         """Test getting room members."""
         manager = RoomManager()
         room = "test_room"
 
-        manager.add_member_to_room(room, "member_1")
-        manager.add_member_to_room(room, "member_2")
-        manager.add_member_to_room(room, "member_3")
+        await manager.add_member_to_room(room, "member_1")
+        await manager.add_member_to_room(room, "member_2")
+        await manager.add_member_to_room(room, "member_3")
 
-        members = manager.get_room_members(room)
+        members = await manager.get_room_members(room)
         assert len(members) == 3
         assert "member_1" in members
         assert "member_2" in members
 
-    def test_get_member_rooms(self):
+    async def test_get_member_rooms(self):
         """Test getting all rooms for a member."""
         manager = RoomManager()
 
-        manager.add_member_to_room("room_1", "member_1")
-        manager.add_member_to_room("room_2", "member_1")
-        manager.add_member_to_room("room_3", "member_1")
+        await manager.add_member_to_room("room_1", "member_1")
+        await manager.add_member_to_room("room_2", "member_1")
+        await manager.add_member_to_room("room_3", "member_1")
 
-        rooms = manager.get_member_rooms("member_1")
+        rooms = await manager.get_member_rooms("member_1")
         assert len(rooms) == 3
         assert "room_1" in rooms
         assert "room_2" in rooms
 
-    def test_remove_member_from_all_rooms(self):
+    async def test_remove_member_from_all_rooms(self):
         """Test removing member from all rooms."""
         manager = RoomManager()
 
-        manager.add_member_to_room("room_1", "member_1")
-        manager.add_member_to_room("room_2", "member_1")
-        manager.add_member_to_room("room_3", "member_1")
+        await manager.add_member_to_room("room_1", "member_1")
+        await manager.add_member_to_room("room_2", "member_1")
+        await manager.add_member_to_room("room_3", "member_1")
 
-        removed_from = manager.remove_member_from_all_rooms("member_1")
+        removed_from = await manager.remove_member_from_all_rooms("member_1")
         assert len(removed_from) == 3
 
         # Member should not be in any room
         for room in ["room_1", "room_2", "room_3"]:
-            assert "member_1" not in manager.get_room_members(room)
+            assert "member_1" not in (await manager.get_room_members(room))
 
-    def test_get_all_rooms(self):
+    async def test_get_all_rooms(self):
         """Test getting all rooms."""
         manager = RoomManager()
 
-        manager.add_member_to_room("room_1", "member_1")
-        manager.add_member_to_room("room_1", "member_2")
-        manager.add_member_to_room("room_2", "member_3")
+        await manager.add_member_to_room("room_1", "member_1")
+        await manager.add_member_to_room("room_1", "member_2")
+        await manager.add_member_to_room("room_2", "member_3")
 
-        all_rooms = manager.get_all_rooms()
+        all_rooms = await manager.get_all_rooms()
         assert len(all_rooms) == 2
         assert all_rooms["room_1"] == 2
         assert all_rooms["room_2"] == 1
@@ -209,79 +209,78 @@ class TestRoomManager:
 class TestRoomSubscriptionManager:
     """Test subscription management."""
 
-    def test_register_connection(self):
+    async def test_register_connection(self):
         """Test registering a connection."""
         manager = RoomSubscriptionManager()
         user_id = str(uuid4())
 
-        manager.register_connection("conn_1", user_id)
+        await manager.register_connection("conn_1", user_id)
 
-        assert "conn_1" in manager.connection_to_user
-        assert manager.connection_to_user["conn_1"] == user_id
-        assert user_id in manager.user_subscriptions
+        assert await manager.get_connection_user("conn_1") == user_id
+        assert await manager.get_user_rooms(user_id) == set()
 
-    def test_unregister_connection(self):
+    async def test_unregister_connection(self):
         """Test unregistering a connection."""
         manager = RoomSubscriptionManager()
         user_id = str(uuid4())
 
-        manager.register_connection("conn_1", user_id)
-        returned_user = manager.unregister_connection("conn_1")
+        await manager.register_connection("conn_1", user_id)
+        returned_user = await manager.unregister_connection("conn_1")
 
         assert returned_user == user_id
-        assert "conn_1" not in manager.connection_to_user
+        assert await manager.get_connection_user("conn_1") is None
 
-    def test_subscribe_to_room(self):
+    async def test_subscribe_to_room(self):
         """Test subscribing to a room."""
         manager = RoomSubscriptionManager()
         user_id = str(uuid4())
 
-        manager.register_connection("conn_1", user_id)
-        success = manager.subscribe_to_room("conn_1", "project:123")
+        await manager.register_connection("conn_1", user_id)
+        success = await manager.subscribe_to_room("conn_1", "project:123")
 
         assert success is True
-        assert "project:123" in manager.get_user_rooms(user_id)
+        assert "project:123" in (await manager.get_user_rooms(user_id))
 
-    def test_unsubscribe_from_room(self):
+    async def test_unsubscribe_from_room(self):
         """Test unsubscribing from a room."""
         manager = RoomSubscriptionManager()
         user_id = str(uuid4())
 
-        manager.register_connection("conn_1", user_id)
-        manager.subscribe_to_room("conn_1", "project:123")
+        await manager.register_connection("conn_1", user_id)
+        await manager.subscribe_to_room("conn_1", "project:123")
 
-        success = manager.unsubscribe_from_room("conn_1", "project:123")
+        success = await manager.unsubscribe_from_room("conn_1", "project:123")
 
         assert success is True
-        assert "project:123" not in manager.get_user_rooms(user_id)
+        assert "project:123" not in (await manager.get_user_rooms(user_id))
 
-    def test_get_user_rooms(self):
+    async def test_get_user_rooms(self):
         """Test getting all rooms for a user."""
         manager = RoomSubscriptionManager()
         user_id = str(uuid4())
 
-        manager.register_connection("conn_1", user_id)
-        manager.subscribe_to_room("conn_1", "project:123")
-        manager.subscribe_to_room("conn_1", "user:456")
+        await manager.register_connection("conn_1", user_id)
+        await manager.subscribe_to_room("conn_1", "project:123")
+        await manager.subscribe_to_room("conn_1", "user:456")
 
-        rooms = manager.get_user_rooms(user_id)
+        rooms = await manager.get_user_rooms(user_id)
         assert len(rooms) == 2
         assert "project:123" in rooms
         assert "user:456" in rooms
 
-    def test_clear_user_subscriptions(self):
+    async def test_clear_user_subscriptions(self):
         """Test clearing all subscriptions for a user."""
         manager = RoomSubscriptionManager()
         user_id = str(uuid4())
 
-        manager.register_connection("conn_1", user_id)
-        manager.subscribe_to_room("conn_1", "project:123")
-        manager.subscribe_to_room("conn_1", "user:456")
+        await manager.register_connection("conn_1", user_id)
+        await manager.subscribe_to_room("conn_1", "project:123")
+        await manager.subscribe_to_room("conn_1", "user:456")
 
-        cleared_rooms = manager.clear_user_subscriptions(user_id)
+        cleared_rooms = await manager.clear_user_subscriptions(user_id)
 
         assert len(cleared_rooms) == 2
-        assert len(manager.get_user_rooms(user_id)) == 0
+        assert len(await manager.get_user_rooms(user_id)) == 0
 
 
 class TestWebSocketAuth:
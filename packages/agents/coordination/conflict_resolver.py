@@ -11,16 +11,12 @@ from datetime import datetime
 import logging
 import uuid
 
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-
-from base import BaseAgent, Task, Context, AgentResult, TaskType
-from protocol import (
+from ..base import BaseAgent, Task, Context, AgentResult, TaskType
+from ..protocol import (
     AgentMessage, EscalationRequest, Evidence,
     MessageIntent, MessagePriority
 )
-from registry import AgentRegistry
+from ..registry import AgentRegistry
 
 
 @dataclass
@@ -11,13 +11,9 @@ from enum import Enum
 import logging
 import statistics
 
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-
-from base import BaseAgent, Task, Context, AgentResult, TaskType
-from protocol import Evidence
-from registry import AgentRegistry, AgentCapability
+from ..base import BaseAgent, Task, Context, AgentResult, TaskType
+from ..protocol import Evidence
+from ..registry import AgentRegistry, AgentCapability
 
 
 class OptimizationGoal(str, Enum):
@@ -9,19 +9,20 @@ from typing import List, Dict, Any, Optional, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 import asyncio
+import heapq
 import logging
 import uuid
 
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-
-from base import BaseAgent, Task, Context, AgentResult, TaskType, Priority
-from protocol import (
+from ..base import BaseAgent, Task, Context, AgentResult, TaskType, Priority
+from ..protocol import (
     AgentMessage, HandoffRequest, HandoffReason, Evidence,
     MessageIntent, MessagePriority
 )
-from registry import AgentRegistry, AgentCapability
+from ..registry import AgentRegistry, AgentCapability
+
+
+# Relative subtask cost used to rank ready subtasks by critical path
+COMPLEXITY_WEIGHTS = {"low": 1.0, "medium": 2.0, "high": 3.0}
 
 
 @dataclass
@@ -31,7 +32,7 @@ class SubTask:
     parent_task_id: str
     task: Task
     assigned_agent: Optional[str] = None
-    status: str = "pending"  # pending, assigned, running, completed, failed
+    status: str = "pending"  # pending, assigned, running, completed, failed, cancelled
     result: Optional[AgentResult] = None
     dependencies: List[str] = field(default_factory=list)
     attempts: int = 0
@@ -51,6 +52,7 @@ class SwarmExecution:
     total_subtasks: int = 0
     completed_subtasks: int = 0
     failed_subtasks: int = 0
+    cancelled_subtasks: int = 0
     total_cost: float = 0.0
     total_time_ms: int = 0
     created_at: datetime = field(default_factory=datetime.utcnow)
@@ -78,6 +80,7 @@ class SwarmCoordinator(BaseAgent):
         max_parallel_agents: int = 10,
         enable_cost_optimization: bool = True,
         enable_time_optimization: bool = True,
+        critical_path_priority: bool = True,
         **kwargs
     ):
         """
@@ -89,6 +92,8 @@ class SwarmCoordinator(BaseAgent):
             max_parallel_agents: Maximum parallel agents
             enable_cost_optimization: Enable cost optimization
             enable_time_optimization: Enable time optimization
+            critical_path_priority: Start DAG subtasks on the longest remaining
+                path first; otherwise ready subtasks start in declaration order
             **kwargs: Additional BaseAgent arguments
         """
         super().__init__(
@@ -101,6 +106,7 @@ class SwarmCoordinator(BaseAgent):
         self.max_parallel_agents = max_parallel_agents
         self.enable_cost_optimization = enable_cost_optimization
         self.enable_time_optimization = enable_time_optimization
+        self.critical_path_priority = critical_path_priority
 
         # Active swarms
         self.active_swarms: Dict[str, SwarmExecution] = {}
@@ -201,12 +207,13 @@ Provide decomposition in JSON format:
                     "swarm_execution",
                     f"Coordinated {swarm.total_subtasks} subtasks, "
                     f"{swarm.completed_subtasks} completed, "
-                    f"{swarm.failed_subtasks} failed"
+                    f"{swarm.failed_subtasks} failed, "
+                    f"{swarm.cancelled_subtasks} cancelled"
                 )
             ]
 
             return AgentResult(
-                success=swarm.failed_subtasks == 0,
+                success=swarm.failed_subtasks == 0 and swarm.cancelled_subtasks == 0,
                 output=aggregated,
                 evidence=evidence,
                 metadata={
@@ -214,6 +221,7 @@ Provide decomposition in JSON format:
                     "total_subtasks": swarm.total_subtasks,
                     "completed_subtasks": swarm.completed_subtasks,
                     "failed_subtasks": swarm.failed_subtasks,
+                    "cancelled_subtasks": swarm.cancelled_subtasks,
                     "total_cost": swarm.total_cost,
                     "total_time_ms": swarm.total_time_ms,
                     "strategy": swarm.strategy
@@ -383,45 +391,161 @@ Identify dependencies between subtasks and recommend an execution strategy."""
         swarm: SwarmExecution,
         context: Context
     ) -> List[AgentResult]:
-        """Execute subtasks respecting DAG dependencies"""
-        results = []
-        completed_ids = set()
-        pending_subtasks = swarm.subtasks.copy()
-
-        while pending_subtasks:
-            # Find subtasks with satisfied dependencies
-            ready = [
-                st for st in pending_subtasks
-                if all(dep in completed_ids for dep in st.dependencies)
-            ]
+        """
+        Execute subtasks respecting DAG dependencies
 
-            if not ready:
-                self.logger.error("Circular dependency detected in subtasks")
-                break
+        Subtasks are launched as soon as all of their dependencies have
+        succeeded, rather than in barrier-synchronized waves, so a slow subtask
+        only delays its own descendants. Ready subtasks are started in order of
+        their remaining critical path. When a subtask fails, every subtask
+        that depends on it (directly or transitively) is cancelled.
 
-            # Execute ready subtasks in parallel
-            semaphore = asyncio.Semaphore(self.max_parallel_agents)
+        Args:
+            swarm: Swarm execution state
+            context: Execution context
 
-            async def execute_ready(subtask: SubTask) -> Optional[AgentResult]:
-                async with semaphore:
-                    return await self._execute_subtask(subtask, swarm, context)
+        Returns:
+            Results in completion order
+        """
+        results = []
+        subtasks = {st.id: st for st in swarm.subtasks}
+        order = {st.id: i for i, st in enumerate(swarm.subtasks)}
+        dependents: Dict[str, List[str]] = {st.id: [] for st in swarm.subtasks}
+        in_degree: Dict[str, int] = {}
+        blocked: Set[str] = set()
+
+        for st in swarm.subtasks:
+            deps = set(st.dependencies)
+            missing = deps - subtasks.keys()
+            if missing:
+                self.logger.error(
+                    f"Subtask {st.id} depends on unknown subtasks: {sorted(missing)}"
+                )
+                blocked.add(st.id)
+            for dep in deps - missing:
+                dependents[dep].append(st.id)
+            in_degree[st.id] = len(deps - missing)
+
+        priorities = (
+            self._critical_path_lengths(swarm.subtasks, dependents)
+            if self.critical_path_priority else {}
+        )
+        ready: List[tuple] = []
 
-            batch_results = await asyncio.gather(
-                *[execute_ready(st) for st in ready],
-                return_exceptions=True
+        def push_ready(subtask_id: str) -> None:
+            heapq.heappush(
+                ready, (-priorities.get(subtask_id, 0.0), order[subtask_id], subtask_id)
             )
 
-            # Process results
-            for subtask, result in zip(ready, batch_results):
-                if isinstance(result, AgentResult):
-                    results.append(result)
-                    if result.success:
-                        completed_ids.add(subtask.id)
+        def cancel_dependents(subtask_id: str) -> None:
+            stack = list(dependents[subtask_id])
+            while stack:
+                dependent = subtasks[stack.pop()]
+                if dependent.status == "cancelled":
+                    continue
+                dependent.status = "cancelled"
+                dependent.completed_at = datetime.utcnow()
+                swarm.cancelled_subtasks += 1
+                stack.extend(dependents[dependent.id])
+
+        for subtask_id in blocked:
+            subtasks[subtask_id].status = "cancelled"
+            swarm.cancelled_subtasks += 1
+            cancel_dependents(subtask_id)
 
-                pending_subtasks.remove(subtask)
+        for st in swarm.subtasks:
+            if in_degree[st.id] == 0 and st.status != "cancelled":
+                push_ready(st.id)
+
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while ready or running:
+                while ready and len(running) < self.max_parallel_agents:
+                    _, _, subtask_id = heapq.heappop(ready)
+                    task = asyncio.create_task(
+                        self._execute_subtask(subtasks[subtask_id], swarm, context)
+                    )
+                    running[task] = subtask_id
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    subtask_id = running.pop(task)
+                    if task.exception() is not None:
+                        self.logger.error(f"Subtask {subtask_id} raised: {task.exception()}")
+                        result = None
+                    else:
+                        result = task.result()
+
+                    if result is not None:
+                        results.append(result)
+
+                    if result is not None and result.success:
+                        for dependent in dependents[subtask_id]:
+                            in_degree[dependent] -= 1
+                            if in_degree[dependent] == 0 and subtasks[dependent].status != "cancelled":
+                                push_ready(dependent)
+                    else:
+                        cancel_dependents(subtask_id)
+        finally:
+            # Cancelled mid-run; don't leave subtasks holding agent pool leases
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        unscheduled = [st for st in swarm.subtasks if st.status == "pending"]
+        if unscheduled:
+            self.logger.error(
+                f"Circular dependency detected in subtasks: {[st.id for st in unscheduled]}"
+            )
+            for st in unscheduled:
+                st.status = "cancelled"
+                swarm.cancelled_subtasks += 1
 
         return results
 
+    @staticmethod
+    def _critical_path_lengths(
+        subtasks: List[SubTask],
+        dependents: Dict[str, List[str]]
+    ) -> Dict[str, float]:
+        """
+        Compute each subtask's longest weighted path to a sink
+
+        Args:
+            subtasks: Subtasks in the DAG
+            dependents: Map of subtask ID to the IDs that depend on it
+
+        Returns:
+            Map of subtask ID to critical path length (cyclic subtasks omitted)
+        """
+        weights = {
+            st.id: COMPLEXITY_WEIGHTS.get(
+                st.task.metadata.get("estimated_complexity", "medium"), 2.0
+            )
+            for st in subtasks
+        }
+
+        # Reverse topological order via Kahn's algorithm on the dependents graph
+        remaining = {st_id: len(children) for st_id, children in dependents.items()}
+        parents: Dict[str, List[str]] = {st_id: [] for st_id in dependents}
+        for st_id, children in dependents.items():
+            for child in children:
+                parents[child].append(st_id)
+
+        lengths: Dict[str, float] = {}
+        sinks = [st_id for st_id, count in remaining.items() if count == 0]
+        while sinks:
+            st_id = sinks.pop()
+            lengths[st_id] = weights[st_id] + max(
+                (lengths[child] for child in dependents[st_id]), default=0.0
+            )
+            for parent in parents[st_id]:
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    sinks.append(parent)
+
+        return lengths
+
     async def _execute_subtask(
         self,
         subtask: SubTask,
@@ -465,20 +589,21 @@ Identify dependencies between subtasks and recommend an execution strategy."""
                     self.logger.warning(f"Failed to acquire agent {agent_id}")
                     continue
 
-                # Execute task
-                result = await self.registry.execute_task(
-                    subtask.task,
-                    context,
-                    preferred_agent=agent_id
-                )
-
-                # Release agent
-                if result:
+                # Execute task on the leased instance
+                result = None
+                try:
+                    result = await self.registry.execute_task(
+                        subtask.task,
+                        context,
+                        preferred_agent=agent_id
+                    )
+                finally:
+                    # Always return the instance to the pool
                     await self.registry.release_agent(
                         agent_id,
                         subtask.id,
-                        result.success,
-                        result.execution_time_ms or 0
+                        bool(result and result.success),
+                        (result.execution_time_ms or 0) if result else 0
                     )
 
                 if result and result.success:
@@ -575,6 +700,7 @@ Identify dependencies between subtasks and recommend an execution strategy."""
             "total_subtasks": swarm.total_subtasks,
             "completed_subtasks": swarm.completed_subtasks,
             "failed_subtasks": swarm.failed_subtasks,
+            "cancelled_subtasks": swarm.cancelled_subtasks,
             "outputs": outputs,
             "evidence": [
                 {
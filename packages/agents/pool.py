@@ -0,0 +1,189 @@
+"""
+Agent Instance Pool
+
+Agents keep mutable per-execution state (status, current task, history), so a
+single instance must never run two tasks at once. Each pool owns up to
+``max_size`` instances of one agent and leases them to tasks exclusively;
+callers wait in FIFO order when every instance is busy.
+"""
+from typing import Any, Callable, Deque, Dict, List, Optional
+from collections import deque
+import asyncio
+import logging
+import time
+
+from .base import BaseAgent, AgentStatus
+
+
+class AgentPool:
+    """
+    Bounded pool of instances for a single agent ID
+
+    Features:
+    - Lazy instance creation up to max_size
+    - Exclusive leases keyed by task ID
+    - FIFO wait queue with timeout when exhausted
+    - Utilization and wait-time metrics
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        factory: Callable[[], Optional[BaseAgent]],
+        max_size: int = 5,
+        acquire_timeout: float = 30.0
+    ):
+        """
+        Initialize agent pool
+
+        Args:
+            agent_id: Agent identifier
+            factory: Creates a new agent instance (None on failure)
+            max_size: Maximum number of instances
+            acquire_timeout: Default seconds to wait for a free instance
+        """
+        self.agent_id = agent_id
+        self.factory = factory
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+
+        self.instances: List[BaseAgent] = []
+        self._idle: List[BaseAgent] = []
+        self._leases: Dict[str, BaseAgent] = {}
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # Metrics
+        self.total_acquired = 0
+        self.total_timeouts = 0
+        self.total_wait_ms = 0.0
+        self.peak_in_use = 0
+
+        self.logger = logging.getLogger(f"AgentPool.{agent_id}")
+
+    @property
+    def in_use(self) -> int:
+        """Number of leased instances"""
+        return len(self._leases)
+
+    def get_leased(self, task_id: str) -> Optional[BaseAgent]:
+        """Get the instance leased to a task, if any"""
+        return self._leases.get(task_id)
+
+    async def acquire(
+        self,
+        task_id: str,
+        timeout: Optional[float] = None
+    ) -> Optional[BaseAgent]:
+        """
+        Lease an instance to a task
+
+        Args:
+            task_id: Task the instance is leased to
+            timeout: Seconds to wait when exhausted (defaults to acquire_timeout)
+
+        Returns:
+            Agent instance, or None on timeout or creation failure
+        """
+        if task_id in self._leases:
+            return self._leases[task_id]
+
+        if self._idle:
+            agent = self._idle.pop()
+        elif len(self.instances) < self.max_size:
+            agent = self._create()
+        else:
+            started = time.monotonic()
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                agent = await asyncio.wait_for(
+                    waiter,
+                    timeout=self.acquire_timeout if timeout is None else timeout
+                )
+            except asyncio.TimeoutError:
+                self.total_timeouts += 1
+                self.logger.warning(
+                    f"Timed out waiting for {self.agent_id} instance for task {task_id} "
+                    f"({self.in_use}/{self.max_size} in use)"
+                )
+                return None
+            except asyncio.CancelledError:
+                # Don't lose an instance handed over just before cancellation
+                if waiter.done() and not waiter.cancelled() and waiter.result() is not None:
+                    self._return(waiter.result())
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            self.total_wait_ms += (time.monotonic() - started) * 1000
+
+        if agent is None:
+            return None
+
+        self._leases[task_id] = agent
+        self.total_acquired += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        return agent
+
+    def release(self, task_id: str) -> bool:
+        """
+        Return a task's instance to the pool
+
+        Args:
+            task_id: Task holding the lease
+
+        Returns:
+            True if a lease was released
+        """
+        agent = self._leases.pop(task_id, None)
+        if agent is None:
+            return False
+
+        agent.status = AgentStatus.IDLE
+        agent.current_task = None
+        self._return(agent)
+        return True
+
+    def _return(self, agent: BaseAgent) -> None:
+        """Give an instance to the next waiter or put it back on the idle list"""
+        # Hand the instance straight to the next waiter, if any
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(agent)
+                return
+
+        self._idle.append(agent)
+
+    def _create(self) -> Optional[BaseAgent]:
+        """Create a new pooled instance"""
+        agent = self.factory()
+        if agent is not None:
+            self.instances.append(agent)
+        return agent
+
+    def close(self) -> None:
+        """Fail all waiters and drop idle instances"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+        for agent in self._idle:
+            self.instances.remove(agent)
+        self._idle.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool utilization statistics"""
+        return {
+            "agent_id": self.agent_id,
+            "max_size": self.max_size,
+            "instances": len(self.instances),
+            "in_use": self.in_use,
+            "idle": len(self._idle),
+            "waiting": len(self._waiters),
+            "utilization": self.in_use / self.max_size if self.max_size else 0.0,
+            "peak_in_use": self.peak_in_use,
+            "total_acquired": self.total_acquired,
+            "total_timeouts": self.total_timeouts,
+            "avg_wait_ms": self.total_wait_ms / self.total_acquired if self.total_acquired else 0.0
+        }
@@ -5,9 +5,13 @@ Defines message formats, handoff protocols, evidence sharing,
 and state persistence for inter-agent communication.
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Awaitable, Callable, Deque
+from collections import OrderedDict, deque
 from datetime import datetime
 from enum import Enum
+import asyncio
+import logging
+import time
 import uuid
 import json
 
@@ -398,80 +402,269 @@ class AgentState:
         )
 
 
+@dataclass
+class _Conversation:
+    """Retained messages and evidence index for one conversation"""
+    message_ids: Deque[str] = field(default_factory=deque)
+    evidence: Dict[str, Evidence] = field(default_factory=dict)
+    last_activity: float = field(default_factory=time.monotonic)
+
+
+class _Subscription:
+    """Subscriber callback with its own bounded delivery queue and worker"""
+
+    def __init__(self, callback: Callable[[AgentMessage], Awaitable[None]], max_pending: int):
+        self.callback = callback
+        self.queue: "asyncio.Queue[AgentMessage]" = asyncio.Queue(maxsize=max_pending)
+        self.worker: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+
 class MessageBus:
     """
     Event-driven message bus for agent communication
 
     Features:
-    - Async message delivery
+    - Async message delivery through bounded per-agent mailboxes
     - Message routing
-    - Conversation tracking
-    - Evidence aggregation
+    - Subscriber callbacks dispatched on their own tasks, so a slow
+      subscriber never blocks senders
+    - Conversation tracking with size and TTL bounded retention
+    - Evidence aggregation indexed on insert
+
+    Full mailboxes and subscriber queues drop their oldest message.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        mailbox_size: int = 1000,
+        max_pending_callbacks: int = 100,
+        max_conversations: int = 10000,
+        max_messages_per_conversation: int = 1000,
+        conversation_ttl_seconds: float = 3600.0
+    ):
+        """
+        Initialize message bus
+
+        Args:
+            mailbox_size: Maximum undelivered messages per agent
+            max_pending_callbacks: Maximum queued callbacks per subscriber
+            max_conversations: Maximum retained conversations
+            max_messages_per_conversation: Maximum retained messages per conversation
+            conversation_ttl_seconds: Conversations idle this long are evicted
+        """
+        self.mailbox_size = mailbox_size
+        self.max_pending_callbacks = max_pending_callbacks
+        self.max_conversations = max_conversations
+        self.max_messages_per_conversation = max_messages_per_conversation
+        self.conversation_ttl_seconds = conversation_ttl_seconds
+
         self.messages: Dict[str, AgentMessage] = {}
-        self.conversations: Dict[str, List[str]] = {}
-        self.agent_queues: Dict[str, List[str]] = {}
-        self.subscribers: Dict[str, List[callable]] = {}
+        self.conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+        self.agent_queues: Dict[str, "asyncio.Queue[AgentMessage]"] = {}
+        self.subscribers: Dict[str, List[_Subscription]] = {}
+
+        self.dropped_messages = 0
+        self.logger = logging.getLogger("MessageBus")
 
     async def send(self, message: AgentMessage) -> None:
         """Send message to recipients"""
-        # Store message
-        self.messages[message.message_id] = message
-
         # Track conversation
         if message.conversation_id:
-            if message.conversation_id not in self.conversations:
-                self.conversations[message.conversation_id] = []
-            self.conversations[message.conversation_id].append(message.message_id)
+            self._retain(message)
 
         # Queue for recipients
         for agent_id in message.to_agents:
-            if agent_id not in self.agent_queues:
-                self.agent_queues[agent_id] = []
-            self.agent_queues[agent_id].append(message.message_id)
+            mailbox = self._get_mailbox(agent_id)
+            if mailbox.full():
+                mailbox.get_nowait()
+                self.dropped_messages += 1
+                self.logger.warning(f"Mailbox for {agent_id} full, dropped oldest message")
+            mailbox.put_nowait(message)
 
             # Notify subscribers
-            if agent_id in self.subscribers:
-                for callback in self.subscribers[agent_id]:
-                    await callback(message)
-
-    async def receive(self, agent_id: str) -> Optional[AgentMessage]:
-        """Receive next message for agent"""
-        if agent_id not in self.agent_queues or not self.agent_queues[agent_id]:
+            for subscription in self.subscribers.get(agent_id, []):
+                self._dispatch(subscription, message)
+
+    async def receive(
+        self,
+        agent_id: str,
+        timeout: Optional[float] = 0
+    ) -> Optional[AgentMessage]:
+        """
+        Receive next message for agent
+
+        Args:
+            agent_id: Recipient agent
+            timeout: Seconds to wait for a message; 0 returns immediately
+                and None waits indefinitely
+
+        Returns:
+            Next message, or None if none arrived in time
+        """
+        mailbox = self._get_mailbox(agent_id)
+        if timeout == 0:
+            return None if mailbox.empty() else mailbox.get_nowait()
+
+        try:
+            return await asyncio.wait_for(mailbox.get(), timeout=timeout)
+        except asyncio.TimeoutError:
             return None
 
-        message_id = self.agent_queues[agent_id].pop(0)
-        return self.messages.get(message_id)
+    async def ack(self, agent_id: str, message: AgentMessage) -> None:
+        """
+        Acknowledge a received message
+
+        In-process mailboxes hand each message out exactly once, so this is a
+        no-op; distributed backends use it to stop redelivery.
+        """
 
-    def subscribe(self, agent_id: str, callback: callable) -> None:
+    def subscribe(
+        self,
+        agent_id: str,
+        callback: Callable[[AgentMessage], Awaitable[None]]
+    ) -> None:
         """Subscribe to messages for agent"""
         if agent_id not in self.subscribers:
             self.subscribers[agent_id] = []
-        self.subscribers[agent_id].append(callback)
+        self.subscribers[agent_id].append(
+            _Subscription(callback, self.max_pending_callbacks)
+        )
+
+    def unsubscribe(
+        self,
+        agent_id: str,
+        callback: Callable[[AgentMessage], Awaitable[None]]
+    ) -> None:
+        """Remove a subscription and stop its worker"""
+        remaining = []
+        for subscription in self.subscribers.get(agent_id, []):
+            if subscription.callback == callback:
+                if subscription.worker:
+                    subscription.worker.cancel()
+            else:
+                remaining.append(subscription)
+        self.subscribers[agent_id] = remaining
 
     def get_conversation(self, conversation_id: str) -> List[AgentMessage]:
-        """Get all messages in a conversation"""
-        if conversation_id not in self.conversations:
+        """Get all retained messages in a conversation"""
+        self._evict_expired()
+        conversation = self.conversations.get(conversation_id)
+        if not conversation:
             return []
 
         return [
             self.messages[msg_id]
-            for msg_id in self.conversations[conversation_id]
+            for msg_id in conversation.message_ids
             if msg_id in self.messages
         ]
 
     def get_evidence_trail(self, conversation_id: str) -> List[Evidence]:
-        """Get all evidence from a conversation"""
-        messages = self.get_conversation(conversation_id)
-        evidence = []
-        seen_ids = set()
-
-        for msg in messages:
-            for e in msg.evidence:
-                if e.id not in seen_ids:
-                    evidence.append(e)
-                    seen_ids.add(e.id)
-
-        return evidence
+        """Get all evidence from a conversation, in first-seen order"""
+        self._evict_expired()
+        conversation = self.conversations.get(conversation_id)
+        if not conversation:
+            return []
+
+        return list(conversation.evidence.values())
+
+    async def join(self) -> None:
+        """Wait until every queued subscriber callback has run"""
+        for subscriptions in self.subscribers.values():
+            for subscription in subscriptions:
+                await subscription.queue.join()
+
+    async def close(self) -> None:
+        """Stop subscriber workers"""
+        workers = [
+            subscription.worker
+            for subscriptions in self.subscribers.values()
+            for subscription in subscriptions
+            if subscription.worker
+        ]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bus statistics"""
+        return {
+            "retained_messages": len(self.messages),
+            "conversations": len(self.conversations),
+            "queued_messages": sum(q.qsize() for q in self.agent_queues.values()),
+            "dropped_messages": self.dropped_messages,
+            "pending_callbacks": sum(
+                s.queue.qsize() for subs in self.subscribers.values() for s in subs
+            ),
+            "dropped_callbacks": sum(
+                s.dropped for subs in self.subscribers.values() for s in subs
+            )
+        }
+
+    def _get_mailbox(self, agent_id: str) -> "asyncio.Queue[AgentMessage]":
+        """Get or create an agent's mailbox"""
+        if agent_id not in self.agent_queues:
+            self.agent_queues[agent_id] = asyncio.Queue(maxsize=self.mailbox_size)
+        return self.agent_queues[agent_id]
+
+    def _retain(self, message: AgentMessage) -> None:
+        """Add a message to its conversation and index its evidence"""
+        if message.message_id in self.messages:
+            return
+
+        conversation = self.conversations.get(message.conversation_id)
+        if conversation is None:
+            conversation = self.conversations[message.conversation_id] = _Conversation()
+        else:
+            self.conversations.move_to_end(message.conversation_id)
+        conversation.last_activity = time.monotonic()
+
+        self.messages[message.message_id] = message
+        conversation.message_ids.append(message.message_id)
+        if len(conversation.message_ids) > self.max_messages_per_conversation:
+            self.messages.pop(conversation.message_ids.popleft(), None)
+
+        for e in message.evidence:
+            conversation.evidence.setdefault(e.id, e)
+
+        self._evict_expired()
+        while len(self.conversations) > self.max_conversations:
+            self._evict_oldest()
+
+    def _evict_expired(self) -> None:
+        """Evict conversations idle for longer than the TTL"""
+        cutoff = time.monotonic() - self.conversation_ttl_seconds
+        while self.conversations:
+            oldest = next(iter(self.conversations.values()))
+            if oldest.last_activity >= cutoff:
+                break
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        """Evict the least recently active conversation"""
+        _, conversation = self.conversations.popitem(last=False)
+        for msg_id in conversation.message_ids:
+            self.messages.pop(msg_id, None)
+
+    def _dispatch(self, subscription: _Subscription, message: AgentMessage) -> None:
+        """Queue a message for a subscriber without blocking the sender"""
+        if subscription.worker is None or subscription.worker.done():
+            subscription.worker = asyncio.create_task(self._run_subscriber(subscription))
+
+        if subscription.queue.full():
+            subscription.queue.get_nowait()
+            subscription.queue.task_done()
+            subscription.dropped += 1
+            self.logger.warning("Subscriber queue full, dropped oldest message")
+        subscription.queue.put_nowait(message)
+
+    async def _run_subscriber(self, subscription: _Subscription) -> None:
+        """Deliver queued messages to a subscriber in order"""
+        while True:
+            message = await subscription.queue.get()
+            try:
+                await subscription.callback(message)
+            except Exception as e:
+                self.logger.error(f"Subscriber callback failed: {e}")
+            finally:
+                subscription.queue.task_done()
@@ -0,0 +1,318 @@
+"""
+Redis Streams Message Bus
+
+Distributed MessageBus backend so agents in different processes (Temporal
+workers, API pods) can exchange messages. Each agent has an inbox stream with
+one consumer group; every process hosting that agent reads from the group as
+its own consumer, so each message is handled once across the fleet.
+
+receive() acknowledges messages as it hands them out, like the in-process
+MessageBus. With ``explicit_ack`` they stay pending until ack(), and entries
+another consumer left pending (e.g. it crashed) are reclaimed after
+``claim_idle_ms``. Subscriber listeners always ack after their callbacks.
+"""
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict, deque
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+
+from .protocol import AgentMessage, MessageBus
+
+
+def _decode(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class RedisStreamMessageBus(MessageBus):
+    """
+    MessageBus backed by Redis Streams
+
+    Features:
+    - One inbox stream and consumer group per agent
+    - Batched XREADGROUP with a local prefetch buffer
+    - Ack on receive, or explicit acks with reclaim of entries other
+      consumers left pending
+    - Compact JSON built on AgentMessage.to_dict/from_dict
+    - Conversation and evidence tracking inherited from MessageBus
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        prefix: str = "agents",
+        consumer_name: Optional[str] = None,
+        batch_size: int = 50,
+        stream_maxlen: int = 10000,
+        claim_idle_ms: int = 60000,
+        listen_block_ms: int = 5000,
+        explicit_ack: bool = False,
+        max_unacked: int = 10000,
+        **kwargs
+    ):
+        """
+        Initialize Redis Streams message bus
+
+        Args:
+            redis_client: redis.asyncio client
+            prefix: Key prefix for inbox streams
+            consumer_name: Consumer name within each group (host and pid by default)
+            batch_size: Entries fetched per XREADGROUP/XAUTOCLAIM call
+            stream_maxlen: Approximate maximum entries kept per inbox stream
+            claim_idle_ms: Entries other consumers left pending this long
+                are reclaimed
+            listen_block_ms: How long subscriber listeners block per read;
+                0 polls instead of blocking
+            explicit_ack: Keep messages from receive() pending until ack(),
+                for at-least-once delivery across processes
+            max_unacked: Received messages remembered for ack(); beyond
+                this the oldest are forgotten and left for reclaim
+            **kwargs: MessageBus retention and backpressure settings
+        """
+        super().__init__(**kwargs)
+        self.redis = redis_client
+        self.prefix = prefix
+        self.consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.stream_maxlen = stream_maxlen
+        self.claim_idle_ms = claim_idle_ms
+        self.listen_block_ms = listen_block_ms
+        self.explicit_ack = explicit_ack
+        self.max_unacked = max_unacked
+
+        self._groups: Set[str] = set()
+        self._buffers: Dict[str, Deque[Tuple[str, AgentMessage]]] = {}
+        self._entry_ids: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._next_reclaim: Dict[str, float] = {}
+        self._listeners: Dict[str, asyncio.Task] = {}
+        self._closing = False
+        self.logger = logging.getLogger("RedisStreamMessageBus")
+
+    def _stream_key(self, agent_id: str) -> str:
+        """Inbox stream key for an agent"""
+        return f"{self.prefix}:inbox:{agent_id}"
+
+    @staticmethod
+    def serialize(message: AgentMessage) -> str:
+        """Encode a message as compact JSON"""
+        return json.dumps(message.to_dict(), separators=(",", ":"), default=str)
+
+    @staticmethod
+    def deserialize(data) -> AgentMessage:
+        """Decode a message produced by serialize"""
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        return AgentMessage.from_dict(json.loads(data))
+
+    async def _ensure_group(self, agent_id: str) -> None:
+        """Create the agent's stream and consumer group if needed"""
+        if agent_id in self._groups:
+            return
+
+        try:
+            await self.redis.xgroup_create(
+                self._stream_key(agent_id), agent_id, id="0", mkstream=True
+            )
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._groups.add(agent_id)
+
+    async def send(self, message: AgentMessage) -> None:
+        """Send message to recipients' inbox streams"""
+        if message.conversation_id:
+            self._retain(message)
+
+        for agent_id in message.to_agents:
+            await self._ensure_group(agent_id)
+
+        payload = {"m": self.serialize(message)}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for agent_id in message.to_agents:
+                pipe.xadd(
+                    self._stream_key(agent_id),
+                    payload,
+                    maxlen=self.stream_maxlen,
+                    approximate=True
+                )
+            await pipe.execute()
+
+    async def receive(
+        self,
+        agent_id: str,
+        timeout: Optional[float] = 0
+    ) -> Optional[AgentMessage]:
+        """
+        Receive next message for agent
+
+        The message is acknowledged on receipt, or with explicit_ack stays
+        pending until ack() is called for it.
+
+        Args:
+            agent_id: Recipient agent
+            timeout: Seconds to block for a message; 0 returns immediately
+                and None blocks indefinitely
+
+        Returns:
+            Next message, or None if none arrived in time
+        """
+        entry = await self._next(agent_id, timeout)
+        if entry is None:
+            return None
+
+        entry_id, message = entry
+        if not self.explicit_ack:
+            await self.redis.xack(self._stream_key(agent_id), agent_id, entry_id)
+            return message
+
+        self._entry_ids[(agent_id, message.message_id)] = entry_id
+        if len(self._entry_ids) > self.max_unacked:
+            (_, forgotten), _ = self._entry_ids.popitem(last=False)
+            self.logger.warning(
+                f"Over {self.max_unacked} unacked messages, forgetting {forgotten}"
+            )
+        return message
+
+    async def _next(
+        self,
+        agent_id: str,
+        timeout: Optional[float]
+    ) -> Optional[Tuple[str, AgentMessage]]:
+        """Next buffered or fetched entry, unacknowledged"""
+        buffer = self._buffers.setdefault(agent_id, deque())
+        if not buffer:
+            await self._fill(agent_id, buffer, timeout)
+        if not buffer:
+            return None
+
+        entry_id, message = buffer.popleft()
+        if message.conversation_id:
+            self._retain(message)
+        return entry_id, message
+
+    async def ack(self, agent_id: str, message: AgentMessage) -> None:
+        """Acknowledge a message received with explicit_ack so it is not redelivered"""
+        entry_id = self._entry_ids.pop((agent_id, message.message_id), None)
+        if entry_id:
+            await self.redis.xack(self._stream_key(agent_id), agent_id, entry_id)
+
+    async def _fill(
+        self,
+        agent_id: str,
+        buffer: Deque[Tuple[str, AgentMessage]],
+        timeout: Optional[float]
+    ) -> None:
+        """Fetch a batch of reclaimed or new entries into the local buffer"""
+        await self._ensure_group(agent_id)
+        stream = self._stream_key(agent_id)
+
+        # Take over entries left pending by other consumers that stopped
+        # acking; this consumer's own pending entries are awaiting ack()
+        now = time.monotonic()
+        if now >= self._next_reclaim.get(agent_id, 0.0):
+            self._next_reclaim[agent_id] = now + self.claim_idle_ms / 1000
+            pending = await self.redis.xpending_range(
+                stream,
+                agent_id,
+                min="-",
+                max="+",
+                count=self.batch_size,
+                idle=self.claim_idle_ms
+            )
+            stale = [
+                entry["message_id"] for entry in pending
+                if _decode(entry["consumer"]) != self.consumer_name
+            ]
+            if stale:
+                entries = await self.redis.xclaim(
+                    stream, agent_id, self.consumer_name, self.claim_idle_ms, stale
+                )
+                # Entries trimmed from the stream come back without fields
+                self._buffer_entries(
+                    stream, agent_id, [e for e in entries if e and e[1]], buffer
+                )
+                if buffer:
+                    return
+
+        block = None if timeout == 0 else int((timeout or 0) * 1000)
+        response = await self.redis.xreadgroup(
+            agent_id,
+            self.consumer_name,
+            {stream: ">"},
+            count=self.batch_size,
+            block=block
+        )
+        for _, entries in response or []:
+            self._buffer_entries(stream, agent_id, entries, buffer)
+
+    def _buffer_entries(
+        self,
+        stream: str,
+        agent_id: str,
+        entries: List[Tuple[Any, Dict]],
+        buffer: Deque[Tuple[str, AgentMessage]]
+    ) -> None:
+        """Decode stream entries, discarding ones that cannot be parsed"""
+        for entry_id, fields in entries:
+            entry_id = _decode(entry_id)
+            data = fields.get(b"m", fields.get("m")) if fields else None
+            try:
+                buffer.append((entry_id, self.deserialize(data)))
+            except Exception as e:
+                # Ack poison entries so they are not reclaimed forever
+                self.logger.error(f"Dropping undecodable entry {entry_id} on {stream}: {e}")
+                asyncio.ensure_future(self.redis.xack(stream, agent_id, entry_id))
+
+    def subscribe(
+        self,
+        agent_id: str,
+        callback: Callable[[AgentMessage], Awaitable[None]]
+    ) -> None:
+        """
+        Subscribe to messages for agent
+
+        Starts a listener that reads the agent's inbox, runs every callback
+        and then acks, so messages are redelivered if the process dies first.
+        """
+        super().subscribe(agent_id, callback)
+        if agent_id not in self._listeners or self._listeners[agent_id].done():
+            self._listeners[agent_id] = asyncio.create_task(self._listen(agent_id))
+
+    async def _listen(self, agent_id: str) -> None:
+        """Deliver inbox messages to local subscribers"""
+        while not self._closing:
+            try:
+                entry = await self._next(agent_id, timeout=self.listen_block_ms / 1000)
+                if entry is None:
+                    await asyncio.sleep(0 if self.listen_block_ms else 0.05)
+                    continue
+                entry_id, message = entry
+
+                results = await asyncio.gather(
+                    *[s.callback(message) for s in self.subscribers.get(agent_id, [])],
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Subscriber callback failed: {result}")
+                await self.redis.xack(self._stream_key(agent_id), agent_id, entry_id)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Inbox listener for {agent_id} failed: {e}")
+                await asyncio.sleep(1.0)
+
+    async def close(self) -> None:
+        """Stop inbox listeners and subscriber workers"""
+        # The flag also stops listeners whose cancellation a client call absorbs
+        self._closing = True
+        listeners = list(self._listeners.values())
+        for listener in listeners:
+            listener.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+        self._listeners.clear()
+        await super().close()
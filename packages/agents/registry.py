@@ -4,16 +4,17 @@ Agent Registry
 Manages agent lifecycle, discovery, orchestration, capability tracking,
 status monitoring, and load balancing for all agents in the system.
 """
-from typing import Dict, List, Optional, Type, Any
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, deque
 from enum import Enum
 
 from .base import BaseAgent, Task, Context, AgentResult, TaskType, AgentStatus
 from .protocol import AgentState, MessageBus
+from .pool import AgentPool
 
 
 class AgentCapability(str, Enum):
@@ -89,6 +90,7 @@ class AgentRegistry:
     - Capability-based agent selection
     - Load balancing
     - Health monitoring
+    - Per-agent instance pools bounded by max_concurrent_tasks
     """
 
     def __init__(
@@ -97,7 +99,8 @@ class AgentRegistry:
         anthropic_client=None,
         openai_client=None,
         redis_client=None,
-        message_bus: Optional[MessageBus] = None
+        message_bus: Optional[MessageBus] = None,
+        acquire_timeout: float = 30.0
     ):
         """
         Initialize agent registry
@@ -107,16 +110,20 @@ class AgentRegistry:
             anthropic_client: Anthropic API client
             openai_client: OpenAI API client
             redis_client: Redis client for distributed state
-            message_bus: Message bus for agent communication
+            message_bus: Message bus for agent communication (in-process by
+                default); pass a RedisStreamMessageBus to share messages
+                across processes
+            acquire_timeout: Seconds to wait for a pooled agent instance
         """
         self.moe_router = moe_router
         self.anthropic_client = anthropic_client
         self.openai_client = openai_client
         self.redis_client = redis_client
-        self.message_bus = message_bus or MessageBus()
+        self.message_bus = message_bus if message_bus is not None else MessageBus()
+        self.acquire_timeout = acquire_timeout
 
         self.registrations: Dict[str, AgentRegistration] = {}
-        self.instances: Dict[str, BaseAgent] = {}
+        self.pools: Dict[str, AgentPool] = {}
         self.agent_states: Dict[str, AgentState] = {}
         self.capability_index: Dict[AgentCapability, set] = defaultdict(set)
 
@@ -167,6 +174,16 @@ class AgentRegistry:
 
         self.registrations[agent_id] = registration
 
+        # Replace any previous pool; leased instances finish on their own
+        if agent_id in self.pools:
+            self.pools[agent_id].close()
+        self.pools[agent_id] = AgentPool(
+            agent_id,
+            factory=lambda: self._create_agent(agent_id),
+            max_size=max_concurrent_tasks,
+            acquire_timeout=self.acquire_timeout
+        )
+
         # Update capability index
         for cap in capabilities or []:
             self.capability_index[cap].add(agent_id)
@@ -188,29 +205,49 @@ class AgentRegistry:
             del self.registrations[agent_id]
             self.logger.info(f"Unregistered agent {agent_id}")
 
-        if agent_id in self.instances:
-            del self.instances[agent_id]
+        if agent_id in self.pools:
+            self.pools.pop(agent_id).close()
 
     def get_agent(
         self,
         agent_id: str,
+        task_id: Optional[str] = None,
         **kwargs
     ) -> Optional[BaseAgent]:
         """
-        Get or create agent instance
+        Get an agent instance
 
         Args:
             agent_id: Agent identifier
+            task_id: Return the pooled instance leased to this task
             **kwargs: Additional initialization arguments
 
         Returns:
-            Agent instance or None
+            The leased instance if task_id holds one, otherwise a new
+            standalone instance outside the pool, or None
         """
-        # Return existing instance if available
-        if agent_id in self.instances:
-            return self.instances[agent_id]
+        if task_id is not None and agent_id in self.pools:
+            leased = self.pools[agent_id].get_leased(task_id)
+            if leased:
+                return leased
 
-        # Create new instance
+        return self._create_agent(agent_id, **kwargs)
+
+    def _create_agent(
+        self,
+        agent_id: str,
+        **kwargs
+    ) -> Optional[BaseAgent]:
+        """
+        Create a new agent instance
+
+        Args:
+            agent_id: Agent identifier
+            **kwargs: Additional initialization arguments
+
+        Returns:
+            Agent instance or None
+        """
         if agent_id not in self.registrations:
             self.logger.error(f"Agent {agent_id} not registered")
             return None
@@ -228,7 +265,6 @@ class AgentRegistry:
             }
 
             agent = registration.agent_class(**init_kwargs)
-            self.instances[agent_id] = agent
 
             self.logger.info(f"Created instance of {agent_id}")
             return agent
@@ -345,69 +381,226 @@ class AgentRegistry:
         if not agent_id:
             return None
 
-        # Get agent instance
-        agent = self.get_agent(agent_id)
-        if not agent:
+        return await self._execute_on_agent(agent_id, task, context)
+
+    async def _execute_on_agent(
+        self,
+        agent_id: str,
+        task: Task,
+        context: Context
+    ) -> Optional[AgentResult]:
+        """
+        Execute task on a pooled instance of a specific agent
+
+        Args:
+            agent_id: Agent to run the task on
+            task: Task to execute
+            context: Execution context
+
+        Returns:
+            AgentResult or None if no instance could be acquired
+        """
+        # Use the instance already leased to this task, or lease one for the call
+        pool = self.pools[agent_id]
+        agent = pool.get_leased(task.id)
+        if agent:
+            return await agent.execute_with_tracking(task, context)
+
+        if not await self.acquire_agent(agent_id, task.id):
             return None
 
-        # Execute task
-        result = await agent.execute_with_tracking(task, context)
+        result = None
+        try:
+            result = await pool.get_leased(task.id).execute_with_tracking(task, context)
+        finally:
+            await self.release_agent(
+                agent_id,
+                task.id,
+                bool(result and result.success),
+                (result.execution_time_ms or 0) if result else 0
+            )
 
         return result
 
+    async def select_agent(self, task: Task) -> Optional[str]:
+        """
+        Select the least-loaded agent for a task
+
+        Agents matching the task's required_capabilities metadata are tried
+        first, via find_agents_by_capability; otherwise agents registered for
+        the task type are ranked by load, then priority.
+
+        Args:
+            task: Task to route
+
+        Returns:
+            Agent ID or None
+        """
+        for cap_name in task.metadata.get("required_capabilities", []):
+            try:
+                capability = AgentCapability(cap_name)
+            except ValueError:
+                continue
+            agents = await self.find_agents_by_capability(capability, only_available=True)
+            if agents:
+                return agents[0]
+
+        candidates = self.find_agents(task_type=task.type, enabled_only=True)
+        if not candidates:
+            self.logger.warning(f"No agents found for task type {task.type.value}")
+            return None
+
+        # Prefer agents with free capacity, then lowest load, then priority
+        return min(
+            candidates,
+            key=lambda aid: (
+                not self.registrations[aid].is_available(),
+                self.registrations[aid].current_load,
+                -self.registrations[aid].priority
+            )
+        )
+
     async def execute_workflow(
         self,
         tasks: List[Task],
         context: Context,
-        parallel: bool = False
+        parallel: bool = False,
+        max_concurrency: int = 10
     ) -> List[AgentResult]:
         """
         Execute workflow of multiple tasks
 
+        Tasks wait for their dependencies rather than being skipped; tasks
+        whose dependencies fail or are outside the workflow are skipped.
+
         Args:
             tasks: List of tasks to execute
             context: Shared execution context
-            parallel: Execute tasks in parallel (if no dependencies)
+            parallel: Run independent tasks concurrently (one at a time if False)
+            max_concurrency: Maximum tasks running at once when parallel
 
         Returns:
-            List of AgentResults
+            List of AgentResults in completion order
         """
         results = []
-        completed_task_ids = set()
-
-        if parallel:
-            # Execute all tasks in parallel
-            import asyncio
-            async_results = await asyncio.gather(
-                *[self.execute_task(task, context) for task in tasks],
-                return_exceptions=True
-            )
-            results = [r for r in async_results if isinstance(r, AgentResult)]
-        else:
-            # Execute tasks sequentially, respecting dependencies
-            for task in tasks:
-                # Check dependencies
-                if task.dependencies:
-                    missing = set(task.dependencies) - completed_task_ids
-                    if missing:
-                        self.logger.warning(
-                            f"Task {task.id} has missing dependencies: {missing}, skipping"
-                        )
-                        continue
-
-                result = await self.execute_task(task, context)
-                if result:
-                    results.append(result)
-                    if result.success:
-                        completed_task_ids.add(task.id)
+        async for _, result in self.stream_workflow(
+            tasks,
+            context,
+            max_concurrency=max_concurrency if parallel else 1
+        ):
+            if result:
+                results.append(result)
 
         return results
 
+    async def stream_workflow(
+        self,
+        tasks: List[Task],
+        context: Context,
+        max_concurrency: int = 10
+    ) -> AsyncIterator[Tuple[Task, Optional[AgentResult]]]:
+        """
+        Execute a task dependency graph, yielding results as tasks complete
+
+        Each task starts as soon as its dependencies have succeeded. At most
+        max_concurrency tasks run at once, and each agent's instance pool
+        bounds how many of them run on the same agent.
+
+        Args:
+            tasks: Tasks to execute
+            context: Shared execution context
+            max_concurrency: Maximum tasks running at once
+
+        Yields:
+            (task, result) pairs in completion order; result is None when the
+            task could not be routed or executed
+        """
+        by_id = {task.id: task for task in tasks}
+        dependents: Dict[str, List[str]] = {task.id: [] for task in tasks}
+        in_degree: Dict[str, int] = {}
+        skipped: set = set()
+
+        for task in tasks:
+            deps = set(task.dependencies)
+            missing = deps - by_id.keys()
+            if missing:
+                self.logger.warning(
+                    f"Task {task.id} has missing dependencies: {missing}, skipping"
+                )
+                skipped.add(task.id)
+            for dep in deps - missing:
+                dependents[dep].append(task.id)
+            in_degree[task.id] = len(deps - missing)
+
+        def skip_dependents(task_id: str) -> None:
+            stack = list(dependents[task_id])
+            while stack:
+                dependent = stack.pop()
+                if dependent not in skipped:
+                    self.logger.warning(
+                        f"Skipping task {dependent}: dependency {task_id} did not succeed"
+                    )
+                    skipped.add(dependent)
+                    stack.extend(dependents[dependent])
+
+        for task_id in list(skipped):
+            skip_dependents(task_id)
+
+        ready = deque(
+            task.id for task in tasks
+            if in_degree[task.id] == 0 and task.id not in skipped
+        )
+        running: Dict[asyncio.Task, str] = {}
+
+        async def run(task: Task) -> Optional[AgentResult]:
+            agent_id = await self.select_agent(task)
+            if not agent_id:
+                return None
+            return await self._execute_on_agent(agent_id, task, context)
+
+        try:
+            while ready or running:
+                while ready and len(running) < max_concurrency:
+                    task_id = ready.popleft()
+                    running[asyncio.create_task(run(by_id[task_id]))] = task_id
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    task_id = running.pop(finished)
+                    if finished.exception() is not None:
+                        self.logger.error(
+                            f"Task {task_id} failed: {finished.exception()}"
+                        )
+                        result = None
+                    else:
+                        result = finished.result()
+
+                    if result and result.success:
+                        for dependent in dependents[task_id]:
+                            in_degree[dependent] -= 1
+                            if in_degree[dependent] == 0 and dependent not in skipped:
+                                ready.append(dependent)
+                    else:
+                        skip_dependents(task_id)
+
+                    yield by_id[task_id], result
+        finally:
+            # Consumer stopped early; don't leave tasks holding agent instances
+            for pending in running:
+                pending.cancel()
+
+        unreached = [
+            task.id for task in tasks
+            if task.id not in skipped and in_degree[task.id] > 0
+        ]
+        if unreached:
+            self.logger.warning(f"Circular dependencies, skipped tasks: {unreached}")
+
     def get_registry_stats(self) -> Dict[str, Any]:
         """Get registry statistics"""
         total_registered = len(self.registrations)
         enabled = sum(1 for r in self.registrations.values() if r.enabled)
-        instances = len(self.instances)
+        instances = sum(len(pool.instances) for pool in self.pools.values())
 
         # Task type coverage
         task_type_coverage = {}
@@ -417,17 +610,22 @@ class AgentRegistry:
 
         # Agent stats
         agent_stats = {}
-        for agent_id, agent in self.instances.items():
-            agent_stats[agent_id] = agent.get_stats()
+        for agent_id, pool in self.pools.items():
+            agent_stats[agent_id] = [agent.get_stats() for agent in pool.instances]
 
         return {
             "total_registered": total_registered,
             "enabled": enabled,
             "active_instances": instances,
             "task_type_coverage": task_type_coverage,
-            "agent_stats": agent_stats
+            "agent_stats": agent_stats,
+            "pool_stats": self.get_pool_stats()
         }
 
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get instance pool utilization per agent"""
+        return {agent_id: pool.get_stats() for agent_id, pool in self.pools.items()}
+
     def list_agents(self) -> List[Dict[str, Any]]:
         """List all registered agents"""
         return [
@@ -438,11 +636,18 @@ class AgentRegistry:
                 "priority": reg.priority,
                 "enabled": reg.enabled,
                 "tags": reg.tags,
-                "status": self.instances[reg.agent_id].status.value if reg.agent_id in self.instances else "not_instantiated"
+                "status": self._pool_status(reg.agent_id)
             }
             for reg in self.registrations.values()
         ]
 
+    def _pool_status(self, agent_id: str) -> str:
+        """Summarize pool state as an agent status"""
+        pool = self.pools.get(agent_id)
+        if not pool or not pool.instances:
+            return "not_instantiated"
+        return AgentStatus.RUNNING.value if pool.in_use else AgentStatus.IDLE.value
+
     def enable_agent(self, agent_id: str):
         """Enable an agent"""
         if agent_id in self.registrations:
@@ -497,14 +702,20 @@ class AgentRegistry:
     async def acquire_agent(
         self,
         agent_id: str,
-        task_id: str
+        task_id: str,
+        timeout: Optional[float] = None
     ) -> bool:
         """
-        Acquire agent for a task
+        Acquire a pooled agent instance for a task
+
+        Waits for a free instance when all max_concurrent_tasks instances are
+        leased. The leased instance is returned by get_agent(agent_id, task_id)
+        and used by execute_task until release_agent is called.
 
         Args:
             agent_id: Agent to acquire
             task_id: Task ID
+            timeout: Seconds to wait for a free instance (registry default if None)
 
         Returns:
             True if acquired successfully
@@ -514,11 +725,15 @@ class AgentRegistry:
 
         agent = self.registrations[agent_id]
 
-        if not agent.is_available():
+        if not agent.enabled:
             return False
 
-        # Increment load
-        agent.current_load += 1
+        instance = await self.pools[agent_id].acquire(task_id, timeout=timeout)
+        if instance is None:
+            return False
+
+        # Track load
+        agent.current_load = self.pools[agent_id].in_use
         agent.last_heartbeat = datetime.utcnow()
 
         # Update state
@@ -556,8 +771,10 @@ class AgentRegistry:
 
         agent = self.registrations[agent_id]
 
-        # Decrement load
-        agent.current_load = max(0, agent.current_load - 1)
+        # Return instance to the pool
+        pool = self.pools[agent_id]
+        pool.release(task_id)
+        agent.current_load = pool.in_use
 
         # Update statistics
         agent.update_stats(success, execution_time_ms)
@@ -565,8 +782,9 @@ class AgentRegistry:
         # Update state
         if agent_id in self.agent_states:
             state = self.agent_states[agent_id]
-            state.current_task_id = None
-            state.status = "idle"
+            if pool.in_use == 0:
+                state.current_task_id = None
+                state.status = "idle"
             state.last_updated = datetime.utcnow()
 
         self.logger.info(
@@ -581,6 +799,10 @@ class AgentRegistry:
 
     async def stop(self) -> None:
         """Stop registry background tasks"""
+        for pool in self.pools.values():
+            pool.close()
+        await self.message_bus.close()
+
         if self._heartbeat_task:
             self._heartbeat_task.cancel()
             try:
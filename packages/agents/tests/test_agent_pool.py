@@ -0,0 +1,160 @@
+"""
+Unit tests for agent instance pools
+"""
+import asyncio
+
+from packages.agents.base import AgentResult, AgentStatus, Task, TaskType
+from packages.agents.pool import AgentPool
+from packages.agents.tests.conftest import MockAgent
+
+
+class SlowAgent(MockAgent):
+    """Mock agent that records which instance ran which task"""
+
+    def __init__(self, **kwargs):
+        super().__init__(task_type=TaskType.CODE_GENERATION, **kwargs)
+
+    async def execute(self, task, context):
+        await asyncio.sleep(0.01)
+        return AgentResult(
+            success=True,
+            output={"instance": id(self), "task_id": task.id},
+            evidence=[]
+        )
+
+
+def make_pool(max_size=2, acquire_timeout=1.0):
+    """Create a pool of mock agents"""
+    return AgentPool(
+        "test-agent",
+        factory=lambda: MockAgent(agent_id="test-agent", task_type=TaskType.CODE_GENERATION),
+        max_size=max_size,
+        acquire_timeout=acquire_timeout
+    )
+
+
+def make_task(task_id):
+    """Create a code generation task"""
+    return Task(
+        id=task_id,
+        type=TaskType.CODE_GENERATION,
+        description=task_id,
+        input_data={}
+    )
+
+
+class TestAgentPool:
+    """Test pool leasing"""
+
+    async def test_leases_are_exclusive(self):
+        """Test that concurrent leases get distinct instances"""
+        pool = make_pool(max_size=2)
+
+        first = await pool.acquire("task-1")
+        second = await pool.acquire("task-2")
+
+        assert first is not second
+        assert pool.in_use == 2
+        assert await pool.acquire("task-1") is first
+
+    async def test_released_instance_is_reused(self):
+        """Test that released instances are reset and reused"""
+        pool = make_pool(max_size=2)
+        agent = await pool.acquire("task-1")
+        agent.status = AgentStatus.COMPLETED
+
+        assert pool.release("task-1") is True
+        assert pool.release("task-1") is False
+        assert agent.status == AgentStatus.IDLE
+        assert await pool.acquire("task-2") is agent
+        assert len(pool.instances) == 1
+
+    async def test_waiter_receives_released_instance(self):
+        """Test that an exhausted pool hands instances to waiters"""
+        pool = make_pool(max_size=1)
+        agent = await pool.acquire("task-1")
+
+        waiter = asyncio.create_task(pool.acquire("task-2"))
+        await asyncio.sleep(0)
+        assert pool.get_stats()["waiting"] == 1
+
+        pool.release("task-1")
+
+        assert await waiter is agent
+        assert pool.get_leased("task-2") is agent
+
+    async def test_acquire_times_out(self):
+        """Test that waiting is bounded by the timeout"""
+        pool = make_pool(max_size=1)
+        await pool.acquire("task-1")
+
+        assert await pool.acquire("task-2", timeout=0.01) is None
+
+        stats = pool.get_stats()
+        assert stats["total_timeouts"] == 1
+        assert stats["waiting"] == 0
+        assert stats["utilization"] == 1.0
+
+
+class TestRegistryPools:
+    """Test registry integration"""
+
+    async def test_parallel_workflow_uses_separate_instances(self, agent_registry, sample_context):
+        """Test that parallel tasks never share an agent instance"""
+        agent_registry.register(
+            agent_id="test-agent",
+            agent_class=SlowAgent,
+            task_types=[TaskType.CODE_GENERATION],
+            description="Test agent",
+            max_concurrent_tasks=3
+        )
+
+        results = await agent_registry.execute_workflow(
+            [make_task(f"task-{i}") for i in range(3)],
+            sample_context,
+            parallel=True
+        )
+
+        assert len(results) == 3
+        assert len({r.output["instance"] for r in results}) == 3
+        stats = agent_registry.get_pool_stats()["test-agent"]
+        assert stats["in_use"] == 0
+        assert stats["peak_in_use"] == 3
+
+    async def test_pool_bounds_concurrency(self, agent_registry, sample_context):
+        """Test that extra tasks wait for an instance"""
+        agent_registry.register(
+            agent_id="test-agent",
+            agent_class=SlowAgent,
+            task_types=[TaskType.CODE_GENERATION],
+            description="Test agent",
+            max_concurrent_tasks=1
+        )
+
+        results = await agent_registry.execute_workflow(
+            [make_task(f"task-{i}") for i in range(3)],
+            sample_context,
+            parallel=True
+        )
+
+        assert len(results) == 3
+        assert len(agent_registry.pools["test-agent"].instances) == 1
+        assert agent_registry.registrations["test-agent"].total_tasks_completed == 3
+
+    async def test_execute_task_uses_acquired_instance(self, agent_registry, sample_context):
+        """Test that execute_task runs on the instance leased by acquire_agent"""
+        agent_registry.register(
+            agent_id="test-agent",
+            agent_class=SlowAgent,
+            task_types=[TaskType.CODE_GENERATION],
+            description="Test agent",
+            max_concurrent_tasks=2
+        )
+
+        assert await agent_registry.acquire_agent("test-agent", "task-1") is True
+        leased = agent_registry.get_agent("test-agent", task_id="task-1")
+        result = await agent_registry.execute_task(make_task("task-1"), sample_context)
+        await agent_registry.release_agent("test-agent", "task-1", True, 10)
+
+        assert result.output["instance"] == id(leased)
+        assert agent_registry.registrations["test-agent"].current_load == 0
@@ -0,0 +1,148 @@
+"""
+Unit tests for the agent MessageBus
+"""
+import asyncio
+
+from packages.agents.protocol import AgentMessage, Evidence, MessageBus
+
+
+def make_message(to_agent="agent-b", conversation_id="conv-1", evidence=None):
+    """Create a request message"""
+    return AgentMessage.create_request(
+        from_agent="agent-a",
+        to_agent=to_agent,
+        payload={"n": 1},
+        evidence=evidence,
+        conversation_id=conversation_id
+    )
+
+
+class TestMailboxes:
+    """Test per-agent mailbox delivery"""
+
+    async def test_messages_are_received_in_order(self):
+        """Test FIFO delivery and non-blocking receive"""
+        bus = MessageBus()
+        first, second = make_message(), make_message()
+        await bus.send(first)
+        await bus.send(second)
+
+        assert await bus.receive("agent-b") is first
+        assert await bus.receive("agent-b") is second
+        assert await bus.receive("agent-b") is None
+
+    async def test_receive_waits_for_message(self):
+        """Test awaitable receive with timeout"""
+        bus = MessageBus()
+        message = make_message()
+
+        waiter = asyncio.create_task(bus.receive("agent-b", timeout=1.0))
+        await asyncio.sleep(0)
+        await bus.send(message)
+
+        assert await waiter is message
+        assert await bus.receive("agent-b", timeout=0.01) is None
+
+    async def test_full_mailbox_drops_oldest(self):
+        """Test that mailboxes are bounded"""
+        bus = MessageBus(mailbox_size=2)
+        messages = [make_message() for _ in range(3)]
+        for message in messages:
+            await bus.send(message)
+
+        assert await bus.receive("agent-b") is messages[1]
+        assert bus.get_stats()["dropped_messages"] == 1
+
+
+class TestSubscribers:
+    """Test subscriber dispatch"""
+
+    async def test_slow_subscriber_does_not_block_sender(self):
+        """Test that send returns before a slow callback finishes"""
+        bus = MessageBus()
+        release = asyncio.Event()
+        delivered = []
+
+        async def slow_callback(message):
+            await release.wait()
+            delivered.append(message.message_id)
+
+        bus.subscribe("agent-b", slow_callback)
+        messages = [make_message() for _ in range(3)]
+
+        await asyncio.wait_for(
+            asyncio.gather(*[bus.send(m) for m in messages]), timeout=0.5
+        )
+        assert delivered == []
+
+        release.set()
+        await bus.join()
+
+        assert delivered == [m.message_id for m in messages]
+        await bus.close()
+
+    async def test_failing_subscriber_keeps_running(self):
+        """Test that callback errors are isolated"""
+        bus = MessageBus()
+        delivered = []
+
+        async def flaky_callback(message):
+            if not delivered:
+                delivered.append(None)
+                raise RuntimeError("boom")
+            delivered.append(message.message_id)
+
+        bus.subscribe("agent-b", flaky_callback)
+        await bus.send(make_message())
+        second = make_message()
+        await bus.send(second)
+        await bus.join()
+
+        assert delivered == [None, second.message_id]
+        await bus.close()
+
+
+class TestRetention:
+    """Test conversation retention and evidence indexing"""
+
+    async def test_evidence_trail_is_deduplicated(self):
+        """Test evidence indexed on insert"""
+        bus = MessageBus()
+        shared = Evidence(id="e1", source="test", description="shared")
+        other = Evidence(id="e2", source="test", description="other")
+        await bus.send(make_message(evidence=[shared]))
+        await bus.send(make_message(evidence=[shared, other]))
+
+        assert [e.id for e in bus.get_evidence_trail("conv-1")] == ["e1", "e2"]
+        assert len(bus.get_conversation("conv-1")) == 2
+
+    async def test_conversation_count_is_bounded(self):
+        """Test least recently active conversations are evicted"""
+        bus = MessageBus(max_conversations=2)
+        await bus.send(make_message(conversation_id="a"))
+        await bus.send(make_message(conversation_id="b"))
+        await bus.send(make_message(conversation_id="a"))
+        await bus.send(make_message(conversation_id="c"))
+
+        assert list(bus.conversations) == ["a", "c"]
+        assert bus.get_conversation("b") == []
+        assert len(bus.messages) == 3
+
+    async def test_messages_per_conversation_are_bounded(self):
+        """Test per-conversation message cap"""
+        bus = MessageBus(max_messages_per_conversation=2)
+        messages = [make_message() for _ in range(3)]
+        for message in messages:
+            await bus.send(message)
+
+        assert bus.get_conversation("conv-1") == messages[1:]
+        assert len(bus.messages) == 2
+
+    async def test_idle_conversations_expire(self):
+        """Test TTL eviction"""
+        bus = MessageBus(conversation_ttl_seconds=0.01)
+        await bus.send(make_message())
+        await asyncio.sleep(0.02)
+
+        assert bus.get_conversation("conv-1") == []
+        assert bus.messages == {}
@@ -0,0 +1,161 @@
+"""
+Unit tests for the Redis Streams MessageBus backend
+"""
+import asyncio
+
+import pytest
+
+from packages.agents.protocol import AgentMessage, Evidence, HandoffReason, HandoffRequest
+from packages.agents.redis_bus import RedisStreamMessageBus
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client():
+    """In-memory Redis shared by all bus instances in a test"""
+    return fakeredis.FakeAsyncRedis()
+
+
+def make_bus(redis_client, consumer_name, **kwargs):
+    """Create a bus acting as one process"""
+    return RedisStreamMessageBus(redis_client, consumer_name=consumer_name, **kwargs)
+
+
+def make_message(to_agent="agent-b", **kwargs):
+    """Create a request message"""
+    return AgentMessage.create_request(
+        from_agent="agent-a",
+        to_agent=to_agent,
+        payload={"n": 1},
+        **kwargs
+    )
+
+
+class TestRedisStreamMessageBus:
+    """Cross-process delivery through Redis Streams"""
+
+    async def test_round_trip_between_processes(self, redis_client):
+        """Test that a message sent in one process is received in another"""
+        sender = make_bus(redis_client, "pod-1")
+        receiver = make_bus(redis_client, "pod-2")
+        evidence = Evidence(id="e1", source="test", description="evidence")
+        message = make_message(evidence=[evidence], conversation_id="conv-1")
+
+        await sender.send(message)
+        received = await receiver.receive("agent-b")
+
+        assert received.to_dict() == message.to_dict()
+        assert [e.id for e in receiver.get_evidence_trail("conv-1")] == ["e1"]
+        assert await receiver.receive("agent-b") is None
+
+    async def test_handoff_requests_are_delivered(self, redis_client):
+        """Test protocol objects sent through their message form"""
+        bus = make_bus(redis_client, "pod-1")
+        handoff = HandoffRequest(
+            handoff_id="handoff-1",
+            from_agent="planner",
+            to_agent="codegen",
+            reason=HandoffReason.NEEDS_SPECIALIST,
+            context={"plan": "x"},
+            work_state={}
+        )
+
+        await bus.send(handoff.to_message())
+        received = await bus.receive("codegen")
+
+        assert received.from_agent == "planner"
+
+    async def test_each_message_goes_to_one_consumer(self, redis_client):
+        """Test consumer group load sharing across processes"""
+        await make_bus(redis_client, "pod-0").send(make_message())
+        consumers = [make_bus(redis_client, f"pod-{i}", batch_size=1) for i in range(2)]
+        for _ in range(3):
+            await consumers[0].send(make_message())
+
+        received = [
+            await consumers[0].receive("agent-b"),
+            await consumers[1].receive("agent-b"),
+            await consumers[0].receive("agent-b"),
+            await consumers[1].receive("agent-b"),
+        ]
+
+        assert len({m.message_id for m in received}) == 4
+
+    async def test_batched_reads_buffer_locally(self, redis_client):
+        """Test that one XREADGROUP serves several receives"""
+        bus = make_bus(redis_client, "pod-1", batch_size=10)
+        for _ in range(3):
+            await bus.send(make_message())
+
+        await bus.receive("agent-b")
+
+        assert len(bus._buffers["agent-b"]) == 2
+
+    async def test_receive_acks_by_default(self, redis_client):
+        """Test that receive() leaves nothing pending without explicit_ack"""
+        bus = make_bus(redis_client, "pod-1", claim_idle_ms=0)
+        await bus.send(make_message())
+
+        await bus.receive("agent-b")
+
+        pending = await redis_client.xpending(bus._stream_key("agent-b"), "agent-b")
+        assert pending["pending"] == 0
+        assert await bus.receive("agent-b") is None
+
+    async def test_own_pending_entries_are_not_reclaimed(self, redis_client):
+        """Test that an unacked message is not handed to its receiver again"""
+        bus = make_bus(redis_client, "pod-1", claim_idle_ms=0, explicit_ack=True)
+        await bus.send(make_message())
+
+        assert await bus.receive("agent-b") is not None
+        await asyncio.sleep(0.01)
+        assert await bus.receive("agent-b") is None
+
+    async def test_unacked_ids_are_bounded(self, redis_client):
+        """Test that messages never acked are eventually forgotten"""
+        bus = make_bus(redis_client, "pod-1", explicit_ack=True, max_unacked=2)
+        for _ in range(3):
+            await bus.send(make_message())
+
+        for _ in range(3):
+            await bus.receive("agent-b")
+
+        assert len(bus._entry_ids) == 2
+
+    async def test_unacked_messages_are_reclaimed(self, redis_client):
+        """Test that pending entries of a dead consumer are redelivered"""
+        crashed = make_bus(redis_client, "pod-1", claim_idle_ms=0, explicit_ack=True)
+        survivor = make_bus(redis_client, "pod-2", claim_idle_ms=0, explicit_ack=True)
+        message = make_message()
+        await crashed.send(message)
+
+        assert (await crashed.receive("agent-b")).message_id == message.message_id
+        await asyncio.sleep(0.01)
+        reclaimed = await survivor.receive("agent-b")
+
+        assert reclaimed.message_id == message.message_id
+        await survivor.ack("agent-b", reclaimed)
+        pending = await redis_client.xpending(survivor._stream_key("agent-b"), "agent-b")
+        assert pending["pending"] == 0
+
+    async def test_subscribers_receive_remote_messages(self, redis_client):
+        """Test subscriber listener delivery and ack"""
+        receiver = make_bus(redis_client, "pod-2", listen_block_ms=0)
+        delivered = asyncio.Event()
+        received = []
+
+        async def callback(message):
+            received.append(message.message_id)
+            delivered.set()
+
+        receiver.subscribe("agent-b", callback)
+        message = make_message()
+        await make_bus(redis_client, "pod-1").send(message)
+        await asyncio.wait_for(delivered.wait(), timeout=2.0)
+        await asyncio.sleep(0.05)
+
+        assert received == [message.message_id]
+        pending = await redis_client.xpending(receiver._stream_key("agent-b"), "agent-b")
+        assert pending["pending"] == 0
+        await receiver.close()
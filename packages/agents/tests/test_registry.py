@@ -11,6 +11,8 @@ from packages.agents.registry import (
     AgentCapability
 )
 from packages.agents.base import TaskType, Task, Context, Priority
+from packages.agents.protocol import MessageBus
+from packages.agents.redis_bus import RedisStreamMessageBus
 from packages.agents.tests.conftest import MockAgent
 
 
@@ -34,6 +36,15 @@ class TestAgentRegistryInitialization:
         assert registry.anthropic_client == mock_anthropic_client
         assert registry.openai_client == mock_openai_client
 
+    def test_redis_client_keeps_in_process_bus(self):
+        """Test that the Redis Streams bus is only used when passed in"""
+        redis_client = Mock()
+
+        assert type(AgentRegistry(redis_client=redis_client).message_bus) is MessageBus
+
+        bus = RedisStreamMessageBus(redis_client)
+        assert AgentRegistry(redis_client=redis_client, message_bus=bus).message_bus is bus
+
 
 class TestAgentRegistration:
     """Test agent registration"""
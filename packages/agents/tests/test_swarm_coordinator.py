@@ -0,0 +1,204 @@
+"""
+Unit tests for SwarmCoordinator DAG scheduling
+"""
+import asyncio
+
+import pytest
+
+from packages.agents.coordination.swarm_coordinator import (
+    SwarmCoordinator,
+    SwarmExecution,
+    SubTask,
+)
+from packages.agents.base import AgentResult, Task, TaskType
+
+
+def make_subtask(subtask_id, dependencies=(), complexity="medium"):
+    """Create a subtask with the given dependencies"""
+    return SubTask(
+        id=subtask_id,
+        parent_task_id="parent",
+        task=Task(
+            id=subtask_id,
+            type=TaskType.CODE_GENERATION,
+            description=subtask_id,
+            input_data={},
+            metadata={"estimated_complexity": complexity}
+        ),
+        dependencies=list(dependencies)
+    )
+
+
+def make_swarm(subtasks):
+    """Create a DAG swarm execution"""
+    return SwarmExecution(
+        swarm_id="swarm-1",
+        parent_task=Task(
+            id="parent",
+            type=TaskType.PLANNING,
+            description="parent",
+            input_data={}
+        ),
+        subtasks=subtasks,
+        strategy="dag",
+        total_subtasks=len(subtasks)
+    )
+
+
+class FakeExecutor:
+    """Replaces _execute_subtask with timed, scripted outcomes"""
+
+    def __init__(self, durations=None, failures=()):
+        self.durations = durations or {}
+        self.failures = set(failures)
+        self.started = []
+        self.finished = []
+
+    async def __call__(self, subtask, swarm, context):
+        self.started.append(subtask.id)
+        subtask.status = "running"
+        await asyncio.sleep(self.durations.get(subtask.id, 0.0))
+        self.finished.append(subtask.id)
+        success = subtask.id not in self.failures
+        subtask.status = "completed" if success else "failed"
+        return AgentResult(success=success, output={"id": subtask.id}, evidence=[])
+
+
+@pytest.fixture
+def coordinator(mock_moe_router):
+    """Create a swarm coordinator"""
+    return SwarmCoordinator(moe_router=mock_moe_router, max_parallel_agents=4)
+
+
+class TestDagScheduling:
+    """Test the ready-queue DAG scheduler"""
+
+    async def test_dependents_start_without_waiting_for_wave(self, coordinator, sample_context):
+        """A fast branch proceeds while an unrelated slow subtask is running"""
+        executor = FakeExecutor(durations={"slow": 0.2})
+        coordinator._execute_subtask = executor
+        swarm = make_swarm([
+            make_subtask("slow"),
+            make_subtask("fast"),
+            make_subtask("after_fast", ["fast"]),
+            make_subtask("after_slow", ["slow"]),
+        ])
+
+        results = await coordinator._execute_dag(swarm, sample_context)
+
+        assert len(results) == 4
+        assert executor.finished.index("after_fast") < executor.finished.index("slow")
+        assert executor.finished[-1] == "after_slow"
+
+    async def test_dependencies_are_respected(self, coordinator, sample_context):
+        """Test that diamond dependencies run in order"""
+        executor = FakeExecutor(durations={"left": 0.02})
+        coordinator._execute_subtask = executor
+        swarm = make_swarm([
+            make_subtask("root"),
+            make_subtask("left", ["root"]),
+            make_subtask("right", ["root"]),
+            make_subtask("join", ["left", "right"]),
+        ])
+
+        await coordinator._execute_dag(swarm, sample_context)
+
+        assert executor.started[0] == "root"
+        assert executor.started.index("join") > executor.finished.index("left")
+
+    async def test_failure_cancels_transitive_dependents(self, coordinator, sample_context):
+        """Test that dependents of a failed subtask never run"""
+        executor = FakeExecutor(failures={"a"})
+        coordinator._execute_subtask = executor
+        subtasks = [
+            make_subtask("a"),
+            make_subtask("b", ["a"]),
+            make_subtask("c", ["b"]),
+            make_subtask("independent"),
+        ]
+        swarm = make_swarm(subtasks)
+
+        await coordinator._execute_dag(swarm, sample_context)
+
+        assert set(executor.started) == {"a", "independent"}
+        assert [st.status for st in subtasks] == ["failed", "cancelled", "cancelled", "completed"]
+        assert swarm.cancelled_subtasks == 2
+
+    async def test_critical_path_first(self, mock_moe_router, sample_context):
+        """Test that the longest remaining chain starts first"""
+        coordinator = SwarmCoordinator(moe_router=mock_moe_router, max_parallel_agents=1)
+        executor = FakeExecutor()
+        coordinator._execute_subtask = executor
+        swarm = make_swarm([
+            make_subtask("leaf", complexity="high"),
+            make_subtask("chain_1", complexity="low"),
+            make_subtask("chain_2", ["chain_1"], complexity="medium"),
+            make_subtask("chain_3", ["chain_2"], complexity="medium"),
+        ])
+
+        await coordinator._execute_dag(swarm, sample_context)
+
+        assert executor.started[0] == "chain_1"
+
+    async def test_parallelism_is_bounded(self, mock_moe_router, sample_context):
+        """Test that at most max_parallel_agents subtasks run at once"""
+        coordinator = SwarmCoordinator(moe_router=mock_moe_router, max_parallel_agents=2)
+        running = 0
+        peak = 0
+
+        async def execute(subtask, swarm, context):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return AgentResult(success=True, output={}, evidence=[])
+
+        coordinator._execute_subtask = execute
+        swarm = make_swarm([make_subtask(f"t{i}") for i in range(6)] + [
+            make_subtask("join", [f"t{i}" for i in range(6)])
+        ])
+
+        results = await coordinator._execute_dag(swarm, sample_context)
+
+        assert len(results) == 7
+        assert peak == 2
+
+    async def test_cycles_and_unknown_dependencies_are_cancelled(self, coordinator, sample_context):
+        """Test that unschedulable subtasks are reported, not run"""
+        executor = FakeExecutor()
+        coordinator._execute_subtask = executor
+        subtasks = [
+            make_subtask("x", ["y"]),
+            make_subtask("y", ["x"]),
+            make_subtask("orphan", ["missing"]),
+            make_subtask("ok"),
+        ]
+        swarm = make_swarm(subtasks)
+
+        await coordinator._execute_dag(swarm, sample_context)
+
+        assert executor.started == ["ok"]
+        assert swarm.cancelled_subtasks == 3
+
+    async def test_cancellation_stops_running_subtasks(self, coordinator, sample_context):
+        """Test that cancelling the scheduler cancels and awaits its subtasks"""
+        cancelled = []
+
+        async def execute(subtask, swarm, context):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(subtask.id)
+                raise
+
+        coordinator._execute_subtask = execute
+        swarm = make_swarm([make_subtask("a"), make_subtask("b")])
+
+        scheduler = asyncio.create_task(coordinator._execute_dag(swarm, sample_context))
+        await asyncio.sleep(0.01)
+        scheduler.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await scheduler
+
+        assert sorted(cancelled) == ["a", "b"]
@@ -0,0 +1,162 @@
+"""
+Unit tests for AgentRegistry workflow execution
+"""
+import asyncio
+
+import pytest
+
+from packages.agents.base import AgentResult, Task, TaskType
+from packages.agents.registry import AgentCapability
+from packages.agents.tests.conftest import MockAgent
+
+
+class WorkflowAgent(MockAgent):
+    """Mock agent with scripted durations and failures"""
+
+    durations = {}
+    failures = set()
+    started = []
+    running = 0
+    peak = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(task_type=TaskType.CODE_GENERATION, **kwargs)
+
+    async def execute(self, task, context):
+        cls = WorkflowAgent
+        cls.started.append(task.id)
+        cls.running += 1
+        cls.peak = max(cls.peak, cls.running)
+        try:
+            await asyncio.sleep(cls.durations.get(task.id, 0.01))
+        finally:
+            cls.running -= 1
+        return AgentResult(
+            success=task.id not in cls.failures,
+            output={"task_id": task.id, "agent_id": self.agent_id},
+            evidence=[]
+        )
+
+
+@pytest.fixture(autouse=True)
+def reset_workflow_agent():
+    """Reset class-level recording between tests"""
+    WorkflowAgent.durations = {}
+    WorkflowAgent.failures = set()
+    WorkflowAgent.started = []
+    WorkflowAgent.running = 0
+    WorkflowAgent.peak = 0
+
+
+@pytest.fixture
+def registry(agent_registry):
+    """Registry with one pooled workflow agent"""
+    agent_registry.register(
+        agent_id="worker",
+        agent_class=WorkflowAgent,
+        task_types=[TaskType.CODE_GENERATION],
+        description="Worker",
+        max_concurrent_tasks=10
+    )
+    return agent_registry
+
+
+def make_task(task_id, dependencies=(), **metadata):
+    """Create a code generation task"""
+    return Task(
+        id=task_id,
+        type=TaskType.CODE_GENERATION,
+        description=task_id,
+        input_data={},
+        dependencies=list(dependencies),
+        metadata=metadata
+    )
+
+
+class TestWorkflowExecution:
+    """Test dependency-aware workflow execution"""
+
+    async def test_sequential_waits_for_dependencies(self, registry, sample_context):
+        """Test that out-of-order dependents run after their dependencies"""
+        tasks = [make_task("b", ["a"]), make_task("a")]
+
+        results = await registry.execute_workflow(tasks, sample_context)
+
+        assert [r.output["task_id"] for r in results] == ["a", "b"]
+        assert WorkflowAgent.peak == 1
+
+    async def test_parallel_respects_dependencies(self, registry, sample_context):
+        """Test that dependents start only after all dependencies succeed"""
+        WorkflowAgent.durations = {"slow": 0.05}
+        tasks = [
+            make_task("slow"),
+            make_task("fast"),
+            make_task("after_fast", ["fast"]),
+            make_task("join", ["slow", "after_fast"]),
+        ]
+
+        results = await registry.execute_workflow(tasks, sample_context, parallel=True)
+
+        order = [r.output["task_id"] for r in results]
+        assert order.index("after_fast") < order.index("slow")
+        assert order[-1] == "join"
+
+    async def test_concurrency_is_bounded(self, registry, sample_context):
+        """Test the global concurrency cap"""
+        tasks = [make_task(f"t{i}") for i in range(8)]
+
+        results = await registry.execute_workflow(
+            tasks, sample_context, parallel=True, max_concurrency=3
+        )
+
+        assert len(results) == 8
+        assert WorkflowAgent.peak == 3
+
+    async def test_failed_dependency_skips_dependents(self, registry, sample_context):
+        """Test that dependents of failed and unknown tasks are skipped"""
+        WorkflowAgent.failures = {"a"}
+        tasks = [
+            make_task("a"),
+            make_task("b", ["a"]),
+            make_task("c", ["b"]),
+            make_task("orphan", ["missing"]),
+            make_task("ok"),
+        ]
+
+        await registry.execute_workflow(tasks, sample_context, parallel=True)
+
+        assert sorted(WorkflowAgent.started) == ["a", "ok"]
+
+    async def test_stream_yields_as_tasks_complete(self, registry, sample_context):
+        """Test that results are streamed before the workflow finishes"""
+        WorkflowAgent.durations = {"slow": 0.2}
+        stream = registry.stream_workflow(
+            [make_task("slow"), make_task("fast")], sample_context
+        )
+
+        task, result = await stream.__anext__()
+
+        assert task.id == "fast"
+        assert result.success
+        assert "slow" in WorkflowAgent.started
+        await stream.aclose()
+
+    async def test_routes_to_least_loaded_capable_agent(self, registry, sample_context):
+        """Test capability routing ordered by current load"""
+        for agent_id in ("reviewer-1", "reviewer-2"):
+            registry.register(
+                agent_id=agent_id,
+                agent_class=WorkflowAgent,
+                task_types=[TaskType.CODE_GENERATION],
+                description=agent_id,
+                capabilities=[AgentCapability.CODE_REVIEW],
+                max_concurrent_tasks=1
+            )
+        await registry.acquire_agent("reviewer-1", "busy-task")
+
+        results = await registry.execute_workflow(
+            [make_task("review", required_capabilities=["code_review"])],
+            sample_context
+        )
+
+        assert results[0].output["agent_id"] == "reviewer-2"
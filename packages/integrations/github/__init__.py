@@ -4,12 +4,14 @@ GitHub Integration Package
 Provides comprehensive GitHub API integration including:
 - Issue operations
 - Pull request management
+- Git Data API commits
 - Project board operations
 - GitHub Actions integration
 - Webhook handling
 """
 
 from .client import GitHubClient
+from .git import GitDataOperations
 from .issues import IssueOperations
 from .prs import PullRequestOperations
 from .projects import ProjectOperations
@@ -18,6 +20,7 @@ from .webhooks import WebhookHandler
 
 __all__ = [
     "GitHubClient",
+    "GitDataOperations",
     "IssueOperations",
     "PullRequestOperations",
     "ProjectOperations",
@@ -0,0 +1,284 @@
+"""
+GitHub Git Data Operations
+
+Provides low-level Git operations through the Git Data API:
+- Read and move refs
+- Create blobs, trees and commits
+- Commit many files at once
+- Set commit statuses
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from .client import GitHubClient
+
+
+class GitDataOperations:
+    """
+    GitHub Git Data operations
+
+    Builds commits directly from blobs and trees, so a multi-file change is
+    a single commit without a local checkout.
+    """
+
+    def __init__(self, client: GitHubClient):
+        """
+        Initialize Git Data operations
+
+        Args:
+            client: GitHubClient instance
+        """
+        self.client = client
+
+    async def get_ref(self, owner: str, repo: str, ref: str) -> Dict[str, Any]:
+        """
+        Get a reference
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Reference without "refs/", e.g. "heads/main"
+
+        Returns:
+            Reference data; the commit SHA is in ["object"]["sha"]
+        """
+        endpoint = f"/repos/{owner}/{repo}/git/ref/{ref}"
+        return await self.client.get(endpoint)
+
+    async def update_ref(
+        self,
+        owner: str,
+        repo: str,
+        ref: str,
+        sha: str,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Point a reference at a commit
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Reference without "refs/", e.g. "heads/feature/x"
+            sha: Commit SHA
+            force: Allow a non-fast-forward update
+
+        Returns:
+            Updated reference data
+        """
+        endpoint = f"/repos/{owner}/{repo}/git/refs/{ref}"
+        return await self.client.patch(endpoint, json={"sha": sha, "force": force})
+
+    async def get_commit(self, owner: str, repo: str, sha: str) -> Dict[str, Any]:
+        """
+        Get a commit
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            sha: Commit SHA
+
+        Returns:
+            Commit data; the tree SHA is in ["tree"]["sha"]
+        """
+        endpoint = f"/repos/{owner}/{repo}/git/commits/{sha}"
+        return await self.client.get(endpoint)
+
+    async def create_blob(self, owner: str, repo: str, content: str) -> Dict[str, Any]:
+        """
+        Create a blob
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            content: File content (UTF-8)
+
+        Returns:
+            Blob data including SHA
+        """
+        endpoint = f"/repos/{owner}/{repo}/git/blobs"
+        return await self.client.post(endpoint, json={"content": content, "encoding": "utf-8"})
+
+    async def create_tree(
+        self,
+        owner: str,
+        repo: str,
+        entries: List[Dict[str, Any]],
+        base_tree: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a tree
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            entries: Tree entries ({"path", "mode", "type", "sha"}); a None
+                SHA deletes the path from base_tree
+            base_tree: Tree the entries are applied on top of
+
+        Returns:
+            Tree data including SHA
+        """
+        endpoint = f"/repos/{owner}/{repo}/git/trees"
+        payload: Dict[str, Any] = {"tree": entries}
+
+        if base_tree:
+            payload["base_tree"] = base_tree
+
+        return await self.client.post(endpoint, json=payload)
+
+    async def create_commit(
+        self,
+        owner: str,
+        repo: str,
+        message: str,
+        tree: str,
+        parents: List[str],
+    ) -> Dict[str, Any]:
+        """
+        Create a commit
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            message: Commit message
+            tree: Tree SHA
+            parents: Parent commit SHAs
+
+        Returns:
+            Commit data including SHA
+        """
+        endpoint = f"/repos/{owner}/{repo}/git/commits"
+        return await self.client.post(
+            endpoint, json={"message": message, "tree": tree, "parents": parents}
+        )
+
+    async def create_blobs(
+        self,
+        owner: str,
+        repo: str,
+        files: Dict[str, str],
+        max_concurrency: int = 8,
+        on_blob: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, str]:
+        """
+        Create blobs for many files concurrently
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            files: Path -> content
+            max_concurrency: Maximum blob requests in flight
+            on_blob: Called with (path, sha) as each blob is created
+
+        Returns:
+            Path -> blob SHA
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def create(path: str, content: str):
+            async with semaphore:
+                blob = await self.create_blob(owner, repo, content)
+            if on_blob:
+                on_blob(path, blob["sha"])
+            return path, blob["sha"]
+
+        results = await asyncio.gather(*(create(p, c) for p, c in files.items()))
+        return dict(results)
+
+    async def commit_files(
+        self,
+        owner: str,
+        repo: str,
+        branch: str,
+        files: Dict[str, Optional[str]],
+        message: str,
+        blob_shas: Optional[Dict[str, str]] = None,
+        max_concurrency: int = 8,
+        on_blob: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Commit many file changes to a branch as one commit
+
+        Blobs are created concurrently, then one tree and one commit, and the
+        branch is moved to the new commit.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            branch: Branch to commit to
+            files: Path -> content; None deletes the file
+            message: Commit message
+            blob_shas: Blobs already created for some paths, e.g. by an
+                earlier attempt; these are not uploaded again
+            max_concurrency: Maximum blob requests in flight
+            on_blob: Called with (path, sha) as each blob is created
+
+        Returns:
+            {"sha": commit SHA, "tree": tree SHA, "parent": previous head}
+        """
+        blob_shas = dict(blob_shas or {})
+        head = await self.get_ref(owner, repo, f"heads/{branch}")
+        parent = head["object"]["sha"]
+        base_commit = await self.get_commit(owner, repo, parent)
+
+        missing = {
+            path: content for path, content in files.items()
+            if content is not None and path not in blob_shas
+        }
+        blob_shas.update(
+            await self.create_blobs(owner, repo, missing, max_concurrency, on_blob)
+        )
+
+        entries = [
+            {
+                "path": path,
+                "mode": "100644",
+                "type": "blob",
+                "sha": blob_shas[path] if content is not None else None,
+            }
+            for path, content in files.items()
+        ]
+        tree = await self.create_tree(
+            owner, repo, entries, base_tree=base_commit["tree"]["sha"]
+        )
+        commit = await self.create_commit(
+            owner, repo, message, tree["sha"], [parent]
+        )
+        await self.update_ref(owner, repo, f"heads/{branch}", commit["sha"])
+
+        return {"sha": commit["sha"], "tree": tree["sha"], "parent": parent}
+
+    async def create_commit_status(
+        self,
+        owner: str,
+        repo: str,
+        sha: str,
+        state: str,
+        description: str,
+        context: str = "default",
+        target_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Set a commit status
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            sha: Commit SHA
+            state: error, failure, pending or success
+            description: Short description
+            context: Status context label
+            target_url: Link shown with the status
+
+        Returns:
+            Created status data
+        """
+        endpoint = f"/repos/{owner}/{repo}/statuses/{sha}"
+        payload = {"state": state, "description": description, "context": context}
+
+        if target_url:
+            payload["target_url"] = target_url
+
+        return await self.client.post(endpoint, json=payload)
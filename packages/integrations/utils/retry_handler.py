@@ -239,6 +239,10 @@ class CircuitBreaker:
     - CLOSED: Normal operation
     - OPEN: All requests fail immediately
     - HALF_OPEN: Test if service recovered
+
+    With a shared registry (e.g. moe_router's CircuitBreakerRegistry), state
+    lives in the registry under ``name`` instead, so every worker and the
+    router see the same breaker.
     """
 
     def __init__(
@@ -246,6 +250,8 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         recovery_timeout: float = 60.0,
         expected_exception: Type[Exception] = Exception,
+        name: Optional[str] = None,
+        registry=None,
     ):
         """
         Initialize circuit breaker.
@@ -254,10 +260,18 @@ class CircuitBreaker:
             failure_threshold: Number of failures before opening circuit
             recovery_timeout: Time to wait before testing recovery
             expected_exception: Exception type to track
+            name: Breaker identifier in the shared registry (e.g. provider)
+            registry: Optional shared registry providing allow(name),
+                record(name, success) and reset(name)
         """
+        if registry is not None and not name:
+            raise ValueError("A shared circuit breaker registry requires a name")
+
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
+        self.name = name
+        self.registry = registry
 
         self.failure_count = 0
         self.last_failure_time: Optional[float] = None
@@ -280,6 +294,9 @@ class CircuitBreaker:
         Raises:
             CircuitBreakerError: If circuit is open
         """
+        if self.registry is not None:
+            return await self._call_shared(func, *args, **kwargs)
+
         async with self.lock:
             # Check if we should try to recover
             if self.state == "OPEN":
@@ -322,8 +339,28 @@ class CircuitBreaker:
 
             raise
 
+    async def _call_shared(self, func: Callable, *args, **kwargs) -> T:
+        """Execute function with state held in the shared registry."""
+        # allow() reads locally cached state; only outcomes hit the store
+        if not self.registry.allow(self.name):
+            raise CircuitBreakerError(f"Circuit breaker for {self.name} is OPEN")
+
+        try:
+            if asyncio.iscoroutinefunction(func):
+                result = await func(*args, **kwargs)
+            else:
+                result = func(*args, **kwargs)
+        except self.expected_exception:
+            await asyncio.to_thread(self.registry.record, self.name, False)
+            raise
+
+        await asyncio.to_thread(self.registry.record, self.name, True)
+        return result
+
     def reset(self):
         """Manually reset the circuit breaker."""
+        if self.registry is not None:
+            self.registry.reset(self.name)
         self.state = "CLOSED"
         self.failure_count = 0
         self.last_failure_time = None
@@ -19,6 +19,7 @@ from .strategies.cost_predictor import CostPredictor
 from .strategies.performance_tracker import PerformanceTracker
 from .strategies.hybrid_router import HybridRouter, ConsensusStrategy
 from .strategies.learning_loop import LearningLoop
+from .strategies.bandit_router import BanditRouter
 
 __version__ = "1.0.0"
 
@@ -43,4 +44,5 @@ __all__ = [
     "HybridRouter",
     "ConsensusStrategy",
     "LearningLoop",
+    "BanditRouter",
 ]
@@ -0,0 +1,476 @@
+"""
+Circuit Breaker Registry
+
+Circuit breakers keyed by provider or model, optionally shared across
+workers through Redis. Trips are decided on a sliding-window failure rate.
+Once an open breaker's timeout elapses it becomes half-open and a single
+probe request, the one that takes the probe lease, is let through; its
+outcome closes or reopens the breaker for everyone. Each worker caches breaker state locally and
+receives changes over pub/sub, so checks stay off the network.
+"""
+import logging
+import math
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+
+from .models import CircuitBreakerState
+
+
+# Record an outcome, prune the sliding window and apply state transitions.
+# KEYS: state hash, window hash, probe lease
+# ARGV: success, now, bucket_seconds, window_seconds, min_requests,
+#       failure_rate, open_seconds, token, channel, identifier
+_RECORD_SCRIPT = """
+local now = tonumber(ARGV[2])
+local bucket_seconds = tonumber(ARGV[3])
+local window_seconds = tonumber(ARGV[4])
+local success = ARGV[1] == '1'
+local bucket = math.floor(now / bucket_seconds)
+local oldest = bucket - math.ceil(window_seconds / bucket_seconds) + 1
+
+redis.call('HINCRBY', KEYS[2], bucket .. (success and ':s' or ':f'), 1)
+redis.call('EXPIRE', KEYS[2], math.ceil(window_seconds * 2))
+
+local total, failures = 0, 0
+local fields = redis.call('HGETALL', KEYS[2])
+for i = 1, #fields, 2 do
+    local b, kind = string.match(fields[i], '^(%-?%d+):(%a)$')
+    if tonumber(b) < oldest then
+        redis.call('HDEL', KEYS[2], fields[i])
+    else
+        local count = tonumber(fields[i + 1])
+        total = total + count
+        if kind == 'f' then failures = failures + count end
+    end
+end
+
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local opened_until = tonumber(redis.call('HGET', KEYS[1], 'opened_until') or '0')
+local consecutive
+if success then
+    redis.call('HSET', KEYS[1], 'consecutive_failures', 0, 'last_success', ARGV[2])
+    consecutive = 0
+else
+    consecutive = redis.call('HINCRBY', KEYS[1], 'consecutive_failures', 1)
+    redis.call('HSET', KEYS[1], 'last_failure', ARGV[2])
+end
+
+local changed = false
+if state == 'open' and now >= opened_until then
+    -- Half-open: only the probe lease holder's outcome decides
+    if redis.call('GET', KEYS[3]) == ARGV[8] then
+        if success then
+            state = 'closed'
+            redis.call('DEL', KEYS[2])
+            total, failures = 0, 0
+        else
+            opened_until = now + tonumber(ARGV[7])
+        end
+        redis.call('DEL', KEYS[3])
+        changed = true
+    end
+elseif state == 'closed' and not success and total >= tonumber(ARGV[5])
+        and failures / total >= tonumber(ARGV[6]) then
+    state = 'open'
+    opened_until = now + tonumber(ARGV[7])
+    changed = true
+end
+
+if changed then
+    redis.call('HSET', KEYS[1], 'state', state, 'opened_until', tostring(opened_until))
+    redis.call('PUBLISH', ARGV[9], ARGV[10] .. ' ' .. state .. ' ' .. tostring(opened_until))
+end
+return {state, tostring(opened_until), consecutive, total, failures}
+"""
+
+
+class _BreakerView:
+    """Locally cached breaker state"""
+
+    __slots__ = (
+        "state",
+        "opened_until",
+        "consecutive_failures",
+        "window_requests",
+        "window_failures",
+        "last_failure",
+        "last_success",
+        "fetched_at"
+    )
+
+    def __init__(self, state: str = "closed", opened_until: float = 0.0):
+        self.state = state
+        self.opened_until = opened_until
+        self.consecutive_failures = 0
+        self.window_requests = 0
+        self.window_failures = 0
+        self.last_failure: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.fetched_at = 0.0
+
+
+class CircuitBreakerRegistry:
+    """Sliding-window circuit breakers with optional Redis-shared state"""
+
+    def __init__(
+        self,
+        redis_client=None,
+        namespace: str = "moe:breaker",
+        window_seconds: float = 60.0,
+        bucket_seconds: float = 5.0,
+        min_requests: int = 5,
+        failure_rate_threshold: float = 0.5,
+        open_seconds: float = 60.0,
+        probe_lease_seconds: float = 10.0,
+        cache_ttl_seconds: float = 30.0,
+        listen: bool = True,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize circuit breaker registry
+
+        Args:
+            redis_client: Redis client (decode_responses=True) for shared
+                state; state is process-local without it
+            namespace: Redis key namespace
+            window_seconds: Sliding window length for the failure rate
+            bucket_seconds: Window bucket granularity
+            min_requests: Requests in the window before the breaker can trip
+            failure_rate_threshold: Failure rate (0-1) that trips the breaker
+            open_seconds: Time an open breaker rejects traffic before probing
+            probe_lease_seconds: How long a worker may hold the probe lease
+            cache_ttl_seconds: Maximum age of cached state before re-reading
+            listen: Subscribe to state changes published by other workers
+            clock: Wall-clock time source shared across workers
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.redis = redis_client
+        self.namespace = namespace
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.min_requests = min_requests
+        self.failure_rate_threshold = failure_rate_threshold
+        self.open_seconds = open_seconds
+        self.probe_lease_seconds = probe_lease_seconds
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.clock = clock
+
+        self.token = uuid.uuid4().hex
+        self._cache: Dict[str, _BreakerView] = {}
+        self._tracked: Set[str] = set()
+        self._lock = threading.Lock()
+
+        # Process-local store used without Redis
+        self._windows: Dict[str, Dict[int, List[int]]] = {}
+        self._probes: Dict[str, Tuple[str, float]] = {}
+
+        self._listener = None
+        if self.redis is not None:
+            self._record_script = self.redis.register_script(_RECORD_SCRIPT)
+            if listen:
+                self._start_listener()
+
+    # Keys
+
+    @property
+    def channel(self) -> str:
+        return f"{self.namespace}:events"
+
+    def _state_key(self, identifier: str) -> str:
+        return f"{self.namespace}:{identifier}"
+
+    def _window_key(self, identifier: str) -> str:
+        return f"{self.namespace}:{identifier}:window"
+
+    def _probe_key(self, identifier: str) -> str:
+        return f"{self.namespace}:{identifier}:probe"
+
+    # Checks
+
+    def allow(self, identifier: str) -> bool:
+        """
+        Check whether a request may be sent
+
+        Closed breakers allow traffic, open breakers reject it, and
+        half-open breakers allow one probe per lease: the call that takes
+        the lease. Call this only for a request that will be sent.
+
+        Args:
+            identifier: Provider or model identifier
+
+        Returns:
+            True if the request may proceed
+        """
+        view = self._view(identifier)
+        if view.state == "closed":
+            return True
+
+        if self.clock() < view.opened_until:
+            return False
+
+        return self._acquire_probe(identifier)
+
+    def is_open(self, identifier: str) -> bool:
+        """Check whether a breaker rejects traffic, without taking the probe lease"""
+        view = self._view(identifier)
+        return view.state == "open" and self.clock() < view.opened_until
+
+    def _view(self, identifier: str) -> _BreakerView:
+        """Cached state, re-read from Redis once it is older than the cache TTL"""
+        view = self._cache.get(identifier)
+        if view is not None and (
+            self.redis is None or time.monotonic() - view.fetched_at < self.cache_ttl_seconds
+        ):
+            return view
+
+        if self.redis is None:
+            view = _BreakerView()
+        else:
+            view = self._load(identifier)
+        self._cache[identifier] = view
+        return view
+
+    def _load(self, identifier: str) -> _BreakerView:
+        """Read breaker state from Redis"""
+        view = _BreakerView()
+        try:
+            data = self.redis.hgetall(self._state_key(identifier))
+            if data:
+                self._tracked.add(identifier)
+            view.state = data.get("state", "closed")
+            view.opened_until = float(data.get("opened_until", 0.0))
+            view.consecutive_failures = int(data.get("consecutive_failures", 0))
+            view.last_failure = float(data["last_failure"]) if "last_failure" in data else None
+            view.last_success = float(data["last_success"]) if "last_success" in data else None
+        except Exception as e:
+            # Fail open: an unreachable store must not block all traffic
+            self.logger.warning(f"Failed to load breaker state for {identifier}: {e}")
+        view.fetched_at = time.monotonic()
+        return view
+
+    def _acquire_probe(self, identifier: str) -> bool:
+        """Take the half-open probe lease; held leases admit no further probes"""
+        now = self.clock()
+
+        if self.redis is None:
+            with self._lock:
+                holder = self._probes.get(identifier)
+                if holder and holder[1] > now:
+                    return False
+                self._probes[identifier] = (self.token, now + self.probe_lease_seconds)
+                return True
+
+        try:
+            key = self._probe_key(identifier)
+            if self.redis.set(key, self.token, nx=True, px=int(self.probe_lease_seconds * 1000)):
+                self.logger.info(f"Probing half-open circuit for {identifier}")
+                return True
+            return False
+        except Exception as e:
+            self.logger.warning(f"Failed to acquire probe lease for {identifier}: {e}")
+            return False
+
+    # Outcomes
+
+    def record(self, identifier: str, success: bool) -> str:
+        """
+        Record a request outcome
+
+        Args:
+            identifier: Provider or model identifier
+            success: Whether the request succeeded
+
+        Returns:
+            Breaker state after the outcome
+        """
+        now = self.clock()
+        self._tracked.add(identifier)
+
+        if self.redis is not None:
+            try:
+                state, opened_until, consecutive, total, failures = self._record_script(
+                    keys=[
+                        self._state_key(identifier),
+                        self._window_key(identifier),
+                        self._probe_key(identifier)
+                    ],
+                    args=[
+                        1 if success else 0,
+                        now,
+                        self.bucket_seconds,
+                        self.window_seconds,
+                        self.min_requests,
+                        self.failure_rate_threshold,
+                        self.open_seconds,
+                        self.token,
+                        self.channel,
+                        identifier
+                    ]
+                )
+            except Exception as e:
+                self.logger.warning(f"Failed to record outcome for {identifier}: {e}")
+                return self._view(identifier).state
+        else:
+            with self._lock:
+                state, opened_until, consecutive, total, failures = self._record_local(
+                    identifier, success, now
+                )
+
+        previous = self._cache.get(identifier)
+        view = _BreakerView(state, float(opened_until))
+        view.consecutive_failures = int(consecutive)
+        view.window_requests = int(total)
+        view.window_failures = int(failures)
+        view.last_failure = previous.last_failure if previous else None
+        view.last_success = previous.last_success if previous else None
+        if success:
+            view.last_success = now
+        else:
+            view.last_failure = now
+        view.fetched_at = time.monotonic()
+        self._cache[identifier] = view
+
+        if previous is None or previous.state != state or (
+            state == "open" and previous.opened_until != view.opened_until
+        ):
+            if state == "open":
+                self.logger.warning(
+                    f"Circuit breaker opened for {identifier} "
+                    f"({int(failures)}/{int(total)} failures in window)"
+                )
+            elif previous is not None:
+                self.logger.info(f"Circuit breaker for {identifier} closed")
+
+        return state
+
+    def _record_local(
+        self,
+        identifier: str,
+        success: bool,
+        now: float
+    ) -> Tuple[str, float, int, int, int]:
+        """Process-local equivalent of the record script"""
+        bucket = math.floor(now / self.bucket_seconds)
+        oldest = bucket - math.ceil(self.window_seconds / self.bucket_seconds) + 1
+
+        window = self._windows.setdefault(identifier, {})
+        counts = window.setdefault(bucket, [0, 0])
+        counts[0 if success else 1] += 1
+        for stale in [b for b in window if b < oldest]:
+            del window[stale]
+        total = sum(s + f for s, f in window.values())
+        failures = sum(f for _, f in window.values())
+
+        view = self._cache.get(identifier) or _BreakerView()
+        state, opened_until = view.state, view.opened_until
+        consecutive = 0 if success else view.consecutive_failures + 1
+
+        if state == "open" and now >= opened_until:
+            holder = self._probes.get(identifier)
+            if holder and holder[0] == self.token:
+                if success:
+                    state = "closed"
+                    window.clear()
+                    total = failures = 0
+                else:
+                    opened_until = now + self.open_seconds
+                del self._probes[identifier]
+        elif (
+            state == "closed"
+            and not success
+            and total >= self.min_requests
+            and failures / total >= self.failure_rate_threshold
+        ):
+            state = "open"
+            opened_until = now + self.open_seconds
+
+        return state, opened_until, consecutive, total, failures
+
+    def reset(self, identifier: str):
+        """Manually close a breaker and clear its window"""
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                pipe.hset(
+                    self._state_key(identifier),
+                    mapping={"state": "closed", "opened_until": 0, "consecutive_failures": 0}
+                )
+                pipe.delete(self._window_key(identifier), self._probe_key(identifier))
+                pipe.publish(self.channel, f"{identifier} closed 0")
+                pipe.execute()
+            except Exception as e:
+                self.logger.error(f"Failed to reset breaker for {identifier}: {e}")
+        else:
+            self._windows.pop(identifier, None)
+            self._probes.pop(identifier, None)
+
+        view = _BreakerView()
+        view.fetched_at = time.monotonic()
+        self._cache[identifier] = view
+        self._tracked.add(identifier)
+        self.logger.info(f"Manually reset circuit breaker for {identifier}")
+
+    # Propagation
+
+    def _start_listener(self):
+        """Apply state changes published by other workers to the local cache"""
+        try:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._on_event})
+            self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except Exception as e:
+            # Cached state then refreshes on cache_ttl_seconds instead
+            self.logger.warning(f"Breaker event subscription failed: {e}")
+
+    def _on_event(self, message: Dict[str, Any]):
+        try:
+            identifier, state, opened_until = message["data"].rsplit(" ", 2)
+        except (AttributeError, ValueError):
+            return
+
+        view = self._cache.get(identifier)
+        if view is None:
+            return
+        view.state = state
+        view.opened_until = float(opened_until)
+        if state == "closed":
+            view.consecutive_failures = 0
+        self._tracked.add(identifier)
+
+    def close(self):
+        """Stop the pub/sub listener"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    # Reporting
+
+    def get_state(self, identifier: str) -> CircuitBreakerState:
+        """Current breaker state for one identifier"""
+        view = self._view(identifier)
+        state = view.state
+        if state == "open" and self.clock() >= view.opened_until:
+            state = "half_open"
+
+        def to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+            return datetime.utcfromtimestamp(timestamp) if timestamp else None
+
+        return CircuitBreakerState(
+            identifier=identifier,
+            state=state,
+            failure_count=view.consecutive_failures,
+            window_requests=view.window_requests,
+            window_failures=view.window_failures,
+            last_failure=to_datetime(view.last_failure),
+            last_success=to_datetime(view.last_success),
+            next_retry_at=to_datetime(view.opened_until) if view.state == "open" else None,
+            failure_threshold=self.min_requests,
+            retry_timeout_seconds=int(self.open_seconds)
+        )
+
+    def get_states(self) -> Dict[str, CircuitBreakerState]:
+        """States of all breakers that have recorded outcomes"""
+        return {identifier: self.get_state(identifier) for identifier in sorted(self._tracked)}
@@ -88,6 +88,9 @@ class RoutingRequest(BaseModel):
     vendor_preference: Optional[Provider] = Field(None, description="Preferred vendor")
     vendor_diversity: bool = Field(False, description="Prefer vendor diversity")
     enable_parallel: bool = Field(False, description="Enable parallel execution")
+    routing_mode: Optional[Literal["standard", "thompson", "ucb"]] = Field(
+        None, description="Ranking strategy; defaults to the router's configured mode"
+    )
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
 
@@ -174,8 +177,10 @@ class CircuitBreakerState(BaseModel):
     identifier: str = Field(..., description="Provider or model ID")
     state: Literal["closed", "open", "half_open"] = Field("closed", description="Circuit state")
     failure_count: int = Field(0, description="Consecutive failures")
+    window_requests: int = Field(0, description="Requests in the sliding window")
+    window_failures: int = Field(0, description="Failures in the sliding window")
     last_failure: Optional[datetime] = Field(None, description="Last failure timestamp")
     last_success: Optional[datetime] = Field(None, description="Last success timestamp")
     next_retry_at: Optional[datetime] = Field(None, description="Next retry timestamp")
-    failure_threshold: int = Field(5, description="Failures before opening")
+    failure_threshold: int = Field(5, description="Window requests before the breaker can open")
     retry_timeout_seconds: int = Field(60, description="Timeout before retry")
@@ -7,8 +7,7 @@ hybrid routing, and learning loops.
 import logging
 import yaml
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Set
 from collections import defaultdict
 
 from .models import (
@@ -21,10 +20,12 @@ from .models import (
     CircuitBreakerState,
     ModelCapability
 )
+from .circuit_breaker import CircuitBreakerRegistry
 from .strategies.cost_predictor import CostPredictor
 from .strategies.performance_tracker import PerformanceTracker
 from .strategies.hybrid_router import HybridRouter, ConsensusStrategy
 from .strategies.learning_loop import LearningLoop
+from .strategies.bandit_router import BanditRouter
 
 
 class MoERouter:
@@ -34,9 +35,10 @@ class MoERouter:
     Features:
     - Multi-factor routing (cost, quality, latency, capabilities)
     - Performance-based learning
-    - Circuit breaker for failed providers
+    - Circuit breaker for failed providers, shared across workers via Redis
     - Hybrid/parallel execution
     - A/B testing framework
+    - Bandit routing (Thompson sampling / UCB) for automatic exploration
     """
 
     def __init__(
@@ -44,7 +46,11 @@ class MoERouter:
         config_path: Optional[str] = None,
         redis_url: Optional[str] = None,
         enable_learning: bool = True,
-        enable_circuit_breaker: bool = True
+        enable_circuit_breaker: bool = True,
+        routing_mode: str = "standard",
+        bandit_router: Optional[BanditRouter] = None,
+        max_history: int = 10000,
+        circuit_breaker: Optional[CircuitBreakerRegistry] = None
     ):
         """
         Initialize MoE Router
@@ -54,6 +60,11 @@ class MoERouter:
             redis_url: Redis connection URL for performance tracking
             enable_learning: Enable learning loop
             enable_circuit_breaker: Enable circuit breaker for failed providers
+            routing_mode: Default ranking strategy (standard, thompson, ucb)
+            bandit_router: Optional preconfigured BanditRouter
+            max_history: Routing decisions kept in request_history
+            circuit_breaker: Optional preconfigured CircuitBreakerRegistry;
+                by default breakers share the performance tracker's Redis
         """
         self.logger = logging.getLogger(self.__class__.__name__)
 
@@ -69,20 +80,34 @@ class MoERouter:
         self.performance_tracker = PerformanceTracker(redis_url=redis_url)
         self.hybrid_router = HybridRouter()
 
+        if routing_mode != "standard" and routing_mode not in BanditRouter.STRATEGIES:
+            raise ValueError(f"Unknown routing mode: {routing_mode}")
+        self.routing_mode = routing_mode
+        self.bandit_router = bandit_router or BanditRouter(
+            strategy=routing_mode if routing_mode in BanditRouter.STRATEGIES else "thompson"
+        )
+
         self.learning_loop = None
         if enable_learning:
             self.learning_loop = LearningLoop(performance_tracker=self.performance_tracker)
 
         # Circuit breaker state
         self.enable_circuit_breaker = enable_circuit_breaker
-        self.circuit_breakers: Dict[str, CircuitBreakerState] = {}
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreakerRegistry(
+                redis_client=self.performance_tracker.redis if self.performance_tracker.use_redis else None,
+                listen=enable_circuit_breaker
+            )
+        self.breaker_registry = circuit_breaker
 
         # Request tracking
+        self.max_history = max_history
         self.request_history: List[RoutingDecision] = []
 
         self.logger.info(
             f"MoE Router initialized with {len(self.models)} models, "
             f"learning={'enabled' if enable_learning else 'disabled'}, "
+            f"routing_mode={routing_mode}, "
             f"circuit_breaker={'enabled' if enable_circuit_breaker else 'disabled'}"
         )
 
@@ -156,12 +181,26 @@ class MoERouter:
             return self._create_parallel_decision(request, available_models, evidence_list)
 
         # Step 3: Score and rank models
-        scored_models = self._score_models(request, available_models, evidence_list)
+        routing_mode = request.routing_mode or self.routing_mode
+        if routing_mode in BanditRouter.STRATEGIES:
+            scored_models = self._score_models_bandit(
+                request, available_models, evidence_list, routing_mode
+            )
+        else:
+            scored_models = self._score_models(request, available_models, evidence_list)
 
         if not scored_models:
             return self._create_error_decision("No models passed scoring")
 
-        # Step 4: Select top model
+        # Step 4: Select the top model whose breaker admits the request; a
+        # half-open breaker is probed only for the model actually selected
+        denied: Set[str] = set()
+        while scored_models and not self._admit(scored_models[0][0], denied):
+            scored_models = scored_models[1:]
+
+        if not scored_models:
+            return self._create_error_decision("No models available: half-open circuits are being probed")
+
         selected_model, final_score = scored_models[0]
 
         # Step 5: Prepare fallbacks
@@ -182,13 +221,13 @@ class MoERouter:
         decision = RoutingDecision(
             selected_model=selected_model.id,
             rationale=rationale,
-            confidence=min(1.0, final_score / 100),  # Normalize score to confidence
+            confidence=max(0.0, min(1.0, final_score / 100)),  # Normalize score to confidence
             evidence_ids=[e.id for e in evidence_list],
             evidence=evidence_list,
             estimated_cost=cost_prediction.expected_cost,
             estimated_quality=selected_model.quality_score,
             fallback_models=fallback_models,
-            routing_strategy="standard",
+            routing_strategy=routing_mode,
             metadata={
                 "final_score": final_score,
                 "cost_efficiency": cost_prediction.cost_efficiency_score,
@@ -196,8 +235,10 @@ class MoERouter:
             }
         )
 
-        # Track decision
+        # Track decision, trimming in batches to keep appends amortized O(1)
         self.request_history.append(decision)
+        if len(self.request_history) > 2 * self.max_history:
+            del self.request_history[:-self.max_history]
 
         self.logger.info(
             f"Selected {selected_model.id} with confidence {decision.confidence:.2f}"
@@ -220,7 +261,7 @@ class MoERouter:
 
             # Check circuit breaker
             if self.enable_circuit_breaker:
-                if self._is_circuit_open(model.provider.value):
+                if self._is_circuit_open(Provider(model.provider).value):
                     evidence_list.append(Evidence(
                         id=f"circuit_breaker_{model.id}",
                         source="circuit_breaker",
@@ -353,6 +394,48 @@ class MoERouter:
 
         return scored
 
+    def _score_models_bandit(
+        self,
+        request: RoutingRequest,
+        models: List[ModelDefinition],
+        evidence_list: List[Evidence],
+        strategy: str
+    ) -> List[tuple[ModelDefinition, float]]:
+        """Rank models with the bandit router, scaled to the 0-100 score range"""
+        candidates = []
+        expected_costs = {}
+
+        for model in models:
+            cost_pred = self.cost_predictor.predict_cost(model, request)
+            if not cost_pred.within_budget:
+                continue  # Skip models over budget
+            candidates.append(model)
+            expected_costs[model.id] = cost_pred.expected_cost
+
+        ranked = self.bandit_router.rank(
+            request.task_type,
+            candidates,
+            expected_costs,
+            strategy=strategy
+        )
+
+        scored = []
+        for model, reward, factors in ranked:
+            score = reward * 100
+            scored.append((model, score))
+
+            evidence_list.append(Evidence(
+                id=f"score_{model.id}",
+                source=f"bandit_{strategy}",
+                description=(
+                    f"{model.id} score: {score:.1f} "
+                    f"({', '.join(f'{k}={v}' for k, v in factors.items())})"
+                ),
+                weight=max(0.0, min(1.0, reward))
+            ))
+
+        return scored
+
     def _create_parallel_decision(
         self,
         request: RoutingRequest,
@@ -366,6 +449,12 @@ class MoERouter:
             num_models=3
         )
 
+        # Every parallel model is sent a request, so each must be admitted
+        denied: Set[str] = set()
+        parallel_models = [m for m in parallel_models if self._admit(m, denied)]
+        if not parallel_models:
+            return self._create_error_decision("No models available matching requirements")
+
         # Calculate cost/quality tradeoff
         tradeoff = self.hybrid_router.calculate_cost_quality_tradeoff(
             parallel_models,
@@ -491,26 +580,42 @@ class MoERouter:
 
     # Circuit Breaker Methods
 
+    @property
+    def circuit_breakers(self) -> Dict[str, CircuitBreakerState]:
+        """Breaker states for providers that have recorded outcomes"""
+        return self.breaker_registry.get_states()
+
     def _is_circuit_open(self, identifier: str) -> bool:
         """Check if circuit breaker is open for provider/model"""
-        if identifier not in self.circuit_breakers:
-            return False
+        # Half-open breakers stay candidates; their probe lease is only
+        # taken once a model is selected (see _admit)
+        return self.breaker_registry.is_open(identifier)
+
+    def _admit(self, model: ModelDefinition, denied: Set[str]) -> bool:
+        """
+        Let a request through the selected model's circuit breaker
 
-        breaker = self.circuit_breakers[identifier]
+        Takes the probe lease when the breaker is half-open, so it must only
+        be called for a model that will be sent the request.
 
-        if breaker.state == "closed":
-            return False
+        Args:
+            model: Selected model
+            denied: Providers already refused during this selection; updated
 
-        if breaker.state == "open":
-            # Check if retry timeout has elapsed
-            if breaker.next_retry_at and datetime.utcnow() >= breaker.next_retry_at:
-                # Move to half-open state
-                breaker.state = "half_open"
-                self.logger.info(f"Circuit breaker for {identifier} moved to half-open")
-                return False
+        Returns:
+            True if the request may be sent to the model
+        """
+        if not self.enable_circuit_breaker:
+            return True
+
+        provider = Provider(model.provider).value
+        if provider in denied:
+            return False
+        if self.breaker_registry.allow(provider):
             return True
 
-        # half_open state - allow some requests through
+        # Another request is probing the half-open breaker
+        denied.add(provider)
         return False
 
     def record_request_outcome(
@@ -520,10 +625,11 @@ class MoERouter:
         latency_ms: Optional[int] = None,
         cost: Optional[float] = None,
         quality_score: Optional[float] = None,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        task_type: Optional[TaskType] = None
     ):
         """
-        Record request outcome for circuit breaker and performance tracking
+        Record request outcome for circuit breaker and bandit routing
 
         Args:
             model_id: Model identifier
@@ -532,21 +638,29 @@ class MoERouter:
             cost: Actual cost
             quality_score: Quality score
             error: Error message if failed
+            task_type: Task type, required to update bandit posteriors
         """
         model = self._get_model_by_id(model_id)
         if not model:
             return
 
-        provider = model.provider.value
+        provider = Provider(model.provider).value
 
         # Update circuit breaker
         if self.enable_circuit_breaker:
             self._update_circuit_breaker(provider, success)
 
-        # Record in performance tracker
-        # Note: task_type should be passed but not available here
-        # Would need to track request context
-        # For now, skip performance tracking in this method
+        # Update bandit posteriors (O(1) per outcome)
+        if task_type is not None:
+            self.bandit_router.update(
+                model_id,
+                task_type,
+                success=success,
+                quality_score=quality_score,
+                latency_ms=latency_ms,
+                cost=cost,
+                prior_quality=model.quality_score
+            )
 
         self.logger.debug(
             f"Recorded {'success' if success else 'failure'} for {model_id}"
@@ -554,36 +668,7 @@ class MoERouter:
 
     def _update_circuit_breaker(self, identifier: str, success: bool):
         """Update circuit breaker state"""
-        if identifier not in self.circuit_breakers:
-            self.circuit_breakers[identifier] = CircuitBreakerState(
-                identifier=identifier
-            )
-
-        breaker = self.circuit_breakers[identifier]
-
-        if success:
-            breaker.failure_count = 0
-            breaker.last_success = datetime.utcnow()
-
-            if breaker.state == "half_open":
-                breaker.state = "closed"
-                self.logger.info(f"Circuit breaker for {identifier} closed")
-
-        else:
-            breaker.failure_count += 1
-            breaker.last_failure = datetime.utcnow()
-
-            if breaker.failure_count >= breaker.failure_threshold:
-                if breaker.state != "open":
-                    breaker.state = "open"
-                    breaker.next_retry_at = (
-                        datetime.utcnow() +
-                        timedelta(seconds=breaker.retry_timeout_seconds)
-                    )
-                    self.logger.warning(
-                        f"Circuit breaker opened for {identifier} "
-                        f"after {breaker.failure_count} failures"
-                    )
+        self.breaker_registry.record(identifier, success)
 
     def get_circuit_breaker_status(self) -> Dict[str, Any]:
         """Get status of all circuit breakers"""
@@ -591,6 +676,8 @@ class MoERouter:
             identifier: {
                 "state": breaker.state,
                 "failure_count": breaker.failure_count,
+                "window_requests": breaker.window_requests,
+                "window_failures": breaker.window_failures,
                 "last_failure": breaker.last_failure.isoformat() if breaker.last_failure else None,
                 "last_success": breaker.last_success.isoformat() if breaker.last_success else None,
                 "next_retry": breaker.next_retry_at.isoformat() if breaker.next_retry_at else None
@@ -600,10 +687,7 @@ class MoERouter:
 
     def reset_circuit_breaker(self, identifier: str):
         """Manually reset a circuit breaker"""
-        if identifier in self.circuit_breakers:
-            self.circuit_breakers[identifier].state = "closed"
-            self.circuit_breakers[identifier].failure_count = 0
-            self.logger.info(f"Manually reset circuit breaker for {identifier}")
+        self.breaker_registry.reset(identifier)
 
     # Analytics and Reporting
 
@@ -0,0 +1,417 @@
+"""
+Routing Replay Simulator
+
+Replays logged or synthetic routing requests through MoERouter.select_model
+and reports throughput, selection latency, simulated cost, quality and
+regret, so routing changes can be benchmarked offline and in CI.
+
+Usage:
+    python -m moe_router.simulator --corpus decisions.jsonl --mode thompson
+    python -m moe_router.simulator --synthetic 2000 --models 1000 --max-p99-ms 60
+"""
+import argparse
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import Counter
+
+import numpy as np
+import yaml
+from pydantic import BaseModel, Field
+
+from .models import ModelCapability, ModelDefinition, Provider, RoutingRequest, TaskType
+from .router import MoERouter
+
+
+class ModelOutcome(BaseModel):
+    """Observed or simulated outcome of running a request on a model"""
+    success: bool = Field(..., description="Whether the request succeeded")
+    quality_score: Optional[float] = Field(None, ge=0.0, le=1.0, description="Quality score")
+    cost: Optional[float] = Field(None, description="Actual cost")
+    latency_ms: Optional[int] = Field(None, description="Actual latency")
+
+    @property
+    def reward(self) -> float:
+        """Success-weighted quality"""
+        if not self.success:
+            return 0.0
+        return self.quality_score if self.quality_score is not None else 1.0
+
+
+class ReplayRecord(BaseModel):
+    """A routing request with the outcomes known for it"""
+    request: RoutingRequest = Field(..., description="Routing request")
+    logged_model: Optional[str] = Field(None, description="Model chosen in production")
+    outcomes: Dict[str, ModelOutcome] = Field(
+        default_factory=dict, description="Known outcomes by model ID"
+    )
+
+
+def load_corpus(path: str) -> Iterator[ReplayRecord]:
+    """
+    Stream replay records from a JSONL file
+
+    Each line holds a ReplayRecord; lines with a flat ``model_id`` and
+    ``outcome`` (as logged by the router) are accepted too.
+
+    Args:
+        path: JSONL file path
+
+    Yields:
+        Replay records
+    """
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if "model_id" in data and "outcomes" not in data:
+                data = {
+                    "request": data["request"],
+                    "logged_model": data["model_id"],
+                    "outcomes": {data["model_id"]: data.get("outcome", {})}
+                }
+            yield ReplayRecord(**data)
+
+
+class SyntheticWorkload:
+    """
+    Synthetic models and requests with known ground truth
+
+    Every model+task pair has a hidden success probability and mean quality,
+    so outcomes can be sampled for any model the router picks and regret is
+    measured against the best eligible model.
+    """
+
+    QUALITY_REQUIREMENTS = (0.5, 0.7, 0.8)
+
+    def __init__(self, num_models: int = 50, seed: int = 0):
+        """
+        Initialize workload
+
+        Args:
+            num_models: Number of synthetic models
+            seed: Random seed
+        """
+        self.random = random.Random(seed)
+        self.models = [self._make_model(i) for i in range(num_models)]
+        self._models_by_id = {model.id: model for model in self.models}
+        self.task_types = list(TaskType)
+
+        # Hidden per model+task (success probability, mean quality)
+        self.truth: Dict[Tuple[str, TaskType], Tuple[float, float]] = {}
+        for model in self.models:
+            for task_type in self.task_types:
+                skill = min(1.0, max(0.0, self.random.gauss(model.quality_score, 0.1)))
+                self.truth[(model.id, task_type)] = (0.5 + skill / 2, skill)
+
+        # Best expected reward per (task type, quality requirement)
+        self._best: Dict[Tuple[TaskType, float], float] = {}
+        for task_type in self.task_types:
+            for requirement in self.QUALITY_REQUIREMENTS:
+                self._best[(task_type, requirement)] = max(
+                    (
+                        self.expected_reward(model.id, task_type)
+                        for model in self.models
+                        if model.quality_score >= requirement
+                    ),
+                    default=0.0
+                )
+
+    def _make_model(self, index: int) -> ModelDefinition:
+        quality = round(self.random.uniform(0.6, 0.98), 3)
+        cost = round(0.0002 + quality ** 4 * self.random.uniform(0.005, 0.03), 6)
+        latency = int(300 + self.random.uniform(0, 2500) * quality)
+        capabilities = [ModelCapability.CODE, ModelCapability.REASONING]
+        capabilities += [
+            capability
+            for capability in (
+                ModelCapability.FUNCTION_CALLING,
+                ModelCapability.VISION,
+                ModelCapability.JSON_MODE
+            )
+            if self.random.random() < 0.5
+        ]
+        return ModelDefinition(
+            id=f"model-{index:04d}",
+            provider=self.random.choice(list(Provider)),
+            capabilities=capabilities,
+            cost_per_1k_input=cost,
+            cost_per_1k_output=cost * 3,
+            context_window=self.random.choice([32000, 128000, 200000]),
+            quality_score=quality,
+            latency_p50_ms=latency,
+            latency_p95_ms=latency * 2
+        )
+
+    def write_config(self, path: Path) -> Path:
+        """Write the synthetic models as a router models.yaml"""
+        with open(path, "w") as f:
+            yaml.safe_dump(
+                {"models": [json.loads(model.model_dump_json()) for model in self.models]},
+                f
+            )
+        return path
+
+    def requests(self, count: int) -> Iterator[ReplayRecord]:
+        """Lazily generate replay records"""
+        for i in range(count):
+            yield ReplayRecord(request=RoutingRequest(
+                task_type=self.random.choice(self.task_types),
+                task_description=f"synthetic request {i}",
+                estimated_input_tokens=self.random.randint(100, 8000),
+                estimated_output_tokens=self.random.randint(100, 2000),
+                quality_requirement=self.random.choice(self.QUALITY_REQUIREMENTS),
+                requires_tools=self.random.random() < 0.2
+            ))
+
+    def expected_reward(self, model_id: str, task_type: TaskType) -> float:
+        """Expected success-weighted quality of a model on a task type"""
+        success, quality = self.truth[(model_id, task_type)]
+        return success * quality
+
+    def outcome(self, record: ReplayRecord, model_id: str) -> Optional[ModelOutcome]:
+        """Sample an outcome for the chosen model"""
+        truth = self.truth.get((model_id, record.request.task_type))
+        if truth is None:
+            return None
+        success, quality = truth
+        model = self._models_by_id[model_id]
+        tokens_in = record.request.estimated_input_tokens or 0
+        tokens_out = record.request.estimated_output_tokens or 0
+        return ModelOutcome(
+            success=self.random.random() < success,
+            quality_score=min(1.0, max(0.0, self.random.gauss(quality, 0.05))),
+            cost=(tokens_in * model.cost_per_1k_input + tokens_out * model.cost_per_1k_output) / 1000,
+            latency_ms=int(self.random.expovariate(1 / model.latency_p50_ms))
+        )
+
+    def regret(self, record: ReplayRecord, model_id: str) -> Optional[float]:
+        """Expected reward lost against the best eligible model"""
+        request = record.request
+        best = self._best.get((request.task_type, request.quality_requirement))
+        if best is None or (model_id, request.task_type) not in self.truth:
+            return None
+        return max(0.0, best - self.expected_reward(model_id, request.task_type))
+
+
+class RoutingSimulator:
+    """Replays records through a router and collects a benchmark report"""
+
+    def __init__(
+        self,
+        router: MoERouter,
+        workload: Optional[SyntheticWorkload] = None,
+        feedback: bool = True
+    ):
+        """
+        Initialize simulator
+
+        Args:
+            router: Router under test
+            workload: Synthetic workload supplying sampled outcomes and
+                regret; logged outcomes are used otherwise
+            feedback: Report outcomes back to the router so learning
+                strategies adapt during the replay
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.router = router
+        self.workload = workload
+        self.feedback = feedback
+
+    def _outcome(self, record: ReplayRecord, model_id: str) -> Optional[ModelOutcome]:
+        if model_id in record.outcomes:
+            return record.outcomes[model_id]
+        if self.workload:
+            return self.workload.outcome(record, model_id)
+        return None
+
+    def _regret(self, record: ReplayRecord, model_id: str) -> Optional[float]:
+        if self.workload:
+            return self.workload.regret(record, model_id)
+
+        # Logged data: only measurable when the chosen model's outcome and
+        # at least one alternative are known
+        if model_id not in record.outcomes or len(record.outcomes) < 2:
+            return None
+        best = max(outcome.reward for outcome in record.outcomes.values())
+        return best - record.outcomes[model_id].reward
+
+    def run(self, records: Iterable[ReplayRecord], limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Replay records and report results
+
+        Args:
+            records: Replay records
+            limit: Stop after this many records
+
+        Returns:
+            Benchmark report
+        """
+        latencies: List[float] = []
+        selections: Counter = Counter()
+        strategies: Counter = Counter()
+        observed = 0
+        successes = 0
+        total_cost = 0.0
+        qualities: List[float] = []
+        regrets: List[float] = []
+        errors = 0
+
+        started = time.perf_counter()
+        for index, record in enumerate(records):
+            if limit is not None and index >= limit:
+                break
+
+            t0 = time.perf_counter()
+            decision = self.router.select_model(record.request)
+            latencies.append(time.perf_counter() - t0)
+
+            strategies[decision.routing_strategy] += 1
+            if decision.routing_strategy == "error":
+                errors += 1
+                continue
+            model_id = decision.selected_model
+            selections[model_id] += 1
+
+            outcome = self._outcome(record, model_id)
+            if outcome is not None:
+                observed += 1
+                successes += outcome.success
+                total_cost += outcome.cost if outcome.cost is not None else decision.estimated_cost
+                if outcome.quality_score is not None:
+                    qualities.append(outcome.quality_score)
+
+                if self.feedback:
+                    self.router.record_request_outcome(
+                        model_id,
+                        success=outcome.success,
+                        latency_ms=outcome.latency_ms,
+                        cost=outcome.cost,
+                        quality_score=outcome.quality_score,
+                        task_type=record.request.task_type
+                    )
+            else:
+                total_cost += decision.estimated_cost
+
+            regret = self._regret(record, model_id)
+            if regret is not None:
+                regrets.append(regret)
+
+        elapsed = time.perf_counter() - started
+        decisions = len(latencies)
+        latency_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+
+        return {
+            "decisions": decisions,
+            "errors": errors,
+            "elapsed_seconds": round(elapsed, 4),
+            "decisions_per_second": round(decisions / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_p50_ms": round(float(np.percentile(latency_ms, 50)), 4),
+            "latency_p99_ms": round(float(np.percentile(latency_ms, 99)), 4),
+            "simulated_cost": round(total_cost, 6),
+            "observed_outcomes": observed,
+            "success_rate": round(successes / observed, 4) if observed else None,
+            "avg_quality": round(float(np.mean(qualities)), 4) if qualities else None,
+            "avg_regret": round(float(np.mean(regrets)), 4) if regrets else None,
+            "cumulative_regret": round(float(np.sum(regrets)), 4) if regrets else None,
+            "unique_models": len(selections),
+            "top_models": selections.most_common(10),
+            "strategy_distribution": dict(strategies)
+        }
+
+
+def compare(
+    routers: Dict[str, Callable[[], MoERouter]],
+    records: Callable[[], Iterable[ReplayRecord]],
+    workload: Optional[SyntheticWorkload] = None,
+    limit: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the same corpus through several router configurations
+
+    Args:
+        routers: Router factories by configuration name
+        records: Factory returning a fresh record iterable per run
+        workload: Optional synthetic workload
+        limit: Stop each run after this many records
+
+    Returns:
+        Report per configuration name
+    """
+    return {
+        name: RoutingSimulator(factory(), workload=workload).run(records(), limit=limit)
+        for name, factory in routers.items()
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point; exits non-zero when a threshold is exceeded"""
+    parser = argparse.ArgumentParser(description="Replay routing requests through MoERouter")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--corpus", help="JSONL file of replay records")
+    source.add_argument("--synthetic", type=int, help="Number of synthetic requests")
+    parser.add_argument("--models", type=int, default=50, help="Synthetic model count")
+    parser.add_argument("--config", help="Router models.yaml (corpus mode)")
+    parser.add_argument(
+        "--mode",
+        action="append",
+        choices=["standard", "thompson", "ucb"],
+        help="Routing mode to run; repeat to compare"
+    )
+    parser.add_argument("--limit", type=int, help="Stop after this many records")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if p99 selection latency exceeds this")
+    parser.add_argument("--min-throughput", type=float, help="Fail if decisions/second is below this")
+    args = parser.parse_args(argv)
+
+    modes = args.mode or ["standard"]
+    workload = None
+    config_path = args.config
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic:
+            workload = SyntheticWorkload(num_models=args.models, seed=args.seed)
+            config_path = str(workload.write_config(Path(tmp) / "models.yaml"))
+            records = lambda: workload.requests(args.synthetic)
+        else:
+            records = lambda: load_corpus(args.corpus)
+
+        reports = compare(
+            {
+                mode: lambda mode=mode: MoERouter(
+                    config_path=config_path,
+                    enable_learning=False,
+                    routing_mode=mode
+                )
+                for mode in modes
+            },
+            records,
+            workload=workload,
+            limit=args.limit
+        )
+
+    print(json.dumps(reports, indent=2))
+
+    failed = False
+    for mode, report in reports.items():
+        if args.max_p99_ms is not None and report["latency_p99_ms"] > args.max_p99_ms:
+            print(f"{mode}: p99 {report['latency_p99_ms']}ms exceeds {args.max_p99_ms}ms", file=sys.stderr)
+            failed = True
+        if args.min_throughput is not None and report["decisions_per_second"] < args.min_throughput:
+            print(
+                f"{mode}: {report['decisions_per_second']} decisions/s below {args.min_throughput}",
+                file=sys.stderr
+            )
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
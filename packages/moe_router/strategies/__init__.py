@@ -3,6 +3,7 @@ from .cost_predictor import CostPredictor
 from .performance_tracker import PerformanceTracker
 from .hybrid_router import HybridRouter, ConsensusStrategy
 from .learning_loop import LearningLoop
+from .bandit_router import BanditRouter
 
 __all__ = [
     "CostPredictor",
@@ -10,4 +11,5 @@ __all__ = [
     "HybridRouter",
     "ConsensusStrategy",
     "LearningLoop",
+    "BanditRouter",
 ]
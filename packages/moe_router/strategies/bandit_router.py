@@ -0,0 +1,332 @@
+"""
+Bandit Routing Strategy
+
+Treats each model+task combination as a bandit arm with Beta posteriors over
+success and quality. Models are ranked by a cost- and latency-aware reward
+using Thompson sampling or UCB, so models with little data are explored in
+proportion to their uncertainty instead of through manual A/B tests.
+"""
+import logging
+import math
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import Counter
+
+from ..models import ModelDefinition, TaskType
+
+
+class ArmPosterior:
+    """Posterior state for one model+task arm, updated in O(1)"""
+
+    __slots__ = (
+        "success_alpha",
+        "success_beta",
+        "quality_alpha",
+        "quality_beta",
+        "pulls",
+        "avg_latency_ms",
+        "avg_cost"
+    )
+
+    # Exponential moving average rate for latency and cost
+    EMA_ALPHA = 0.1
+
+    def __init__(self, prior_quality: float = 0.5, prior_strength: float = 2.0):
+        # Priors centred on the configured quality score, worth
+        # `prior_strength` pseudo-observations
+        self.success_alpha = 1.0 + prior_strength * prior_quality
+        self.success_beta = 1.0 + prior_strength * (1 - prior_quality)
+        self.quality_alpha = self.success_alpha
+        self.quality_beta = self.success_beta
+        self.pulls = 0
+        self.avg_latency_ms: Optional[float] = None
+        self.avg_cost: Optional[float] = None
+
+    def update(
+        self,
+        success: bool,
+        quality_score: Optional[float] = None,
+        latency_ms: Optional[int] = None,
+        cost: Optional[float] = None
+    ):
+        """Add one observed outcome"""
+        self.pulls += 1
+        if success:
+            self.success_alpha += 1
+        else:
+            self.success_beta += 1
+
+        # Fractional Bernoulli update keeps the quality posterior conjugate
+        if quality_score is not None:
+            self.quality_alpha += quality_score
+            self.quality_beta += 1 - quality_score
+
+        if latency_ms is not None:
+            self.avg_latency_ms = self._ema(self.avg_latency_ms, float(latency_ms))
+        if cost is not None:
+            self.avg_cost = self._ema(self.avg_cost, cost)
+
+    def _ema(self, current: Optional[float], value: float) -> float:
+        if current is None:
+            return value
+        return self.EMA_ALPHA * value + (1 - self.EMA_ALPHA) * current
+
+    @property
+    def success_mean(self) -> float:
+        return self.success_alpha / (self.success_alpha + self.success_beta)
+
+    @property
+    def quality_mean(self) -> float:
+        return self.quality_alpha / (self.quality_alpha + self.quality_beta)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize posterior state"""
+        return {
+            "pulls": self.pulls,
+            "success_mean": round(self.success_mean, 4),
+            "quality_mean": round(self.quality_mean, 4),
+            "avg_latency_ms": self.avg_latency_ms,
+            "avg_cost": self.avg_cost
+        }
+
+
+class BanditRouter:
+    """Ranks models with Thompson sampling or UCB over per-arm posteriors"""
+
+    STRATEGIES = ("thompson", "ucb")
+
+    def __init__(
+        self,
+        strategy: str = "thompson",
+        cost_weight: float = 0.3,
+        latency_weight: float = 0.1,
+        prior_strength: float = 2.0,
+        ucb_exploration: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize bandit router
+
+        Args:
+            strategy: Default selection strategy (thompson, ucb)
+            cost_weight: Reward penalty for the most expensive candidate
+            latency_weight: Reward penalty for the slowest candidate
+            prior_strength: Pseudo-observations given to the configured
+                quality score
+            ucb_exploration: UCB exploration coefficient
+            seed: Random seed for reproducible sampling
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown bandit strategy: {strategy}")
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.strategy = strategy
+        self.cost_weight = cost_weight
+        self.latency_weight = latency_weight
+        self.prior_strength = prior_strength
+        self.ucb_exploration = ucb_exploration
+        self.random = random.Random(seed)
+        self.arms: Dict[Tuple[str, TaskType], ArmPosterior] = {}
+        self.total_pulls: Counter = Counter()
+
+    def _get_arm(
+        self,
+        model_id: str,
+        task_type: TaskType,
+        prior_quality: float = 0.5
+    ) -> ArmPosterior:
+        """Get or create the posterior for a model+task arm"""
+        key = (model_id, task_type)
+        arm = self.arms.get(key)
+        if arm is None:
+            arm = ArmPosterior(prior_quality, self.prior_strength)
+            self.arms[key] = arm
+        return arm
+
+    def update(
+        self,
+        model_id: str,
+        task_type: TaskType,
+        success: bool,
+        quality_score: Optional[float] = None,
+        latency_ms: Optional[int] = None,
+        cost: Optional[float] = None,
+        prior_quality: float = 0.5
+    ):
+        """
+        Update posteriors with an observed outcome
+
+        Args:
+            model_id: Model identifier
+            task_type: Task type
+            success: Whether request succeeded
+            quality_score: Quality score (0-1)
+            latency_ms: Latency in milliseconds
+            cost: Actual cost
+            prior_quality: Prior used if the arm has not been seen yet
+        """
+        arm = self._get_arm(model_id, task_type, prior_quality)
+        arm.update(success, quality_score, latency_ms, cost)
+        self.total_pulls[task_type] += 1
+
+    def rank(
+        self,
+        task_type: TaskType,
+        models: List[ModelDefinition],
+        expected_costs: Dict[str, float],
+        strategy: Optional[str] = None
+    ) -> List[Tuple[ModelDefinition, float, Dict[str, float]]]:
+        """
+        Rank candidate models by sampled or optimistic reward
+
+        Args:
+            task_type: Task type
+            models: Candidate models
+            expected_costs: Expected request cost per model ID
+            strategy: Selection strategy, defaults to the router's
+
+        Returns:
+            List of (model, reward, factors) sorted by reward descending
+        """
+        strategy = strategy or self.strategy
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown bandit strategy: {strategy}")
+
+        penalties = self._penalties(task_type, models, expected_costs)
+        total = self.total_pulls[task_type]
+        ranked = []
+
+        for model in models:
+            arm = self._get_arm(model.id, task_type, model.quality_score)
+
+            if strategy == "thompson":
+                success = self.random.betavariate(arm.success_alpha, arm.success_beta)
+                quality = self.random.betavariate(arm.quality_alpha, arm.quality_beta)
+                bonus = 0.0
+            else:
+                success = arm.success_mean
+                quality = arm.quality_mean
+                bonus = self.ucb_exploration * math.sqrt(
+                    2 * math.log(total + 1) / (arm.pulls + 1)
+                )
+
+            reward = success * quality - penalties[model.id] + bonus
+            ranked.append((model, reward, {
+                "success": round(success, 4),
+                "quality": round(quality, 4),
+                "penalty": round(penalties[model.id], 4),
+                "bonus": round(bonus, 4)
+            }))
+
+        ranked.sort(key=lambda x: x[1], reverse=True)
+        return ranked
+
+    def _penalties(
+        self,
+        task_type: TaskType,
+        models: List[ModelDefinition],
+        expected_costs: Dict[str, float]
+    ) -> Dict[str, float]:
+        """Cost and latency penalties normalized across the candidates"""
+        latencies = {}
+        for model in models:
+            arm = self.arms.get((model.id, task_type))
+            if arm and arm.avg_latency_ms is not None:
+                latencies[model.id] = arm.avg_latency_ms
+            else:
+                latencies[model.id] = float(model.latency_p50_ms or 0)
+
+        max_cost = max((expected_costs.get(m.id, 0.0) for m in models), default=0.0)
+        max_latency = max(latencies.values(), default=0.0)
+
+        penalties = {}
+        for model in models:
+            penalty = 0.0
+            if max_cost > 0:
+                penalty += self.cost_weight * expected_costs.get(model.id, 0.0) / max_cost
+            if max_latency > 0:
+                penalty += self.latency_weight * latencies[model.id] / max_latency
+            penalties[model.id] = penalty
+        return penalties
+
+    def replay(
+        self,
+        records: Iterable[Dict[str, Any]],
+        models: List[ModelDefinition],
+        strategy: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate the policy offline against logged routing decisions
+
+        Uses the replay method: a logged record counts, and updates the
+        posteriors, only when the policy picks the model that was logged.
+
+        Args:
+            records: Logged decisions with task_type, model_id, success and
+                optional quality_score, cost, latency_ms, candidates
+                (model IDs) and expected_costs (model ID -> cost)
+            models: Model definitions referenced by the records
+            strategy: Selection strategy, defaults to the router's
+
+        Returns:
+            Replay statistics
+        """
+        by_id = {model.id: model for model in models}
+        total = 0
+        matched = 0
+        total_reward = 0.0
+        selections: Counter = Counter()
+
+        for record in records:
+            total += 1
+            task_type = TaskType(record["task_type"])
+            candidates = [
+                by_id[model_id]
+                for model_id in record.get("candidates") or by_id
+                if model_id in by_id
+            ]
+            if record["model_id"] not in by_id or not candidates:
+                continue
+
+            expected_costs = {
+                model.id: record.get("expected_costs", {}).get(
+                    model.id, (model.cost_per_1k_input + model.cost_per_1k_output) / 2
+                )
+                for model in candidates
+            }
+            chosen = self.rank(task_type, candidates, expected_costs, strategy)[0][0]
+            selections[chosen.id] += 1
+            if chosen.id != record["model_id"]:
+                continue
+
+            matched += 1
+            quality = record.get("quality_score")
+            penalty = self._penalties(task_type, candidates, expected_costs)[chosen.id]
+            total_reward += (
+                float(record["success"]) * (quality if quality is not None else 1.0) - penalty
+            )
+            self.update(
+                chosen.id,
+                task_type,
+                success=record["success"],
+                quality_score=quality,
+                latency_ms=record.get("latency_ms"),
+                cost=record.get("cost"),
+                prior_quality=chosen.quality_score
+            )
+
+        return {
+            "records": total,
+            "matched": matched,
+            "match_rate": round(matched / total, 4) if total else 0.0,
+            "avg_reward": round(total_reward / matched, 4) if matched else 0.0,
+            "selections": dict(selections)
+        }
+
+    def get_arm_stats(self, task_type: Optional[TaskType] = None) -> Dict[str, Dict[str, Any]]:
+        """Posterior summaries keyed by model:task"""
+        return {
+            f"{model_id}:{arm_task.value}": arm.to_dict()
+            for (model_id, arm_task), arm in self.arms.items()
+            if task_type is None or arm_task == task_type
+        }
@@ -3,10 +3,15 @@ Learning Loop Strategy
 
 Implements feedback collection, A/B testing, and continuous improvement
 of routing decisions based on outcomes.
+Learned weights and A/B statistics are shared through Redis when available,
+with each replica keeping an incrementally synced local copy.
 """
+import json
 import logging
+import math
 import random
-from typing import Dict, List, Optional, Tuple, Any
+import time
+from typing import Dict, Optional, Tuple, Any
 from datetime import datetime, timedelta
 from collections import defaultdict
 import numpy as np
@@ -20,6 +25,100 @@ from ..models import (
 )
 
 
+class VariantStats:
+    """
+    Streaming sufficient statistics for one A/B test variant
+
+    Keeps counts and sums instead of raw feedback so memory stays constant
+    and replicas can merge their updates with HINCRBYFLOAT.
+    """
+
+    FIELDS = (
+        "count",
+        "score_sum",
+        "score_sq_sum",
+        "successes",
+        "cost_count",
+        "cost_sum",
+        "quality_count",
+        "quality_sum"
+    )
+
+    def __init__(self, **values: float):
+        for field in self.FIELDS:
+            setattr(self, field, float(values.get(field, 0.0)))
+
+    @classmethod
+    def increments(cls, feedback: FeedbackData, score: float) -> Dict[str, float]:
+        """Field increments contributed by one feedback sample"""
+        increments = {
+            "count": 1.0,
+            "score_sum": score,
+            "score_sq_sum": score * score,
+            "successes": 1.0 if feedback.outcome == "success" else 0.0
+        }
+        if feedback.actual_cost is not None:
+            increments["cost_count"] = 1.0
+            increments["cost_sum"] = feedback.actual_cost
+        if feedback.quality_score is not None:
+            increments["quality_count"] = 1.0
+            increments["quality_sum"] = feedback.quality_score
+        return increments
+
+    def apply(self, increments: Dict[str, float]):
+        """Add field increments"""
+        for field, value in increments.items():
+            setattr(self, field, getattr(self, field) + value)
+
+    @property
+    def samples(self) -> int:
+        """Number of feedback samples"""
+        return int(self.count)
+
+    def summary(self) -> Dict[str, float]:
+        """Calculate variant statistics"""
+        if not self.count:
+            return {
+                "avg_score": 0.0,
+                "score_std": 0.0,
+                "success_rate": 0.0,
+                "avg_cost": 0.0,
+                "avg_quality": 0.0
+            }
+
+        mean = self.score_sum / self.count
+        variance = max(0.0, self.score_sq_sum / self.count - mean * mean)
+
+        return {
+            "avg_score": round(mean, 4),
+            "score_std": round(math.sqrt(variance), 4),
+            "success_rate": round(self.successes / self.count, 4),
+            "avg_cost": round(self.cost_sum / self.cost_count, 6) if self.cost_count else 0.0,
+            "avg_quality": round(self.quality_sum / self.quality_count, 4) if self.quality_count else 0.0
+        }
+
+    def to_dict(self) -> Dict[str, float]:
+        """Serialize statistics"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+# Atomic EMA update of one weight field. Bumps the global version counter and
+# records it against the field so replicas can pull only what changed.
+# KEYS: weights hash, version counter, changes zset
+# ARGV: field, alpha, default weight, target score
+_EMA_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or ARGV[3])
+local alpha = tonumber(ARGV[2])
+local weight = alpha * tonumber(ARGV[4]) + (1 - alpha) * current
+if weight < 0 then weight = 0 elseif weight > 1 then weight = 1 end
+weight = tostring(weight)
+redis.call('HSET', KEYS[1], ARGV[1], weight)
+local version = redis.call('INCR', KEYS[2])
+redis.call('ZADD', KEYS[3], version, ARGV[1])
+return {weight, version}
+"""
+
+
 class ABTestConfig:
     """Configuration for A/B testing"""
     def __init__(
@@ -40,8 +139,36 @@ class ABTestConfig:
         self.min_samples = min_samples
         self.duration_days = duration_days
         self.start_time = datetime.utcnow()
-        self.results_a: List[FeedbackData] = []
-        self.results_b: List[FeedbackData] = []
+        self.stats_a = VariantStats()
+        self.stats_b = VariantStats()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize test configuration (without statistics)"""
+        return {
+            "test_id": self.test_id,
+            "model_a": self.model_a,
+            "model_b": self.model_b,
+            "task_type": self.task_type.value,
+            "traffic_split": self.traffic_split,
+            "min_samples": self.min_samples,
+            "duration_days": self.duration_days,
+            "start_time": self.start_time.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ABTestConfig":
+        """Deserialize test configuration produced by to_dict"""
+        config = cls(
+            test_id=data["test_id"],
+            model_a=data["model_a"],
+            model_b=data["model_b"],
+            task_type=TaskType(data["task_type"]),
+            traffic_split=data["traffic_split"],
+            min_samples=data["min_samples"],
+            duration_days=data["duration_days"]
+        )
+        config.start_time = datetime.fromisoformat(data["start_time"])
+        return config
 
 
 class LearningLoop:
@@ -64,17 +191,188 @@ class LearningLoop:
     PR_MERGED_BONUS = 0.2
     PR_REVERTED_PENALTY = -0.5
 
-    def __init__(self, performance_tracker=None):
+    # Exponential moving average learning rate
+    LEARNING_RATE = 0.1
+    DEFAULT_WEIGHT = 0.5
+
+    # A/B statistics are kept this long after a test ends
+    AB_STATS_RETENTION_DAYS = 30
+
+    def __init__(
+        self,
+        performance_tracker=None,
+        redis_client=None,
+        namespace: str = "moe:learning",
+        sync_interval_seconds: float = 5.0,
+        snapshot_interval_seconds: float = 300.0
+    ):
         """
         Initialize learning loop
 
         Args:
             performance_tracker: Optional PerformanceTracker instance
+            redis_client: Redis client (decode_responses=True) for shared
+                state; defaults to the performance tracker's connection
+            namespace: Redis key namespace
+            sync_interval_seconds: Minimum seconds between incremental syncs
+            snapshot_interval_seconds: Seconds between full reloads of the
+                shared weights
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.performance_tracker = performance_tracker
         self.ab_tests: Dict[str, ABTestConfig] = {}
-        self.model_weights: Dict[Tuple[str, TaskType], float] = defaultdict(lambda: 0.5)
+        self.model_weights: Dict[Tuple[str, TaskType], float] = defaultdict(
+            lambda: self.DEFAULT_WEIGHT
+        )
+
+        if redis_client is None and getattr(performance_tracker, "use_redis", False) is True:
+            redis_client = performance_tracker.redis
+
+        self.redis = redis_client
+        self.use_redis = redis_client is not None
+        self.namespace = namespace
+        self.sync_interval_seconds = sync_interval_seconds
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self._synced_version = 0
+        self._next_sync = 0.0
+        self._next_snapshot = 0.0
+
+        if self.use_redis:
+            self._ema_script = self.redis.register_script(_EMA_SCRIPT)
+            self.sync(full=True)
+
+    # Shared State
+
+    @property
+    def _weights_key(self) -> str:
+        return f"{self.namespace}:weights"
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.namespace}:weights:version"
+
+    @property
+    def _changes_key(self) -> str:
+        return f"{self.namespace}:weights:changes"
+
+    @property
+    def _ab_tests_key(self) -> str:
+        return f"{self.namespace}:ab_tests"
+
+    def _ab_stats_key(self, test_id: str, variant: str) -> str:
+        return f"{self.namespace}:ab:{test_id}:{variant}"
+
+    @staticmethod
+    def _weight_field(model_id: str, task_type: TaskType) -> str:
+        return f"{model_id}:{task_type.value}"
+
+    @staticmethod
+    def _parse_weight_field(field: str) -> Tuple[str, TaskType]:
+        model_id, task_type = field.rsplit(":", 1)
+        return model_id, TaskType(task_type)
+
+    def sync(self, full: bool = False) -> int:
+        """
+        Pull shared state from Redis into the local copy
+
+        Incremental syncs fetch only weights whose version is newer than the
+        last one seen; a full sync reloads the whole weights hash.
+
+        Args:
+            full: Reload a complete snapshot instead of changes only
+
+        Returns:
+            Number of weights refreshed
+        """
+        if not self.use_redis:
+            return 0
+
+        now = time.monotonic()
+        full = full or now >= self._next_snapshot
+        self._next_sync = now + self.sync_interval_seconds
+
+        try:
+            if full:
+                # Read the version first so writes racing the snapshot are
+                # picked up again by the next incremental sync
+                version = int(self.redis.get(self._version_key) or 0)
+                snapshot = self.redis.hgetall(self._weights_key)
+                weights = defaultdict(lambda: self.DEFAULT_WEIGHT)
+                for field, value in snapshot.items():
+                    self._store_local(weights, field, value)
+                self.model_weights = weights
+                self._next_snapshot = now + self.snapshot_interval_seconds
+                refreshed = len(snapshot)
+            else:
+                changes = self.redis.zrangebyscore(
+                    self._changes_key, f"({self._synced_version}", "+inf", withscores=True
+                )
+                if not changes:
+                    return 0
+                fields = [field for field, _ in changes]
+                values = self.redis.hmget(self._weights_key, fields)
+                for field, value in zip(fields, values):
+                    if value is not None:
+                        self._store_local(self.model_weights, field, value)
+                version = int(max(score for _, score in changes))
+                refreshed = len(fields)
+
+            self._synced_version = max(self._synced_version, version)
+            self._sync_ab_tests()
+            return refreshed
+
+        except Exception as e:
+            self.logger.warning(f"Learning state sync failed: {e}")
+            return 0
+
+    def _maybe_sync(self):
+        """Run an incremental sync if the sync interval has elapsed"""
+        if self.use_redis and time.monotonic() >= self._next_sync:
+            self.sync()
+
+    def _store_local(self, weights: Dict, field: str, value: str):
+        """Store a Redis weight field in a local weights map"""
+        try:
+            weights[self._parse_weight_field(field)] = float(value)
+        except ValueError:
+            self.logger.debug(f"Ignoring unknown weight field {field}")
+
+    def _sync_ab_tests(self):
+        """Load A/B tests started by other replicas"""
+        for test_id, data in self.redis.hgetall(self._ab_tests_key).items():
+            if test_id not in self.ab_tests:
+                self.ab_tests[test_id] = ABTestConfig.from_dict(json.loads(data))
+
+    def _load_ab_stats(self, test: ABTestConfig):
+        """Refresh a test's variant statistics from Redis"""
+        if not self.use_redis:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hgetall(self._ab_stats_key(test.test_id, "a"))
+            pipe.hgetall(self._ab_stats_key(test.test_id, "b"))
+            data_a, data_b = pipe.execute()
+            test.stats_a = VariantStats(**data_a)
+            test.stats_b = VariantStats(**data_b)
+        except Exception as e:
+            self.logger.warning(f"Failed to load A/B stats for {test.test_id}: {e}")
+
+    def _apply_ema(self, key: Tuple[str, TaskType], target: float, alpha: float) -> float:
+        """Move a weight towards target, atomically in Redis when shared"""
+        if self.use_redis:
+            try:
+                weight, _ = self._ema_script(
+                    keys=[self._weights_key, self._version_key, self._changes_key],
+                    args=[self._weight_field(*key), alpha, self.DEFAULT_WEIGHT, target]
+                )
+                self.model_weights[key] = float(weight)
+                return self.model_weights[key]
+            except Exception as e:
+                self.logger.warning(f"Shared weight update failed, updating locally: {e}")
+
+        new_weight = alpha * target + (1 - alpha) * self.model_weights[key]
+        self.model_weights[key] = max(0.0, min(1.0, new_weight))
+        return self.model_weights[key]
 
     def collect_feedback(
         self,
@@ -115,13 +413,7 @@ class LearningLoop:
 
         # Update weight with exponential moving average
         current_weight = self.model_weights[key]
-        alpha = 0.1  # Learning rate
-        new_weight = alpha * score + (1 - alpha) * current_weight
-
-        # Clamp to [0, 1]
-        new_weight = max(0.0, min(1.0, new_weight))
-
-        self.model_weights[key] = new_weight
+        new_weight = self._apply_ema(key, score, self.LEARNING_RATE)
 
         self.logger.debug(
             f"Updated weight for {feedback.model_id} on {feedback.task_type}: "
@@ -163,19 +455,44 @@ class LearningLoop:
         Returns:
             Weight (0-1), higher means better historical performance
         """
+        self._maybe_sync()
         key = (model_id, task_type)
-        return self.model_weights.get(key, 0.5)  # Default to neutral
+        return self.model_weights.get(key, self.DEFAULT_WEIGHT)  # Default to neutral
 
     def _update_ab_test(self, feedback: FeedbackData):
         """Update A/B test results if feedback belongs to a test"""
+        self._maybe_sync()
+        score = None
+
         for test in self.ab_tests.values():
             if feedback.task_type != test.task_type:
                 continue
 
             if feedback.model_id == test.model_a:
-                test.results_a.append(feedback)
+                variant, stats = "a", test.stats_a
             elif feedback.model_id == test.model_b:
-                test.results_b.append(feedback)
+                variant, stats = "b", test.stats_b
+            else:
+                continue
+
+            if score is None:
+                score = self._calculate_feedback_score(feedback)
+            increments = VariantStats.increments(feedback, score)
+            stats.apply(increments)
+
+            if self.use_redis:
+                try:
+                    key = self._ab_stats_key(test.test_id, variant)
+                    retention = timedelta(
+                        days=test.duration_days + self.AB_STATS_RETENTION_DAYS
+                    )
+                    pipe = self.redis.pipeline()
+                    for field, value in increments.items():
+                        pipe.hincrbyfloat(key, field, value)
+                    pipe.expire(key, retention)
+                    pipe.execute()
+                except Exception as e:
+                    self.logger.warning(f"Failed to record A/B stats for {test.test_id}: {e}")
 
     def _log_insights(
         self,
@@ -245,6 +562,12 @@ class LearningLoop:
 
         self.ab_tests[test_id] = config
 
+        if self.use_redis:
+            try:
+                self.redis.hset(self._ab_tests_key, test_id, json.dumps(config.to_dict()))
+            except Exception as e:
+                self.logger.warning(f"Failed to share A/B test {test_id}: {e}")
+
         self.logger.info(
             f"Started A/B test {test_id}: {model_a} vs {model_b} "
             f"for {task_type} (split: {traffic_split:.0%})"
@@ -300,20 +623,23 @@ class LearningLoop:
         Returns:
             Analysis results
         """
+        if test_id not in self.ab_tests:
+            self._maybe_sync()
         if test_id not in self.ab_tests:
             return {"error": "Test not found"}
 
         test = self.ab_tests[test_id]
+        self._load_ab_stats(test)
 
         # Calculate statistics for each variant
-        stats_a = self._calculate_variant_stats(test.results_a)
-        stats_b = self._calculate_variant_stats(test.results_b)
+        stats_a = test.stats_a.summary()
+        stats_b = test.stats_b.summary()
 
         # Determine winner
         winner = None
         confidence = 0.0
 
-        if len(test.results_a) >= test.min_samples and len(test.results_b) >= test.min_samples:
+        if test.stats_a.samples >= test.min_samples and test.stats_b.samples >= test.min_samples:
             # Statistical comparison
             if stats_a["avg_score"] > stats_b["avg_score"] * 1.05:  # 5% threshold
                 winner = test.model_a
@@ -331,12 +657,12 @@ class LearningLoop:
             "duration_days": (datetime.utcnow() - test.start_time).days,
             "variant_a": {
                 "model": test.model_a,
-                "samples": len(test.results_a),
+                "samples": test.stats_a.samples,
                 **stats_a
             },
             "variant_b": {
                 "model": test.model_b,
-                "samples": len(test.results_b),
+                "samples": test.stats_b.samples,
                 **stats_b
             },
             "winner": winner,
@@ -344,28 +670,6 @@ class LearningLoop:
             "recommendation": self._get_ab_recommendation(test, stats_a, stats_b, winner)
         }
 
-    def _calculate_variant_stats(self, results: List[FeedbackData]) -> Dict[str, float]:
-        """Calculate statistics for A/B test variant"""
-        if not results:
-            return {
-                "avg_score": 0.0,
-                "success_rate": 0.0,
-                "avg_cost": 0.0,
-                "avg_quality": 0.0
-            }
-
-        scores = [self._calculate_feedback_score(r) for r in results]
-        successes = sum(1 for r in results if r.outcome == "success")
-        costs = [r.actual_cost for r in results if r.actual_cost is not None]
-        qualities = [r.quality_score for r in results if r.quality_score is not None]
-
-        return {
-            "avg_score": round(np.mean(scores), 4),
-            "success_rate": round(successes / len(results), 4),
-            "avg_cost": round(np.mean(costs), 6) if costs else 0.0,
-            "avg_quality": round(np.mean(qualities), 4) if qualities else 0.0
-        }
-
     def _get_ab_recommendation(
         self,
         test: ABTestConfig,
@@ -375,7 +679,7 @@ class LearningLoop:
     ) -> str:
         """Generate recommendation from A/B test"""
         if not winner:
-            if len(test.results_a) < test.min_samples or len(test.results_b) < test.min_samples:
+            if test.stats_a.samples < test.min_samples or test.stats_b.samples < test.min_samples:
                 return "Insufficient data - continue test"
             else:
                 return "No clear winner - results are statistically similar"
@@ -463,6 +767,11 @@ class LearningLoop:
         Returns:
             Exported metrics
         """
+        self._maybe_sync()
+        active_tests = [test for test in self.ab_tests.values() if self._is_test_active(test)]
+        for test in active_tests:
+            self._load_ab_stats(test)
+
         metrics = {
             "timestamp": datetime.utcnow().isoformat(),
             "model_weights": {
@@ -475,11 +784,10 @@ class LearningLoop:
                     "model_a": test.model_a,
                     "model_b": test.model_b,
                     "task_type": test.task_type.value,
-                    "samples_a": len(test.results_a),
-                    "samples_b": len(test.results_b)
+                    "samples_a": test.stats_a.samples,
+                    "samples_b": test.stats_b.samples
                 }
-                for test in self.ab_tests.values()
-                if self._is_test_active(test)
+                for test in active_tests
             ]
         }
 
@@ -497,18 +805,21 @@ class LearningLoop:
             model_id: Optional model ID filter
             task_type: Optional task type filter
         """
-        if model_id is None and task_type is None:
+        self.sync(full=True)
+
+        if model_id is None and task_type is None and not self.use_redis:
             # Reset all
             self.model_weights.clear()
             self.logger.info("Reset all learned weights")
         else:
-            # Reset filtered
+            # Reset filtered; shared weights are reset through the versioned
+            # update path so other replicas pick the change up
             keys_to_reset = [
                 key for key in self.model_weights.keys()
                 if (model_id is None or key[0] == model_id) and
                    (task_type is None or key[1] == task_type)
             ]
             for key in keys_to_reset:
-                self.model_weights[key] = 0.5
+                self._apply_ema(key, self.DEFAULT_WEIGHT, alpha=1.0)
 
             self.logger.info(f"Reset {len(keys_to_reset)} weights")
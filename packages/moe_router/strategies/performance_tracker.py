@@ -2,8 +2,11 @@
 Performance Tracking Strategy
 
 Tracks success rates, latency, and quality metrics for model+task combinations.
-Uses Redis for persistent storage with time-based decay.
+Uses Redis for persistent storage with time-based decay. Feedback is indexed
+in per model+task sorted sets scored by timestamp, and the set of tracked
+combinations is kept so queries never scan the keyspace.
 """
+import heapq
 import json
 import logging
 from typing import Dict, List, Optional, Tuple
@@ -34,6 +37,10 @@ class PerformanceTracker:
     MIN_REQUESTS_FOR_CONFIDENCE = 10
     CONFIDENCE_WEIGHT_SCALE = 100
 
+    # Storage retention
+    METRICS_TTL = timedelta(days=30)
+    FEEDBACK_TTL = timedelta(days=90)
+
     def __init__(
         self,
         redis_url: Optional[str] = None,
@@ -77,6 +84,42 @@ class PerformanceTracker:
         """Generate Redis key for feedback data"""
         return f"{self.namespace}:feedback:{request_id}"
 
+    def _get_feedback_index_key(self, model_id: str, task_type: TaskType) -> str:
+        """Generate Redis key for the feedback index of a model+task combination"""
+        return f"{self.namespace}:feedback_index:{model_id}:{task_type.value}"
+
+    @property
+    def _combinations_key(self) -> str:
+        """Redis set of model+task combinations with metrics or feedback"""
+        return f"{self.namespace}:combinations"
+
+    @staticmethod
+    def _combination(model_id: str, task_type: TaskType) -> str:
+        return f"{model_id}:{task_type.value}"
+
+    def _get_combinations(
+        self,
+        model_id: Optional[str] = None,
+        task_type: Optional[TaskType] = None
+    ) -> List[Tuple[str, TaskType]]:
+        """List tracked model+task combinations matching the filters"""
+        if model_id and task_type:
+            return [(model_id, task_type)]
+
+        combinations = []
+        for member in self.redis.smembers(self._combinations_key):
+            member_model, member_task = member.rsplit(":", 1)
+            try:
+                member_task = TaskType(member_task)
+            except ValueError:
+                continue
+            if model_id and member_model != model_id:
+                continue
+            if task_type and member_task != task_type:
+                continue
+            combinations.append((member_model, member_task))
+        return combinations
+
     def record_request(
         self,
         model_id: str,
@@ -179,12 +222,11 @@ class PerformanceTracker:
             # Update timestamp
             metrics.last_updated = datetime.utcnow()
 
-            # Save back to Redis with TTL
-            self.redis.setex(
-                key,
-                timedelta(days=30),  # 30 day TTL
-                metrics.json()
-            )
+            # Save back to Redis with TTL and register the combination
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setex(key, self.METRICS_TTL, metrics.json())
+            pipe.sadd(self._combinations_key, self._combination(model_id, task_type))
+            pipe.execute()
 
         except Exception as e:
             self.logger.error(f"Error recording request in Redis: {e}")
@@ -370,12 +412,19 @@ class PerformanceTracker:
         """
         if self.use_redis:
             try:
-                key = self._get_feedback_key(feedback.request_id)
-                self.redis.setex(
-                    key,
-                    timedelta(days=90),  # 90 day TTL
+                index_key = self._get_feedback_index_key(feedback.model_id, feedback.task_type)
+                cutoff = (datetime.utcnow() - self.FEEDBACK_TTL).timestamp()
+
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.setex(
+                    self._get_feedback_key(feedback.request_id),
+                    self.FEEDBACK_TTL,
                     feedback.json()
                 )
+                pipe.zadd(index_key, {feedback.request_id: feedback.timestamp.timestamp()})
+                pipe.zremrangebyscore(index_key, "-inf", cutoff)
+                pipe.expire(index_key, self.FEEDBACK_TTL)
+                pipe.execute()
             except Exception as e:
                 self.logger.error(f"Error recording feedback in Redis: {e}")
         else:
@@ -410,31 +459,11 @@ class PerformanceTracker:
             List of feedback data
         """
         if self.use_redis:
-            # Query Redis for feedback
-            pattern = f"{self.namespace}:feedback:*"
-            feedback_list = []
-
             try:
-                for key in self.redis.scan_iter(match=pattern, count=1000):
-                    data = self.redis.get(key)
-                    if data:
-                        feedback = FeedbackData.parse_raw(data)
-
-                        # Apply filters
-                        if model_id and feedback.model_id != model_id:
-                            continue
-                        if task_type and feedback.task_type != task_type:
-                            continue
-
-                        feedback_list.append(feedback)
-
-                        if len(feedback_list) >= limit:
-                            break
-
+                return self._get_feedback_history_redis(model_id, task_type, limit)
             except Exception as e:
                 self.logger.error(f"Error retrieving feedback from Redis: {e}")
-
-            return feedback_list
+                return []
         else:
             # Filter in-memory feedback
             filtered = self._feedback_history
@@ -446,6 +475,106 @@ class PerformanceTracker:
 
             return filtered[-limit:]
 
+    def _get_feedback_history_redis(
+        self,
+        model_id: Optional[str],
+        task_type: Optional[TaskType],
+        limit: int
+    ) -> List[FeedbackData]:
+        """Fetch the newest feedback from the matching indexes, oldest first"""
+        index_keys = [
+            self._get_feedback_index_key(combo_model, combo_task)
+            for combo_model, combo_task in self._get_combinations(model_id, task_type)
+        ]
+        if not index_keys or limit <= 0:
+            return []
+
+        # Newest `limit` entries of each index, merged by timestamp
+        pipe = self.redis.pipeline(transaction=False)
+        for index_key in index_keys:
+            pipe.zrevrange(index_key, 0, limit - 1, withscores=True)
+        ranges = pipe.execute()
+
+        newest = heapq.nlargest(
+            limit,
+            (
+                (score, request_id, index_key)
+                for index_key, entries in zip(index_keys, ranges)
+                for request_id, score in entries
+            )
+        )
+        if not newest:
+            return []
+
+        values = self.redis.mget([self._get_feedback_key(request_id) for _, request_id, _ in newest])
+
+        feedback_list = []
+        expired = defaultdict(list)
+        for (_, request_id, index_key), data in zip(newest, values):
+            if data:
+                feedback_list.append(FeedbackData.parse_raw(data))
+            else:
+                expired[index_key].append(request_id)
+
+        # Drop index entries whose feedback has expired
+        if expired:
+            pipe = self.redis.pipeline(transaction=False)
+            for index_key, request_ids in expired.items():
+                pipe.zrem(index_key, *request_ids)
+            pipe.execute()
+
+        feedback_list.reverse()
+        return feedback_list
+
+    def rebuild_feedback_index(self) -> int:
+        """
+        Index feedback stored before the feedback index existed
+
+        Scans the keyspace once; regular queries never scan.
+
+        Returns:
+            Number of feedback records indexed
+        """
+        if not self.use_redis:
+            return 0
+
+        indexed = 0
+        pattern = f"{self.namespace}:feedback:*"
+        try:
+            batch = []
+            for key in self.redis.scan_iter(match=pattern, count=1000):
+                batch.append(key)
+                if len(batch) >= 1000:
+                    indexed += self._index_feedback_keys(batch)
+                    batch = []
+            if batch:
+                indexed += self._index_feedback_keys(batch)
+        except Exception as e:
+            self.logger.error(f"Error rebuilding feedback index: {e}")
+
+        self.logger.info(f"Indexed {indexed} feedback records")
+        return indexed
+
+    def _index_feedback_keys(self, keys: List[str]) -> int:
+        """Add a batch of feedback keys to their indexes"""
+        pipe = self.redis.pipeline(transaction=False)
+        indexed = 0
+        for data in self.redis.mget(keys):
+            if not data:
+                continue
+            feedback = FeedbackData.parse_raw(data)
+            pipe.zadd(
+                self._get_feedback_index_key(feedback.model_id, feedback.task_type),
+                {feedback.request_id: feedback.timestamp.timestamp()}
+            )
+            pipe.sadd(
+                self._combinations_key,
+                self._combination(feedback.model_id, feedback.task_type)
+            )
+            indexed += 1
+        pipe.execute()
+        return indexed
+
     def get_aggregate_stats(self, task_type: Optional[TaskType] = None) -> Dict:
         """
         Get aggregate statistics across all models
@@ -465,22 +594,19 @@ class PerformanceTracker:
         }
 
         if self.use_redis:
-            pattern = f"{self.namespace}:*:*"
             metrics_list = []
 
             try:
-                for key in self.redis.scan_iter(match=pattern, count=1000):
-                    if ":feedback:" in key:
-                        continue
+                combinations = self._get_combinations(task_type=task_type)
+                if combinations:
+                    values = self.redis.mget([
+                        self._get_key(combo_model, combo_task)
+                        for combo_model, combo_task in combinations
+                    ])
 
-                    data = self.redis.get(key)
-                    if data:
-                        metrics = PerformanceMetrics.parse_raw(data)
-
-                        if task_type and metrics.task_type != task_type:
-                            continue
-
-                        metrics_list.append(metrics)
+                    metrics_list = [
+                        PerformanceMetrics.parse_raw(data) for data in values if data
+                    ]
 
             except Exception as e:
                 self.logger.error(f"Error retrieving stats from Redis: {e}")
@@ -524,21 +650,15 @@ class PerformanceTracker:
             task_type: Optional task type filter
         """
         if self.use_redis:
-            pattern = f"{self.namespace}:"
-            if model_id:
-                pattern += f"{model_id}:"
-            else:
-                pattern += "*:"
-
-            if task_type:
-                pattern += task_type.value
-            else:
-                pattern += "*"
-
             try:
-                for key in self.redis.scan_iter(match=pattern):
-                    self.redis.delete(key)
-                self.logger.info(f"Reset metrics matching pattern: {pattern}")
+                combinations = self._get_combinations(model_id, task_type)
+                # Combinations stay registered; they also locate feedback indexes
+                if combinations:
+                    self.redis.delete(*[
+                        self._get_key(combo_model, combo_task)
+                        for combo_model, combo_task in combinations
+                    ])
+                self.logger.info(f"Reset {len(combinations)} metrics in Redis")
             except Exception as e:
                 self.logger.error(f"Error resetting metrics in Redis: {e}")
         else:
@@ -0,0 +1,159 @@
+"""
+Unit tests for the circuit breaker registry
+"""
+import time
+
+import pytest
+
+from moe_router.circuit_breaker import CircuitBreakerRegistry
+
+
+class Clock:
+    """Controllable wall clock"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def redis_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+
+def make_shared(redis_server, clock, **kwargs):
+    """Registry on the shared fake Redis server"""
+    import fakeredis
+    return CircuitBreakerRegistry(
+        redis_client=fakeredis.FakeRedis(server=redis_server, decode_responses=True),
+        clock=clock,
+        **kwargs
+    )
+
+
+class TestLocalRegistry:
+    """Test process-local breakers"""
+
+    def test_trips_on_window_failure_rate(self, clock):
+        """Test that the failure rate over the window trips the breaker"""
+        registry = CircuitBreakerRegistry(min_requests=4, failure_rate_threshold=0.5, clock=clock)
+
+        registry.record("openai", True)
+        registry.record("openai", True)
+        registry.record("openai", False)
+        assert registry.allow("openai")
+
+        assert registry.record("openai", False) == "open"
+        assert not registry.allow("openai")
+        assert registry.get_state("openai").window_failures == 2
+
+    def test_old_failures_leave_the_window(self, clock):
+        """Test that failures outside the sliding window are forgotten"""
+        registry = CircuitBreakerRegistry(min_requests=3, window_seconds=10, bucket_seconds=1, clock=clock)
+        registry.record("openai", False)
+        registry.record("openai", False)
+
+        clock.now += 30
+        registry.record("openai", True)
+
+        assert registry.record("openai", False) == "closed"
+        assert registry.get_state("openai").window_requests == 2
+
+    def test_half_open_probe_closes(self, clock):
+        """Test that a successful probe closes the breaker"""
+        registry = CircuitBreakerRegistry(min_requests=1, open_seconds=60, clock=clock)
+        registry.record("openai", False)
+
+        clock.now += 61
+        assert registry.get_state("openai").state == "half_open"
+        assert registry.allow("openai")
+
+        assert registry.record("openai", True) == "closed"
+        assert registry.allow("openai")
+
+    def test_one_probe_per_lease(self, clock):
+        """Test that a half-open breaker admits one probe until its lease expires"""
+        registry = CircuitBreakerRegistry(
+            min_requests=1, open_seconds=60, probe_lease_seconds=10, clock=clock
+        )
+        registry.record("openai", False)
+
+        clock.now += 61
+        assert registry.is_open("openai") is False
+        assert registry.allow("openai")
+        assert not registry.allow("openai")
+
+        clock.now += 11
+        assert registry.allow("openai")
+
+
+class TestSharedRegistry:
+    """Test Redis-shared breakers"""
+
+    def test_trip_is_visible_to_other_workers(self, redis_server, clock):
+        """Test that failures from all workers share one sliding window"""
+        first = make_shared(redis_server, clock, min_requests=2, listen=False, cache_ttl_seconds=0)
+        second = make_shared(redis_server, clock, min_requests=2, listen=False, cache_ttl_seconds=0)
+
+        assert second.allow("anthropic")
+        first.record("anthropic", False)
+        second.record("anthropic", False)
+
+        assert not first.allow("anthropic")
+        assert not second.allow("anthropic")
+
+    def test_pubsub_updates_cached_state(self, redis_server, clock):
+        """Test that state changes reach cached workers without polling"""
+        first = make_shared(redis_server, clock, min_requests=1, listen=False)
+        second = make_shared(redis_server, clock, min_requests=1)
+        try:
+            assert second.allow("anthropic")
+
+            first.record("anthropic", False)
+
+            deadline = time.monotonic() + 3
+            while second.allow("anthropic") and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert not second.allow("anthropic")
+        finally:
+            second.close()
+
+    def test_single_probe_lease_holder(self, redis_server, clock):
+        """Test that only one worker probes a half-open breaker"""
+        first = make_shared(redis_server, clock, min_requests=1, listen=False, cache_ttl_seconds=0)
+        second = make_shared(redis_server, clock, min_requests=1, listen=False, cache_ttl_seconds=0)
+        first.record("anthropic", False)
+        clock.now += 61
+
+        assert first.allow("anthropic")
+        assert not second.allow("anthropic")
+
+        # Only the lease holder's outcome resolves the probe
+        assert second.record("anthropic", True) == "open"
+        assert first.record("anthropic", False) == "open"
+        assert not second.allow("anthropic")
+
+        clock.now += 61
+        assert second.allow("anthropic")
+        assert second.record("anthropic", True) == "closed"
+        assert first.allow("anthropic")
+
+    def test_reset_clears_shared_state(self, redis_server, clock):
+        """Test manual reset"""
+        first = make_shared(redis_server, clock, min_requests=1, listen=False)
+        second = make_shared(redis_server, clock, min_requests=1, listen=False, cache_ttl_seconds=0)
+        first.record("anthropic", False)
+
+        second.reset("anthropic")
+
+        assert first.get_state("anthropic").state == "open"  # cached until TTL or event
+        assert second.allow("anthropic")
+        assert make_shared(redis_server, clock, listen=False).allow("anthropic")
@@ -5,6 +5,7 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 
+from moe_router.circuit_breaker import CircuitBreakerRegistry
 from moe_router.router import MoERouter
 from moe_router.models import (
     RoutingRequest,
@@ -272,6 +273,33 @@ class TestCircuitBreaker:
         model = router._get_model_by_id(decision.selected_model)
         assert model.provider != Provider.ANTHROPIC
 
+    def test_half_open_probe_taken_only_on_selection(self, router_with_mock_models):
+        """Test that filtering leaves the probe lease for the selected model"""
+        router = router_with_mock_models
+        now = [1_700_000_000.0]
+        router.breaker_registry = CircuitBreakerRegistry(
+            min_requests=1, open_seconds=60, listen=False, clock=lambda: now[0]
+        )
+        request = RoutingRequest(
+            task_type=TaskType.CODE_GENERATION,
+            task_description="Generate code",
+            quality_requirement=0.7
+        )
+
+        # Anthropic half-open; OpenAI and Google open
+        router.record_request_outcome(model_id="claude-3-opus", success=False)
+        now[0] += 61
+        router.record_request_outcome(model_id="gpt-4-turbo", success=False)
+        router.record_request_outcome(model_id="gemini-pro", success=False)
+
+        available = router._filter_available_models(request, [])
+        assert {m.provider for m in available} == {Provider.ANTHROPIC}
+
+        # The first selection takes the single probe, the next finds it taken
+        first = router.select_model(request)
+        assert router._get_model_by_id(first.selected_model).provider == Provider.ANTHROPIC
+        assert router.select_model(request).selected_model == "none"
+
     def test_reset_circuit_breaker(self, router_with_mock_models):
         """Test manual circuit breaker reset"""
         router = router_with_mock_models
@@ -395,3 +423,37 @@ class TestErrorHandling:
         # Should handle gracefully
         assert router is not None
 
+
+
+class TestBanditRouting:
+    """Test bandit routing mode"""
+
+    def test_request_selects_bandit_mode(self, router_with_mock_models, basic_routing_request):
+        """Test per-request bandit selection"""
+        basic_routing_request.routing_mode = "ucb"
+
+        decision = router_with_mock_models.select_model(basic_routing_request)
+
+        assert decision.routing_strategy == "ucb"
+        assert 0.0 <= decision.confidence <= 1.0
+        assert any(e.source == "bandit_ucb" for e in decision.evidence)
+
+    def test_outcomes_update_posteriors(self, router_with_mock_models):
+        """Test that recorded outcomes with a task type reach the bandit"""
+        router = router_with_mock_models
+
+        router.record_request_outcome(
+            "gpt-4-turbo",
+            success=True,
+            quality_score=0.9,
+            task_type=TaskType.CODE_GENERATION
+        )
+        router.record_request_outcome("gpt-4-turbo", success=True)
+
+        stats = router.bandit_router.get_arm_stats(TaskType.CODE_GENERATION)
+        assert stats["gpt-4-turbo:code_generation"]["pulls"] == 1
+
+    def test_invalid_routing_mode(self):
+        """Test routing mode validation"""
+        with pytest.raises(ValueError):
+            MoERouter(routing_mode="greedy", enable_learning=False)
@@ -0,0 +1,138 @@
+"""
+Unit tests for the routing replay simulator
+"""
+import json
+
+import pytest
+
+from moe_router.models import RoutingRequest, TaskType
+from moe_router.router import MoERouter
+from moe_router.simulator import (
+    ModelOutcome,
+    ReplayRecord,
+    RoutingSimulator,
+    SyntheticWorkload,
+    compare,
+    load_corpus,
+    main
+)
+
+
+@pytest.fixture
+def workload():
+    return SyntheticWorkload(num_models=20, seed=1)
+
+
+@pytest.fixture
+def config_path(workload, tmp_path):
+    return str(workload.write_config(tmp_path / "models.yaml"))
+
+
+class TestSyntheticWorkload:
+    """Test synthetic workload generation"""
+
+    def test_requests_are_lazy_and_reproducible(self):
+        """Test seeded, lazily generated requests"""
+        first = [r.request.task_type for r in SyntheticWorkload(5, seed=3).requests(10)]
+        second = [r.request.task_type for r in SyntheticWorkload(5, seed=3).requests(10)]
+
+        assert first == second
+        assert iter(SyntheticWorkload(5).requests(10**6)) is not None
+
+    def test_regret_is_zero_for_best_model(self, workload):
+        """Test regret against the best eligible model"""
+        record = next(workload.requests(1))
+        task_type = record.request.task_type
+        eligible = [
+            m for m in workload.models
+            if m.quality_score >= record.request.quality_requirement
+        ]
+        best = max(eligible, key=lambda m: workload.expected_reward(m.id, task_type))
+
+        assert workload.regret(record, best.id) == 0.0
+        assert all(workload.regret(record, m.id) >= 0.0 for m in eligible)
+
+
+class TestRoutingSimulator:
+    """Test replay runs"""
+
+    def test_synthetic_run_reports_metrics(self, workload, config_path):
+        """Test the benchmark report for a synthetic replay"""
+        router = MoERouter(config_path=config_path, enable_learning=False, routing_mode="thompson")
+
+        report = RoutingSimulator(router, workload=workload).run(workload.requests(200))
+
+        assert report["decisions"] == 200
+        assert report["decisions_per_second"] > 0
+        assert report["latency_p99_ms"] >= report["latency_p50_ms"] > 0
+        assert report["simulated_cost"] > 0
+        assert report["avg_regret"] is not None
+        assert report["observed_outcomes"] + report["errors"] <= 200
+        assert router.bandit_router.get_arm_stats()
+
+    def test_logged_corpus_regret(self, tmp_path, sample_models):
+        """Test replay of logged records with known outcomes"""
+        config = tmp_path / "models.yaml"
+        import yaml
+        with open(config, "w") as f:
+            yaml.dump({"models": [m.dict() for m in sample_models]}, f)
+        router = MoERouter(config_path=str(config), enable_learning=False)
+
+        request = RoutingRequest(
+            task_type=TaskType.CODE_GENERATION,
+            task_description="logged",
+            quality_requirement=0.8
+        )
+        selected = router.select_model(request).selected_model
+        corpus = tmp_path / "corpus.jsonl"
+        with open(corpus, "w") as f:
+            f.write(ReplayRecord(
+                request=request,
+                outcomes={
+                    selected: ModelOutcome(success=True, quality_score=0.6, cost=0.01),
+                    "other": ModelOutcome(success=True, quality_score=0.9)
+                }
+            ).json() + "\n")
+            f.write(json.dumps({
+                "request": json.loads(request.json()),
+                "model_id": selected,
+                "outcome": {"success": False}
+            }) + "\n")
+
+        report = RoutingSimulator(router, feedback=False).run(load_corpus(str(corpus)))
+
+        assert report["decisions"] == 2
+        assert report["observed_outcomes"] == 2
+        assert report["success_rate"] == 0.5
+        assert report["avg_regret"] == pytest.approx(0.3)
+
+    def test_compare_configurations(self, workload, config_path):
+        """Test running the same corpus under several modes"""
+        reports = compare(
+            {
+                mode: lambda mode=mode: MoERouter(
+                    config_path=config_path, enable_learning=False, routing_mode=mode
+                )
+                for mode in ("standard", "ucb")
+            },
+            lambda: workload.requests(50),
+            workload=workload
+        )
+
+        assert set(reports) == {"standard", "ucb"}
+        assert reports["ucb"]["strategy_distribution"].get("ucb", 0) > 0
+
+    def test_cli_fails_on_latency_threshold(self, capsys):
+        """Test the CI regression gate"""
+        code = main(["--synthetic", "20", "--models", "5", "--max-p99-ms", "0"])
+
+        assert code == 1
+        assert "exceeds" in capsys.readouterr().err
+
+    def test_router_history_is_bounded(self, config_path, workload):
+        """Test that long replays do not grow request history without bound"""
+        router = MoERouter(config_path=config_path, enable_learning=False, max_history=10)
+
+        RoutingSimulator(router, workload=workload).run(workload.requests(100))
+
+        assert len(router.request_history) <= 20
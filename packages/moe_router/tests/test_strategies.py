@@ -8,6 +8,7 @@ from moe_router.strategies.cost_predictor import CostPredictor
 from moe_router.strategies.performance_tracker import PerformanceTracker
 from moe_router.strategies.hybrid_router import HybridRouter
 from moe_router.strategies.learning_loop import LearningLoop
+from moe_router.strategies.bandit_router import BanditRouter
 from moe_router.models import (
     ModelDefinition,
     RoutingRequest,
@@ -193,6 +194,167 @@ class TestPerformanceTracker:
         assert weight < 1.0
 
 
+class TestFeedbackIndex:
+    """Test indexed Redis feedback storage"""
+
+    @pytest.fixture
+    def performance_tracker(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        tracker = PerformanceTracker(redis_url=None)
+        tracker.redis = fakeredis.FakeRedis(decode_responses=True)
+        tracker.use_redis = True
+        return tracker
+
+    @staticmethod
+    def record(tracker, request_id, model_id, task_type, minutes_ago, outcome="success"):
+        from datetime import datetime, timedelta
+        from moe_router.models import FeedbackData
+        tracker.record_feedback(FeedbackData(
+            request_id=request_id,
+            model_id=model_id,
+            task_type=task_type,
+            outcome=outcome,
+            timestamp=datetime.utcnow() - timedelta(minutes=minutes_ago)
+        ))
+
+    def test_history_is_newest_first_limited_and_filtered(self, performance_tracker):
+        """Test time-ordered range queries across indexes"""
+        self.record(performance_tracker, "r1", "model-a", TaskType.CODE_GENERATION, 40)
+        self.record(performance_tracker, "r2", "model-b", TaskType.CODE_GENERATION, 30)
+        self.record(performance_tracker, "r3", "model-a", TaskType.CODE_REVIEW, 20)
+        self.record(performance_tracker, "r4", "model-a", TaskType.CODE_GENERATION, 10)
+
+        history = performance_tracker.get_feedback_history(limit=3)
+        by_model = performance_tracker.get_feedback_history(model_id="model-a")
+        by_task = performance_tracker.get_feedback_history(task_type=TaskType.CODE_GENERATION)
+
+        assert [f.request_id for f in history] == ["r2", "r3", "r4"]
+        assert [f.request_id for f in by_model] == ["r1", "r3", "r4"]
+        assert [f.request_id for f in by_task] == ["r1", "r2", "r4"]
+
+    def test_history_skips_expired_feedback(self, performance_tracker):
+        """Test that index entries for expired feedback are dropped"""
+        self.record(performance_tracker, "r1", "model-a", TaskType.CODE_GENERATION, 20)
+        self.record(performance_tracker, "r2", "model-a", TaskType.CODE_GENERATION, 10)
+        performance_tracker.redis.delete(performance_tracker._get_feedback_key("r1"))
+
+        history = performance_tracker.get_feedback_history(model_id="model-a")
+
+        assert [f.request_id for f in history] == ["r2"]
+        index_key = performance_tracker._get_feedback_index_key(
+            "model-a", TaskType.CODE_GENERATION
+        )
+        assert performance_tracker.redis.zcard(index_key) == 1
+
+    def test_aggregate_stats_without_scanning(self, performance_tracker):
+        """Test aggregate stats from registered combinations"""
+        self.record(performance_tracker, "r1", "model-a", TaskType.CODE_GENERATION, 3)
+        self.record(performance_tracker, "r2", "model-a", TaskType.CODE_GENERATION, 2, "failure")
+        self.record(performance_tracker, "r3", "model-b", TaskType.CODE_REVIEW, 1)
+        performance_tracker.redis.scan_iter = Mock(side_effect=AssertionError("scanned"))
+
+        stats = performance_tracker.get_aggregate_stats()
+        generation = performance_tracker.get_aggregate_stats(TaskType.CODE_GENERATION)
+
+        assert stats["total_requests"] == 3
+        assert stats["successful_requests"] == 2
+        assert generation["total_requests"] == 2
+        assert generation["avg_success_rate"] == 0.5
+
+    def test_rebuild_indexes_existing_feedback(self, performance_tracker):
+        """Test indexing feedback written before the index existed"""
+        self.record(performance_tracker, "r1", "model-a", TaskType.CODE_GENERATION, 5)
+        performance_tracker.redis.delete(
+            performance_tracker._get_feedback_index_key("model-a", TaskType.CODE_GENERATION),
+            performance_tracker._combinations_key
+        )
+
+        assert performance_tracker.get_feedback_history() == []
+        assert performance_tracker.rebuild_feedback_index() == 1
+        assert [f.request_id for f in performance_tracker.get_feedback_history()] == ["r1"]
+
+
+class TestBanditRouter:
+    """Test bandit routing strategy"""
+
+    @pytest.fixture
+    def models(self):
+        return [
+            ModelDefinition(
+                id=model_id,
+                provider=Provider.OPENAI,
+                capabilities=[ModelCapability.CODE],
+                cost_per_1k_input=cost,
+                cost_per_1k_output=cost,
+                context_window=8000,
+                quality_score=0.8,
+                latency_p50_ms=500
+            )
+            for model_id, cost in (("cheap", 0.001), ("pricey", 0.01))
+        ]
+
+    def test_update_moves_posterior(self):
+        """Test O(1) posterior updates"""
+        bandit = BanditRouter(seed=1)
+
+        bandit.update("m", TaskType.CODE_GENERATION, success=True, quality_score=1.0, latency_ms=100)
+        bandit.update("m", TaskType.CODE_GENERATION, success=False, quality_score=0.0, latency_ms=200)
+
+        stats = bandit.get_arm_stats()["m:code_generation"]
+        assert stats["pulls"] == 2
+        assert stats["success_mean"] == 0.5
+        assert stats["avg_latency_ms"] == pytest.approx(110.0)
+
+    @pytest.mark.parametrize("strategy", ["thompson", "ucb"])
+    def test_converges_on_cheaper_equal_model(self, models, strategy):
+        """Test that equal-quality models are separated by cost"""
+        bandit = BanditRouter(strategy=strategy, seed=7)
+        costs = {"cheap": 0.001, "pricey": 0.01}
+        picks = []
+
+        for _ in range(200):
+            chosen = bandit.rank(TaskType.CODE_GENERATION, models, costs)[0][0]
+            picks.append(chosen.id)
+            bandit.update(chosen.id, TaskType.CODE_GENERATION, success=True, quality_score=0.9)
+
+        assert picks[-50:].count("cheap") > 40
+
+    def test_explores_failing_model_away(self, models):
+        """Test that a failing arm loses traffic"""
+        bandit = BanditRouter(seed=3)
+        costs = {"cheap": 0.001, "pricey": 0.001}
+        for _ in range(30):
+            bandit.update("cheap", TaskType.CODE_GENERATION, success=False, quality_score=0.1)
+            bandit.update("pricey", TaskType.CODE_GENERATION, success=True, quality_score=0.9)
+
+        picks = [
+            bandit.rank(TaskType.CODE_GENERATION, models, costs)[0][0].id
+            for _ in range(20)
+        ]
+
+        assert picks.count("pricey") == 20
+
+    def test_replay_counts_matching_decisions(self, models):
+        """Test offline replay evaluation"""
+        bandit = BanditRouter(seed=5)
+        records = [
+            {"task_type": "code_generation", "model_id": model_id, "success": True, "quality_score": 0.9}
+            for model_id in ("cheap", "pricey") * 50
+        ]
+
+        result = bandit.replay(records, models)
+
+        assert result["records"] == 100
+        assert 0 < result["matched"] <= 100
+        assert result["match_rate"] == result["matched"] / 100
+        assert sum(result["selections"].values()) == 100
+
+    def test_unknown_strategy_rejected(self):
+        """Test strategy validation"""
+        with pytest.raises(ValueError):
+            BanditRouter(strategy="greedy")
+
+
 class TestHybridRouter:
     """Test hybrid routing strategy"""
 
@@ -359,3 +521,91 @@ class TestLearningLoop:
         
         assert weight > 0
 
+
+
+class TestSharedLearningState:
+    """Test Redis-backed learning loop state"""
+
+    @pytest.fixture
+    def redis_client(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.FakeRedis(decode_responses=True)
+
+    @staticmethod
+    def make_feedback(model_id, outcome="success", **kwargs):
+        from moe_router.models import FeedbackData
+        return FeedbackData(
+            request_id="req",
+            model_id=model_id,
+            task_type=TaskType.CODE_GENERATION,
+            outcome=outcome,
+            **kwargs
+        )
+
+    def test_weights_survive_restart(self, redis_client):
+        """Test that weights are reloaded by a new instance"""
+        loop = LearningLoop(redis_client=redis_client)
+        loop.collect_feedback(self.make_feedback("model-a"))
+        weight = loop.get_model_weight("model-a", TaskType.CODE_GENERATION)
+
+        restarted = LearningLoop(redis_client=redis_client)
+
+        assert weight == pytest.approx(0.55)
+        assert restarted.get_model_weight("model-a", TaskType.CODE_GENERATION) == pytest.approx(weight)
+
+    def test_replica_updates_are_atomic_and_synced(self, redis_client):
+        """Test that replicas apply EMA updates to the same shared weight"""
+        first = LearningLoop(redis_client=redis_client, sync_interval_seconds=0)
+        second = LearningLoop(redis_client=redis_client, sync_interval_seconds=0)
+
+        first.collect_feedback(self.make_feedback("model-a", outcome="failure"))
+        second.collect_feedback(self.make_feedback("model-a", outcome="failure"))
+
+        assert second.model_weights[("model-a", TaskType.CODE_GENERATION)] == pytest.approx(0.405)
+        assert first.sync() == 1
+        assert first.get_model_weight("model-a", TaskType.CODE_GENERATION) == pytest.approx(0.405)
+        assert first.sync() == 0
+
+    def test_reset_propagates_to_replicas(self, redis_client):
+        """Test that resets go through the shared store"""
+        first = LearningLoop(redis_client=redis_client, sync_interval_seconds=0)
+        second = LearningLoop(redis_client=redis_client, sync_interval_seconds=0)
+        first.collect_feedback(self.make_feedback("model-a"))
+
+        second.reset_learning(model_id="model-a")
+
+        assert first.get_model_weight("model-a", TaskType.CODE_GENERATION) == 0.5
+
+    def test_ab_stats_are_shared_sufficient_statistics(self, redis_client):
+        """Test that A/B results are aggregated across replicas"""
+        first = LearningLoop(redis_client=redis_client, sync_interval_seconds=0)
+        second = LearningLoop(redis_client=redis_client, sync_interval_seconds=0)
+        test_id = first.start_ab_test(
+            "model-a", "model-b", TaskType.CODE_GENERATION, min_samples=1
+        )
+
+        first.collect_feedback(self.make_feedback("model-a", quality_score=1.0, actual_cost=0.02))
+        second.collect_feedback(self.make_feedback("model-a", outcome="failure", quality_score=0.0))
+        second.collect_feedback(self.make_feedback("model-b", outcome="partial", quality_score=0.2))
+
+        analysis = first.analyze_ab_test(test_id)
+
+        variant_a = analysis["variant_a"]
+        assert variant_a["samples"] == 2
+        assert variant_a["avg_score"] == 0.5
+        assert variant_a["score_std"] == 0.5
+        assert variant_a["success_rate"] == 0.5
+        assert variant_a["avg_cost"] == 0.02
+        assert analysis["variant_b"]["samples"] == 1
+        assert analysis["winner"] == "model-a"
+
+    def test_memory_fallback_without_redis(self):
+        """Test that the loop works without a shared store"""
+        loop = LearningLoop()
+        test_id = loop.start_ab_test("model-a", "model-b", TaskType.CODE_GENERATION)
+
+        loop.collect_feedback(self.make_feedback("model-b"))
+
+        assert loop.use_redis is False
+        assert loop.get_model_weight("model-b", TaskType.CODE_GENERATION) == pytest.approx(0.55)
+        assert loop.analyze_ab_test(test_id)["variant_b"]["samples"] == 1
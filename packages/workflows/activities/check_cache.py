@@ -0,0 +1,200 @@
+"""
+Content-addressed cache for quality check results
+
+A check's verdict only depends on the tool that produced it and the content
+of the files it looked at, so results are keyed by
+(check, tool version, content hash of the check's inputs):
+
+- file checks (lint, security, static analysis) are cached per file, so
+  they may only run tools that judge each file on its own
+- dependency checks are keyed by the lockfiles
+- test, coverage and performance checks are keyed by the whole tree
+
+Content hashes are git blob hashes, read with `git ls-tree` without a
+checkout.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Tool versions per check - bump when a tool or its configuration changes so
+# cached verdicts from the old version are no longer used
+CHECK_TOOL_VERSIONS = {
+    'unit_tests': 'pytest-7',
+    'integration_tests': 'pytest-7',
+    'linting': 'pylint-3/flake8-6/black-23',
+    'security': 'bandit-1/safety-2/semgrep-1',
+    'coverage': 'coverage-7',
+    'performance': 'locust-2',
+    'dependencies': 'pip-audit-2',
+    'static_analysis': 'radon-6',
+}
+
+# Maximum age of cached verdicts for checks backed by advisory databases,
+# which can fail on unchanged content once new vulnerabilities are published
+CHECK_MAX_AGE_SECONDS = {
+    'security': 24 * 3600,
+    'dependencies': 24 * 3600,
+}
+
+# Checks cached per file, and the files they look at. A file's verdict is
+# reused while its own content is unchanged, so cross-file tools such as
+# mypy do not belong here; they need a tree-keyed check
+FILE_CHECKS = {'linting', 'security', 'static_analysis'}
+SOURCE_EXTENSIONS = {
+    '.py', '.js', '.jsx', '.ts', '.tsx', '.go', '.rs', '.java', '.rb', '.php',
+}
+
+# Checks keyed by lockfiles only
+LOCKFILE_CHECKS = {'dependencies'}
+LOCKFILES = {
+    'requirements.txt', 'poetry.lock', 'Pipfile.lock', 'uv.lock', 'pyproject.toml',
+    'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'go.sum', 'Cargo.lock',
+}
+
+
+def cache_key(check: str, *parts: str) -> str:
+    """Cache key for a check over the given content hashes"""
+    digest = hashlib.sha256()
+    for part in (check, CHECK_TOOL_VERSIONS.get(check, 'unknown'), *parts):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def is_source_file(path: str) -> bool:
+    return os.path.splitext(path)[1] in SOURCE_EXTENSIONS
+
+
+def is_lockfile(path: str) -> bool:
+    name = os.path.basename(path)
+    return name in LOCKFILES or (name.startswith('requirements') and name.endswith('.txt'))
+
+
+async def list_tree(branch: str, repo_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    List files of a branch with their git blob hashes
+
+    Args:
+        branch: Branch or commit
+        repo_path: Repository checkout (defaults to QUALITY_GATE_REPO or cwd)
+
+    Returns:
+        Mapping of path to blob hash (empty if the branch cannot be read)
+    """
+    process = await asyncio.create_subprocess_exec(
+        'git', 'ls-tree', '-r', '--full-tree', branch,
+        cwd=repo_path or os.environ.get('QUALITY_GATE_REPO', '.'),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        logger.warning(f"Cannot list {branch}: {stderr.decode().strip()}")
+        return {}
+
+    files = {}
+    for line in stdout.decode().splitlines():
+        # <mode> <type> <hash>\t<path>
+        meta, path = line.split('\t', 1)
+        files[path] = meta.split()[2]
+    return files
+
+
+def fingerprint(files: Dict[str, str], checks: Iterable[str]) -> Dict[str, Any]:
+    """
+    Compute cache keys for checks over a file listing
+
+    Args:
+        files: Mapping of path to content hash
+        checks: Check identifiers
+
+    Returns:
+        {'tree': {check: key}, 'files': {check: {path: key}}}
+    """
+    tree_hash = cache_key('tree', *(f"{path}:{blob}" for path, blob in sorted(files.items())))
+    lock_hash = cache_key(
+        'lockfiles',
+        *(f"{path}:{blob}" for path, blob in sorted(files.items()) if is_lockfile(path)),
+    )
+
+    result: Dict[str, Any] = {'tree': {}, 'files': {}}
+    for check in checks:
+        if check in FILE_CHECKS:
+            result['files'][check] = {
+                path: cache_key(check, path, blob)
+                for path, blob in files.items()
+                if is_source_file(path)
+            }
+        elif check in LOCKFILE_CHECKS:
+            result['tree'][check] = cache_key(check, lock_hash)
+        else:
+            result['tree'][check] = cache_key(check, tree_hash)
+    return result
+
+
+class CheckResultCache:
+    """
+    Check results stored as JSON files, sharded by key prefix
+
+    Point QUALITY_CACHE_DIR at a shared volume to share the cache between
+    workers.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize cache
+
+        Args:
+            root: Cache directory (defaults to QUALITY_CACHE_DIR or a
+                directory under the system temp directory)
+        """
+        self.root = Path(
+            root
+            or os.environ.get('QUALITY_CACHE_DIR')
+            or Path(tempfile.gettempdir()) / 'quality-check-cache'
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load cached results, skipping missing, unreadable or expired entries"""
+        now = time.time()
+        found = {}
+        for key in keys:
+            try:
+                entry = json.loads(self._path(key).read_text())
+            except (OSError, ValueError):
+                continue
+            max_age = CHECK_MAX_AGE_SECONDS.get(entry.get('check'))
+            if max_age is not None and now - entry.get('cached_at', 0) > max_age:
+                continue
+            found[key] = entry['result']
+        return found
+
+    def put_many(self, entries: Dict[str, Dict[str, Any]]):
+        """
+        Store results (write then rename, so readers never see partial files)
+
+        Args:
+            entries: {key: {'check': check id, 'result': check result}}
+        """
+        now = time.time()
+        for key, entry in entries.items():
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({**entry, 'cached_at': now}, f)
+            os.replace(tmp, path)
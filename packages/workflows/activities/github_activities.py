@@ -6,12 +6,16 @@ including creating PRs, issues, branches, and updating statuses.
 """
 
 from temporalio import activity
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Blob uploads in flight per apply_pr_changes call
+BLOB_CONCURRENCY = 8
+
 
 @activity.defn
 async def create_branch(branch_name: str, base: str = "main") -> Dict[str, Any]:
@@ -414,3 +418,145 @@ async def push_branch(branch: str, force: bool = False) -> None:
     await asyncio.sleep(0.5)
 
     logger.info("Branch pushed")
+
+
+def _github_operations():
+    """(git, issues, prs) API operations if GITHUB_TOKEN is set, else None (calls are simulated)"""
+    token = os.environ.get('GITHUB_TOKEN')
+    if not token:
+        return None
+
+    from packages.integrations.github import (
+        GitDataOperations,
+        GitHubClient,
+        IssueOperations,
+        PullRequestOperations,
+    )
+    client = GitHubClient(token=token)
+    return GitDataOperations(client), IssueOperations(client), PullRequestOperations(client)
+
+
+def _repository(repository: Optional[str]) -> Tuple[str, str]:
+    """(owner, repo) from "owner/repo", defaulting to GITHUB_REPOSITORY"""
+    owner, _, repo = (repository or os.environ.get('GITHUB_REPOSITORY', 'org/repo')).partition('/')
+    return owner, repo
+
+
+@activity.defn
+async def apply_pr_changes(changes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Commit file changes and update a PR in one activity
+
+    Replaces create_commit, push_branch, add_pr_labels, request_pr_review,
+    add_pr_comment and update_pr_status scheduled one by one. The files
+    become a single commit through the Git Data API (blobs created
+    concurrently, one tree, one commit, one ref update), then labels,
+    reviewers, the comment and the status are applied concurrently.
+
+    Progress is heartbeated; a retried attempt reuses the blobs, the commit
+    and the PR updates already done by earlier attempts.
+
+    Args:
+        changes: {
+            'branch': Branch to commit to,
+            'files': {path: content, or None to delete} (optional),
+            'message': Commit message,
+            'pr_number': PR to update (optional),
+            'labels': Label names (optional),
+            'reviewers': GitHub usernames (optional),
+            'comment': Comment text (optional),
+            'status': {'state', 'description', 'context'} for the new
+                commit, or the PR head without files (optional),
+            'repository': "owner/repo" (default: GITHUB_REPOSITORY),
+        }
+
+    Returns:
+        Commit SHA and the PR updates applied
+    """
+    files = changes.get('files') or {}
+    pr_number = changes.get('pr_number')
+    status = changes.get('status')
+
+    details = activity.info().heartbeat_details
+    progress = dict(details[0]) if details else {}
+    progress.setdefault('blobs', {})
+    progress.setdefault('commit_sha', None)
+    progress.setdefault('done', [])
+
+    def heartbeat(stage: str):
+        activity.heartbeat({**progress, 'stage': stage})
+
+    github = _github_operations()
+    owner, repo = _repository(changes.get('repository'))
+    if github:
+        git, issues, prs = github
+
+    # Step 1: one commit for all files
+    if files and not progress['commit_sha']:
+        logger.info(f"Committing {len(files)} files to {changes['branch']}: {changes.get('message')}")
+
+        def on_blob(path: str, sha: str):
+            progress['blobs'][path] = sha
+            heartbeat(f"Created {len(progress['blobs'])}/{len(files)} blobs")
+
+        if github:
+            commit = await git.commit_files(
+                owner, repo, changes['branch'], files, changes['message'],
+                blob_shas=progress['blobs'],
+                max_concurrency=BLOB_CONCURRENCY,
+                on_blob=on_blob,
+            )
+            progress['commit_sha'] = commit['sha']
+        else:
+            # Simulate blob uploads, tree, commit and ref update
+            await asyncio.sleep(0.5)
+            progress['commit_sha'] = "commit123abc"
+
+        heartbeat("Committed")
+        logger.info(f"Commit created: {progress['commit_sha']}")
+
+    # Step 2: PR updates, concurrently
+    async def update(name: str, call):
+        if name in progress['done']:
+            return
+        if github:
+            await call()
+        else:
+            # Simulate GitHub API call
+            await asyncio.sleep(0.3)
+        progress['done'].append(name)
+        heartbeat(f"Applied {name}")
+
+    async def set_status():
+        sha = progress['commit_sha']
+        if not sha:
+            pr = await prs.get_pull_request(owner, repo, pr_number)
+            sha = pr['head']['sha']
+        await git.create_commit_status(
+            owner, repo, sha, status['state'], status['description'],
+            context=status.get('context', 'autonomous-coding'),
+        )
+
+    updates = []
+    if pr_number and changes.get('labels'):
+        updates.append(update('labels', lambda: issues.add_labels(
+            owner, repo, pr_number, changes['labels'])))
+    if pr_number and changes.get('reviewers'):
+        updates.append(update('reviewers', lambda: prs.request_reviewers(
+            owner, repo, pr_number, changes['reviewers'])))
+    if pr_number and changes.get('comment'):
+        updates.append(update('comment', lambda: issues.add_comment(
+            owner, repo, pr_number, changes['comment'])))
+    if status and (progress['commit_sha'] or pr_number):
+        updates.append(update('status', set_status))
+
+    if updates:
+        logger.info(f"Applying {len(updates)} updates to PR #{pr_number}")
+        await asyncio.gather(*updates)
+
+    return {
+        'commit_sha': progress['commit_sha'],
+        'files_committed': len(files),
+        'pr_number': pr_number,
+        'applied': progress['done'],
+    }
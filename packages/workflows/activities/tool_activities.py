@@ -3,16 +3,31 @@ Activities for executing tools and running checks
 
 These activities handle running tests, linters, security scans,
 and other development tools.
+
+The CPU-bound scanners (linters, security scan, static analysis) are
+synchronous so the worker can run them on a process pool instead of the
+event loop.
 """
 
 from temporalio import activity
 from typing import List, Dict, Any, Optional
 import asyncio
 import logging
+import time
+
+from .check_cache import CheckResultCache, fingerprint, list_tree
+from .result_cache import get_result_cache, memo_key, repo_content_hash
 
 logger = logging.getLogger(__name__)
 
 
+def _target_files(target: Any) -> List[str]:
+    """Files to check when target is {'branch': ..., 'files': [...]}"""
+    if isinstance(target, dict):
+        return list(target.get('files') or [])
+    return []
+
+
 @activity.defn
 async def run_tests(
     target: Any,
@@ -51,49 +66,54 @@ async def run_tests(
 
 
 @activity.defn
-async def run_linters(target: Any) -> Dict[str, Any]:
+def run_linters(target: Any) -> Dict[str, Any]:
     """
     Run linters on code
 
     Args:
-        target: Code to lint
+        target: Code to lint; {'branch': ..., 'files': [...]} limits the
+            run to the given files
 
     Returns:
-        Linting results
+        Linting results, with per-file results under 'files'
     """
     activity.heartbeat("Running linters")
 
-    logger.info("Running linters")
+    files = _target_files(target)
+    logger.info(f"Running linters on {len(files) or 'all'} files")
 
     # Simulate linting
-    await asyncio.sleep(2)
+    time.sleep(2)
 
     return {
         'passed': True,
         'score': 95.0,
         'issues': [],
         'auto_fixable': True,
-        'tools_run': ['pylint', 'flake8', 'mypy', 'black'],
+        'tools_run': ['pylint', 'flake8', 'black'],
+        'files': {path: {'issues': [], 'score': 95.0} for path in files},
     }
 
 
 @activity.defn
-async def run_security_scan(target: Any) -> Dict[str, Any]:
+def run_security_scan(target: Any) -> Dict[str, Any]:
     """
     Run security scanning
 
     Args:
-        target: Code to scan
+        target: Code to scan; {'branch': ..., 'files': [...]} limits the
+            run to the given files
 
     Returns:
-        Security scan results
+        Security scan results, with per-file results under 'files'
     """
     activity.heartbeat("Running security scan")
 
-    logger.info("Running security scan")
+    files = _target_files(target)
+    logger.info(f"Running security scan on {len(files) or 'all'} files")
 
     # Simulate security scan
-    await asyncio.sleep(2)
+    time.sleep(2)
 
     return {
         'issues': [],
@@ -101,6 +121,7 @@ async def run_security_scan(target: Any) -> Dict[str, Any]:
         'auto_fixable': False,
         'tools_run': ['bandit', 'safety', 'semgrep'],
         'vulnerabilities': [],
+        'files': {path: {'issues': [], 'has_critical': False} for path in files},
     }
 
 
@@ -188,22 +209,24 @@ async def check_dependencies(branch: str) -> Dict[str, Any]:
 
 
 @activity.defn
-async def run_static_analysis(branch: str) -> Dict[str, Any]:
+def run_static_analysis(target: Any) -> Dict[str, Any]:
     """
     Run static code analysis
 
     Args:
-        branch: Branch to analyze
+        target: Branch to analyze; {'branch': ..., 'files': [...]} limits
+            the run to the given files
 
     Returns:
-        Static analysis results
+        Static analysis results, with per-file results under 'files'
     """
     activity.heartbeat("Running static analysis")
 
-    logger.info(f"Running static analysis on {branch}")
+    files = _target_files(target)
+    logger.info(f"Running static analysis on {len(files) or 'all'} files")
 
     # Simulate static analysis
-    await asyncio.sleep(2)
+    time.sleep(2)
 
     return {
         'passed': True,
@@ -212,9 +235,104 @@ async def run_static_analysis(branch: str) -> Dict[str, Any]:
         'auto_fixable': True,
         'complexity_score': 8.5,
         'maintainability_index': 75,
+        'files': {path: {'issues': [], 'score': 92.0} for path in files},
     }
 
 
+@activity.defn
+async def fingerprint_check_inputs(branch: str, checks: List[str]) -> Dict[str, Any]:
+    """
+    Compute content-hash cache keys for quality checks
+
+    Args:
+        branch: Branch to fingerprint
+        checks: Check identifiers
+
+    Returns:
+        {'tree': {check: key}, 'files': {check: {path: key}}}, empty if the
+        branch cannot be read
+    """
+    activity.heartbeat("Fingerprinting check inputs")
+
+    files = await list_tree(branch)
+    if not files:
+        return {'tree': {}, 'files': {}}
+
+    logger.info(f"Fingerprinted {len(files)} files on {branch}")
+    return fingerprint(files, checks)
+
+
+@activity.defn
+async def get_cached_check_results(keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Look up cached check results
+
+    Args:
+        keys: Cache keys
+
+    Returns:
+        Cached results by key (misses are omitted)
+    """
+    return await asyncio.to_thread(CheckResultCache().get_many, keys)
+
+
+@activity.defn
+async def store_check_results(entries: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Store check results in the cache
+
+    Args:
+        entries: {key: {'check': check id, 'result': check result}}
+    """
+    await asyncio.to_thread(CheckResultCache().put_many, entries)
+    logger.info(f"Cached {len(entries)} check results")
+
+
+@activity.defn
+async def lookup_activity_result(
+    activity_name: str,
+    args: List[Any],
+    repo_ref: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Look up a memoized activity result
+
+    Args:
+        activity_name: Activity name
+        args: Activity arguments
+        repo_ref: Ref whose content the activity reads; its tree hash is
+            part of the key
+
+    Returns:
+        {'key': cache key, or None if the call cannot be cached,
+         'hit': bool, 'result': cached result}
+    """
+    repo_hash = None
+    if repo_ref:
+        repo_hash = await repo_content_hash(repo_ref)
+        if repo_hash is None:
+            return {'key': None, 'hit': False, 'result': None}
+
+    key = memo_key(activity_name, args, repo_hash)
+    result = await (await get_result_cache()).get(key)
+
+    logger.info(f"{activity_name} result cache {'hit' if result is not None else 'miss'}")
+    return {'key': key, 'hit': result is not None, 'result': result}
+
+
+@activity.defn
+async def store_activity_result(key: str, result: Any, ttl_seconds: int) -> None:
+    """
+    Memoize an activity result
+
+    Args:
+        key: Key from lookup_activity_result
+        result: Activity result
+        ttl_seconds: Time to keep the result
+    """
+    await (await get_result_cache()).set(key, result, ttl_seconds)
+
+
 @activity.defn
 async def fetch_metrics(service: str, timestamp: str) -> Dict[str, Any]:
     """
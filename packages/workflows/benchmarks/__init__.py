@@ -0,0 +1,35 @@
+"""
+Throughput benchmarks for the workflows, on fake activities
+
+Run with: python -m packages.workflows.benchmarks --help
+"""
+
+from .fakes import (
+    FakeActivities,
+    Fixed,
+    LatencyDistribution,
+    LogNormal,
+    SlotUsage,
+    Uniform,
+    parse_latency,
+)
+from .harness import (
+    SCENARIOS,
+    BenchmarkReport,
+    Scenario,
+    run_benchmark,
+)
+
+__all__ = [
+    'FakeActivities',
+    'Fixed',
+    'LatencyDistribution',
+    'LogNormal',
+    'SlotUsage',
+    'Uniform',
+    'parse_latency',
+    'SCENARIOS',
+    'BenchmarkReport',
+    'Scenario',
+    'run_benchmark',
+]
@@ -0,0 +1,144 @@
+"""
+Benchmark command line
+
+Examples:
+    python -m packages.workflows.benchmarks --scenario plan-patch-pr --workflows 50 --concurrency 10
+    python -m packages.workflows.benchmarks --latency llm=lognormal:300,0.8 --slots llm=40
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from dataclasses import asdict, replace
+from typing import Dict, List
+
+from temporalio.client import Client
+from temporalio.testing import WorkflowEnvironment
+
+from ..activities import agent_activities, github_activities, tool_activities
+from ..tuning import ACTIVITY_POOLS, ActivityPool
+from .fakes import FakeActivities, LatencyDistribution, parse_latency
+from .harness import SCENARIOS, run_benchmark
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def _parse_latencies(specs) -> Dict[str, LatencyDistribution]:
+    latencies = {}
+    for spec in specs or []:
+        name, _, distribution = spec.partition('=')
+        latencies[name] = parse_latency(distribution)
+    return latencies
+
+
+def _parse_pools(specs) -> List[ActivityPool]:
+    slots = {}
+    for spec in specs or []:
+        name, _, count = spec.partition('=')
+        slots[name] = int(count)
+    unknown = set(slots) - {pool.name for pool in ACTIVITY_POOLS}
+    if unknown:
+        raise ValueError(f"Unknown pool: {', '.join(sorted(unknown))}")
+
+    pools = []
+    for pool in ACTIVITY_POOLS:
+        if pool.name in slots:
+            count = slots[pool.name]
+            # Fixed pools use all of them; adaptive ones may grow up to them
+            pool = replace(
+                pool,
+                initial_slots=min(pool.initial_slots, count) if pool.adaptive else count,
+                min_slots=min(pool.min_slots, count) if pool.adaptive else count,
+                max_slots=count,
+            )
+        pools.append(pool)
+    return pools
+
+
+async def _run(args):
+    if args.host:
+        client = await Client.connect(args.host, namespace=args.namespace)
+        env = None
+    else:
+        env = await WorkflowEnvironment.start_time_skipping()
+        client = env.client
+
+    try:
+        reports = []
+        for name in args.scenario or list(SCENARIOS):
+            fakes = FakeActivities(
+                [agent_activities, github_activities, tool_activities],
+                latencies=_parse_latencies(args.latency),
+                time_scale=args.time_scale,
+                seed=args.seed,
+            )
+            report = await run_benchmark(
+                client,
+                SCENARIOS[name],
+                fakes,
+                workflows=args.workflows,
+                concurrency=args.concurrency,
+                pools=_parse_pools(args.slots),
+                workflow_slots=args.workflow_slots,
+                sandboxed=not args.unsandboxed,
+            )
+            reports.append(report)
+            if not args.json:
+                print(report.summary())
+        if args.json:
+            print(json.dumps([asdict(r) for r in reports], indent=2))
+    finally:
+        if env:
+            await env.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark workflow throughput on fake activities")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario to run, repeatable (default: all)",
+    )
+    parser.add_argument("--workflows", type=int, default=20, help="Workflows per scenario (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=5, help="Workflows in flight (default: 5)")
+    parser.add_argument(
+        "--slots",
+        action="append",
+        metavar="POOL=N",
+        help="Maximum activity slots of a pool (llm, github-io, cpu, test-runs, tools), "
+             "e.g. llm=40; repeatable (default: the production pools)",
+    )
+    parser.add_argument("--workflow-slots", type=int, default=10, help="Workflow worker task slots (default: 10)")
+    parser.add_argument(
+        "--latency",
+        action="append",
+        metavar="NAME=DIST",
+        help="Latency of an activity or class (llm, github-io, cpu, test-runs, tools), e.g. "
+             "generate_code=lognormal:300,0.8 or cpu=fixed:10; repeatable",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.01,
+        help="Real seconds slept per modeled second of activity latency (default: 0.01)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Latency random seed (default: 0)")
+    parser.add_argument(
+        "--host",
+        default=None,
+        help="Temporal server host:port; default starts a time-skipping test server",
+    )
+    parser.add_argument("--namespace", default="default", help="Temporal namespace (default: default)")
+    parser.add_argument("--unsandboxed", action="store_true", help="Run workflows outside the sandbox")
+    parser.add_argument("--json", action="store_true", help="Print reports as JSON")
+
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
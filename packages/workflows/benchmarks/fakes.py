@@ -0,0 +1,236 @@
+"""
+Fake activities for workflow benchmarks
+
+Each fake is registered under the name of a real activity, sleeps for a
+latency sampled from a distribution and then returns the real stub's result
+(computed without the stub's own sleeps) or a configured response. Latencies
+are modeled seconds, multiplied by time_scale before sleeping so a benchmark
+of 15-minute code generation doesn't take 15 minutes.
+"""
+
+import asyncio
+import inspect
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from unittest import mock
+
+from temporalio import activity
+
+from ..tuning import CPU, GITHUB_IO, LLM, TEST_RUNS, TOOLS, activity_pool
+
+
+class LatencyDistribution(ABC):
+    """Distribution of activity latencies, in modeled seconds"""
+
+    @abstractmethod
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency"""
+
+
+@dataclass
+class Fixed(LatencyDistribution):
+    seconds: float
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+@dataclass
+class Uniform(LatencyDistribution):
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+@dataclass
+class LogNormal(LatencyDistribution):
+    """Long-tailed latency, typical of model and API calls"""
+    median: float
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+
+def parse_latency(spec: str) -> LatencyDistribution:
+    """
+    Parse a latency distribution
+
+    Args:
+        spec: "fixed:SECONDS", "uniform:LOW,HIGH" or "lognormal:MEDIAN[,SIGMA]"
+
+    Returns:
+        Latency distribution
+    """
+    kind, _, params = spec.partition(':')
+    distributions = {'fixed': Fixed, 'uniform': Uniform, 'lognormal': LogNormal}
+    if kind not in distributions or not params:
+        raise ValueError(f"Invalid latency distribution: {spec}")
+    return distributions[kind](*(float(p) for p in params.split(',')))
+
+
+# Latency per activity class, i.e. the worker pool the activity runs on
+DEFAULT_LATENCIES: Dict[str, LatencyDistribution] = {
+    LLM: LogNormal(60, 0.6),
+    GITHUB_IO: LogNormal(0.5, 0.5),
+    CPU: LogNormal(20, 0.4),
+    TEST_RUNS: LogNormal(120, 0.5),
+    TOOLS: LogNormal(1, 0.5),
+}
+
+# Result caches are bypassed so every run does the full work
+BENCHMARK_RESPONSES: Dict[str, Callable[..., Any]] = {
+    'fingerprint_check_inputs': lambda *args: {'tree': {}, 'files': {}},
+    'lookup_activity_result': lambda *args: {'key': None, 'hit': False, 'result': None},
+}
+
+
+class SlotUsage:
+    """Time-weighted count of activities in flight"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.in_flight: Dict[str, int] = {}
+        self.busy_seconds: Dict[str, float] = {}  # Slot-seconds per activity class
+        self.peak = 0
+        self._last = self.clock()
+
+    def _advance(self):
+        now = self.clock()
+        for key, count in self.in_flight.items():
+            self.busy_seconds[key] = self.busy_seconds.get(key, 0.0) + count * (now - self._last)
+        self._last = now
+
+    def start(self, key: str):
+        self._advance()
+        self.in_flight[key] = self.in_flight.get(key, 0) + 1
+        self.peak = max(self.peak, sum(self.in_flight.values()))
+
+    def finish(self, key: str):
+        self._advance()
+        self.in_flight[key] -= 1
+
+    def mean_in_flight(self, elapsed: float) -> Dict[str, float]:
+        """Average activities in flight per class over elapsed seconds"""
+        self._advance()
+        return {key: busy / elapsed for key, busy in self.busy_seconds.items()} if elapsed else {}
+
+    def utilization(self, slots: int, elapsed: float) -> float:
+        """Fraction of slot time in use over elapsed seconds"""
+        return sum(self.mean_in_flight(elapsed).values()) / slots if slots else 0.0
+
+
+class _InstantAsyncio:
+    """asyncio proxy whose sleep returns immediately"""
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+    @staticmethod
+    async def sleep(delay, result=None):
+        return result
+
+
+class _InstantTime:
+    """time proxy whose sleep returns immediately"""
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    @staticmethod
+    def sleep(seconds):
+        pass
+
+
+@contextmanager
+def stub_delays_disabled(modules: Sequence[ModuleType]) -> Iterator[None]:
+    """Make the stub activities in modules skip their simulated delays"""
+    with ExitStack() as stack:
+        for module in modules:
+            if getattr(module, 'asyncio', None) is asyncio:
+                stack.enter_context(mock.patch.object(module, 'asyncio', _InstantAsyncio()))
+            if getattr(module, 'time', None) is time:
+                stack.enter_context(mock.patch.object(module, 'time', _InstantTime()))
+        yield
+
+
+class FakeActivities:
+    """Latency-modeled stand-ins for the activities in some modules"""
+
+    def __init__(
+        self,
+        modules: Sequence[ModuleType],
+        latencies: Optional[Dict[str, LatencyDistribution]] = None,
+        responses: Optional[Dict[str, Callable[..., Any]]] = None,
+        time_scale: float = 0.01,
+        seed: int = 0,
+    ):
+        """
+        Initialize fakes
+
+        Args:
+            modules: Activity modules to fake
+            latencies: Latency by activity name or activity class (llm,
+                github-io, cpu, test-runs, tools); unset ones use
+                DEFAULT_LATENCIES
+            responses: Result function by activity name, called with the
+                activity arguments; others return the stub's result
+            time_scale: Real seconds slept per modeled second
+            seed: Random seed for latency samples
+        """
+        self.modules = list(modules)
+        self.latencies = {**DEFAULT_LATENCIES, **(latencies or {})}
+        self.responses = {**BENCHMARK_RESPONSES, **(responses or {})}
+        self.time_scale = time_scale
+        self.rng = random.Random(seed)
+        self.usage = SlotUsage()
+
+    def activities(self) -> List[Callable]:
+        """Fake activity functions to register on a worker"""
+        return [fake for fakes in self.activities_by_pool().values() for fake in fakes]
+
+    def activities_by_pool(self) -> Dict[str, List[Callable]]:
+        """Fake activity functions per pool of the activities they stand in for"""
+        pools: Dict[str, List[Callable]] = {}
+        for module in self.modules:
+            for attr_name in dir(module):
+                attr = getattr(module, attr_name)
+                if hasattr(attr, '__temporal_activity_definition'):
+                    pool = activity_pool(attr)
+                    pools.setdefault(pool, []).append(self._fake(attr, pool))
+        return pools
+
+    def stub_delays_disabled(self):
+        """Context in which the stubs behind the fakes return immediately"""
+        return stub_delays_disabled(self.modules)
+
+    def _fake(self, fn: Callable, activity_class: str) -> Callable:
+        name = getattr(fn, '__temporal_activity_definition').name
+        latency = self.latencies.get(name) or self.latencies[activity_class]
+
+        @activity.defn(name=name)
+        async def fake(*args):
+            self.usage.start(activity_class)
+            try:
+                await asyncio.sleep(latency.sample(self.rng) * self.time_scale)
+                if name in self.responses:
+                    return self.responses[name](*args)
+                result = fn(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            finally:
+                self.usage.finish(activity_class)
+
+        return fake
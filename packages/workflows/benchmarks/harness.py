@@ -0,0 +1,289 @@
+"""
+Workflow throughput benchmarks
+
+Runs a batch of workflows against fake activities (see fakes.py) at a fixed
+number in flight, on the production worker topology: a workflow worker that
+routes each activity to its pool's task queue, and one worker per activity
+pool with that pool's slots and adaptive concurrency (see tuning.py). The
+fakes are async, so the CPU pool runs them in-process instead of on a
+process pool. Reports:
+
+- throughput in workflows per minute
+- end-to-end latency percentiles
+- history size (events and bytes) per workflow
+- activity slot utilization per pool and mean activities in flight per class
+
+Durations are reported in modeled seconds: wall-clock time divided by the
+fakes' time_scale. Orchestration overhead is not scaled, so it shows up
+magnified; keep time_scale high enough that activity latency dominates when
+sizing fleets, and compare runs at the same scale when looking for
+regressions. Timers inside workflows are skipped by the time-skipping test
+server.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import Counter
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field, replace
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from temporalio.client import Client, WorkflowFailureError
+from temporalio.worker import UnsandboxedWorkflowRunner, Worker
+
+from ..workflows import (
+    Alert,
+    CodeGenerationBatchWorkflow,
+    CodeMigrationWorkflow,
+    IncidentSwarmWorkflow,
+    PlanPatchPRWorkflow,
+    QualityGateWorkflow,
+)
+from ..tuning import (
+    ACTIVITY_POOLS,
+    ActivityPool,
+    TaskQueueRoutingInterceptor,
+    pool_task_queue,
+    pool_worker_options,
+)
+from .fakes import FakeActivities
+
+TASK_QUEUE = "benchmark-task-queue"
+
+# Workflows the scenarios start, and the children they start
+WORKFLOWS = [
+    PlanPatchPRWorkflow,
+    CodeGenerationBatchWorkflow,
+    QualityGateWorkflow,
+    IncidentSwarmWorkflow,
+    CodeMigrationWorkflow,
+]
+
+
+@dataclass
+class Scenario:
+    """Workflow to benchmark and the arguments of its i-th run"""
+    name: str
+    workflow: Callable
+    args: Callable[[int], List[Any]]
+
+
+def _alert(i: int) -> Alert:
+    return Alert(
+        id=f"benchmark-alert-{i}",
+        severity='high',
+        service='api-gateway',
+        message='Error rate above 5%',
+        timestamp='2024-01-01T00:00:00Z',
+        metrics={'error_rate': 0.07},
+        logs=['ERROR upstream timeout'],
+    )
+
+
+SCENARIOS = {
+    s.name: s for s in [
+        Scenario('plan-patch-pr', PlanPatchPRWorkflow.run,
+                 lambda i: [f"Add benchmark feature {i}", False]),
+        Scenario('quality-gate', QualityGateWorkflow.run,
+                 lambda i: [1000 + i, f"feature/benchmark-{i}"]),
+        Scenario('incident-swarm', IncidentSwarmWorkflow.run,
+                 lambda i: [_alert(i)]),
+        Scenario('migration', CodeMigrationWorkflow.run,
+                 lambda i: ['react-upgrade', '17', '18']),
+    ]
+}
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile, 0.0 for no values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+@dataclass
+class BenchmarkReport:
+    """Results of one benchmark run"""
+    scenario: str
+    workflows: int
+    concurrency: int
+    completed: int
+    failed: int
+    duration_seconds: float  # Modeled
+    workflows_per_minute: float  # Completed, modeled
+    latency_seconds: Dict[str, float]  # p50, p90, p99, max; modeled
+    history_events: Dict[str, float]  # mean, max
+    history_bytes: Dict[str, float]  # mean, max
+    activity_slots: Dict[str, int]  # Maximum slots per pool
+    slot_utilization: Dict[str, float]  # Per pool, of its maximum slots
+    peak_activities: int
+    mean_in_flight: Dict[str, float]  # Per activity class
+    errors: Dict[str, int] = field(default_factory=dict)  # Failure reason counts
+
+    def summary(self) -> str:
+        """Human-readable report"""
+        latency = ', '.join(f"{k} {v:.1f}s" for k, v in self.latency_seconds.items())
+        in_flight = ', '.join(f"{k} {v:.1f}" for k, v in sorted(self.mean_in_flight.items()))
+        slots = ', '.join(
+            f"{pool} {self.slot_utilization[pool]:.0%} of {count}"
+            for pool, count in sorted(self.activity_slots.items())
+        )
+        lines = [
+            f"{self.scenario}: {self.completed}/{self.workflows} completed, "
+            f"{self.failed} failed, {self.concurrency} in flight",
+            f"  throughput: {self.workflows_per_minute:.2f} workflows/min "
+            f"over {self.duration_seconds:.0f}s",
+            f"  latency: {latency}",
+            f"  history: {self.history_events['mean']:.0f} events "
+            f"(max {self.history_events['max']:.0f}), "
+            f"{self.history_bytes['mean'] / 1024:.1f} KiB "
+            f"(max {self.history_bytes['max'] / 1024:.1f} KiB)",
+            f"  activity slots used: {slots or 'none'}; peak {self.peak_activities} in flight",
+            f"  mean in flight: {in_flight or 'none'}",
+        ]
+        lines += [f"  error x{count}: {reason}" for reason, count in self.errors.items()]
+        return '\n'.join(lines)
+
+
+def _failure_reason(error: WorkflowFailureError) -> str:
+    cause = error.cause or error
+    return f"{type(cause).__name__}: {cause}"[:200]
+
+
+async def run_benchmark(
+    client: Client,
+    scenario: Scenario,
+    fakes: FakeActivities,
+    workflows: int = 20,
+    concurrency: int = 5,
+    pools: Optional[Sequence[ActivityPool]] = None,
+    workflow_slots: int = 10,
+    task_queue: str = TASK_QUEUE,
+    sandboxed: bool = True,
+    workflow_timeout: timedelta = timedelta(hours=6),
+) -> BenchmarkReport:
+    """
+    Run a scenario and measure it
+
+    Args:
+        client: Client of a time-skipping test environment, or of a dev server
+        scenario: Workflow to run
+        fakes: Activities the pool workers run
+        workflows: Number of workflows to run
+        concurrency: Workflows in flight at once
+        pools: Activity pools (default: ACTIVITY_POOLS, as in production)
+        workflow_slots: Workflow worker max_concurrent_workflow_tasks
+        task_queue: Workflow task queue; pools poll "<task_queue>-<pool>"
+        sandboxed: Run workflows in the sandbox, as production workers do
+        workflow_timeout: Execution timeout; stuck workflows count as failed
+
+    Returns:
+        Benchmark report
+    """
+    run_id = uuid.uuid4().hex[:8]
+    latencies: List[float] = []
+    histories: List[Any] = []
+    errors: Counter = Counter()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def run_one(i: int):
+        async with gate:
+            started = time.monotonic()
+            handle = await client.start_workflow(
+                scenario.workflow,
+                args=scenario.args(i),
+                id=f"benchmark-{scenario.name}-{run_id}-{i}",
+                task_queue=task_queue,
+                execution_timeout=workflow_timeout,
+            )
+            try:
+                await handle.result()
+                latencies.append(time.monotonic() - started)
+            except WorkflowFailureError as e:
+                errors[_failure_reason(e)] += 1
+        histories.append(await handle.fetch_history())
+
+    specs = {spec.name: spec for spec in pools or ACTIVITY_POOLS}
+    activities = fakes.activities_by_pool()
+    unserved = set(activities) - set(specs)
+    if unserved:
+        raise ValueError(f"No pool configured for: {', '.join(sorted(unserved))}")
+
+    routes = {
+        getattr(fn, '__temporal_activity_definition').name: pool_task_queue(task_queue, pool)
+        for pool, fns in activities.items()
+        for fn in fns
+    }
+    options = {} if sandboxed else {'workflow_runner': UnsandboxedWorkflowRunner()}
+    workers = [Worker(
+        client,
+        task_queue=task_queue,
+        workflows=WORKFLOWS,
+        interceptors=[TaskQueueRoutingInterceptor(routes)],
+        max_concurrent_workflow_tasks=workflow_slots,
+        # Fail the workflow on a bug instead of retrying the task until the
+        # execution timeout
+        workflow_failure_exception_types=[Exception],
+        **options,
+    )]
+    workers += [
+        Worker(
+            client,
+            task_queue=pool_task_queue(task_queue, pool),
+            activities=fns,
+            # The fakes are async, so no process pool is needed
+            **pool_worker_options(replace(specs[pool], process_pool=False)),
+        )
+        for pool, fns in activities.items()
+    ]
+    slots = {pool: specs[pool].max_slots for pool in activities}
+
+    with fakes.stub_delays_disabled():
+        async with AsyncExitStack() as stack:
+            for worker in workers:
+                await stack.enter_async_context(worker)
+            fakes.usage.reset()
+            started = time.monotonic()
+            await asyncio.gather(*(run_one(i) for i in range(workflows)))
+            elapsed = time.monotonic() - started
+
+    scale = fakes.time_scale
+    in_flight = fakes.usage.mean_in_flight(elapsed)
+    duration = elapsed / scale
+    event_counts = [len(h.events) for h in histories]
+    byte_counts = [sum(e.ByteSize() for e in h.events) for h in histories]
+
+    return BenchmarkReport(
+        scenario=scenario.name,
+        workflows=workflows,
+        concurrency=concurrency,
+        completed=len(latencies),
+        failed=sum(errors.values()),
+        duration_seconds=duration,
+        workflows_per_minute=len(latencies) / (duration / 60) if duration else 0.0,
+        latency_seconds={
+            'p50': percentile(latencies, 50) / scale,
+            'p90': percentile(latencies, 90) / scale,
+            'p99': percentile(latencies, 99) / scale,
+            'max': max(latencies, default=0.0) / scale,
+        },
+        history_events={
+            'mean': sum(event_counts) / len(event_counts) if event_counts else 0.0,
+            'max': max(event_counts, default=0),
+        },
+        history_bytes={
+            'mean': sum(byte_counts) / len(byte_counts) if byte_counts else 0.0,
+            'max': max(byte_counts, default=0),
+        },
+        activity_slots=slots,
+        slot_utilization={
+            pool: in_flight.get(pool, 0.0) / count for pool, count in slots.items()
+        },
+        peak_activities=fakes.usage.peak,
+        mean_in_flight=in_flight,
+        errors=dict(errors),
+    )
@@ -21,6 +21,7 @@ from workflows import (
     QualityGateWorkflow,
     ContinuousQualityWorkflow,
 )
+from codec import create_data_converter
 
 # Configure logging
 logging.basicConfig(
@@ -44,6 +45,7 @@ class WorkflowClient:
         temporal_host: str = "localhost:7233",
         namespace: str = "default",
         task_queue: str = TASK_QUEUE,
+        blob_store_url: Optional[str] = None,
     ):
         """
         Initialize workflow client
@@ -52,10 +54,13 @@ class WorkflowClient:
             temporal_host: Temporal server host:port
             namespace: Temporal namespace
             task_queue: Task queue name
+            blob_store_url: Blob store for claim-checked payloads; must match
+                the worker's. None only compresses payloads (see codec.py)
         """
         self.temporal_host = temporal_host
         self.namespace = namespace
         self.task_queue = task_queue
+        self.blob_store_url = blob_store_url
         self.client: Optional[Client] = None
 
     async def connect(self):
@@ -64,6 +69,7 @@ class WorkflowClient:
         self.client = await Client.connect(
             self.temporal_host,
             namespace=self.namespace,
+            data_converter=create_data_converter(blob_store_url=self.blob_store_url),
         )
         logger.info(f"Connected to namespace: {self.namespace}")
 
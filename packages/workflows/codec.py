@@ -0,0 +1,324 @@
+"""
+Payload codec for Temporal workflows
+
+Keeps workflow history small: payloads above a size threshold are stored in a
+content-addressed blob store and only a reference goes through history
+(claim check). Smaller payloads are compressed with zstd, or zlib when the
+zstandard package is not installed.
+
+Client and worker must use the same codec and blob store, e.g.:
+
+    converter = create_data_converter(blob_store_url="s3://workflow-payloads/prod")
+    client = await Client.connect(host, data_converter=converter)
+
+Without a blob store, payloads are only compressed: a store every client and
+worker can reach has to be configured explicitly.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+import temporalio.converter
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter, PayloadCodec
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import boto3
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Payloads above this size are stored in the blob store
+CLAIM_CHECK_THRESHOLD_BYTES = 128 * 1024
+
+# Payloads below this size are passed through unchanged
+COMPRESSION_MIN_BYTES = 1024
+
+
+class BlobStore(ABC):
+    """Content-addressed storage for claim-checked payloads"""
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes) -> None:
+        """Store data under key (idempotent for identical content)"""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes:
+        """Load data stored under key"""
+
+
+class MemoryBlobStore(BlobStore):
+    """In-process blob store for tests and local development"""
+
+    def __init__(self):
+        self.blobs: Dict[str, bytes] = {}
+
+    async def put(self, key: str, data: bytes) -> None:
+        self.blobs[key] = data
+
+    async def get(self, key: str) -> bytes:
+        try:
+            return self.blobs[key]
+        except KeyError:
+            raise KeyError(f"Blob not found: {key}")
+
+
+class FileBlobStore(BlobStore):
+    """Blob store on a local or shared filesystem"""
+
+    def __init__(self, root: str):
+        """
+        Initialize file blob store
+
+        Args:
+            root: Directory holding blobs, sharded by key prefix
+        """
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    async def put(self, key: str, data: bytes) -> None:
+        await asyncio.to_thread(self._write, self._path(key), data)
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        if path.exists():
+            return  # Content-addressed: already stored
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see partial blobs
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    async def get(self, key: str) -> bytes:
+        return await asyncio.to_thread(self._path(key).read_bytes)
+
+
+class S3BlobStore(BlobStore):
+    """Blob store on S3 or an S3-compatible service (MinIO, R2, ...)"""
+
+    def __init__(self, bucket: str, prefix: str = "", client=None, **client_kwargs):
+        """
+        Initialize S3 blob store
+
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix inside the bucket
+            client: Optional boto3 S3 client
+            **client_kwargs: Arguments for boto3.client("s3", ...), e.g.
+                endpoint_url for S3-compatible services
+        """
+        if client is None:
+            if not BOTO3_AVAILABLE:
+                raise ImportError("boto3 is required for S3BlobStore")
+            client = boto3.client("s3", **client_kwargs)
+
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def put(self, key: str, data: bytes) -> None:
+        await asyncio.to_thread(
+            self.client.put_object, Bucket=self.bucket, Key=self._key(key), Body=data
+        )
+
+    async def get(self, key: str) -> bytes:
+        response = await asyncio.to_thread(
+            self.client.get_object, Bucket=self.bucket, Key=self._key(key)
+        )
+        return await asyncio.to_thread(response["Body"].read)
+
+
+def create_blob_store(url: str) -> BlobStore:
+    """
+    Create a blob store from a URL
+
+    Supported: memory://, file:///path/to/dir, s3://bucket/prefix
+
+    Args:
+        url: Blob store URL
+
+    Returns:
+        Blob store
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryBlobStore()
+    if parsed.scheme == "file":
+        return FileBlobStore(parsed.path)
+    if parsed.scheme == "s3":
+        return S3BlobStore(parsed.netloc, parsed.path)
+    raise ValueError(f"Unsupported blob store URL: {url}")
+
+
+class ClaimCheckCodec(PayloadCodec):
+    """
+    Claim-check and compression payload codec
+
+    Features:
+    - Payloads above claim_check_threshold go to the blob store, keyed by
+      the SHA-256 of their content, and history keeps only the reference;
+      without a blob store they are compressed in place like smaller ones
+    - Payloads between compression_min_bytes and the threshold are
+      compressed in place when that makes them smaller
+    - Decoding verifies the content hash of claim-checked payloads
+    """
+
+    ENCODING_CLAIM_CHECK = b"binary/claim-check"
+    ENCODING_ZSTD = b"binary/zstd"
+    ENCODING_ZLIB = b"binary/zlib"
+
+    def __init__(
+        self,
+        blob_store: Optional[BlobStore],
+        claim_check_threshold: int = CLAIM_CHECK_THRESHOLD_BYTES,
+        compression_min_bytes: int = COMPRESSION_MIN_BYTES,
+        compression_level: int = 3,
+    ):
+        """
+        Initialize codec
+
+        Args:
+            blob_store: Store for claim-checked payloads; None disables
+                claim checks
+            claim_check_threshold: Serialized size above which payloads are
+                stored out of history
+            compression_min_bytes: Serialized size below which payloads are
+                left uncompressed
+            compression_level: zstd (or zlib) compression level
+        """
+        self.blob_store = blob_store
+        self.claim_check_threshold = claim_check_threshold
+        self.compression_min_bytes = compression_min_bytes
+        self.compression_level = compression_level
+
+        if ZSTD_AVAILABLE:
+            self._encoding = self.ENCODING_ZSTD
+            self._compressor = zstandard.ZstdCompressor(level=compression_level)
+            self._decompressor = zstandard.ZstdDecompressor()
+        else:
+            logger.warning("zstandard not installed - compressing payloads with zlib")
+            self._encoding = self.ENCODING_ZLIB
+
+    def _compress(self, data: bytes) -> bytes:
+        if self._encoding == self.ENCODING_ZSTD:
+            return self._compressor.compress(data)
+        return zlib.compress(data, self.compression_level)
+
+    def _decompress(self, encoding: bytes, data: bytes) -> bytes:
+        if encoding == self.ENCODING_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to decode zstd payloads")
+            return self._decompressor.decompress(data)
+        if encoding == self.ENCODING_ZLIB:
+            return zlib.decompress(data)
+        raise ValueError(f"Unknown payload compression: {encoding!r}")
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        """Encode payloads before they are written to history"""
+        return list(await asyncio.gather(*[self._encode(p) for p in payloads]))
+
+    async def _encode(self, payload: Payload) -> Payload:
+        data = payload.SerializeToString()
+        if len(data) < self.compression_min_bytes:
+            return payload
+
+        compressed = self._compress(data)
+
+        if self.blob_store is not None and len(data) > self.claim_check_threshold:
+            key = hashlib.sha256(data).hexdigest()
+            await self.blob_store.put(key, compressed)
+            reference = {
+                "key": key,
+                "size": len(data),
+                "encoding": self._encoding.decode(),
+            }
+            return Payload(
+                metadata={"encoding": self.ENCODING_CLAIM_CHECK},
+                data=json.dumps(reference, separators=(",", ":")).encode(),
+            )
+
+        if len(compressed) >= len(data):
+            return payload
+        return Payload(metadata={"encoding": self._encoding}, data=compressed)
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        """Decode payloads read from history"""
+        return list(await asyncio.gather(*[self._decode(p) for p in payloads]))
+
+    async def _decode(self, payload: Payload) -> Payload:
+        encoding = payload.metadata.get("encoding", b"")
+
+        if encoding == self.ENCODING_CLAIM_CHECK:
+            reference = json.loads(payload.data)
+            if self.blob_store is None:
+                raise ValueError(
+                    f"Payload {reference['key']} is claim-checked but no blob store is configured"
+                )
+            blob = await self.blob_store.get(reference["key"])
+            data = self._decompress(reference["encoding"].encode(), blob)
+            if hashlib.sha256(data).hexdigest() != reference["key"]:
+                raise ValueError(f"Claim-checked payload {reference['key']} is corrupt")
+            return Payload.FromString(data)
+
+        if encoding in (self.ENCODING_ZSTD, self.ENCODING_ZLIB):
+            return Payload.FromString(self._decompress(encoding, payload.data))
+
+        return payload
+
+
+def create_data_converter(
+    blob_store: Optional[BlobStore] = None,
+    blob_store_url: Optional[str] = None,
+    **codec_kwargs,
+) -> DataConverter:
+    """
+    Create the default data converter with the claim-check codec
+
+    Args:
+        blob_store: Blob store instance
+        blob_store_url: Blob store URL, used when no instance is given.
+            With neither, payloads are only compressed: a per-host default
+            would hold blobs that other workers can't read.
+        **codec_kwargs: ClaimCheckCodec settings
+
+    Returns:
+        Data converter for Client.connect
+    """
+    if blob_store is None and blob_store_url:
+        blob_store = create_blob_store(blob_store_url)
+    elif blob_store is None:
+        logger.info("No blob store configured - large payloads are compressed, not claim-checked")
+
+    return replace(
+        temporalio.converter.default(),
+        payload_codec=ClaimCheckCodec(blob_store, **codec_kwargs),
+    )
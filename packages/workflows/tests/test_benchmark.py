@@ -0,0 +1,166 @@
+"""
+Unit tests for the workflow benchmark harness
+"""
+import random
+import time
+
+import pytest
+
+from temporalio.testing import ActivityEnvironment, WorkflowEnvironment
+
+from packages.workflows.activities import (
+    agent_activities,
+    github_activities,
+    tool_activities,
+)
+from packages.workflows.benchmarks import (
+    SCENARIOS,
+    FakeActivities,
+    Fixed,
+    LogNormal,
+    SlotUsage,
+    Uniform,
+    parse_latency,
+    run_benchmark,
+)
+from packages.workflows.benchmarks.__main__ import _parse_pools
+from packages.workflows.benchmarks.harness import percentile
+from packages.workflows.tuning import ACTIVITY_POOLS, CPU, LLM, TEST_RUNS, TOOLS
+
+
+def fake(fakes, name):
+    return next(
+        f for f in fakes.activities()
+        if getattr(f, '__temporal_activity_definition').name == name
+    )
+
+
+class TestLatency:
+    """Test latency distributions"""
+
+    def test_parse(self):
+        """Distributions parse from CLI specs"""
+        assert parse_latency('fixed:2') == Fixed(2.0)
+        assert parse_latency('uniform:1,3') == Uniform(1.0, 3.0)
+        assert parse_latency('lognormal:60') == LogNormal(60.0)
+
+        with pytest.raises(ValueError):
+            parse_latency('gamma:1')
+
+    def test_lognormal_is_centered_on_median(self):
+        """Half the samples fall below the median"""
+        rng = random.Random(1)
+        samples = [LogNormal(10, 0.5).sample(rng) for _ in range(2000)]
+
+        assert 0.45 < sum(s < 10 for s in samples) / len(samples) < 0.55
+
+
+class TestSlotUsage:
+    """Test slot utilization accounting"""
+
+    def test_time_weighted_utilization(self):
+        """Utilization is slot time in use over slot time available"""
+        now = [0.0]
+        usage = SlotUsage(clock=lambda: now[0])
+
+        usage.start('llm')
+        usage.start('cpu')
+        now[0] = 5.0
+        usage.finish('cpu')
+        now[0] = 10.0
+        usage.finish('llm')
+
+        assert usage.peak == 2
+        assert usage.mean_in_flight(10.0) == {'llm': 1.0, 'cpu': 0.5}
+        assert usage.utilization(slots=3, elapsed=10.0) == pytest.approx(0.5)
+
+
+def test_percentile():
+    """Nearest-rank percentiles"""
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+class TestFakeActivities:
+    """Test fake activities"""
+
+    @pytest.mark.asyncio
+    async def test_returns_stub_result_without_stub_delay(self):
+        """Fakes sleep the sampled latency and return the stub's result"""
+        fakes = FakeActivities(
+            [tool_activities], latencies={'cpu': Fixed(1)}, time_scale=0.01
+        )
+
+        started = time.monotonic()
+        with fakes.stub_delays_disabled():
+            result = await ActivityEnvironment().run(
+                fake(fakes, 'run_linters'), {'files': {'a.py': ''}}
+            )
+
+        assert result['passed']
+        assert time.monotonic() - started < 1
+        assert fakes.usage.in_flight == {'cpu': 0}
+
+    @pytest.mark.asyncio
+    async def test_configured_response_and_latency(self):
+        """Per-activity latencies and responses override the defaults"""
+        fakes = FakeActivities(
+            [github_activities],
+            latencies={'create_branch': Fixed(0)},
+            responses={'create_branch': lambda name: f"created {name}"},
+        )
+
+        result = await ActivityEnvironment().run(fake(fakes, 'create_branch'), 'feature/x')
+
+        assert result == 'created feature/x'
+
+    def test_grouped_by_pool(self):
+        """Fakes are grouped by the pool of the activity they stand in for"""
+        pools = FakeActivities([tool_activities]).activities_by_pool()
+        names = {
+            pool: {getattr(f, '__temporal_activity_definition').name for f in fns}
+            for pool, fns in pools.items()
+        }
+
+        assert set(names) == {CPU, TEST_RUNS, TOOLS}
+        assert 'run_linters' in names[CPU]
+        assert 'run_tests' in names[TEST_RUNS]
+        assert 'fetch_metrics' in names[TOOLS]
+
+
+def test_parse_pool_slots():
+    """Resized fixed pools use all their slots; adaptive ones grow up to them"""
+    pools = {pool.name: pool for pool in _parse_pools(['llm=40', 'tools=8'])}
+
+    assert (pools[LLM].initial_slots, pools[LLM].max_slots) == (5, 40)
+    assert (pools[TOOLS].min_slots, pools[TOOLS].max_slots) == (8, 8)
+
+    with pytest.raises(ValueError):
+        _parse_pools(['gpu=1'])
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_plan_patch_pr_benchmark():
+    """A short run reports every workflow it started"""
+    try:
+        env = await WorkflowEnvironment.start_time_skipping()
+    except RuntimeError as e:
+        pytest.skip(f"Time-skipping test server unavailable: {e}")
+
+    async with env:
+        fakes = FakeActivities(
+            [agent_activities, github_activities, tool_activities], time_scale=0.001
+        )
+        report = await run_benchmark(
+            env.client, SCENARIOS['plan-patch-pr'], fakes,
+            workflows=4, concurrency=2, sandboxed=False,
+        )
+
+    assert report.completed + report.failed == 4
+    assert report.history_events['max'] > 0
+    assert report.peak_activities > 0
+    assert set(report.activity_slots) == {pool.name for pool in ACTIVITY_POOLS}
@@ -0,0 +1,107 @@
+"""
+Unit tests for the quality check result cache
+"""
+import subprocess
+import time
+
+import pytest
+from temporalio.testing import ActivityEnvironment
+
+from packages.workflows.activities.check_cache import (
+    CheckResultCache,
+    fingerprint,
+    list_tree,
+)
+from packages.workflows.activities.tool_activities import (
+    fingerprint_check_inputs,
+    run_linters,
+)
+
+CHECKS = ['unit_tests', 'linting', 'dependencies']
+
+
+class TestFingerprint:
+    """Test cache key computation"""
+
+    def test_file_checks_keyed_per_file(self):
+        """Changing one file only changes that file's key"""
+        before = fingerprint({'a.py': '1', 'b.py': '2', 'README.md': '3'}, CHECKS)
+        after = fingerprint({'a.py': '1', 'b.py': '9', 'README.md': '3'}, CHECKS)
+
+        assert set(before['files']['linting']) == {'a.py', 'b.py'}
+        assert before['files']['linting']['a.py'] == after['files']['linting']['a.py']
+        assert before['files']['linting']['b.py'] != after['files']['linting']['b.py']
+
+    def test_tree_and_lockfile_checks(self):
+        """Tree checks see every file, dependency checks only lockfiles"""
+        base = fingerprint({'a.py': '1', 'poetry.lock': '2'}, CHECKS)
+        code_change = fingerprint({'a.py': '5', 'poetry.lock': '2'}, CHECKS)
+        lock_change = fingerprint({'a.py': '1', 'poetry.lock': '6'}, CHECKS)
+
+        assert base['tree']['unit_tests'] != code_change['tree']['unit_tests']
+        assert base['tree']['dependencies'] == code_change['tree']['dependencies']
+        assert base['tree']['dependencies'] != lock_change['tree']['dependencies']
+
+    @pytest.mark.asyncio
+    async def test_list_tree(self, tmp_path):
+        """Files are listed with git blob hashes"""
+        subprocess.run(['git', 'init', '-q', '-b', 'main', str(tmp_path)], check=True)
+        (tmp_path / 'app.py').write_text('print("hi")\n')
+        subprocess.run(['git', '-C', str(tmp_path), 'add', '.'], check=True)
+        subprocess.run(
+            ['git', '-C', str(tmp_path), '-c', 'user.name=t', '-c', 'user.email=t@t',
+             'commit', '-q', '-m', 'init'],
+            check=True,
+        )
+        blob = subprocess.run(
+            ['git', '-C', str(tmp_path), 'hash-object', 'app.py'],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+
+        assert await list_tree('main', str(tmp_path)) == {'app.py': blob}
+        assert await list_tree('missing', str(tmp_path)) == {}
+
+
+class TestCheckResultCache:
+    """Test cache storage"""
+
+    def test_roundtrip(self, tmp_path):
+        """Stored results are returned; misses are omitted"""
+        cache = CheckResultCache(str(tmp_path))
+        cache.put_many({'abc': {'check': 'linting', 'result': {'issues': []}}})
+
+        assert cache.get_many(['abc', 'missing']) == {'abc': {'issues': []}}
+
+    def test_advisory_checks_expire(self, tmp_path, monkeypatch):
+        """Security and dependency verdicts expire"""
+        cache = CheckResultCache(str(tmp_path))
+        cache.put_many({
+            'deps': {'check': 'dependencies', 'result': {'vulnerabilities': []}},
+            'lint': {'check': 'linting', 'result': {'issues': []}},
+        })
+
+        later = time.time() + 2 * 24 * 3600
+        monkeypatch.setattr(time, 'time', lambda: later)
+
+        assert set(cache.get_many(['deps', 'lint'])) == {'lint'}
+
+
+class TestCheckActivities:
+    """Test cache-aware tool activities"""
+
+    def test_linters_report_per_file(self):
+        """File-scoped runs return a result per file"""
+        result = ActivityEnvironment().run(
+            run_linters, {'branch': 'main', 'files': ['a.py', 'b.py']}
+        )
+
+        assert set(result['files']) == {'a.py', 'b.py'}
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_unknown_branch(self, tmp_path, monkeypatch):
+        """Unreadable branches disable caching instead of failing"""
+        monkeypatch.setenv('QUALITY_GATE_REPO', str(tmp_path))
+
+        result = await ActivityEnvironment().run(fingerprint_check_inputs, 'main', CHECKS)
+
+        assert result == {'tree': {}, 'files': {}}
@@ -0,0 +1,148 @@
+"""
+Unit tests for the claim-check payload codec
+"""
+import pytest
+
+from temporalio.api.common.v1 import Payload
+
+from packages.workflows.codec import (
+    ClaimCheckCodec,
+    FileBlobStore,
+    MemoryBlobStore,
+    create_blob_store,
+    create_data_converter,
+)
+
+
+def make_payload(size: int) -> Payload:
+    """JSON payload with roughly `size` bytes of compressible data"""
+    return Payload(
+        metadata={"encoding": b"json/plain"},
+        data=b'"' + b"diff --git a/file.py b/file.py\n" * (size // 32) + b'"',
+    )
+
+
+class TestClaimCheckCodec:
+    """Test claim-check and compression encoding"""
+
+    @pytest.mark.asyncio
+    async def test_small_payload_passthrough(self):
+        """Payloads below the compression threshold are untouched"""
+        codec = ClaimCheckCodec(MemoryBlobStore())
+        payload = Payload(metadata={"encoding": b"json/plain"}, data=b'"ok"')
+
+        encoded = await codec.encode([payload])
+
+        assert encoded[0] == payload
+        assert await codec.decode(encoded) == [payload]
+
+    @pytest.mark.asyncio
+    async def test_medium_payload_compressed_inline(self):
+        """Payloads below the claim-check threshold are compressed in history"""
+        store = MemoryBlobStore()
+        codec = ClaimCheckCodec(store)
+        payload = make_payload(16 * 1024)
+
+        encoded = await codec.encode([payload])
+
+        assert encoded[0].metadata["encoding"] == codec._encoding
+        assert len(encoded[0].data) < len(payload.data)
+        assert store.blobs == {}
+        assert await codec.decode(encoded) == [payload]
+
+    @pytest.mark.asyncio
+    async def test_large_payload_claim_checked(self):
+        """Payloads above the threshold are replaced with a reference"""
+        store = MemoryBlobStore()
+        codec = ClaimCheckCodec(store, claim_check_threshold=64 * 1024)
+        payload = make_payload(512 * 1024)
+
+        encoded = await codec.encode([payload])
+
+        assert encoded[0].metadata["encoding"] == ClaimCheckCodec.ENCODING_CLAIM_CHECK
+        assert len(encoded[0].data) < 512
+        assert len(store.blobs) == 1
+        assert await codec.decode(encoded) == [payload]
+
+    @pytest.mark.asyncio
+    async def test_identical_payloads_stored_once(self):
+        """Blobs are content-addressed"""
+        store = MemoryBlobStore()
+        codec = ClaimCheckCodec(store, claim_check_threshold=64 * 1024)
+        payload = make_payload(256 * 1024)
+
+        first, second = await codec.encode([payload, payload])
+
+        assert first.data == second.data
+        assert len(store.blobs) == 1
+
+    @pytest.mark.asyncio
+    async def test_corrupt_blob_rejected(self):
+        """Decoding verifies the content hash"""
+        store = MemoryBlobStore()
+        codec = ClaimCheckCodec(store, claim_check_threshold=64 * 1024)
+        encoded = await codec.encode([make_payload(256 * 1024)])
+
+        key = next(iter(store.blobs))
+        store.blobs[key] = codec._compress(b"tampered")
+
+        with pytest.raises(ValueError):
+            await codec.decode(encoded)
+
+    @pytest.mark.asyncio
+    async def test_file_blob_store_roundtrip(self, tmp_path):
+        """Claim-checked payloads survive a separate codec instance"""
+        payload = make_payload(256 * 1024)
+        writer = ClaimCheckCodec(FileBlobStore(str(tmp_path)), claim_check_threshold=64 * 1024)
+        reader = ClaimCheckCodec(FileBlobStore(str(tmp_path)), claim_check_threshold=64 * 1024)
+
+        encoded = await writer.encode([payload])
+
+        assert await reader.decode(encoded) == [payload]
+
+
+class TestDataConverter:
+    """Test data converter construction"""
+
+    def test_create_blob_store(self, tmp_path):
+        """Blob stores are selected by URL scheme"""
+        assert isinstance(create_blob_store("memory://"), MemoryBlobStore)
+        store = create_blob_store(f"file://{tmp_path}")
+        assert isinstance(store, FileBlobStore)
+        assert str(store.root) == str(tmp_path)
+        with pytest.raises(ValueError):
+            create_blob_store("ftp://example.com/payloads")
+
+    @pytest.mark.asyncio
+    async def test_converter_roundtrip(self):
+        """Values round-trip through the converter and codec"""
+        converter = create_data_converter(
+            blob_store=MemoryBlobStore(), claim_check_threshold=64 * 1024
+        )
+        value = {"files": {"main.py": "print('hello')\n" * 20000}}
+
+        payloads = await converter.encode([value])
+
+        assert payloads[0].metadata["encoding"] == ClaimCheckCodec.ENCODING_CLAIM_CHECK
+        assert await converter.decode(payloads, [dict]) == [value]
+
+    @pytest.mark.asyncio
+    async def test_converter_without_blob_store(self):
+        """Without a blob store large payloads are compressed inline"""
+        converter = create_data_converter(claim_check_threshold=64 * 1024)
+        value = {"files": {"main.py": "print('hello')\n" * 20000}}
+
+        payloads = await converter.encode([value])
+
+        assert payloads[0].metadata["encoding"] != ClaimCheckCodec.ENCODING_CLAIM_CHECK
+        assert await converter.decode(payloads, [dict]) == [value]
+
+    @pytest.mark.asyncio
+    async def test_claim_check_needs_blob_store_to_decode(self):
+        """A claim-checked payload can't be decoded without a blob store"""
+        encoded = await ClaimCheckCodec(
+            MemoryBlobStore(), claim_check_threshold=64 * 1024
+        ).encode([make_payload(256 * 1024)])
+
+        with pytest.raises(ValueError):
+            await ClaimCheckCodec(None).decode(encoded)
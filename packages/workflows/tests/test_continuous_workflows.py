@@ -0,0 +1,220 @@
+"""
+Tests for the long-running monitoring workflows
+"""
+import asyncio
+import time
+import uuid
+
+import pytest
+from temporalio import workflow
+from temporalio.client import WorkflowExecutionStatus, WorkflowQueryFailedError
+from temporalio.service import RPCError
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import UnsandboxedWorkflowRunner, Worker
+
+from packages.workflows.workflows.incident_swarm import (
+    ContinuousMonitoringWorkflow,
+    Alert,
+)
+from packages.workflows.workflows.quality_gate import (
+    ContinuousQualityWorkflow,
+    PullRequestEvent,
+)
+
+
+def make_alert(alert_id: str) -> Alert:
+    return Alert(
+        id=alert_id,
+        severity="critical",
+        service="api",
+        message="Error rate above threshold",
+        timestamp="2024-01-01T00:00:00Z",
+        metrics={},
+        logs=[],
+    )
+
+
+@workflow.defn(name="IncidentSwarmWorkflow")
+class StuckIncidentWorkflow:
+    """Incident child that never finishes"""
+
+    @workflow.run
+    async def run(self, alert: Alert):
+        await workflow.wait_condition(lambda: False)
+
+
+@workflow.defn(name="QualityGateWorkflow")
+class StuckQualityGateWorkflow:
+    """Quality gate child that never finishes"""
+
+    @workflow.run
+    async def run(self, pr_number: int, branch: str):
+        await workflow.wait_condition(lambda: False)
+
+
+@pytest.fixture
+async def env():
+    try:
+        environment = await WorkflowEnvironment.start_time_skipping()
+    except RuntimeError as e:
+        pytest.skip(f"Time-skipping test server unavailable: {e}")
+    async with environment:
+        yield environment
+
+
+async def eventually(check, timeout: float = 10.0):
+    """Poll check() until it returns a truthy value"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = await check()
+            if result:
+                return result
+        except (RPCError, WorkflowQueryFailedError):
+            # Queries can fail while a run is continuing as new
+            pass
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.1)
+
+
+def worker(env, task_queue, workflows):
+    return Worker(
+        env.client,
+        task_queue=task_queue,
+        workflows=workflows,
+        workflow_runner=UnsandboxedWorkflowRunner(),
+    )
+
+
+class TestContinuousMonitoringWorkflow:
+    """Test Continuous Monitoring workflow"""
+
+    @pytest.mark.asyncio
+    async def test_alerts_deduplicated(self):
+        """Test duplicate and already handled alerts are not queued"""
+        workflow = ContinuousMonitoringWorkflow()
+        workflow.seen_alerts["alert-0"] = None
+
+        await workflow.report_alerts([make_alert("alert-0"), make_alert("alert-1")])
+        await workflow.report_alerts([make_alert("alert-1"), make_alert("alert-2")])
+
+        assert [a.id for a in workflow.pending_alerts] == ["alert-1", "alert-2"]
+        assert workflow.get_stats()["pending_alerts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stop_signal(self):
+        """Test stop signal is recorded"""
+        workflow = ContinuousMonitoringWorkflow()
+        await workflow.stop_monitoring()
+        assert workflow.stop_requested
+
+    @pytest.mark.workflow
+    @pytest.mark.asyncio
+    async def test_continues_as_new_with_state(self, env):
+        """Incidents start without blocking and state survives continue-as-new"""
+        task_queue = f"monitoring-{uuid.uuid4()}"
+        suffix = uuid.uuid4().hex[:8]
+
+        async with worker(env, task_queue, [ContinuousMonitoringWorkflow, StuckIncidentWorkflow]):
+            started = await env.client.start_workflow(
+                ContinuousMonitoringWorkflow.run,
+                args=["api", 0, 2],
+                id=f"monitoring-{suffix}",
+                task_queue=task_queue,
+            )
+            first_run_id = started.result_run_id
+            # Follows the latest run across continue-as-new
+            handle = env.client.get_workflow_handle(started.id)
+
+            # Each alert is one iteration; the child never finishes, so the
+            # second alert is only handled if the first did not block
+            for i in range(2):
+                await handle.signal(
+                    ContinuousMonitoringWorkflow.report_alerts,
+                    [make_alert(f"alert-{suffix}-{i}")],
+                )
+                await eventually(
+                    lambda i=i: _stat(handle, 'incidents_handled', lambda n: n >= i + 1)
+                )
+
+            # Two iterations done: the workflow continued as new with its state
+            description = await eventually(lambda: _new_run(handle, first_run_id))
+            assert description.status == WorkflowExecutionStatus.RUNNING
+            stats = await handle.query(ContinuousMonitoringWorkflow.get_stats)
+            assert stats['incidents_handled'] == 2
+
+            # Seen alerts were carried over, so a repeat is not started again
+            await handle.signal(
+                ContinuousMonitoringWorkflow.report_alerts, [make_alert(f"alert-{suffix}-0")]
+            )
+            await handle.signal(ContinuousMonitoringWorkflow.stop_monitoring)
+            await handle.result()
+
+            child = await env.client.get_workflow_handle(f"incident-alert-{suffix}-0").describe()
+            assert child.status == WorkflowExecutionStatus.RUNNING
+
+
+class TestContinuousQualityWorkflow:
+    """Test Continuous Quality workflow"""
+
+    @pytest.mark.asyncio
+    async def test_pr_updates_queued(self):
+        """Test PR update signals are queued for the next batch"""
+        workflow = ContinuousQualityWorkflow()
+
+        await workflow.pr_updated(PullRequestEvent(pr_number=1, branch="feature", head_sha="abc123"))
+
+        assert len(workflow.pending_events) == 1
+        assert workflow.get_stats() == {
+            "gates_started": 0,
+            "active_gates": [],
+            "pending_events": 1,
+        }
+
+    @pytest.mark.workflow
+    @pytest.mark.asyncio
+    async def test_continues_as_new_with_state(self, env):
+        """Gates start without blocking and seen commits survive continue-as-new"""
+        task_queue = f"quality-{uuid.uuid4()}"
+        repository = f"acme/app-{uuid.uuid4().hex[:8]}"
+
+        async with worker(env, task_queue, [ContinuousQualityWorkflow, StuckQualityGateWorkflow]):
+            started = await env.client.start_workflow(
+                ContinuousQualityWorkflow.run,
+                args=[repository, 1],
+                id=f"quality-monitor-{repository.replace('/', '-')}",
+                task_queue=task_queue,
+            )
+            first_run_id = started.result_run_id
+            handle = env.client.get_workflow_handle(started.id)
+
+            event = PullRequestEvent(pr_number=1, branch="feature", head_sha="abc123")
+            await handle.signal(ContinuousQualityWorkflow.pr_updated, event)
+
+            # The gate never finishes, yet the batch completes and the
+            # workflow continues as new after max_iterations=1
+            await eventually(lambda: _new_run(handle, first_run_id))
+            stats = await eventually(lambda: _stat(handle, 'gates_started', lambda n: n == 1))
+            assert stats['pending_events'] == 0
+
+            # The same commit again is deduplicated; a new one starts a gate
+            await handle.signal(ContinuousQualityWorkflow.pr_updated, event)
+            await handle.signal(
+                ContinuousQualityWorkflow.pr_updated,
+                PullRequestEvent(pr_number=1, branch="feature", head_sha="def456"),
+            )
+            await eventually(lambda: _stat(handle, 'gates_started', lambda n: n == 2))
+
+            await handle.signal(ContinuousQualityWorkflow.stop_monitoring)
+            await handle.result()
+
+
+async def _stat(handle, key, predicate):
+    stats = await handle.query("get_stats")
+    return stats if predicate(stats[key]) else None
+
+
+async def _new_run(handle, first_run_id):
+    description = await handle.describe()
+    return description if description.run_id != first_run_id else None
@@ -0,0 +1,150 @@
+"""
+Unit tests for event-driven DAG execution
+"""
+import asyncio
+
+import pytest
+
+from temporalio import workflow
+
+from packages.workflows.workflows.dag import chain_lengths, run_dag
+
+
+def node(node_id, deps=(), delay=0.01, success=True):
+    return {'id': node_id, 'deps': list(deps), 'delay': delay, 'success': success}
+
+
+async def run_nodes(nodes, started, **kwargs):
+    async def run(n):
+        started.append(n['id'])
+        await asyncio.sleep(n['delay'])
+        return {'id': n['id'], 'success': n['success']}
+
+    return await run_dag(
+        nodes,
+        run,
+        get_id=lambda n: n['id'],
+        get_dependencies=lambda n: n['deps'],
+        **{'max_concurrency': 10, **kwargs},
+    )
+
+
+class TestRunDag:
+    """Test DAG scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_slow_node_does_not_block_other_branches(self):
+        """Dependents start when their own dependencies finish"""
+        started = []
+        nodes = [
+            node('slow', delay=0.2),
+            node('fast'),
+            node('after-fast', ['fast']),
+            node('after-slow', ['slow']),
+        ]
+
+        outcome = await run_nodes(nodes, started)
+
+        assert started.index('after-fast') < started.index('after-slow')
+        assert list(outcome.results)[:2] == ['fast', 'after-fast']
+        assert outcome.pending == []
+
+    @pytest.mark.asyncio
+    async def test_critical_path_starts_first(self):
+        """With one slot, the node heading the longest chain runs first"""
+        started = []
+        nodes = [
+            node('leaf'),
+            node('root'),
+            node('middle', ['root']),
+            node('end', ['middle']),
+        ]
+
+        await run_nodes(nodes, started, max_concurrency=1)
+
+        assert started[:2] == ['root', 'middle']
+
+    @pytest.mark.asyncio
+    async def test_completed_nodes_are_skipped(self):
+        """Checkpointed nodes are not rerun and satisfy dependencies"""
+        started = []
+        nodes = [node('a'), node('b', ['a'])]
+
+        outcome = await run_nodes(nodes, started, completed=['a'])
+
+        assert started == ['b']
+        assert list(outcome.results) == ['b']
+
+    @pytest.mark.asyncio
+    async def test_stop_when_drains_in_flight(self):
+        """A stopping result lets running nodes finish but starts no more"""
+        started = []
+        nodes = [
+            node('bad', success=False),
+            node('running', delay=0.05),
+            node('next', ['bad']),
+        ]
+
+        outcome = await run_nodes(
+            nodes, started, stop_when=lambda result: not result['success']
+        )
+
+        assert outcome.stopped_on == 'bad'
+        assert 'running' in outcome.results
+        assert outcome.pending == ['next']
+        assert not outcome.interrupted
+
+    @pytest.mark.asyncio
+    async def test_should_stop_interrupts(self):
+        """should_stop ends the run with the rest left for the next run"""
+        started = []
+        nodes = [node('a'), node('b', ['a']), node('c', ['b'])]
+
+        outcome = await run_nodes(nodes, started, should_stop=lambda: len(started) >= 1)
+
+        assert started == ['a']
+        assert outcome.interrupted
+        assert outcome.pending == ['b', 'c']
+
+    @pytest.mark.asyncio
+    async def test_cycle_is_reported_pending(self):
+        """Nodes in a dependency cycle never start"""
+        started = []
+        nodes = [node('a', ['b']), node('b', ['a']), node('c')]
+
+        outcome = await run_nodes(nodes, started)
+
+        assert started == ['c']
+        assert outcome.pending == ['a', 'b']
+        assert not outcome.interrupted
+
+    @pytest.mark.asyncio
+    async def test_pause_and_resume(self, monkeypatch):
+        """No node starts while paused"""
+        async def wait_condition(fn, timeout=None):
+            while not fn():
+                await asyncio.sleep(0.005)
+
+        monkeypatch.setattr(workflow, 'wait_condition', wait_condition)
+
+        state = {'paused': True}
+        started = []
+        task = asyncio.ensure_future(
+            run_nodes([node('a')], started, is_paused=lambda: state['paused'])
+        )
+
+        await asyncio.sleep(0.03)
+        assert started == []
+
+        state['paused'] = False
+        outcome = await asyncio.wait_for(task, 1)
+        assert list(outcome.results) == ['a']
+
+
+def test_chain_lengths():
+    """Chain length counts the longest path of dependents"""
+    lengths = chain_lengths(
+        ['a', 'b', 'c', 'd'], {'a': ['b', 'd'], 'b': ['c']}
+    )
+
+    assert lengths == {'a': 3, 'b': 2, 'c': 1, 'd': 1}
@@ -0,0 +1,88 @@
+"""
+Unit tests for bounded fan-out helpers
+"""
+import asyncio
+
+import pytest
+
+from packages.workflows.workflows.fan_out import bounded_gather, order_by_dependencies
+
+
+class TestBoundedGather:
+    """Test bounded concurrency"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_window(self):
+        """No more than max_concurrency items run at once"""
+        in_flight = 0
+        peak = 0
+        started = []
+
+        async def run(item):
+            nonlocal in_flight, peak
+            started.append(item)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return item * 2
+
+        results = await bounded_gather(list(range(10)), run, max_concurrency=3)
+
+        assert results == [i * 2 for i in range(10)]
+        assert peak == 3
+        assert started == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_on_result_checkpoints(self):
+        """Completed items are reported even if a later item fails"""
+        done = {}
+
+        async def run(item):
+            if item == 'bad':
+                await asyncio.sleep(0.01)
+                raise RuntimeError("boom")
+            return item.upper()
+
+        with pytest.raises(RuntimeError):
+            await bounded_gather(
+                ['a', 'b', 'bad'], run, max_concurrency=2,
+                on_result=lambda item, result: done.__setitem__(item, result),
+            )
+
+        assert done == {'a': 'A', 'b': 'B'}
+
+
+class TestOrderByDependencies:
+    """Test start ordering"""
+
+    def test_dependencies_first_then_priority(self):
+        """Dependencies come first; higher priority first among ready items"""
+        issues = [
+            {'id': 'api', 'deps': ['models'], 'complexity': 5},
+            {'id': 'docs', 'deps': [], 'complexity': 1},
+            {'id': 'models', 'deps': [], 'complexity': 3},
+            {'id': 'ui', 'deps': ['api', 'external'], 'complexity': 8},
+        ]
+
+        ordered = order_by_dependencies(
+            issues,
+            get_id=lambda i: i['id'],
+            get_dependencies=lambda i: i['deps'],
+            get_priority=lambda i: i['complexity'],
+        )
+
+        assert [i['id'] for i in ordered] == ['models', 'docs', 'api', 'ui']
+
+    def test_cycle_falls_back_to_priority(self):
+        """Cyclic items are still returned"""
+        items = [('a', ['b'], 1), ('b', ['a'], 2)]
+
+        ordered = order_by_dependencies(
+            items,
+            get_id=lambda i: i[0],
+            get_dependencies=lambda i: i[1],
+            get_priority=lambda i: i[2],
+        )
+
+        assert [i[0] for i in ordered] == ['b', 'a']
@@ -0,0 +1,105 @@
+"""
+Unit tests for the fail-fast gate scheduler
+"""
+import asyncio
+
+import pytest
+
+from packages.workflows.workflows.gate_scheduler import Gate, run_gates
+from packages.workflows.workflows.quality_gate import QUALITY_CHECKS, QualityGateWorkflow
+
+
+def make_gate(gate_id, delay, result, started, cancelled, blocking=False):
+    async def run():
+        started.append(gate_id)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(gate_id)
+            raise
+        return result
+
+    return Gate(
+        id=gate_id,
+        run=run,
+        cost=delay,
+        is_blocking_failure=lambda r: blocking and not r['passed'],
+    )
+
+
+class TestRunGates:
+    """Test gate scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_all_gates_complete(self):
+        """Without failures every gate runs, cheapest first"""
+        started, cancelled = [], []
+        gates = [
+            make_gate('slow', 0.05, {'passed': True}, started, cancelled),
+            make_gate('fast', 0.01, {'passed': True}, started, cancelled),
+        ]
+
+        outcome = await run_gates(gates)
+
+        assert started == ['fast', 'slow']
+        assert set(outcome.results) == {'fast', 'slow'}
+        assert outcome.failed_on is None
+
+    @pytest.mark.asyncio
+    async def test_blocking_failure_cancels_remaining(self):
+        """A failed blocking gate cancels in-flight and pending gates"""
+        started, cancelled = [], []
+        gates = [
+            make_gate('lint', 0.01, {'passed': False}, started, cancelled, blocking=True),
+            make_gate('integration', 1.0, {'passed': True}, started, cancelled),
+            make_gate('perf', 2.0, {'passed': True}, started, cancelled),
+        ]
+
+        outcome = await run_gates(gates, max_concurrency=2)
+
+        assert outcome.failed_on == 'lint'
+        assert outcome.cancelled == ['integration']
+        assert outcome.skipped == ['perf']
+        assert cancelled == ['integration']
+
+    @pytest.mark.asyncio
+    async def test_non_blocking_failure_reported(self):
+        """Non-blocking failures are reported without stopping the run"""
+        started, cancelled = [], []
+        reported = []
+
+        async def on_result(gate, result):
+            reported.append((gate.id, result['passed']))
+
+        gates = [
+            make_gate('lint', 0.01, {'passed': False}, started, cancelled),
+            make_gate('tests', 0.02, {'passed': True}, started, cancelled, blocking=True),
+        ]
+
+        outcome = await run_gates(gates, on_result=on_result)
+
+        assert reported == [('lint', False), ('tests', True)]
+        assert outcome.failed_on is None
+        assert cancelled == []
+
+    @pytest.mark.asyncio
+    async def test_quality_checks_start_cheapest_first(self):
+        """A cheap blocking failure keeps the long test runs from starting"""
+        started, cancelled = [], []
+        gates = [
+            make_gate(
+                spec.id,
+                spec.timeout.total_seconds() / 10000,
+                {'passed': spec.id != 'dependencies'},
+                started,
+                cancelled,
+                blocking=spec.blocking,
+            )
+            for spec in QUALITY_CHECKS
+        ]
+
+        outcome = await run_gates(gates, max_concurrency=QualityGateWorkflow.MAX_PARALLEL_CHECKS)
+
+        assert outcome.failed_on == 'dependencies'
+        assert started[0] == 'dependencies'
+        assert {'unit_tests', 'integration_tests', 'performance'} <= set(outcome.skipped)
@@ -0,0 +1,136 @@
+"""
+Unit tests for batched PR change application
+"""
+import dataclasses
+
+import pytest
+
+from temporalio.testing import ActivityEnvironment
+
+from packages.workflows.activities import github_activities
+from packages.workflows.activities.github_activities import apply_pr_changes
+
+
+class FakeGit:
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def commit_files(self, owner, repo, branch, files, message,
+                           blob_shas=None, max_concurrency=8, on_blob=None):
+        self.calls.append(('commit_files', sorted(files), dict(blob_shas or {})))
+        for path, content in files.items():
+            if content is not None and path not in (blob_shas or {}):
+                on_blob(path, f"blob-{path}")
+        return {'sha': 'c1', 'tree': 't1', 'parent': 'c0'}
+
+    async def create_commit_status(self, owner, repo, sha, state, description, context):
+        self.calls.append(('status', sha, state, context))
+
+
+class FakeIssues:
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def add_labels(self, owner, repo, number, labels):
+        self.calls.append(('labels', number, labels))
+
+    async def add_comment(self, owner, repo, number, body):
+        self.calls.append(('comment', number, body))
+
+
+class FakePullRequests:
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def request_reviewers(self, owner, repo, number, reviewers):
+        self.calls.append(('reviewers', number, reviewers))
+
+    async def get_pull_request(self, owner, repo, number):
+        return {'head': {'sha': 'head-sha'}}
+
+
+@pytest.fixture
+def github(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        github_activities,
+        '_github_operations',
+        lambda: (FakeGit(calls), FakeIssues(calls), FakePullRequests(calls)),
+    )
+    monkeypatch.setenv('GITHUB_REPOSITORY', 'acme/app')
+    return calls
+
+
+def changes(**overrides):
+    return {
+        'branch': 'feature/x',
+        'files': {'a.py': 'a', 'b.py': 'b', 'old.py': None},
+        'message': 'Add feature',
+        'pr_number': 7,
+        'labels': ['automated'],
+        'reviewers': ['octocat'],
+        'comment': 'Ready for review',
+        'status': {'state': 'success', 'description': 'All checks passed'},
+        **overrides,
+    }
+
+
+class TestApplyPrChanges:
+    """Test the apply_pr_changes activity"""
+
+    @pytest.mark.asyncio
+    async def test_one_commit_then_pr_updates(self, github):
+        """Files become one commit; PR updates follow and the status is on the commit"""
+        env = ActivityEnvironment()
+        heartbeats = []
+        env.on_heartbeat = lambda *details: heartbeats.append(details[0])
+
+        result = await env.run(apply_pr_changes, changes())
+
+        assert github[0] == ('commit_files', ['a.py', 'b.py', 'old.py'], {})
+        assert sorted(call[0] for call in github[1:]) == ['comment', 'labels', 'reviewers', 'status']
+        assert ('status', 'c1', 'success', 'autonomous-coding') in github
+        assert result['commit_sha'] == 'c1'
+        assert sorted(result['applied']) == ['comment', 'labels', 'reviewers', 'status']
+        assert heartbeats[-1]['blobs'] == {'a.py': 'blob-a.py', 'b.py': 'blob-b.py'}
+
+    @pytest.mark.asyncio
+    async def test_retry_resumes_from_heartbeat(self, github):
+        """A retry doesn't repeat the commit or updates already applied"""
+        env = ActivityEnvironment()
+        env.info = dataclasses.replace(env.info, heartbeat_details=[{
+            'blobs': {'a.py': 'blob-a.py'},
+            'commit_sha': 'c1',
+            'done': ['comment'],
+        }])
+
+        await env.run(apply_pr_changes, changes())
+
+        assert sorted(call[0] for call in github) == ['labels', 'reviewers', 'status']
+
+    @pytest.mark.asyncio
+    async def test_status_without_files_goes_on_pr_head(self, github):
+        """Without files only the PR is updated"""
+        result = await ActivityEnvironment().run(
+            apply_pr_changes,
+            changes(files=None, labels=None, reviewers=None),
+        )
+
+        assert ('status', 'head-sha', 'success', 'autonomous-coding') in github
+        assert not any(call[0] == 'commit_files' for call in github)
+        assert result['commit_sha'] is None
+
+    @pytest.mark.asyncio
+    async def test_simulated_without_token(self, monkeypatch):
+        """Without GITHUB_TOKEN the calls are simulated"""
+        monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+        monkeypatch.setattr(github_activities.asyncio, 'sleep', _no_sleep)
+
+        result = await ActivityEnvironment().run(apply_pr_changes, changes())
+
+        assert result['commit_sha'] == 'commit123abc'
+        assert result['files_committed'] == 3
+
+
+async def _no_sleep(*args):
+    pass
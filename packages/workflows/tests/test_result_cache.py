@@ -0,0 +1,157 @@
+"""
+Unit tests for agent activity result memoization
+"""
+from datetime import timedelta
+
+import pytest
+
+from temporalio import workflow
+from temporalio.testing import ActivityEnvironment
+
+from packages.workflows.activities import result_cache
+from packages.workflows.activities.agent_activities import create_design
+from packages.workflows.activities.result_cache import (
+    MemoryResultCache,
+    RedisResultCache,
+    memo_key,
+)
+from packages.workflows.activities.tool_activities import (
+    lookup_activity_result,
+    store_activity_result,
+)
+from packages.workflows.workflows import memo
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    cache = MemoryResultCache()
+    monkeypatch.setattr(result_cache, '_cache', cache)
+    return cache
+
+
+class MockLogger:
+    def info(self, *args, **kwargs):
+        pass
+
+    def warning(self, *args, **kwargs):
+        pass
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class TestMemoKey:
+    """Test cache key normalization"""
+
+    def test_equivalent_arguments_share_key(self):
+        """Key order and surrounding whitespace don't change the key"""
+        assert memo_key('create_issues', [{'a': 1, 'b': ' x '}]) == \
+            memo_key('create_issues', [{'b': 'x', 'a': 1}])
+
+    def test_repo_hash_changes_key(self):
+        """Results are tied to the repository content"""
+        assert memo_key('analyze_codebase', ['react'], 'tree1') != \
+            memo_key('analyze_codebase', ['react'], 'tree2')
+
+
+class TestBackends:
+    """Test cache backends"""
+
+    @pytest.mark.asyncio
+    async def test_memory_cache_expires(self):
+        """Entries are gone after their TTL"""
+        cache = MemoryResultCache()
+        await cache.set('k', {'v': 1}, ttl_seconds=-1)
+
+        assert await cache.get('k') is None
+
+    @pytest.mark.asyncio
+    async def test_redis_roundtrip(self):
+        """Results are stored as JSON under the key prefix"""
+        client = FakeRedis()
+        cache = RedisResultCache(client)
+
+        await cache.set('k', {'v': 1}, ttl_seconds=60)
+
+        assert 'activity-result:k' in client.data
+        assert await cache.get('k') == {'v': 1}
+
+
+class TestCacheActivities:
+    """Test lookup and store activities"""
+
+    @pytest.mark.asyncio
+    async def test_lookup_after_store(self, memory_cache):
+        """A stored result is found for the same call"""
+        env = ActivityEnvironment()
+        miss = await env.run(lookup_activity_result, 'create_design', ['Add login'])
+        await env.run(store_activity_result, miss['key'], {'architecture': 'x'}, 60)
+        hit = await env.run(lookup_activity_result, 'create_design', [' Add login '])
+
+        assert not miss['hit']
+        assert hit == {'key': miss['key'], 'hit': True, 'result': {'architecture': 'x'}}
+
+    @pytest.mark.asyncio
+    async def test_unreadable_repo_disables_caching(self, memory_cache, tmp_path, monkeypatch):
+        """Without a repository hash the call is not cached"""
+        monkeypatch.setenv('QUALITY_GATE_REPO', str(tmp_path))
+
+        lookup = await ActivityEnvironment().run(
+            lookup_activity_result, 'analyze_codebase', ['react'], 'main'
+        )
+
+        assert lookup['key'] is None
+
+
+class TestExecuteMemoizedActivity:
+    """Test the workflow-side helper"""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_activity(self, monkeypatch):
+        """A cache hit returns the cached result without running the activity"""
+        calls = []
+
+        async def execute_activity(activity, args=(), **kwargs):
+            calls.append(activity.__name__)
+            if activity.__name__ == 'lookup_activity_result':
+                return {'key': 'k', 'hit': True, 'result': {'cached': True}}
+
+        monkeypatch.setattr(workflow, 'execute_activity', execute_activity)
+        monkeypatch.setattr(workflow, 'logger', MockLogger())
+
+        result = await memo.execute_memoized_activity(
+            create_design, ['Add login'], ttl=timedelta(days=1)
+        )
+
+        assert result == {'cached': True}
+        assert calls == ['lookup_activity_result']
+
+    @pytest.mark.asyncio
+    async def test_miss_runs_and_stores(self, monkeypatch):
+        """A miss runs the activity and stores its result"""
+        calls = []
+
+        async def execute_activity(activity, args=(), **kwargs):
+            calls.append((activity.__name__, args))
+            if activity.__name__ == 'lookup_activity_result':
+                return {'key': 'k', 'hit': False, 'result': None}
+            if activity.__name__ == 'create_design':
+                return {'architecture': 'new'}
+
+        monkeypatch.setattr(workflow, 'execute_activity', execute_activity)
+        monkeypatch.setattr(workflow, 'logger', MockLogger())
+
+        result = await memo.execute_memoized_activity(
+            create_design, ['Add login'], ttl=timedelta(hours=1)
+        )
+
+        assert result == {'architecture': 'new'}
+        assert calls[-1] == ('store_activity_result', ['k', {'architecture': 'new'}, 3600])
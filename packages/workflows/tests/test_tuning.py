@@ -0,0 +1,202 @@
+"""
+Unit tests for task-queue routing and adaptive concurrency
+"""
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from temporalio.exceptions import ApplicationError
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import StartActivityInput
+
+from packages.workflows import activities, codec, tuning, workflows
+from packages.workflows.activities import agent_activities, github_activities, tool_activities
+from packages.workflows.tuning import (
+    CPU,
+    GITHUB_IO,
+    LLM,
+    TEST_RUNS,
+    TOOLS,
+    AdaptiveSlotSupplier,
+    ConcurrencyLimit,
+    _RoutingOutboundInterceptor,
+    activity_pool,
+    is_rate_limit_error,
+)
+
+
+def start_input(activity: str, task_queue=None) -> StartActivityInput:
+    return StartActivityInput(
+        activity=activity, args=[], activity_id=None, task_queue=task_queue,
+        schedule_to_close_timeout=None, schedule_to_start_timeout=None,
+        start_to_close_timeout=None, heartbeat_timeout=None, retry_policy=None,
+        cancellation_type=None, headers={}, disable_eager_execution=False,
+        versioning_intent=None, summary=None, priority=None,
+        arg_types=None, ret_type=None,
+    )
+
+
+class TestRouting:
+    """Test activity task queue routing"""
+
+    def test_routes_known_activities(self):
+        """Activities without a task queue go to their pool's queue"""
+        next = MagicMock()
+        router = _RoutingOutboundInterceptor(next, {'generate_code': 'q-llm'})
+
+        router.start_activity(start_input('generate_code'))
+        router.start_activity(start_input('notify_team'))
+        router.start_activity(start_input('generate_code', task_queue='custom'))
+
+        queues = [call.args[0].task_queue for call in next.start_activity.call_args_list]
+        assert queues == ['q-llm', None, 'custom']
+
+
+class TestActivityPools:
+    """Test activity partitioning over worker pools"""
+
+    def test_pool_per_activity(self):
+        """Scanners run on the process pool, test runs apart from quick calls"""
+        assert activity_pool(agent_activities.generate_code) == LLM
+        assert activity_pool(github_activities.create_branch) == GITHUB_IO
+        assert activity_pool(tool_activities.run_linters) == CPU
+        assert activity_pool(tool_activities.run_security_scan) == CPU
+        assert activity_pool(tool_activities.run_tests) == TEST_RUNS
+        assert activity_pool(tool_activities.run_performance_tests) == TEST_RUNS
+        assert activity_pool(tool_activities.fetch_metrics) == TOOLS
+        assert activity_pool(tool_activities.lookup_activity_result) == TOOLS
+
+
+@pytest.fixture
+def worker_module(monkeypatch):
+    """worker.py, which imports its siblings as top-level modules"""
+    for name, module in [
+        ('workflows', workflows), ('activities', activities), ('codec', codec), ('tuning', tuning),
+    ]:
+        monkeypatch.setitem(sys.modules, name, module)
+    spec = importlib.util.spec_from_file_location(
+        'worker', Path(__file__).parent.parent / 'worker.py'
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestWorkers:
+    """Test worker construction"""
+
+    def test_every_activity_has_a_pool(self, worker_module):
+        """The pool workers together serve every activity exactly once"""
+        activities = worker_module.collect_activities(worker_module.ACTIVITY_MODULES)
+        pools = {activity_pool(fn) for fn in activities}
+
+        assert pools == {pool.name for pool in tuning.ACTIVITY_POOLS}
+        assert set(worker_module.POOL_NAMES) == pools | {worker_module.WORKFLOW_POOL}
+
+    @pytest.mark.asyncio
+    async def test_unpartitioned_worker(self, worker_module):
+        """The single local worker can run the sync scanners"""
+        try:
+            env = await WorkflowEnvironment.start_time_skipping()
+        except RuntimeError as e:
+            pytest.skip(f"Time-skipping test server unavailable: {e}")
+
+        async with env:
+            worker = await worker_module.create_worker(env.client, 'local-task-queue')
+
+        assert worker.config()['activity_executor'] is not None
+
+
+class TestConcurrencyLimit:
+    """Test AIMD limit updates"""
+
+    def test_grows_only_when_saturated(self):
+        """The limit grows while all slots are in use"""
+        limit = ConcurrencyLimit(initial=4, maximum=10)
+
+        limit.on_success('generate_code', 1.0, in_use=1)
+        assert limit.slots == 4
+
+        for _ in range(8):
+            limit.on_success('generate_code', 1.0, in_use=limit.slots)
+        assert limit.slots == 5
+
+    def test_backs_off_on_latency(self):
+        """Latency well above the baseline shrinks the limit"""
+        limit = ConcurrencyLimit(initial=10)
+
+        limit.on_success('generate_code', 1.0, in_use=10)
+        limit.on_success('generate_code', 5.0, in_use=10)
+
+        assert limit.slots == 9
+
+    def test_baseline_per_activity_type(self):
+        """Slow activity types are not compared against fast ones"""
+        limit = ConcurrencyLimit(initial=10)
+
+        limit.on_success('create_design', 1.0, in_use=1)
+        limit.on_success('generate_code', 600.0, in_use=1)
+
+        assert limit.slots == 10
+
+    def test_rate_limit_halves_within_bounds(self):
+        """Rate-limit errors halve the limit, down to the minimum"""
+        limit = ConcurrencyLimit(initial=8, minimum=3)
+
+        limit.on_rate_limited()
+        assert limit.slots == 4
+        limit.on_rate_limited()
+        assert limit.slots == 3
+
+
+class TestAdaptiveSlotSupplier:
+    """Test slot reservation against the limit"""
+
+    @pytest.mark.asyncio
+    async def test_reserve_waits_for_release(self):
+        """Reservations beyond the limit wait for a released slot"""
+        supplier = AdaptiveSlotSupplier(ConcurrencyLimit(initial=1))
+        ctx = MagicMock()
+
+        permit = await supplier.reserve_slot(ctx)
+        assert supplier.try_reserve_slot(ctx) is None
+
+        waiting = asyncio.ensure_future(supplier.reserve_slot(ctx))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+
+        supplier.release_slot(MagicMock(permit=permit))
+        assert await asyncio.wait_for(waiting, 1) is not None
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_reduces_new_reservations(self):
+        """After a rate limit fewer slots are handed out"""
+        supplier = AdaptiveSlotSupplier(ConcurrencyLimit(initial=4))
+        ctx = MagicMock()
+
+        supplier.record_rate_limited()
+        permits = [supplier.try_reserve_slot(ctx) for _ in range(4)]
+
+        assert sum(permit is not None for permit in permits) == 2
+
+
+class TestRateLimitErrors:
+    """Test rate-limit error detection"""
+
+    def test_detects_rate_limits(self):
+        """Typed application errors and HTTP 429 count as rate limits"""
+        class RateLimitError(Exception):
+            pass
+
+        http_error = Exception("too many requests")
+        http_error.response = MagicMock(status_code=429)
+
+        assert is_rate_limit_error(ApplicationError("slow down", type="RateLimitError"))
+        assert is_rate_limit_error(http_error)
+        assert is_rate_limit_error(RateLimitError())
+        assert not is_rate_limit_error(ApplicationError("bad input", type="ValueError"))
+        assert not is_rate_limit_error(ValueError("bad input"))
@@ -8,7 +8,7 @@ from temporalio.worker import Worker
 
 from packages.workflows.workflows.plan_patch_pr import PlanPatchPRWorkflow, PRResult
 from packages.workflows.workflows.incident_swarm import IncidentSwarmWorkflow
-from packages.workflows.workflows.migration import MigrationWorkflow
+from packages.workflows.workflows.migration import CodeMigrationWorkflow
 from packages.workflows.workflows.quality_gate import QualityGateWorkflow
 
 
@@ -199,7 +199,7 @@ class TestMigrationWorkflow:
     @pytest.mark.asyncio
     async def test_workflow_initialization(self):
         """Test workflow can be instantiated"""
-        workflow = MigrationWorkflow()
+        workflow = CodeMigrationWorkflow()
         assert workflow is not None
 
     @pytest.mark.asyncio
@@ -221,14 +221,14 @@ class TestMigrationWorkflow:
             async with Worker(
                 env.client,
                 task_queue="test-queue",
-                workflows=[MigrationWorkflow],
+                workflows=[CodeMigrationWorkflow],
                 activities={
                     "plan_migration": mock_plan_migration,
                     "execute_migration": mock_execute_migration,
                 }
             ):
                 result = await env.client.execute_workflow(
-                    MigrationWorkflow.run,
+                    CodeMigrationWorkflow.run,
                     {
                         "source": "old_version",
                         "target": "new_version",
@@ -0,0 +1,427 @@
+"""
+Task-queue routing and adaptive concurrency for Temporal workers
+
+Activities are partitioned by the resource they wait on, each class on its
+own task queue served by its own worker pool:
+
+- llm: slow model calls (code generation, diagnosis, reviews)
+- github-io: short GitHub API calls
+- cpu: synchronous scanners (linters, security and static analysis),
+  executed on a process pool
+- test-runs: test suites, builds and deployments that run for minutes
+- tools: quick tool calls (metrics, logs, result caches, notifications)
+
+Workflows keep calling activities without a task queue; a workflow
+interceptor routes each activity to the queue of its class.
+
+Concurrency of the LLM and GitHub pools adapts to what the provider can take
+(AIMD): the slot limit grows by about one slot per window of completions
+while the pool is saturated and latency stays near its baseline, and shrinks
+multiplicatively when latency degrades or a rate-limit error comes back.
+"""
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from temporalio import activity
+from temporalio.exceptions import ApplicationError
+from temporalio.worker import (
+    ActivityInboundInterceptor,
+    CustomSlotSupplier,
+    ExecuteActivityInput,
+    FixedSizeSlotSupplier,
+    Interceptor,
+    SharedStateManager,
+    SlotMarkUsedContext,
+    SlotPermit,
+    SlotReleaseContext,
+    SlotReserveContext,
+    StartActivityInput,
+    WorkerTuner,
+    WorkflowInboundInterceptor,
+    WorkflowInterceptorClassInput,
+    WorkflowOutboundInterceptor,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Activity classes, used as task queue suffixes
+LLM = "llm"
+GITHUB_IO = "github-io"
+CPU = "cpu"
+TEST_RUNS = "test-runs"
+TOOLS = "tools"
+
+# Async tool activities that take minutes; kept apart so quick tool calls
+# don't queue behind them
+LONG_RUNNING_ACTIVITIES = {
+    "run_tests",
+    "run_performance_tests",
+    "run_e2e_tests",
+    "run_build",
+    "deploy_to_staging",
+    "run_smoke_tests",
+}
+
+CPU_SLOTS = os.cpu_count() or 4
+
+# ApplicationError types raised by activities when a provider rate-limits
+RATE_LIMIT_ERROR_TYPES = {"RateLimitError", "RateLimitExceeded", "TooManyRequests"}
+
+
+@dataclass
+class ActivityPool:
+    """Activity class served by its own worker pool and task queue"""
+    name: str
+    initial_slots: int
+    min_slots: int
+    max_slots: int
+    adaptive: bool = True  # Tune slots from latency and rate limits
+    process_pool: bool = False  # Run sync activities on a process pool
+
+
+ACTIVITY_POOLS = [
+    # Slow model calls; provider rate limits decide how many fit
+    ActivityPool(LLM, initial_slots=5, min_slots=1, max_slots=20),
+    # Short API calls, no longer stuck behind 15-minute code generation
+    ActivityPool(GITHUB_IO, initial_slots=20, min_slots=2, max_slots=50),
+    # Scanners are CPU-bound: one process per core
+    ActivityPool(
+        CPU,
+        initial_slots=CPU_SLOTS,
+        min_slots=CPU_SLOTS,
+        max_slots=CPU_SLOTS,
+        adaptive=False,
+        process_pool=True,
+    ),
+    # Test and deployment runs mostly wait on their subprocesses
+    ActivityPool(TEST_RUNS, initial_slots=10, min_slots=10, max_slots=10, adaptive=False),
+    # Quick calls that a workflow usually waits on before anything else
+    ActivityPool(TOOLS, initial_slots=50, min_slots=50, max_slots=50, adaptive=False),
+]
+
+
+def activity_pool(fn: Callable) -> str:
+    """
+    Pool an activity runs on
+
+    Agent and GitHub activities go by module; tool activities go to the
+    process pool when synchronous, else by how long they run.
+    """
+    module = fn.__module__.rsplit(".", 1)[-1]
+    if module == "agent_activities":
+        return LLM
+    if module == "github_activities":
+        return GITHUB_IO
+    if not inspect.iscoroutinefunction(fn):
+        return CPU
+    name = getattr(fn, "__temporal_activity_definition").name
+    return TEST_RUNS if name in LONG_RUNNING_ACTIVITIES else TOOLS
+
+
+def pool_task_queue(task_queue: str, pool: str) -> str:
+    """Task queue of an activity pool, e.g. autonomous-coding-task-queue-llm"""
+    return f"{task_queue}-{pool}"
+
+
+def activity_routes(activities: List[Callable], task_queue: str) -> Dict[str, str]:
+    """Task queue per activity name for TaskQueueRoutingInterceptor"""
+    return {
+        getattr(fn, "__temporal_activity_definition").name:
+            pool_task_queue(task_queue, activity_pool(fn))
+        for fn in activities
+    }
+
+
+class _RoutingOutboundInterceptor(WorkflowOutboundInterceptor):
+    def __init__(self, next: WorkflowOutboundInterceptor, routes: Dict[str, str]):
+        super().__init__(next)
+        self._routes = routes
+
+    def start_activity(self, input: StartActivityInput):
+        # An explicit task_queue at the call site wins
+        if input.task_queue is None and input.activity in self._routes:
+            input = replace(input, task_queue=self._routes[input.activity])
+        return super().start_activity(input)
+
+
+class TaskQueueRoutingInterceptor(Interceptor):
+    """Route activities started by workflows to their pool's task queue"""
+
+    def __init__(self, routes: Dict[str, str]):
+        """
+        Initialize interceptor
+
+        Args:
+            routes: Task queue per activity name; activities not listed run
+                on the workflow's task queue
+        """
+        self.routes = dict(routes)
+
+    def workflow_interceptor_class(self, input: WorkflowInterceptorClassInput):
+        routes = self.routes
+
+        class RoutingInboundInterceptor(WorkflowInboundInterceptor):
+            def init(self, outbound: WorkflowOutboundInterceptor) -> None:
+                super().init(_RoutingOutboundInterceptor(outbound, routes))
+
+        return RoutingInboundInterceptor
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Whether an activity error means the provider is rate limiting
+
+    Recognizes ApplicationErrors with a rate-limit type, HTTP 429 responses
+    (status_code/status on the error or its response, as raised by the LLM
+    and GitHub client libraries) and errors named like RateLimitError.
+    """
+    if isinstance(error, ApplicationError):
+        return error.type in RATE_LIMIT_ERROR_TYPES
+    for source in (error, getattr(error, "response", None)):
+        status = getattr(source, "status_code", None) or getattr(source, "status", None)
+        if status == 429:
+            return True
+    return "RateLimit" in type(error).__name__
+
+
+class ConcurrencyLimit:
+    """
+    AIMD concurrency limit driven by latency and rate-limit feedback
+
+    Latency is compared per activity type against a baseline, the lowest
+    latency seen recently. The baseline drifts up slowly so a lasting shift
+    (e.g. a slower model) becomes the new normal instead of throttling
+    forever.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 100,
+        latency_tolerance: float = 2.0,
+        latency_backoff: float = 0.9,
+        rate_limit_backoff: float = 0.5,
+        baseline_drift: float = 0.01,
+    ):
+        """
+        Initialize limit
+
+        Args:
+            initial: Starting number of slots
+            minimum: Lowest number of slots
+            maximum: Highest number of slots
+            latency_tolerance: Latency above baseline * tolerance counts as
+                congestion
+            latency_backoff: Factor applied to the limit on congestion
+            rate_limit_backoff: Factor applied to the limit on a rate-limit
+                error
+            baseline_drift: Relative increase of the baseline per sample
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_tolerance = latency_tolerance
+        self.latency_backoff = latency_backoff
+        self.rate_limit_backoff = rate_limit_backoff
+        self.baseline_drift = baseline_drift
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.baselines: Dict[str, float] = {}
+
+    @property
+    def slots(self) -> int:
+        """Current number of slots"""
+        return int(self.limit)
+
+    def _set(self, limit: float):
+        self.limit = min(max(limit, float(self.minimum)), float(self.maximum))
+
+    def on_success(self, activity_type: str, latency: float, in_use: int):
+        """
+        Record a completed activity
+
+        Args:
+            activity_type: Activity name
+            latency: Execution time in seconds
+            in_use: Slots in use when it completed (including its own)
+        """
+        baseline = self.baselines.get(activity_type, latency)
+        baseline = min(baseline * (1 + self.baseline_drift), latency)
+        self.baselines[activity_type] = baseline
+
+        if latency > baseline * self.latency_tolerance:
+            self._set(self.limit * self.latency_backoff)
+        elif in_use >= self.slots:
+            # Only grow while the limit is what holds work back
+            self._set(self.limit + 1 / self.limit)
+
+    def on_rate_limited(self):
+        """Record a rate-limit error from the provider"""
+        self._set(self.limit * self.rate_limit_backoff)
+
+
+class _Permit(SlotPermit):
+    def __init__(self):
+        self.used = False
+
+
+class AdaptiveSlotSupplier(CustomSlotSupplier):
+    """
+    Activity slot supplier bounded by a ConcurrencyLimit
+
+    Slots already handed out are never revoked; after the limit drops, new
+    reservations wait until enough slots are released.
+    """
+
+    def __init__(self, limit: ConcurrencyLimit, name: str = "activity"):
+        """
+        Initialize supplier
+
+        Args:
+            limit: Concurrency limit fed by ConcurrencyFeedbackInterceptor
+            name: Pool name for logging
+        """
+        self.limit = limit
+        self.name = name
+        self.reserved = 0
+        self.in_use = 0
+        # The SDK may call release/mark from outside the event loop
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def _try_reserve(self) -> Optional[SlotPermit]:
+        if self.reserved >= self.limit.slots:
+            return None
+        self.reserved += 1
+        return _Permit()
+
+    async def reserve_slot(self, ctx: SlotReserveContext) -> SlotPermit:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                permit = self._try_reserve()
+                if permit:
+                    return permit
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def try_reserve_slot(self, ctx: SlotReserveContext) -> Optional[SlotPermit]:
+        with self._lock:
+            return self._try_reserve()
+
+    def mark_slot_used(self, ctx: SlotMarkUsedContext) -> None:
+        with self._lock:
+            ctx.permit.used = True
+            self.in_use += 1
+
+    def release_slot(self, ctx: SlotReleaseContext) -> None:
+        with self._lock:
+            self.reserved -= 1
+            if getattr(ctx.permit, "used", False):
+                self.in_use -= 1
+        self._wake()
+
+    def record_success(self, activity_type: str, latency: float):
+        """Feed a completed activity into the limit"""
+        with self._lock:
+            before = self.limit.slots
+            self.limit.on_success(activity_type, latency, self.in_use)
+            after = self.limit.slots
+        if after != before:
+            logger.info(f"{self.name} concurrency limit: {before} -> {after}")
+        if after > before:
+            self._wake()
+
+    def record_rate_limited(self):
+        """Feed a rate-limit error into the limit"""
+        with self._lock:
+            before = self.limit.slots
+            self.limit.on_rate_limited()
+            after = self.limit.slots
+        logger.warning(f"{self.name} rate limited, concurrency limit: {before} -> {after}")
+
+    def _wake(self):
+        # Waiters re-check the limit themselves, so waking all of them is safe
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _FeedbackInboundInterceptor(ActivityInboundInterceptor):
+    def __init__(self, next: ActivityInboundInterceptor, supplier: AdaptiveSlotSupplier):
+        super().__init__(next)
+        self._supplier = supplier
+
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        started = time.monotonic()
+        try:
+            result = await super().execute_activity(input)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self._supplier.record_rate_limited()
+            raise
+        self._supplier.record_success(activity.info().activity_type, time.monotonic() - started)
+        return result
+
+
+class ConcurrencyFeedbackInterceptor(Interceptor):
+    """Report activity latency and rate-limit errors to an AdaptiveSlotSupplier"""
+
+    def __init__(self, supplier: AdaptiveSlotSupplier):
+        self.supplier = supplier
+
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _FeedbackInboundInterceptor(next, self.supplier)
+
+
+def pool_worker_options(spec: ActivityPool) -> Dict[str, Any]:
+    """
+    Worker options for an activity pool: an adaptive slot supplier with its
+    feedback interceptor, or a fixed slot count, and the process pool
+    """
+    options: Dict[str, Any] = {}
+
+    if spec.adaptive:
+        supplier = AdaptiveSlotSupplier(
+            ConcurrencyLimit(spec.initial_slots, spec.min_slots, spec.max_slots),
+            name=spec.name,
+        )
+        options["tuner"] = WorkerTuner.create_composite(
+            workflow_supplier=FixedSizeSlotSupplier(1),
+            activity_supplier=supplier,
+            local_activity_supplier=FixedSizeSlotSupplier(1),
+            nexus_supplier=FixedSizeSlotSupplier(1),
+        )
+        options["interceptors"] = [ConcurrencyFeedbackInterceptor(supplier)]
+    else:
+        options["max_concurrent_activities"] = spec.max_slots
+
+    if spec.process_pool:
+        options["activity_executor"] = ProcessPoolExecutor(max_workers=spec.max_slots)
+        # Heartbeats and cancellation from child processes
+        options["shared_state_manager"] = SharedStateManager.create_from_multiprocessing(
+            multiprocessing.Manager()
+        )
+
+    return options
@@ -3,11 +3,18 @@ Temporal worker that executes workflows and activities
 
 The worker connects to the Temporal server and polls for work,
 executing workflows and activities as they are scheduled.
+
+Work is split over pools with their own task queues (see tuning.py): the
+workflows, LLM activities, GitHub activities, CPU-bound scanners, long test
+and deployment runs, and quick tool calls, so short calls never wait behind
+long code generation or test suites.
 """
 
 import asyncio
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Callable, List, Optional, Sequence
 
 from temporalio.client import Client
 from temporalio.worker import Worker
@@ -16,6 +23,7 @@ from temporalio.worker import Worker
 from workflows import (
     PlanPatchPRWorkflow,
     IncrementalPatchWorkflow,
+    CodeGenerationBatchWorkflow,
     IncidentSwarmWorkflow,
     ContinuousMonitoringWorkflow,
     CodeMigrationWorkflow,
@@ -25,6 +33,16 @@ from workflows import (
 
 # Import all activities
 from activities import agent_activities, github_activities, tool_activities
+from codec import create_data_converter
+from tuning import (
+    ACTIVITY_POOLS,
+    CPU,
+    TaskQueueRoutingInterceptor,
+    activity_pool,
+    activity_routes,
+    pool_task_queue,
+    pool_worker_options,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -37,145 +55,225 @@ logger = logging.getLogger(__name__)
 # Task queue configuration
 TASK_QUEUE = "autonomous-coding-task-queue"
 
+WORKFLOWS = [
+    PlanPatchPRWorkflow,
+    IncrementalPatchWorkflow,
+    CodeGenerationBatchWorkflow,
+    IncidentSwarmWorkflow,
+    ContinuousMonitoringWorkflow,
+    CodeMigrationWorkflow,
+    QualityGateWorkflow,
+    ContinuousQualityWorkflow,
+]
+
+# Pool that runs the workflows themselves, on TASK_QUEUE
+WORKFLOW_POOL = "workflows"
+
+POOL_NAMES = [WORKFLOW_POOL] + [pool.name for pool in ACTIVITY_POOLS]
+
+ACTIVITY_MODULES = [agent_activities, github_activities, tool_activities]
+
+# Activity slots of a worker that serves everything on one task queue
+UNPARTITIONED_SLOTS = 10
+
+
+def collect_activities(modules: Sequence[ModuleType]) -> List[Callable]:
+    """Collect activity functions defined in modules"""
+    activities = []
+    for module in modules:
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if hasattr(attr, '__temporal_activity_definition'):
+                activities.append(attr)
+    return activities
+
 
 async def create_worker(
     client: Client,
     task_queue: str = TASK_QUEUE,
+    pool: Optional[str] = None,
 ) -> Worker:
     """
     Create and configure a Temporal worker
 
     Args:
         client: Temporal client
-        task_queue: Task queue name
+        task_queue: Workflow task queue name; activity pools poll
+            "<task_queue>-<pool>"
+        pool: Pool to serve (see POOL_NAMES). None runs all workflows and
+            activities on task_queue without partitioning, e.g. for local
+            development.
 
     Returns:
         Configured worker
     """
-    # Collect all activity functions
-    activities = []
+    activities = collect_activities(ACTIVITY_MODULES)
+
+    if pool is None:
+        worker = Worker(
+            client,
+            task_queue=task_queue,
+            workflows=WORKFLOWS,
+            activities=activities,
+            # Sync scanners run on threads here; the CPU pool uses processes
+            activity_executor=ThreadPoolExecutor(max_workers=UNPARTITIONED_SLOTS),
+            max_concurrent_activities=UNPARTITIONED_SLOTS,
+            max_concurrent_workflow_tasks=10,
+        )
+        logger.info(f"Worker created for task queue: {task_queue}")
+        logger.info(f"Registered {len(activities)} activities")
+        logger.info(f"Registered {len(WORKFLOWS)} workflows")
+        return worker
+
+    if pool == WORKFLOW_POOL:
+        worker = Worker(
+            client,
+            task_queue=task_queue,
+            workflows=WORKFLOWS,
+            interceptors=[TaskQueueRoutingInterceptor(activity_routes(activities, task_queue))],
+            max_concurrent_workflow_tasks=10,
+        )
+        logger.info(f"Workflow worker created for task queue: {task_queue}")
+        logger.info(f"Registered {len(WORKFLOWS)} workflows")
+        return worker
+
+    spec = next((p for p in ACTIVITY_POOLS if p.name == pool), None)
+    if spec is None:
+        raise ValueError(f"Unknown worker pool: {pool}")
+
+    activities = [fn for fn in activities if activity_pool(fn) == spec.name]
+    pool_queue = pool_task_queue(task_queue, spec.name)
 
-    # Agent activities
-    for attr_name in dir(agent_activities):
-        attr = getattr(agent_activities, attr_name)
-        if hasattr(attr, '__temporal_activity_definition'):
-            activities.append(attr)
-
-    # GitHub activities
-    for attr_name in dir(github_activities):
-        attr = getattr(github_activities, attr_name)
-        if hasattr(attr, '__temporal_activity_definition'):
-            activities.append(attr)
-
-    # Tool activities
-    for attr_name in dir(tool_activities):
-        attr = getattr(tool_activities, attr_name)
-        if hasattr(attr, '__temporal_activity_definition'):
-            activities.append(attr)
-
-    # Create worker
     worker = Worker(
         client,
-        task_queue=task_queue,
-        workflows=[
-            PlanPatchPRWorkflow,
-            IncrementalPatchWorkflow,
-            IncidentSwarmWorkflow,
-            ContinuousMonitoringWorkflow,
-            CodeMigrationWorkflow,
-            QualityGateWorkflow,
-            ContinuousQualityWorkflow,
-        ],
+        task_queue=pool_queue,
         activities=activities,
-        max_concurrent_activities=10,
-        max_concurrent_workflow_tasks=10,
+        **pool_worker_options(spec),
     )
 
-    logger.info(f"Worker created for task queue: {task_queue}")
+    logger.info(f"{spec.name} worker created for task queue: {pool_queue}")
     logger.info(f"Registered {len(activities)} activities")
-    logger.info("Registered 7 workflows")
 
     return worker
 
 
-async def run_worker(
-    temporal_host: str = "localhost:7233",
-    namespace: str = "default",
+async def create_workers(
+    client: Client,
     task_queue: str = TASK_QUEUE,
-):
+    pools: Optional[Sequence[str]] = None,
+) -> List[Worker]:
     """
-    Connect to Temporal and run the worker
+    Create the worker topology: a workflow worker and one worker per
+    activity pool
 
     Args:
-        temporal_host: Temporal server host:port
-        namespace: Temporal namespace
-        task_queue: Task queue name
+        client: Temporal client
+        task_queue: Workflow task queue name
+        pools: Pools to serve (default: all of POOL_NAMES)
+
+    Returns:
+        Configured workers
     """
+    return [await create_worker(client, task_queue, pool) for pool in pools or POOL_NAMES]
+
+
+async def _connect(
+    temporal_host: str,
+    namespace: str,
+    blob_store_url: Optional[str],
+) -> Client:
     logger.info(f"Connecting to Temporal server at {temporal_host}")
 
-    # Connect to Temporal
     client = await Client.connect(
         temporal_host,
         namespace=namespace,
+        data_converter=create_data_converter(blob_store_url=blob_store_url),
     )
 
     logger.info(f"Connected to Temporal namespace: {namespace}")
+    return client
 
-    # Create worker
-    worker = await create_worker(client, task_queue)
-
-    # Run the worker
-    logger.info("Starting worker...")
-    logger.info(f"Listening on task queue: {task_queue}")
-    logger.info("Worker is ready to process workflows and activities")
-    logger.info("Press Ctrl+C to stop the worker")
 
+async def _run(workers: List[Worker]):
     try:
-        await worker.run()
+        await asyncio.gather(*[worker.run() for worker in workers])
     except KeyboardInterrupt:
-        logger.info("Worker stopped by user")
+        logger.info("Workers stopped by user")
     except Exception as e:
-        logger.error(f"Worker error: {e}", exc_info=True)
+        logger.error(f"Workers error: {e}", exc_info=True)
         raise
 
 
+async def run_worker(
+    temporal_host: str = "localhost:7233",
+    namespace: str = "default",
+    task_queue: str = TASK_QUEUE,
+    blob_store_url: Optional[str] = None,
+    pools: Optional[Sequence[str]] = None,
+):
+    """
+    Connect to Temporal and run the worker topology
+
+    Deploy pools separately (e.g. pools=["llm"]) to scale each activity
+    class on its own.
+
+    Args:
+        temporal_host: Temporal server host:port
+        namespace: Temporal namespace
+        task_queue: Workflow task queue name
+        blob_store_url: Blob store for claim-checked payloads (see codec.py)
+        pools: Pools to serve (default: all)
+    """
+    client = await _connect(temporal_host, namespace, blob_store_url)
+
+    workers = await create_workers(client, task_queue, pools)
+
+    # Run the workers
+    logger.info("Starting worker...")
+    logger.info(f"Serving pools: {', '.join(pools or POOL_NAMES)}")
+    logger.info("Worker is ready to process workflows and activities")
+    logger.info("Press Ctrl+C to stop the worker")
+
+    await _run(workers)
+
+
 async def run_multi_worker(
     temporal_host: str = "localhost:7233",
     namespace: str = "default",
     num_workers: int = 3,
+    blob_store_url: Optional[str] = None,
+    task_queue: str = TASK_QUEUE,
+    pools: Optional[Sequence[str]] = None,
 ):
     """
-    Run multiple workers for better throughput
+    Run the worker topology with several workers per I/O-bound pool
+
+    The CPU pool gets one worker, as its process pool already uses every
+    core; every other pool gets num_workers workers.
 
     Args:
         temporal_host: Temporal server host:port
         namespace: Temporal namespace
-        num_workers: Number of workers to run
+        num_workers: Number of workers per I/O-bound pool
+        blob_store_url: Blob store for claim-checked payloads (see codec.py)
+        task_queue: Workflow task queue name
+        pools: Pools to serve (default: all)
     """
-    logger.info(f"Starting {num_workers} workers")
+    logger.info(f"Starting {num_workers} workers per pool")
 
-    # Connect to Temporal
-    client = await Client.connect(
-        temporal_host,
-        namespace=namespace,
-    )
+    client = await _connect(temporal_host, namespace, blob_store_url)
 
-    # Create multiple workers
+    # Create the topology
     workers = []
-    for i in range(num_workers):
-        worker = await create_worker(client, TASK_QUEUE)
-        workers.append(worker)
-        logger.info(f"Worker {i+1}/{num_workers} created")
+    for pool in pools or POOL_NAMES:
+        count = 1 if pool == CPU else num_workers
+        for i in range(count):
+            workers.append(await create_worker(client, task_queue, pool))
+            logger.info(f"{pool} worker {i+1}/{count} created")
 
     # Run all workers concurrently
     logger.info("Starting all workers...")
-    try:
-        await asyncio.gather(*[worker.run() for worker in workers])
-    except KeyboardInterrupt:
-        logger.info("Workers stopped by user")
-    except Exception as e:
-        logger.error(f"Workers error: {e}", exc_info=True)
-        raise
+    await _run(workers)
 
 
 def main():
@@ -202,7 +300,19 @@ def main():
         "--workers",
         type=int,
         default=1,
-        help="Number of workers to run (default: 1)",
+        help="Number of workers per I/O-bound pool (default: 1)",
+    )
+    parser.add_argument(
+        "--pool",
+        action="append",
+        choices=POOL_NAMES,
+        help="Pool to serve, repeatable (default: all pools)",
+    )
+    parser.add_argument(
+        "--blob-store",
+        default=None,
+        help="Blob store URL for large payloads (file://, s3://), shared by all workers "
+             "and clients; without one large payloads are only compressed",
     )
 
     args = parser.parse_args()
@@ -214,13 +324,19 @@ def main():
     logger.info(f"Namespace: {args.namespace}")
     logger.info(f"Task Queue: {args.task_queue}")
     logger.info(f"Number of Workers: {args.workers}")
+    logger.info(f"Pools: {', '.join(args.pool or POOL_NAMES)}")
     logger.info("=" * 60)
 
     # Run worker(s)
     if args.workers == 1:
-        asyncio.run(run_worker(args.host, args.namespace, args.task_queue))
+        asyncio.run(run_worker(
+            args.host, args.namespace, args.task_queue, args.blob_store, args.pool,
+        ))
     else:
-        asyncio.run(run_multi_worker(args.host, args.namespace, args.workers))
+        asyncio.run(run_multi_worker(
+            args.host, args.namespace, args.workers, args.blob_store, args.task_queue,
+            args.pool,
+        ))
 
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ Workflow definitions for the autonomous coding system
 from .plan_patch_pr import (
     PlanPatchPRWorkflow,
     IncrementalPatchWorkflow,
+    CodeGenerationBatchWorkflow,
+    CodeGenBatchResult,
     PRResult,
     Design,
     Issue,
@@ -15,6 +17,7 @@ from .incident_swarm import (
     IncidentSwarmWorkflow,
     ContinuousMonitoringWorkflow,
     Alert,
+    MonitoringState,
     Diagnosis,
     ConsensusResult,
     IncidentResult,
@@ -25,18 +28,23 @@ from .migration import (
     MigrationPlan,
     StepResult,
     MigrationResult,
+    MigrationState,
 )
 from .quality_gate import (
     QualityGateWorkflow,
     ContinuousQualityWorkflow,
     QualityCheck,
     QualityGateResult,
+    PullRequestEvent,
+    QualityMonitorState,
 )
 
 __all__ = [
     # Plan-Patch-PR
     'PlanPatchPRWorkflow',
     'IncrementalPatchWorkflow',
+    'CodeGenerationBatchWorkflow',
+    'CodeGenBatchResult',
     'PRResult',
     'Design',
     'Issue',
@@ -46,6 +54,7 @@ __all__ = [
     'IncidentSwarmWorkflow',
     'ContinuousMonitoringWorkflow',
     'Alert',
+    'MonitoringState',
     'Diagnosis',
     'ConsensusResult',
     'IncidentResult',
@@ -55,9 +64,12 @@ __all__ = [
     'MigrationPlan',
     'StepResult',
     'MigrationResult',
+    'MigrationState',
     # Quality Gate
     'QualityGateWorkflow',
     'ContinuousQualityWorkflow',
     'QualityCheck',
     'QualityGateResult',
+    'PullRequestEvent',
+    'QualityMonitorState',
 ]
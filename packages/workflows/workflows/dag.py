@@ -0,0 +1,180 @@
+"""
+Event-driven DAG execution for workflows
+
+Each node starts as soon as its dependencies have finished, instead of in
+waves where one slow node holds back unrelated branches of the graph. With
+bounded parallelism, ready nodes heading the longest remaining chain start
+first so the critical path is never starved.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+from temporalio import workflow
+import asyncio
+import heapq
+
+T = TypeVar('T')
+
+
+@dataclass
+class DagRun:
+    """Outcome of a DAG run"""
+    results: Dict[str, Any] = field(default_factory=dict)  # In completion order
+    stopped_on: Optional[str] = None  # Node whose result stopped the run
+    interrupted: bool = False  # should_stop ended the run with nodes left
+    pending: List[str] = field(default_factory=list)  # Never started
+
+
+def chain_lengths(ids: Sequence[str], dependents: Dict[str, List[str]]) -> Dict[str, int]:
+    """
+    Length of the longest chain of dependents starting at each node
+
+    Nodes in a cycle get the length of the chain past the cycle.
+
+    Args:
+        ids: Node IDs
+        dependents: IDs of the nodes that depend on each node
+
+    Returns:
+        Chain length per node (1 for nodes nothing depends on)
+    """
+    lengths: Dict[str, int] = {}
+    for root in ids:
+        if root in lengths:
+            continue
+        # Iterative post-order DFS; nodes on the stack count as length 0
+        # while visiting so cycles terminate
+        stack = [(root, iter(dependents.get(root, ())))]
+        lengths[root] = 0
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                lengths[node] = 1 + max(
+                    (lengths.get(c, 0) for c in dependents.get(node, ())), default=0
+                )
+            elif child not in lengths:
+                lengths[child] = 0
+                stack.append((child, iter(dependents.get(child, ()))))
+    return lengths
+
+
+async def run_dag(
+    nodes: Sequence[T],
+    run: Callable[[T], Awaitable[Any]],
+    get_id: Callable[[T], str],
+    get_dependencies: Callable[[T], List[str]],
+    max_concurrency: int,
+    completed: Iterable[str] = (),
+    stop_when: Optional[Callable[[Any], bool]] = None,
+    is_paused: Callable[[], bool] = lambda: False,
+    should_stop: Callable[[], bool] = lambda: False,
+    on_result: Optional[Callable[[T, Any], None]] = None,
+) -> DagRun:
+    """
+    Run nodes as their dependencies finish, at most max_concurrency at once
+
+    Stopping (stop_when, should_stop) or pausing never cancels nodes in
+    flight: no new nodes start and the ones running are waited for.
+
+    Args:
+        nodes: Nodes to run
+        run: Coroutine function called per node
+        get_id: Node ID
+        get_dependencies: IDs of nodes that must finish first; unknown IDs
+            that are not in completed block the node
+        max_concurrency: Maximum nodes in flight
+        completed: IDs already finished, e.g. in a previous run before
+            continue-as-new; these nodes are not run again
+        stop_when: Stop starting nodes once a result matches, e.g. a failure
+        is_paused: Checked before starting nodes; the run waits while it is
+            True
+        should_stop: Checked before starting nodes; when True the run drains
+            and returns, e.g. to continue as new
+        on_result: Called as each node finishes, e.g. to checkpoint
+
+    Returns:
+        Results and what was left unstarted
+    """
+    by_id = {get_id(node): node for node in nodes}
+    finished = set(completed)
+
+    unmet: Dict[str, int] = {}
+    dependents: Dict[str, List[str]] = defaultdict(list)
+    for node_id, node in by_id.items():
+        if node_id in finished:
+            continue
+        dependencies = {dep for dep in get_dependencies(node) if dep not in finished}
+        unmet[node_id] = len(dependencies)
+        for dep in dependencies:
+            dependents[dep].append(node_id)
+
+    lengths = chain_lengths(list(unmet), dependents)
+    position = {node_id: index for index, node_id in enumerate(by_id)}
+
+    def priority(node_id: str):
+        return (-lengths[node_id], position[node_id], node_id)
+
+    ready = [priority(node_id) for node_id, count in unmet.items() if count == 0]
+    heapq.heapify(ready)
+
+    outcome = DagRun()
+    running: Dict[asyncio.Future, str] = {}
+
+    try:
+        while True:
+            stopping = outcome.stopped_on is not None or should_stop()
+            paused = is_paused()
+
+            while ready and not stopping and not paused and len(running) < max_concurrency:
+                node_id = heapq.heappop(ready)[2]
+                running[asyncio.ensure_future(run(by_id[node_id]))] = node_id
+
+            if not running and (stopping or not ready):
+                outcome.interrupted = stopping and outcome.stopped_on is None and bool(ready)
+                break
+
+            waiting = list(running)
+            resumed = None
+            if paused and not stopping:
+                resumed = asyncio.ensure_future(
+                    workflow.wait_condition(lambda: not is_paused() or should_stop())
+                )
+                waiting.append(resumed)
+
+            # workflow.wait returns completed tasks in a deterministic order
+            done, _ = await workflow.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if resumed and not resumed.done():
+                resumed.cancel()
+
+            for task in done:
+                if task not in running:
+                    continue
+                node_id = running.pop(task)
+                result = task.result()
+                outcome.results[node_id] = result
+
+                if on_result:
+                    on_result(by_id[node_id], result)
+
+                if stop_when and outcome.stopped_on is None and stop_when(result):
+                    outcome.stopped_on = node_id
+
+                for dependent in dependents.get(node_id, ()):
+                    unmet[dependent] -= 1
+                    if unmet[dependent] == 0:
+                        heapq.heappush(ready, priority(dependent))
+    finally:
+        # Only reached with nodes in flight on an error or cancellation
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    outcome.pending = [
+        node_id for node_id in unmet if node_id not in outcome.results
+    ]
+    return outcome
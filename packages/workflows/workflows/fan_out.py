@@ -0,0 +1,90 @@
+"""
+Bounded fan-out helpers for workflows
+
+Launching one activity per item with a bare asyncio.gather floods provider
+rate limits and worker slots on large inputs. These helpers cap the number
+of items in flight and order items so dependencies and long-running items
+start first.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+import asyncio
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+async def bounded_gather(
+    items: Sequence[T],
+    run: Callable[[T], Awaitable[R]],
+    max_concurrency: int,
+    on_result: Optional[Callable[[T, R], None]] = None,
+) -> List[R]:
+    """
+    Run `run` for every item with at most `max_concurrency` in flight
+
+    Items start in the given order (asyncio.Semaphore wakes waiters FIFO, so
+    this is deterministic inside workflows).
+
+    Args:
+        items: Items to process
+        run: Coroutine function called per item
+        max_concurrency: Maximum items in flight
+        on_result: Called as each item completes, e.g. to checkpoint
+
+    Returns:
+        Results in item order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(item: T) -> R:
+        async with semaphore:
+            result = await run(item)
+        if on_result:
+            on_result(item, result)
+        return result
+
+    return list(await asyncio.gather(*[run_one(item) for item in items]))
+
+
+def order_by_dependencies(
+    items: Sequence[T],
+    get_id: Callable[[T], str],
+    get_dependencies: Callable[[T], List[str]],
+    get_priority: Callable[[T], float] = lambda item: 0,
+) -> List[T]:
+    """
+    Order items so dependencies come first, higher priority first among
+    items whose dependencies are already placed
+
+    Dependencies on unknown IDs are ignored; items in a dependency cycle are
+    appended by priority.
+
+    Args:
+        items: Items to order
+        get_id: Item ID
+        get_dependencies: IDs the item depends on
+        get_priority: Priority (higher starts earlier)
+
+    Returns:
+        Ordered items
+    """
+    by_id: Dict[str, Any] = {get_id(item): item for item in items}
+    # Stable sort keeps the input order for equal priorities
+    remaining = sorted(items, key=lambda item: -get_priority(item))
+    placed: set = set()
+    ordered: List[T] = []
+
+    while remaining:
+        ready = [
+            item for item in remaining
+            if all(dep in placed or dep not in by_id for dep in get_dependencies(item))
+        ]
+        if not ready:
+            ready = remaining  # Cycle: fall back to priority order
+        for item in ready:
+            ordered.append(item)
+            placed.add(get_id(item))
+        remaining = [item for item in remaining if get_id(item) not in placed]
+
+    return ordered
@@ -0,0 +1,90 @@
+"""
+Fail-fast scheduler for quality gate checks
+
+Starts checks cheapest first and, as soon as a blocking check fails, cancels
+the checks still in flight instead of waiting for every check (including
+long integration test runs) to finish.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from temporalio import workflow
+import asyncio
+
+
+@dataclass
+class Gate:
+    """One check to schedule"""
+    id: str
+    run: Callable[[], Awaitable[Any]]
+    cost: float  # Expected duration; cheaper gates start first
+    is_blocking_failure: Callable[[Any], bool] = lambda result: False
+
+
+@dataclass
+class GateRun:
+    """Outcome of a gate run"""
+    results: Dict[str, Any] = field(default_factory=dict)
+    cancelled: List[str] = field(default_factory=list)  # In flight when the gate failed
+    skipped: List[str] = field(default_factory=list)  # Never started
+    failed_on: Optional[str] = None  # Blocking gate that stopped the run
+
+
+async def run_gates(
+    gates: List[Gate],
+    fail_fast: bool = True,
+    max_concurrency: Optional[int] = None,
+    on_result: Optional[Callable[[Gate, Any], Awaitable[None]]] = None,
+) -> GateRun:
+    """
+    Run gates concurrently, cheapest first
+
+    Start order only matters with max_concurrency: without it every gate
+    starts at once.
+
+    Args:
+        gates: Gates to run
+        fail_fast: Cancel remaining gates when a blocking gate fails
+        max_concurrency: Maximum gates in flight (default: all)
+        on_result: Awaited after each gate completes, e.g. to publish
+            progress
+
+    Returns:
+        Results of completed gates and what was cancelled or skipped
+    """
+    outcome = GateRun()
+    pending = sorted(gates, key=lambda gate: gate.cost)
+    running: Dict[asyncio.Task, Gate] = {}
+
+    try:
+        while pending or running:
+            while pending and (max_concurrency is None or len(running) < max_concurrency):
+                gate = pending.pop(0)
+                running[asyncio.ensure_future(gate.run())] = gate
+
+            # workflow.wait returns completed tasks in a deterministic order
+            done, _ = await workflow.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                gate = running.pop(task)
+                result = task.result()
+                outcome.results[gate.id] = result
+
+                if on_result:
+                    await on_result(gate, result)
+
+                if fail_fast and not outcome.failed_on and gate.is_blocking_failure(result):
+                    outcome.failed_on = gate.id
+
+            if outcome.failed_on:
+                break
+    finally:
+        # Cancel in-flight checks on a blocking failure or an error
+        for task, gate in running.items():
+            task.cancel()
+            outcome.cancelled.append(gate.id)
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    outcome.skipped = [gate.id for gate in pending]
+    return outcome
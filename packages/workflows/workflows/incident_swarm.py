@@ -6,9 +6,10 @@ to diagnose, fix, and document issues in parallel.
 """
 
 from datetime import timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from temporalio import workflow
+from temporalio.exceptions import WorkflowAlreadyStartedError
 import asyncio
 
 from ..activities.agent_activities import (
@@ -304,58 +305,157 @@ class IncidentSwarmWorkflow:
         }
 
 
+@dataclass
+class MonitoringState:
+    """Compact monitoring state carried across continue-as-new"""
+    incidents_handled: int = 0
+    seen_alert_ids: List[str] = field(default_factory=list)
+    pending_alerts: List[Alert] = field(default_factory=list)
+
+
 @workflow.defn
 class ContinuousMonitoringWorkflow:
     """
     Long-running workflow that monitors for incidents and spawns
     IncidentSwarmWorkflow for each detected issue
+
+    Alerts arrive through the `report_alerts` signal or batched metric
+    polling. Incident workflows are started without waiting for them, so
+    one long incident never delays detection of the next, and the workflow
+    continues as new periodically to keep its history bounded.
     """
 
+    # Alert IDs remembered for deduplication
+    MAX_SEEN_ALERTS = 1000
+
+    # Loop iterations before continuing as new
+    MAX_ITERATIONS = 500
+
     def __init__(self):
         self.incidents_handled = 0
-        self.active_incidents: List[str] = []
+        self.seen_alerts: Dict[str, None] = {}
+        self.pending_alerts: List[Alert] = []
+        self.active_incidents: Dict[str, workflow.ChildWorkflowHandle] = {}
+        self.stop_requested = False
 
     @workflow.run
-    async def run(self, service: str):
+    async def run(
+        self,
+        service: str,
+        poll_interval_seconds: int = 30,
+        max_iterations: int = MAX_ITERATIONS,
+        state: Optional[MonitoringState] = None,
+    ):
         """
         Continuously monitor a service and respond to incidents
 
         Args:
             service: Service name to monitor
+            poll_interval_seconds: Seconds between metric polls (0 to rely
+                on signals only)
+            max_iterations: Iterations before continuing as new
+            state: State carried over from the previous run
         """
         workflow.logger.info(f"Starting continuous monitoring for {service}")
 
-        while True:
-            # Check for alerts every 30 seconds
-            await asyncio.sleep(30)
-
-            alerts = await workflow.execute_activity(
-                fetch_metrics,
-                args=[service, "now"],
-                start_to_close_timeout=timedelta(seconds=30),
-            )
+        if state:
+            self.incidents_handled = state.incidents_handled
+            self.seen_alerts = dict.fromkeys(state.seen_alert_ids)
+            self.pending_alerts = list(state.pending_alerts) + self.pending_alerts
 
-            # Spawn child workflow for each critical alert
-            for alert_data in alerts.get('critical_alerts', []):
-                alert = Alert(**alert_data)
+        for _ in range(max_iterations):
+            try:
+                await workflow.wait_condition(
+                    lambda: bool(self.pending_alerts) or self.stop_requested,
+                    timeout=timedelta(seconds=poll_interval_seconds) if poll_interval_seconds else None,
+                )
+            except asyncio.TimeoutError:
+                metrics = await workflow.execute_activity(
+                    fetch_metrics,
+                    args=[service, workflow.now().isoformat()],
+                    start_to_close_timeout=timedelta(seconds=30),
+                )
+                self._enqueue([Alert(**a) for a in metrics.get('critical_alerts', [])])
+
+            await self._start_incidents()
+
+            if self.stop_requested:
+                workflow.logger.info(f"Stopping continuous monitoring for {service}")
+                return
+            if workflow.info().is_continue_as_new_suggested():
+                break
+
+        # Incident workflows are abandoned, so they keep running; only
+        # signals still being handled need to finish first
+        await workflow.wait_condition(workflow.all_handlers_finished)
+        workflow.continue_as_new(args=[
+            service,
+            poll_interval_seconds,
+            max_iterations,
+            MonitoringState(
+                incidents_handled=self.incidents_handled,
+                seen_alert_ids=list(self.seen_alerts),
+                pending_alerts=self.pending_alerts,
+            ),
+        ])
 
-                if alert.id not in self.active_incidents:
-                    workflow.logger.info(f"Detected new incident: {alert.id}")
-                    self.active_incidents.append(alert.id)
+    def _enqueue(self, alerts: List[Alert]):
+        """Queue alerts that have not been seen recently"""
+        queued = {alert.id for alert in self.pending_alerts}
+        for alert in alerts:
+            if alert.id not in self.seen_alerts and alert.id not in queued:
+                self.pending_alerts.append(alert)
+                queued.add(alert.id)
+
+    async def _start_incidents(self):
+        """Start an incident workflow for each pending alert without waiting"""
+        alerts, self.pending_alerts = self.pending_alerts, []
+
+        for alert in alerts:
+            workflow.logger.info(f"Detected new incident: {alert.id}")
+            self.seen_alerts[alert.id] = None
+            if len(self.seen_alerts) > self.MAX_SEEN_ALERTS:
+                del self.seen_alerts[next(iter(self.seen_alerts))]
+
+            try:
+                handle = await workflow.start_child_workflow(
+                    IncidentSwarmWorkflow.run,
+                    args=[alert],
+                    id=f"incident-{alert.id}",
+                    parent_close_policy=workflow.ParentClosePolicy.ABANDON,
+                )
+            except WorkflowAlreadyStartedError:
+                workflow.logger.info(f"Incident {alert.id} already being handled")
+                continue
+
+            self.incidents_handled += 1
+            self.active_incidents[alert.id] = handle
+            asyncio.create_task(self._track_incident(alert.id, handle))
+
+    async def _track_incident(self, alert_id: str, handle: workflow.ChildWorkflowHandle):
+        """Drop an incident from the active set once its workflow closes"""
+        try:
+            await handle
+        except Exception as e:
+            workflow.logger.warning(f"Incident {alert_id} failed: {e}")
+        finally:
+            self.active_incidents.pop(alert_id, None)
 
-                    # Spawn child workflow for incident response
-                    await workflow.execute_child_workflow(
-                        IncidentSwarmWorkflow.run,
-                        args=[alert],
-                        id=f"incident-{alert.id}",
-                    )
+    @workflow.signal
+    async def report_alerts(self, alerts: List[Alert]):
+        """Signal: deliver alerts from an external alerting system"""
+        self._enqueue(alerts)
 
-                    self.incidents_handled += 1
+    @workflow.signal
+    async def stop_monitoring(self):
+        """Signal: stop monitoring after the current iteration"""
+        self.stop_requested = True
 
     @workflow.query
     def get_stats(self) -> Dict[str, Any]:
         """Get monitoring statistics"""
         return {
             'incidents_handled': self.incidents_handled,
-            'active_incidents': self.active_incidents,
+            'active_incidents': list(self.active_incidents),
+            'pending_alerts': len(self.pending_alerts),
         }
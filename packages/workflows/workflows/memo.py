@@ -0,0 +1,78 @@
+"""
+Memoized activity execution for workflows
+
+Workflows opt in per call site: execute_memoized_activity looks the call up
+in the activity result cache (see activities/result_cache.py) and only runs
+the activity on a miss. Cache errors never fail the workflow; the activity
+just runs uncached.
+"""
+
+from datetime import timedelta
+from typing import Any, Callable, List, Optional
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError
+
+from ..activities.tool_activities import (
+    lookup_activity_result,
+    store_activity_result,
+)
+
+# Cache lookups and stores are quick; don't let a slow or unavailable
+# backend hold up the workflow
+CACHE_ACTIVITY_TIMEOUT = timedelta(seconds=30)
+CACHE_RETRY_POLICY = RetryPolicy(maximum_attempts=2)
+
+
+async def execute_memoized_activity(
+    activity: Callable,
+    args: List[Any],
+    ttl: timedelta,
+    repo_ref: Optional[str] = None,
+    **options,
+) -> Any:
+    """
+    Execute an activity, reusing a cached result for the same inputs
+
+    Args:
+        activity: Activity function
+        args: Activity arguments (JSON-serializable)
+        ttl: How long the result stays reusable
+        repo_ref: Ref whose content the activity reads, e.g. "main"; the
+            result is only reused while the content is unchanged
+        **options: workflow.execute_activity options
+
+    Returns:
+        Activity result (as decoded from JSON on a cache hit)
+    """
+    name = getattr(activity, '__temporal_activity_definition').name
+
+    try:
+        lookup = await workflow.execute_activity(
+            lookup_activity_result,
+            args=[name, args, repo_ref],
+            start_to_close_timeout=CACHE_ACTIVITY_TIMEOUT,
+            retry_policy=CACHE_RETRY_POLICY,
+        )
+    except ActivityError as e:
+        workflow.logger.warning(f"Result cache lookup for {name} failed: {e}")
+        lookup = {'key': None, 'hit': False, 'result': None}
+
+    if lookup['hit']:
+        workflow.logger.info(f"Reusing cached {name} result")
+        return lookup['result']
+
+    result = await workflow.execute_activity(activity, args=args, **options)
+
+    if lookup['key']:
+        try:
+            await workflow.execute_activity(
+                store_activity_result,
+                args=[lookup['key'], result, int(ttl.total_seconds())],
+                start_to_close_timeout=CACHE_ACTIVITY_TIMEOUT,
+                retry_policy=CACHE_RETRY_POLICY,
+            )
+        except ActivityError as e:
+            workflow.logger.warning(f"Caching {name} result failed: {e}")
+
+    return result
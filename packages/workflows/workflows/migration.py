@@ -5,12 +5,15 @@ Orchestrates large-scale code migrations with incremental steps,
 validation at each stage, and rollback capability.
 """
 
-from datetime import timedelta
-from dataclasses import dataclass
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from temporalio import workflow
 import asyncio
 
+from .dag import run_dag
+from .memo import execute_memoized_activity
+from .fan_out import bounded_gather, order_by_dependencies
 from ..activities.agent_activities import (
     analyze_codebase,
     create_migration_plan,
@@ -76,6 +79,17 @@ class MigrationResult:
     duration_minutes: float
 
 
+@dataclass
+class MigrationState:
+    """Progress of an incremental migration carried across continue-as-new"""
+    plan: MigrationPlan
+    branch_name: str
+    started_at: datetime
+    completed_step_ids: List[str] = field(default_factory=list)
+    step_results: List[StepResult] = field(default_factory=list)
+    paused: bool = False
+
+
 @workflow.defn
 class CodeMigrationWorkflow:
     """
@@ -88,11 +102,25 @@ class CodeMigrationWorkflow:
     6. Create PR with all changes
     """
 
+    # Maximum migration steps executing at once
+    MAX_PARALLEL_STEPS = 5
+
+    # Steps started per run before continuing as new
+    MAX_STEPS_PER_RUN = 200
+
+    # How long a codebase analysis is reused while the base branch is
+    # unchanged
+    ANALYSIS_CACHE_TTL = timedelta(days=1)
+    BASE_BRANCH = "main"
+
     def __init__(self):
         self.plan: Optional[MigrationPlan] = None
         self.step_results: List[StepResult] = []
+        self.completed_step_ids: List[str] = []
         self.rollback_performed = False
         self.current_step: Optional[str] = None
+        self.paused = False
+        self.steps_started = 0
 
     @workflow.run
     async def run(
@@ -102,6 +130,7 @@ class CodeMigrationWorkflow:
         target_version: str,
         incremental: bool = True,
         auto_rollback: bool = True,
+        state: Optional[MigrationState] = None,
     ) -> MigrationResult:
         """
         Execute code migration workflow
@@ -112,51 +141,88 @@ class CodeMigrationWorkflow:
             target_version: Target version/pattern
             incremental: Execute steps incrementally with validation
             auto_rollback: Automatically rollback on failure
+            state: Progress carried over from the previous run
 
         Returns:
             MigrationResult with detailed outcome
         """
-        start_time = workflow.now()
-        workflow.logger.info(
-            f"Starting {migration_type} migration: {source_version} -> {target_version}"
-        )
+        if state:
+            # Continued as new: plan and branch exist, resume the steps
+            start_time = state.started_at
+            branch_name = state.branch_name
+            self.plan = state.plan
+            self.completed_step_ids = list(state.completed_step_ids)
+            self.step_results = list(state.step_results)
+            self.paused = self.paused or state.paused
+            workflow.logger.info(
+                f"Resuming migration: {len(self.completed_step_ids)}/"
+                f"{len(self.plan.steps)} steps done"
+            )
+        else:
+            start_time = workflow.now()
+            workflow.logger.info(
+                f"Starting {migration_type} migration: {source_version} -> {target_version}"
+            )
 
-        # Step 1: Analyze codebase
-        workflow.logger.info("Step 1: Analyzing codebase")
-        analysis = await workflow.execute_activity(
-            analyze_codebase,
-            args=[migration_type, source_version],
-            start_to_close_timeout=timedelta(minutes=15),
-            heartbeat_timeout=timedelta(minutes=3),
-        )
+            # Step 1: Analyze codebase
+            workflow.logger.info("Step 1: Analyzing codebase")
+            analysis = await execute_memoized_activity(
+                analyze_codebase,
+                [migration_type, source_version],
+                ttl=self.ANALYSIS_CACHE_TTL,
+                repo_ref=self.BASE_BRANCH,
+                start_to_close_timeout=timedelta(minutes=15),
+                heartbeat_timeout=timedelta(minutes=3),
+            )
 
-        workflow.logger.info(
-            f"Analysis complete: {analysis['files_affected']} files affected"
-        )
+            workflow.logger.info(
+                f"Analysis complete: {analysis['files_affected']} files affected"
+            )
 
-        # Step 2: Generate migration plan
-        workflow.logger.info("Step 2: Generating migration plan")
-        self.plan = await workflow.execute_activity(
-            create_migration_plan,
-            args=[analysis, source_version, target_version],
-            start_to_close_timeout=timedelta(minutes=10),
-        )
+            # Step 2: Generate migration plan
+            workflow.logger.info("Step 2: Generating migration plan")
+            self.plan = await workflow.execute_activity(
+                create_migration_plan,
+                args=[analysis, source_version, target_version],
+                start_to_close_timeout=timedelta(minutes=10),
+            )
 
-        workflow.logger.info(
-            f"Migration plan created with {len(self.plan.steps)} steps"
-        )
+            workflow.logger.info(
+                f"Migration plan created with {len(self.plan.steps)} steps"
+            )
 
-        # Step 3: Create migration branch
-        branch_name = f"migration/{migration_type}-{target_version}"
-        await workflow.execute_activity(
-            create_branch,
-            args=[branch_name],
-            start_to_close_timeout=timedelta(minutes=1),
-        )
+            # Step 3: Create migration branch
+            branch_name = f"migration/{migration_type}-{target_version}"
+            await workflow.execute_activity(
+                create_branch,
+                args=[branch_name],
+                start_to_close_timeout=timedelta(minutes=1),
+            )
 
         # Step 4: Execute migration steps
         if incremental:
             success = await self._execute_incremental_migration(auto_rollback)
+            if success is None:
+                # Checkpoint completed steps to keep history bounded
+                workflow.logger.info(
+                    f"Continuing as new after {len(self.completed_step_ids)} steps"
+                )
+                await workflow.wait_condition(workflow.all_handlers_finished)
+                workflow.continue_as_new(args=[
+                    migration_type,
+                    source_version,
+                    target_version,
+                    incremental,
+                    auto_rollback,
+                    MigrationState(
+                        plan=self.plan,
+                        branch_name=branch_name,
+                        started_at=start_time,
+                        completed_step_ids=self.completed_step_ids,
+                        step_results=self.step_results,
+                        paused=self.paused,
+                    ),
+                ])
         else:
             success = await self._execute_batch_migration()
 
@@ -198,69 +264,86 @@ class CodeMigrationWorkflow:
 
         return result
 
-    async def _execute_incremental_migration(self, auto_rollback: bool) -> bool:
-        """Execute migration steps incrementally with validation"""
-
-        # Build dependency graph
-        step_map = {step.id: step for step in self.plan.steps}
-        completed = set()
-
-        while len(completed) < len(self.plan.steps):
-            # Find steps ready to execute (dependencies satisfied)
-            ready_steps = [
-                step for step in self.plan.steps
-                if step.id not in completed
-                and all(dep in completed for dep in step.dependencies)
-            ]
-
-            if not ready_steps:
-                workflow.logger.error("No ready steps but migration incomplete (circular dependency?)")
-                return False
-
-            # Execute ready steps in parallel
-            results = await asyncio.gather(*[
-                self._execute_step(step)
-                for step in ready_steps
-            ])
-
-            # Check results
-            for step, result in zip(ready_steps, results):
-                self.step_results.append(result)
-
-                if result.success:
-                    completed.add(step.id)
-                    workflow.logger.info(f"Step {step.id} completed successfully")
-                else:
-                    workflow.logger.error(f"Step {step.id} failed: {result.errors}")
-
-                    if auto_rollback:
-                        await self._rollback_migration()
-                        return False
-                    else:
-                        # Continue with remaining steps even if one fails
-                        completed.add(step.id)
+    async def _execute_incremental_migration(self, auto_rollback: bool) -> Optional[bool]:
+        """
+        Execute migration steps with validation, each as soon as its
+        dependencies are done
+
+        Returns:
+            Whether the migration succeeded, or None when the run stopped
+            early to continue as new
+        """
+        dag = await run_dag(
+            self.plan.steps,
+            self._execute_step,
+            get_id=lambda step: step.id,
+            get_dependencies=lambda step: step.dependencies,
+            max_concurrency=self.MAX_PARALLEL_STEPS,
+            completed=self.completed_step_ids,
+            # Without auto-rollback, continue with remaining steps even if
+            # one fails
+            stop_when=(lambda result: not result.success) if auto_rollback else None,
+            is_paused=lambda: self.paused,
+            should_stop=self._should_continue_as_new,
+            on_result=self._record_step_result,
+        )
+
+        if dag.stopped_on:
+            await self._rollback_migration()
+            return False
+
+        if dag.interrupted:
+            return None
+
+        if dag.pending:
+            workflow.logger.error(
+                f"Steps {dag.pending} never became ready (circular or missing dependency?)"
+            )
+            return False
 
         return True
 
+    def _record_step_result(self, step: MigrationStep, result: StepResult):
+        """Checkpoint a finished step"""
+        self.step_results.append(result)
+        self.completed_step_ids.append(step.id)
+
+        if result.success:
+            workflow.logger.info(f"Step {step.id} completed successfully")
+        else:
+            workflow.logger.error(f"Step {step.id} failed: {result.errors}")
+
+    def _should_continue_as_new(self) -> bool:
+        return (
+            self.steps_started >= self.MAX_STEPS_PER_RUN
+            or workflow.info().is_continue_as_new_suggested()
+        )
+
     async def _execute_batch_migration(self) -> bool:
         """Execute all migration steps in parallel (faster but riskier)"""
 
         workflow.logger.info("Executing batch migration (all steps in parallel)")
 
-        results = await asyncio.gather(*[
-            self._execute_step(step)
-            for step in self.plan.steps
-        ])
+        # Without waiting on dependencies, but starting them first
+        ordered = order_by_dependencies(
+            self.plan.steps,
+            get_id=lambda step: step.id,
+            get_dependencies=lambda step: step.dependencies,
+            get_priority=lambda step: len(step.files_to_change),
+        )
+        results = await bounded_gather(ordered, self._execute_step, self.MAX_PARALLEL_STEPS)
 
-        self.step_results = results
+        results_by_step = {result.step_id: result for result in results}
+        self.step_results = [results_by_step[step.id] for step in self.plan.steps]
 
         # Check if all succeeded
-        return all(r.success for r in results)
+        return all(r.success for r in self.step_results)
 
     async def _execute_step(self, step: MigrationStep) -> StepResult:
         """Execute a single migration step with validation"""
 
         self.current_step = step.id
+        self.steps_started += 1
         workflow.logger.info(f"Executing step: {step.description}")
 
         try:
@@ -368,15 +451,15 @@ class CodeMigrationWorkflow:
 
     @workflow.signal
     async def pause_migration(self):
-        """Pause the migration after current step"""
+        """Pause the migration: steps in flight finish, no new steps start"""
         workflow.logger.info("Migration pause requested")
-        # In production, set a flag to pause after current step
+        self.paused = True
 
     @workflow.signal
     async def resume_migration(self):
         """Resume a paused migration"""
         workflow.logger.info("Migration resume requested")
-        # In production, clear the pause flag
+        self.paused = False
 
     @workflow.query
     def get_progress(self) -> Dict[str, Any]:
@@ -386,5 +469,6 @@ class CodeMigrationWorkflow:
             'completed_steps': len([r for r in self.step_results if r.success]),
             'failed_steps': len([r for r in self.step_results if not r.success]),
             'current_step': self.current_step,
+            'paused': self.paused,
             'rollback_performed': self.rollback_performed,
         }
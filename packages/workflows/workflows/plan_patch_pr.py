@@ -9,8 +9,11 @@ from datetime import timedelta
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from temporalio import workflow, activity
-import asyncio
+from temporalio.exceptions import ActivityError, ApplicationError, ChildWorkflowError
 
+from .fan_out import bounded_gather, order_by_dependencies
+from .gate_scheduler import Gate, run_gates
+from .memo import execute_memoized_activity
 from ..activities.agent_activities import (
     create_design,
     create_issues,
@@ -85,6 +88,63 @@ class QAResult:
     patches: List[Patch]
 
 
+@dataclass
+class CodeGenBatchResult:
+    """Result of a code generation batch"""
+    patches: Dict[str, Dict[str, Any]]  # issue ID -> generate_code result
+    failed_issue_ids: List[str]
+
+
+def _field(item: Any, name: str, default: Any = None) -> Any:
+    """Read a field from an activity result dict or a dataclass"""
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+async def _generate_patch(issue: Issue) -> Patch:
+    return await workflow.execute_activity(
+        generate_code,
+        args=[issue],
+        start_to_close_timeout=timedelta(minutes=15),
+        heartbeat_timeout=timedelta(minutes=2),
+    )
+
+
+@workflow.defn
+class CodeGenerationBatchWorkflow:
+    """
+    Child workflow generating code for a batch of issues
+
+    Failed issues are reported instead of failing the batch, so patches that
+    were generated are kept and only the failures are retried.
+    """
+
+    @workflow.run
+    async def run(self, issues: List[Dict[str, Any]], max_concurrency: int = 5) -> CodeGenBatchResult:
+        """
+        Generate patches for a batch of issues
+
+        Args:
+            issues: Issues in start order
+            max_concurrency: Maximum generate_code activities in flight
+
+        Returns:
+            Patches by issue ID and the IDs of issues that failed
+        """
+        result = CodeGenBatchResult(patches={}, failed_issue_ids=[])
+
+        async def generate(issue: Dict[str, Any]):
+            try:
+                result.patches[_field(issue, 'id')] = await _generate_patch(issue)
+            except ActivityError as e:
+                workflow.logger.warning(f"Code generation failed for {_field(issue, 'id')}: {e}")
+                result.failed_issue_ids.append(_field(issue, 'id'))
+
+        await bounded_gather(issues, generate, max_concurrency)
+        return result
+
+
 @workflow.defn
 class PlanPatchPRWorkflow:
     """
@@ -96,10 +156,26 @@ class PlanPatchPRWorkflow:
     5. PR creation and merge
     """
 
+    # Maximum generate_code activities in flight
+    CODEGEN_MAX_CONCURRENCY = 5
+
+    # Designs with more issues are generated in child workflow batches
+    CODEGEN_BATCH_SIZE = 20
+
+    # Child batch workflows running at once
+    CODEGEN_MAX_PARALLEL_BATCHES = 2
+
+    # Rounds of child batches; later rounds only retry failed issues
+    CODEGEN_BATCH_ATTEMPTS = 3
+
+    # How long designs and issue breakdowns are reused for the same input
+    PLANNING_CACHE_TTL = timedelta(days=7)
+
     def __init__(self):
         self.design: Optional[Design] = None
         self.issues: List[Issue] = []
         self.patches: List[Patch] = []
+        self.generated: Dict[str, Dict[str, Any]] = {}  # Checkpoint: issue ID -> patch
         self.qa_result: Optional[QAResult] = None
         self.pr_result: Optional[PRResult] = None
 
@@ -119,9 +195,10 @@ class PlanPatchPRWorkflow:
 
         # Step 1: Chief Architect creates design
         workflow.logger.info("Step 1: Creating design with Chief Architect")
-        self.design = await workflow.execute_activity(
+        self.design = await execute_memoized_activity(
             create_design,
-            args=[requirement],
+            [requirement],
+            ttl=self.PLANNING_CACHE_TTL,
             start_to_close_timeout=timedelta(minutes=10),
             retry_policy=workflow.RetryPolicy(
                 maximum_attempts=3,
@@ -131,9 +208,10 @@ class PlanPatchPRWorkflow:
 
         # Step 2: Planner creates issues
         workflow.logger.info(f"Step 2: Breaking down design into issues")
-        self.issues = await workflow.execute_activity(
+        self.issues = await execute_memoized_activity(
             create_issues,
-            args=[self.design],
+            [self.design],
+            ttl=self.PLANNING_CACHE_TTL,
             start_to_close_timeout=timedelta(minutes=5),
         )
 
@@ -149,15 +227,7 @@ class PlanPatchPRWorkflow:
 
         # Step 4: Parallel code generation for each issue
         workflow.logger.info("Step 3: Generating code for all issues in parallel")
-        self.patches = await asyncio.gather(*[
-            workflow.execute_activity(
-                generate_code,
-                args=[issue],
-                start_to_close_timeout=timedelta(minutes=15),
-                heartbeat_timeout=timedelta(minutes=2),
-            )
-            for issue in self.issues
-        ])
+        self.patches = await self._generate_patches(self.issues)
 
         workflow.logger.info(f"Generated {len(self.patches)} patches")
 
@@ -198,28 +268,102 @@ class PlanPatchPRWorkflow:
         workflow.logger.info(f"Workflow completed: {self.pr_result.pr_url}")
         return self.pr_result
 
-    async def _run_quality_gates(self, patches: List[Patch]) -> QAResult:
-        """Run all quality gates in parallel"""
+    async def _generate_patches(self, issues: List[Issue]) -> List[Patch]:
+        """
+        Generate patches with bounded concurrency
 
-        # Run tests, linting, and security scan concurrently
-        test_result, lint_result, security_result = await asyncio.gather(
-            workflow.execute_activity(
-                run_tests,
-                args=[patches],
-                start_to_close_timeout=timedelta(minutes=10),
-            ),
-            workflow.execute_activity(
-                run_linters,
-                args=[patches],
-                start_to_close_timeout=timedelta(minutes=5),
-            ),
-            workflow.execute_activity(
-                run_security_scan,
+        Issues start in dependency order, most complex first. Large designs
+        are split into child workflow batches; finished patches are
+        checkpointed in self.generated so only failed issues are retried.
+        """
+        ordered = order_by_dependencies(
+            issues,
+            get_id=lambda issue: _field(issue, 'id'),
+            get_dependencies=lambda issue: _field(issue, 'dependencies') or [],
+            get_priority=lambda issue: _field(issue, 'estimated_complexity') or 0,
+        )
+
+        if len(ordered) <= self.CODEGEN_BATCH_SIZE:
+            return await bounded_gather(ordered, _generate_patch, self.CODEGEN_MAX_CONCURRENCY)
+
+        per_batch_concurrency = max(1, self.CODEGEN_MAX_CONCURRENCY // self.CODEGEN_MAX_PARALLEL_BATCHES)
+
+        for attempt in range(self.CODEGEN_BATCH_ATTEMPTS):
+            remaining = [issue for issue in ordered if _field(issue, 'id') not in self.generated]
+            if not remaining:
+                break
+
+            batches = [
+                remaining[i:i + self.CODEGEN_BATCH_SIZE]
+                for i in range(0, len(remaining), self.CODEGEN_BATCH_SIZE)
+            ]
+            workflow.logger.info(
+                f"Generating {len(remaining)} patches in {len(batches)} batches (round {attempt + 1})"
+            )
+
+            async def run_batch(indexed) -> Optional[CodeGenBatchResult]:
+                index, batch = indexed
+                try:
+                    return await workflow.execute_child_workflow(
+                        CodeGenerationBatchWorkflow.run,
+                        args=[batch, per_batch_concurrency],
+                        id=f"{workflow.info().workflow_id}-codegen-{attempt}-{index}",
+                    )
+                except ChildWorkflowError as e:
+                    workflow.logger.warning(f"Code generation batch {index} failed: {e}")
+                    return None
+
+            def checkpoint(indexed, result: Optional[CodeGenBatchResult]):
+                if result:
+                    self.generated.update(result.patches)
+
+            await bounded_gather(
+                list(enumerate(batches)),
+                run_batch,
+                self.CODEGEN_MAX_PARALLEL_BATCHES,
+                on_result=checkpoint,
+            )
+
+        missing = [_field(issue, 'id') for issue in ordered if _field(issue, 'id') not in self.generated]
+        if missing:
+            raise ApplicationError(f"Code generation failed for issues: {', '.join(missing)}")
+
+        return [self.generated[_field(issue, 'id')] for issue in ordered]
+
+    async def _run_quality_gates(self, patches: List[Patch], fail_fast: bool = True) -> QAResult:
+        """
+        Run all quality gates in parallel, cheapest first
+
+        Test and lint failures both lead to an auto-fix and a full re-run, so
+        with fail_fast the first of them to fail cancels the other checks.
+        """
+        def execute(activity_fn, timeout: timedelta):
+            return lambda: workflow.execute_activity(
+                activity_fn,
                 args=[patches],
-                start_to_close_timeout=timedelta(minutes=5),
-            ),
+                start_to_close_timeout=timeout,
+            )
+
+        # Run tests, linting, and security scan concurrently
+        gate_run = await run_gates(
+            [
+                Gate('tests', execute(run_tests, timedelta(minutes=10)), cost=10,
+                     is_blocking_failure=lambda result: not result['passed']),
+                Gate('linting', execute(run_linters, timedelta(minutes=5)), cost=5,
+                     is_blocking_failure=lambda result: not result['passed']),
+                Gate('security', execute(run_security_scan, timedelta(minutes=5)), cost=5),
+            ],
+            fail_fast=fail_fast,
         )
 
+        if gate_run.failed_on:
+            workflow.logger.info(f"Quality gate {gate_run.failed_on} failed, cancelled {gate_run.cancelled}")
+
+        # Checks cancelled by a failure count as not passed
+        test_result = gate_run.results.get('tests', {'passed': False, 'coverage': 0.0})
+        lint_result = gate_run.results.get('linting', {'passed': False})
+        security_result = gate_run.results.get('security', {'issues': []})
+
         return QAResult(
             tests_passed=test_result['passed'],
             coverage=test_result['coverage'],
@@ -239,8 +383,8 @@ class PlanPatchPRWorkflow:
             start_to_close_timeout=timedelta(minutes=10),
         )
 
-        # Re-run quality gates on fixed code
-        new_qa_result = await self._run_quality_gates(fixed_patches)
+        # Re-run all quality gates on fixed code for the final verdict
+        new_qa_result = await self._run_quality_gates(fixed_patches, fail_fast=False)
         new_qa_result.auto_fixed = True
 
         return new_qa_result
@@ -6,11 +6,13 @@ fix issues or block merge if critical failures occur.
 """
 
 from datetime import timedelta
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from temporalio import workflow
+from temporalio.exceptions import WorkflowAlreadyStartedError
 import asyncio
 
+from .gate_scheduler import Gate, run_gates
 from ..activities.tool_activities import (
     run_tests,
     run_linters,
@@ -19,6 +21,9 @@ from ..activities.tool_activities import (
     check_code_coverage,
     check_dependencies,
     run_static_analysis,
+    fingerprint_check_inputs,
+    get_cached_check_results,
+    store_check_results,
 )
 from ..activities.agent_activities import (
     review_code,
@@ -27,7 +32,7 @@ from ..activities.agent_activities import (
 )
 from ..activities.github_activities import (
     update_pr_status,
-    add_pr_comment,
+    apply_pr_changes,
 )
 
 
@@ -54,6 +59,32 @@ class QualityGateResult:
     overall_score: float
     auto_fixes_applied: bool
     blocking_issues: List[str]
+    cache_hits: int = 0
+    cache_lookups: int = 0
+    cache_hit_rate: float = 0.0
+
+
+@dataclass
+class CheckSpec:
+    """How to run one quality check"""
+    id: str  # Cache identifier (see activities/check_cache.py)
+    name: str
+    activity: Callable
+    timeout: timedelta  # Also the expected cost: cheaper checks start first
+    blocking: bool = False  # A required failure cancels the remaining checks
+    extra_args: Tuple[Any, ...] = ()
+
+
+QUALITY_CHECKS = [
+    CheckSpec('unit_tests', 'Unit Tests', run_tests, timedelta(minutes=10), blocking=True, extra_args=('unit',)),
+    CheckSpec('integration_tests', 'Integration Tests', run_tests, timedelta(minutes=15), blocking=True, extra_args=('integration',)),
+    CheckSpec('linting', 'Linting', run_linters, timedelta(minutes=5)),
+    CheckSpec('security', 'Security Scan', run_security_scan, timedelta(minutes=5), blocking=True),
+    CheckSpec('coverage', 'Code Coverage', check_code_coverage, timedelta(minutes=5), blocking=True),
+    CheckSpec('performance', 'Performance Tests', run_performance_tests, timedelta(minutes=10)),
+    CheckSpec('dependencies', 'Dependencies', check_dependencies, timedelta(minutes=3), blocking=True),
+    CheckSpec('static_analysis', 'Static Analysis', run_static_analysis, timedelta(minutes=5)),
+]
 
 
 @workflow.defn
@@ -68,9 +99,17 @@ class QualityGateWorkflow:
     6. Blocks merge if critical failures
     """
 
+    # Checks in flight at once. Below the number of checks so the long test
+    # runs only start as cheap checks (dependencies, scanners) finish, and a
+    # blocking failure among those skips them
+    MAX_PARALLEL_CHECKS = 4
+
     def __init__(self):
         self.checks: List[QualityCheck] = []
         self.auto_fixes_applied = False
+        self.cache_hits = 0
+        self.cache_lookups = 0
+        self.failed_fast_on: Optional[str] = None
 
     @workflow.run
     async def run(
@@ -80,6 +119,7 @@ class QualityGateWorkflow:
         attempt_auto_fix: bool = True,
         required_coverage: float = 80.0,
         required_score: float = 85.0,
+        fail_fast: bool = True,
     ) -> QualityGateResult:
         """
         Execute quality gate checks
@@ -90,6 +130,7 @@ class QualityGateWorkflow:
             attempt_auto_fix: Whether to attempt automated fixes
             required_coverage: Minimum required code coverage (%)
             required_score: Minimum required overall quality score
+            fail_fast: Cancel remaining checks when a blocking check fails
 
         Returns:
             QualityGateResult with all check results
@@ -105,16 +146,22 @@ class QualityGateWorkflow:
 
         # Step 1: Run all quality checks in parallel
         workflow.logger.info("Step 1: Running quality checks in parallel")
-        self.checks = await self._run_all_checks(branch, required_coverage)
+        self.checks = await self._run_all_checks(pr_number, branch, required_coverage, fail_fast)
 
         # Step 2: Attempt auto-fixes if enabled and needed
         if attempt_auto_fix and self._has_auto_fixable_issues():
+            if self.failed_fast_on:
+                # Report the failure now rather than after fixes and re-run
+                await self._update_pr_status(
+                    pr_number, self._calculate_results(pr_number, required_score)
+                )
+
             workflow.logger.info("Step 2: Attempting automated fixes")
             await self._apply_auto_fixes(branch)
 
             # Re-run checks after fixes
             workflow.logger.info("Re-running checks after auto-fixes")
-            self.checks = await self._run_all_checks(branch, required_coverage)
+            self.checks = await self._run_all_checks(pr_number, branch, required_coverage, fail_fast)
 
         # Step 3: Calculate overall results
         result = self._calculate_results(pr_number, required_score)
@@ -131,152 +178,261 @@ class QualityGateWorkflow:
 
     async def _run_all_checks(
         self,
+        pr_number: int,
         branch: str,
         required_coverage: float,
+        fail_fast: bool = True,
     ) -> List[QualityCheck]:
-        """Run all quality checks in parallel"""
-
-        # Execute all checks concurrently
-        results = await asyncio.gather(
-            # Unit tests
-            workflow.execute_activity(
-                run_tests,
-                args=[branch, 'unit'],
-                start_to_close_timeout=timedelta(minutes=10),
-            ),
-            # Integration tests
-            workflow.execute_activity(
-                run_tests,
-                args=[branch, 'integration'],
-                start_to_close_timeout=timedelta(minutes=15),
-            ),
-            # Linting
-            workflow.execute_activity(
-                run_linters,
-                args=[branch],
-                start_to_close_timeout=timedelta(minutes=5),
-            ),
-            # Security scan
-            workflow.execute_activity(
-                run_security_scan,
-                args=[branch],
-                start_to_close_timeout=timedelta(minutes=5),
-            ),
-            # Code coverage
-            workflow.execute_activity(
-                check_code_coverage,
-                args=[branch],
-                start_to_close_timeout=timedelta(minutes=5),
-            ),
-            # Performance tests
-            workflow.execute_activity(
-                run_performance_tests,
-                args=[branch],
-                start_to_close_timeout=timedelta(minutes=10),
-            ),
-            # Dependency check
-            workflow.execute_activity(
-                check_dependencies,
-                args=[branch],
-                start_to_close_timeout=timedelta(minutes=3),
-            ),
-            # Static analysis
-            workflow.execute_activity(
-                run_static_analysis,
-                args=[branch],
-                start_to_close_timeout=timedelta(minutes=5),
-            ),
+        """
+        Run quality checks in parallel, cheapest first, at most
+        MAX_PARALLEL_CHECKS at once
+
+        Checks whose inputs are unchanged reuse cached verdicts; file-level
+        checks only run on files without a cached verdict. With fail_fast, a
+        failed blocking check cancels the checks still running and the rest
+        are reported as skipped.
+        """
+        fingerprints = await workflow.execute_activity(
+            fingerprint_check_inputs,
+            args=[branch, [spec.id for spec in QUALITY_CHECKS]],
+            start_to_close_timeout=timedelta(minutes=2),
         )
 
-        (
-            unit_tests,
-            integration_tests,
-            linting,
-            security,
-            coverage,
-            performance,
-            dependencies,
-            static_analysis,
-        ) = results
-
-        # Convert results to QualityCheck objects
-        checks = [
-            QualityCheck(
-                name='Unit Tests',
-                passed=unit_tests['passed'],
-                required=True,
-                score=100.0 if unit_tests['passed'] else 0.0,
-                issues=unit_tests.get('failures', []),
-                auto_fixable=False,
-                details=unit_tests,
-            ),
-            QualityCheck(
-                name='Integration Tests',
-                passed=integration_tests['passed'],
+        keys = list(fingerprints['tree'].values()) + [
+            key
+            for file_keys in fingerprints['files'].values()
+            for key in file_keys.values()
+        ]
+        cached: Dict[str, Dict[str, Any]] = {}
+        if keys:
+            cached = await workflow.execute_activity(
+                get_cached_check_results,
+                args=[keys],
+                start_to_close_timeout=timedelta(minutes=1),
+            )
+        self.cache_lookups += len(keys)
+        self.cache_hits += len(cached)
+
+        specs = {spec.id: spec for spec in QUALITY_CHECKS}
+
+        async def report_failure(gate: Gate, outcome):
+            # Surface non-blocking failures (e.g. lint) while checks still run
+            check = self._to_quality_check(specs[gate.id], outcome[0], required_coverage)
+            if not check.passed and not gate.is_blocking_failure(outcome):
+                await workflow.execute_activity(
+                    update_pr_status,
+                    args=[pr_number, 'pending', f"{check.name} failed - remaining checks in progress"],
+                    start_to_close_timeout=timedelta(seconds=30),
+                )
+
+        gate_run = await run_gates(
+            [
+                Gate(
+                    id=spec.id,
+                    run=lambda spec=spec: self._run_check(spec, branch, fingerprints, cached),
+                    cost=spec.timeout.total_seconds(),
+                    is_blocking_failure=lambda outcome, spec=spec: self._is_blocking_failure(
+                        spec, outcome[0], required_coverage
+                    ),
+                )
+                for spec in QUALITY_CHECKS
+            ],
+            fail_fast=fail_fast,
+            max_concurrency=self.MAX_PARALLEL_CHECKS,
+            on_result=report_failure,
+        )
+        self.failed_fast_on = gate_run.failed_on
+        if gate_run.failed_on:
+            workflow.logger.info(
+                f"{specs[gate_run.failed_on].name} failed, cancelled "
+                f"{len(gate_run.cancelled)} and skipped {len(gate_run.skipped)} checks"
+            )
+
+        checks = []
+        new_entries = {}
+        for spec in QUALITY_CHECKS:
+            if spec.id in gate_run.results:
+                result, entries = gate_run.results[spec.id]
+                new_entries.update(entries)
+                checks.append(self._to_quality_check(spec, result, required_coverage))
+            else:
+                checks.append(QualityCheck(
+                    name=spec.name,
+                    passed=False,
+                    required=False,
+                    score=0.0,
+                    issues=[f"Not run: {specs[gate_run.failed_on].name} failed"],
+                    auto_fixable=False,
+                    details={'skipped': True},
+                ))
+
+        if new_entries:
+            await workflow.execute_activity(
+                store_check_results,
+                args=[new_entries],
+                start_to_close_timeout=timedelta(minutes=1),
+            )
+
+        return checks
+
+    def _is_blocking_failure(
+        self,
+        spec: CheckSpec,
+        result: Dict[str, Any],
+        required_coverage: float,
+    ) -> bool:
+        """Whether a check result fails the gate outright"""
+        check = self._to_quality_check(spec, result, required_coverage)
+        return spec.blocking and check.required and not check.passed
+
+    def _to_quality_check(
+        self,
+        spec: CheckSpec,
+        result: Dict[str, Any],
+        required_coverage: float,
+    ) -> QualityCheck:
+        """Convert a check result to a QualityCheck"""
+        if spec.id in ('unit_tests', 'integration_tests'):
+            return QualityCheck(
+                name=spec.name,
+                passed=result['passed'],
                 required=True,
-                score=100.0 if integration_tests['passed'] else 0.0,
-                issues=integration_tests.get('failures', []),
+                score=100.0 if result['passed'] else 0.0,
+                issues=result.get('failures', []),
                 auto_fixable=False,
-                details=integration_tests,
-            ),
-            QualityCheck(
-                name='Linting',
-                passed=linting['passed'],
+                details=result,
+            )
+        if spec.id == 'linting':
+            return QualityCheck(
+                name=spec.name,
+                passed=result['passed'],
                 required=False,
-                score=linting['score'],
-                issues=linting.get('issues', []),
-                auto_fixable=linting.get('auto_fixable', True),
-                details=linting,
-            ),
-            QualityCheck(
-                name='Security Scan',
-                passed=len(security['issues']) == 0,
-                required=security.get('has_critical', False),
-                score=100.0 - (len(security['issues']) * 10),
-                issues=security['issues'],
-                auto_fixable=security.get('auto_fixable', False),
-                details=security,
-            ),
-            QualityCheck(
-                name='Code Coverage',
-                passed=coverage['percentage'] >= required_coverage,
+                score=result['score'],
+                issues=result.get('issues', []),
+                auto_fixable=result.get('auto_fixable', True),
+                details=result,
+            )
+        if spec.id == 'security':
+            return QualityCheck(
+                name=spec.name,
+                passed=len(result['issues']) == 0,
+                required=result.get('has_critical', False),
+                score=100.0 - (len(result['issues']) * 10),
+                issues=result['issues'],
+                auto_fixable=result.get('auto_fixable', False),
+                details=result,
+            )
+        if spec.id == 'coverage':
+            return QualityCheck(
+                name=spec.name,
+                passed=result['percentage'] >= required_coverage,
                 required=True,
-                score=coverage['percentage'],
-                issues=[f"Coverage {coverage['percentage']:.1f}% < required {required_coverage}%"]
-                if coverage['percentage'] < required_coverage else [],
+                score=result['percentage'],
+                issues=[f"Coverage {result['percentage']:.1f}% < required {required_coverage}%"]
+                if result['percentage'] < required_coverage else [],
                 auto_fixable=True,
-                details=coverage,
-            ),
-            QualityCheck(
-                name='Performance Tests',
-                passed=performance['passed'],
+                details=result,
+            )
+        if spec.id == 'performance':
+            return QualityCheck(
+                name=spec.name,
+                passed=result['passed'],
                 required=False,
-                score=performance['score'],
-                issues=performance.get('regressions', []),
+                score=result['score'],
+                issues=result.get('regressions', []),
                 auto_fixable=False,
-                details=performance,
-            ),
-            QualityCheck(
-                name='Dependencies',
-                passed=len(dependencies['vulnerabilities']) == 0,
-                required=dependencies.get('has_critical', False),
-                score=100.0 - (len(dependencies['vulnerabilities']) * 5),
-                issues=dependencies['vulnerabilities'],
+                details=result,
+            )
+        if spec.id == 'dependencies':
+            return QualityCheck(
+                name=spec.name,
+                passed=len(result['vulnerabilities']) == 0,
+                required=result.get('has_critical', False),
+                score=100.0 - (len(result['vulnerabilities']) * 5),
+                issues=result['vulnerabilities'],
                 auto_fixable=False,
-                details=dependencies,
-            ),
-            QualityCheck(
-                name='Static Analysis',
-                passed=static_analysis['passed'],
-                required=False,
-                score=static_analysis['score'],
-                issues=static_analysis.get('issues', []),
-                auto_fixable=static_analysis.get('auto_fixable', True),
-                details=static_analysis,
-            ),
-        ]
+                details=result,
+            )
+        # Static analysis
+        return QualityCheck(
+            name=spec.name,
+            passed=result['passed'],
+            required=False,
+            score=result['score'],
+            issues=result.get('issues', []),
+            auto_fixable=result.get('auto_fixable', True),
+            details=result,
+        )
 
-        return checks
+    async def _run_check(
+        self,
+        spec: CheckSpec,
+        branch: str,
+        fingerprints: Dict[str, Any],
+        cached: Dict[str, Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Run one check, reusing cached verdicts
+
+        Returns:
+            Check result and new cache entries
+        """
+        file_keys = fingerprints['files'].get(spec.id)
+        if file_keys is not None:
+            changed = [path for path, key in file_keys.items() if key not in cached]
+            fresh = None
+            if changed:
+                fresh = await self._execute_check(spec, {'branch': branch, 'files': changed})
+            entries = {
+                file_keys[path]: {'check': spec.id, 'result': result}
+                for path, result in (fresh or {}).get('files', {}).items()
+                if path in file_keys
+            }
+            return self._merge_file_results(fresh, file_keys, cached), entries
+
+        key = fingerprints['tree'].get(spec.id)
+        if key in cached:
+            return cached[key], {}
+
+        result = await self._execute_check(spec, branch)
+        # Failed test runs may be flaky, so only their passes are cached
+        if key is None or not result.get('passed', True):
+            return result, {}
+        return result, {key: {'check': spec.id, 'result': result}}
+
+    async def _execute_check(self, spec: CheckSpec, target: Any) -> Dict[str, Any]:
+        """Execute the activity for a check"""
+        return await workflow.execute_activity(
+            spec.activity,
+            args=[target, *spec.extra_args],
+            start_to_close_timeout=spec.timeout,
+        )
+
+    def _merge_file_results(
+        self,
+        fresh: Optional[Dict[str, Any]],
+        file_keys: Dict[str, str],
+        cached: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Combine cached per-file verdicts with results for changed files"""
+        fresh_files = (fresh or {}).get('files', {})
+        files = [
+            cached[key] if key in cached else fresh_files.get(path, {})
+            for path, key in file_keys.items()
+        ]
+        issues = [issue for result in files for issue in result.get('issues', [])]
+        scores = [result['score'] for result in files if 'score' in result]
+
+        merged = {k: v for k, v in (fresh or {}).items() if k != 'files'}
+        merged.update(
+            passed=not issues,
+            issues=issues,
+            has_critical=any(result.get('has_critical') for result in files),
+            score=sum(scores) / len(scores) if scores else merged.get('score', 100.0),
+            files_checked=len(fresh_files),
+            files_cached=len(file_keys) - len(fresh_files),
+        )
+        return merged
 
     def _has_auto_fixable_issues(self) -> bool:
         """Check if there are any auto-fixable issues"""
@@ -333,9 +489,9 @@ class QualityGateWorkflow:
             check.passed for check in self.checks if check.required
         )
 
-        # Calculate weighted overall score
-        total_weight = len(self.checks)
-        overall_score = sum(check.score for check in self.checks) / total_weight
+        # Calculate weighted overall score over the checks that ran
+        ran = [check for check in self.checks if not check.details.get('skipped')]
+        overall_score = sum(check.score for check in ran) / len(ran) if ran else 0.0
 
         # Collect blocking issues
         blocking_issues = []
@@ -357,6 +513,9 @@ class QualityGateWorkflow:
             overall_score=overall_score,
             auto_fixes_applied=self.auto_fixes_applied,
             blocking_issues=blocking_issues,
+            cache_hits=self.cache_hits,
+            cache_lookups=self.cache_lookups,
+            cache_hit_rate=self.cache_hits / self.cache_lookups if self.cache_lookups else 0.0,
         )
 
     async def _update_pr_status(self, pr_number: int, result: QualityGateResult):
@@ -369,18 +528,20 @@ class QualityGateWorkflow:
             f"{len([c for c in result.checks if c.passed])}/{len(result.checks)} checks passed"
         )
 
+        # Status check and detailed comment in one activity
         await workflow.execute_activity(
-            update_pr_status,
-            args=[pr_number, status, description],
-            start_to_close_timeout=timedelta(seconds=30),
-        )
-
-        # Add detailed comment
-        comment = self._generate_comment(result)
-        await workflow.execute_activity(
-            add_pr_comment,
-            args=[pr_number, comment],
+            apply_pr_changes,
+            args=[{
+                'pr_number': pr_number,
+                'status': {
+                    'state': status,
+                    'description': description,
+                    'context': 'quality-gate',
+                },
+                'comment': self._generate_comment(result),
+            }],
             start_to_close_timeout=timedelta(seconds=30),
+            heartbeat_timeout=timedelta(seconds=10),
         )
 
     def _generate_comment(self, result: QualityGateResult) -> str:
@@ -427,28 +588,152 @@ class QualityGateWorkflow:
         }
 
 
+@dataclass
+class PullRequestEvent:
+    """New commit pushed to a pull request"""
+    pr_number: int
+    branch: str
+    head_sha: str
+
+
+@dataclass
+class QualityMonitorState:
+    """Compact monitoring state carried across continue-as-new"""
+    gates_started: int = 0
+    seen_commits: List[str] = field(default_factory=list)
+    pending_events: List[PullRequestEvent] = field(default_factory=list)
+
+
 @workflow.defn
 class ContinuousQualityWorkflow:
     """
     Long-running workflow that monitors PRs and automatically
     runs quality gates on new commits
+
+    Commits arrive through the `pr_updated` signal (e.g. from a GitHub
+    webhook). Quality gates are started without waiting for them, a gate
+    for an outdated commit is cancelled when a newer one arrives, and the
+    workflow continues as new periodically to keep its history bounded.
     """
 
+    # PR commits remembered for deduplication
+    MAX_SEEN_COMMITS = 1000
+
+    # Event batches before continuing as new
+    MAX_ITERATIONS = 500
+
+    def __init__(self):
+        self.gates_started = 0
+        self.seen_commits: Dict[str, None] = {}
+        self.pending_events: List[PullRequestEvent] = []
+        self.active_gates: Dict[int, workflow.ChildWorkflowHandle] = {}
+        self.stop_requested = False
+
     @workflow.run
-    async def run(self, repository: str):
+    async def run(
+        self,
+        repository: str,
+        max_iterations: int = MAX_ITERATIONS,
+        state: Optional[QualityMonitorState] = None,
+    ):
         """
         Monitor repository and run quality gates on PRs
 
         Args:
             repository: Repository name to monitor
+            max_iterations: Event batches before continuing as new
+            state: State carried over from the previous run
         """
         workflow.logger.info(f"Starting continuous quality monitoring for {repository}")
 
-        while True:
-            await asyncio.sleep(60)  # Check every minute
-
-            # In production, fetch open PRs from GitHub
-            # For each PR with new commits, spawn QualityGateWorkflow
+        if state:
+            self.gates_started = state.gates_started
+            self.seen_commits = dict.fromkeys(state.seen_commits)
+            self.pending_events = list(state.pending_events) + self.pending_events
+
+        for _ in range(max_iterations):
+            await workflow.wait_condition(
+                lambda: bool(self.pending_events) or self.stop_requested
+            )
+
+            await self._start_gates(repository)
+
+            if self.stop_requested:
+                workflow.logger.info(f"Stopping continuous quality monitoring for {repository}")
+                return
+            if workflow.info().is_continue_as_new_suggested():
+                break
+
+        # Quality gates are abandoned, so they keep running; only signals
+        # still being handled need to finish first
+        await workflow.wait_condition(workflow.all_handlers_finished)
+        workflow.continue_as_new(args=[
+            repository,
+            max_iterations,
+            QualityMonitorState(
+                gates_started=self.gates_started,
+                seen_commits=list(self.seen_commits),
+                pending_events=self.pending_events,
+            ),
+        ])
+
+    async def _start_gates(self, repository: str):
+        """Start a quality gate for each new commit without waiting"""
+        events, self.pending_events = self.pending_events, []
+
+        for event in events:
+            key = f"{event.pr_number}:{event.head_sha}"
+            if key in self.seen_commits:
+                continue
+            self.seen_commits[key] = None
+            if len(self.seen_commits) > self.MAX_SEEN_COMMITS:
+                del self.seen_commits[next(iter(self.seen_commits))]
+
+            # A gate for an older commit of the same PR is now stale
+            previous = self.active_gates.pop(event.pr_number, None)
+            if previous:
+                previous.cancel()
+
+            try:
+                handle = await workflow.start_child_workflow(
+                    QualityGateWorkflow.run,
+                    args=[event.pr_number, event.branch],
+                    id=f"quality-gate-{repository.replace('/', '-')}-pr-{event.pr_number}-{event.head_sha[:12]}",
+                    parent_close_policy=workflow.ParentClosePolicy.ABANDON,
+                )
+            except WorkflowAlreadyStartedError:
+                workflow.logger.info(f"Quality gate for {key} already running")
+                continue
+
+            self.gates_started += 1
+            self.active_gates[event.pr_number] = handle
+            asyncio.create_task(self._track_gate(event.pr_number, handle))
+
+    async def _track_gate(self, pr_number: int, handle: workflow.ChildWorkflowHandle):
+        """Drop a gate from the active set once its workflow closes"""
+        try:
+            await handle
+        except Exception as e:
+            workflow.logger.warning(f"Quality gate for PR #{pr_number} did not complete: {e}")
+        finally:
+            if self.active_gates.get(pr_number) is handle:
+                del self.active_gates[pr_number]
+
+    @workflow.signal
+    async def pr_updated(self, event: PullRequestEvent):
+        """Signal: a pull request received a new commit"""
+        self.pending_events.append(event)
+
+    @workflow.signal
+    async def stop_monitoring(self):
+        """Signal: stop monitoring after the current batch"""
+        self.stop_requested = True
 
-            # Placeholder for demonstration
-            await asyncio.sleep(1)
+    @workflow.query
+    def get_stats(self) -> Dict[str, Any]:
+        """Get monitoring statistics"""
+        return {
+            'gates_started': self.gates_started,
+            'active_gates': sorted(self.active_gates),
+            'pending_events': len(self.pending_events),
+        }